@@ -1,5 +1,8 @@
 # app/api/deps.py
 
+import secrets
+from typing import Optional
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
@@ -12,29 +15,35 @@ from app.config import settings
 # OAuth2 로그인을 위한 토큰 URL 설정
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/users/login")
 
-# 현재 사용자 가져오기
-def get_current_user(
-        db: Session = Depends(get_db),
-        token: str = Depends(oauth2_scheme)
-) -> User:
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="토큰 인증에 실패했습니다",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
+# 토큰에서 사용자 ID 추출 (유효하지 않으면 None)
+def decode_user_id(token: str) -> Optional[str]:
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=["HS256"]
         )
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            raise credentials_exception
     except JWTError:
-        raise credentials_exception
+        return None
+    return payload.get("sub")
 
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="토큰 인증에 실패했습니다",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+# 토큰만 검증 (DB 조회 없음) - 304 처럼 사용자 정보 없이 응답할 수 있는 경로는 이것만 먼저 확인
+def get_token_user_id(token: str = Depends(oauth2_scheme)) -> str:
+    user_id = decode_user_id(token)
+    if user_id is None:
+        raise _credentials_exception()
+    return user_id
+
+# 토큰의 사용자 조회 및 활성 여부 확인
+def load_current_user(db: Session, user_id: str) -> User:
     user = db.query(User).filter(User.id == user_id).first()
     if user is None:
-        raise credentials_exception
+        raise _credentials_exception()
     if not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -42,6 +51,13 @@ def get_current_user(
         )
     return user
 
+# 현재 사용자 가져오기
+def get_current_user(
+        db: Session = Depends(get_db),
+        token: str = Depends(oauth2_scheme)
+) -> User:
+    return load_current_user(db, get_token_user_id(token))
+
 # 관리자 권한 체크
 def get_current_admin(
         current_user: User = Depends(get_current_user),
@@ -53,6 +69,15 @@ def get_current_admin(
         )
     return current_user
 
+# /metrics 접근 확인 (METRICS_TOKEN 과 같은 토큰이거나 관리자)
+def verify_metrics_access(
+        db: Session = Depends(get_db),
+        token: str = Depends(oauth2_scheme)
+) -> None:
+    if settings.METRICS_TOKEN and secrets.compare_digest(token, settings.METRICS_TOKEN):
+        return
+    get_current_admin(load_current_user(db, get_token_user_id(token)))
+
 # 페이징 매개변수
 def get_pagination_params(
         page: int = 1,
@@ -1,22 +1,64 @@
 # app/api/quiz.py
-from typing import Any, List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List, Literal, Optional
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, Response, status, Query
 from sqlalchemy.orm import Session
-import random
 
-from app.api.deps import get_current_admin, get_current_user, get_pagination_params
+from app.api.deps import (
+    get_current_admin,
+    get_current_user,
+    get_pagination_params,
+    get_token_user_id,
+    load_current_user,
+)
+from app.config import settings
 from app.db import get_db
 from app.models.user import User
-from app.models.quiz import Quiz
-from app.models.question import Question
-from app.models.submission import Submission
+from app.models.quiz import Quiz, QuizRoster
+from app.models.question import Question, QuestionSignature
+from app.services.exam import (
+    add_to_roster,
+    check_exam_window,
+    create_submission,
+    get_in_progress_submission,
+    roster_allows,
+    run_materialize,
+    validate_exam_window,
+)
+from app.services.quiz_cache import (
+    get_active_quizzes,
+    get_quiz,
+    invalidate_quiz,
+)
+from app.services.quiz import (
+    QUESTION_FIELDS,
+    QUIZ_FIELDS,
+    build_page,
+    load_quiz_detail,
+    parse_fieldset,
+    quiz_detail_dict,
+)
+from app.services import adaptive, attempts, blueprint, deadlines, dedup, exposure, item_analysis, leaderboard, score_stats, search
+from app.services.snapshot import request_rebuild
+from app.services.warmup import run_warmup
+from app.utils.cache import get_index_version, quiz_etag_key, quiz_list_etag_key
+from app.utils.conditional import conditional_response, get_validators, is_fresh, not_modified, render
 from app.schemas.quiz import (
     QuizCreate,
     QuizUpdate,
     Quiz as QuizSchema,
+    QuizWithAttempt,
     QuizWithQuestions,
     QuestionCreate,
-    Question as QuestionSchema
+    Question as QuestionSchema,
+    LeaderboardEntry,
+    LeaderboardRank,
+    RosterResult,
+    ScoreDistribution,
+    DuplicateCluster,
+    ItemAnalysis,
+    SearchPage,
+    RosterUpdate
 )
 
 router = APIRouter()
@@ -30,56 +72,146 @@ def create_quiz(
         current_user: User = Depends(get_current_admin)
 ) -> Any:
     """퀴즈 생성 (관리자 전용)"""
+    validate_exam_window(quiz_in.starts_at, quiz_in.ends_at)
+    deadlines.validate_time_limit(quiz_in.time_limit_minutes)
+    # 블루프린트 재고는 문제를 추가한 뒤 활성화/수정할 때 검사
+    sections = blueprint.validate_blueprint(quiz_in.blueprint, quiz_in.adaptive) or None
     quiz = Quiz(
         title=quiz_in.title,
         description=quiz_in.description,
-        questions_count=quiz_in.questions_count,
+        questions_count=sum(section["count"] for section in sections) if sections else quiz_in.questions_count,
         randomize_questions=quiz_in.randomize_questions,
         randomize_options=quiz_in.randomize_options,
+        adaptive=quiz_in.adaptive,
+        blueprint=sections,
+        starts_at=quiz_in.starts_at,
+        ends_at=quiz_in.ends_at,
+        time_limit_minutes=quiz_in.time_limit_minutes,
         created_by=current_user.id
     )
     db.add(quiz)
     db.commit()
     db.refresh(quiz)
+    invalidate_quiz(quiz.id)
     return quiz
 
 # 퀴즈 목록 조회
-@router.get("/", response_model=List[QuizSchema])
+@router.get("/", response_model=List[QuizWithAttempt])
 def read_quizzes(
+        request: Request,
         db: Session = Depends(get_db),
-        current_user: User = Depends(get_current_user),
+        user_id: str = Depends(get_token_user_id),
         page: int = Query(1, ge=1, description="페이지 번호"),
-        page_size: int = Query(10, ge=1, le=100, description="페이지 크기")
+        page_size: int = Query(10, ge=1, le=100, description="페이지 크기"),
+        with_attempts: bool = Query(False, description="퀴즈별 내 응시 요약(attempt) 포함")
 ) -> Any:
     """모든 퀴즈 목록 조회 (관리자는 모든 퀴즈, 일반 사용자는 응시 가능한 퀴즈)"""
+    # 사용자 확인 후 색인된 ETag 와 같으면 퀴즈 조회 없이 304 (응시 요약을 포함하면 사용자마다 본문이 달라 색인하지 않음)
+    current_user = load_current_user(db, user_id)
+    index_field = f"{page}:{page_size}"
+    if not with_attempts:
+        validators = get_validators(quiz_list_etag_key(), index_field)
+        if validators and is_fresh(request, validators):
+            return not_modified(request, validators)
+    # 목록을 읽기 전의 무효화 버전 (읽는 도중 바뀌면 이 본문은 색인하지 않음)
+    index_version = None if with_attempts else get_index_version(quiz_list_etag_key())
+
     pagination = get_pagination_params(page, page_size)
 
-    if current_user.is_admin:
-        quizzes = db.query(Quiz).filter(Quiz.is_active == True) \
-            .offset(pagination["skip"]).limit(pagination["limit"]).all()
-    else:
-        # 일반 사용자는 퀴즈 목록 조회 시 응시 여부 확인
-        quizzes = db.query(Quiz).filter(Quiz.is_active == True) \
-            .offset(pagination["skip"]).limit(pagination["limit"]).all()
+    # 활성 퀴즈 목록은 캐시에서 읽고 페이지만 잘라서 반환
+    quizzes = get_active_quizzes(db)[pagination["skip"]:pagination["skip"] + pagination["limit"]]
+    if with_attempts:
+        # 페이지 전체의 응시 여부를 요약 표에서 쿼리 하나로
+        summaries = attempts.get_summaries(db, current_user.id, [quiz["id"] for quiz in quizzes])
+        body = render(List[QuizWithAttempt], [{**quiz, "attempt": summaries.get(quiz["id"])} for quiz in quizzes])
+        return conditional_response(request, body)
+    body = render(List[QuizSchema], quizzes)
+    return conditional_response(
+        request, body, index_key=quiz_list_etag_key(), index_field=index_field, index_version=index_version
+    )
+
+# 캐시 예열 (관리자만)
+@router.post("/warmup", status_code=status.HTTP_202_ACCEPTED)
+def warmup_cache(
+        *,
+        background_tasks: BackgroundTasks,
+        quiz_ids: Optional[List[int]] = Query(None, description="문제까지 예열할 퀴즈 ID (생략 시 모든 활성 퀴즈)"),
+        current_user: User = Depends(get_current_admin)
+) -> Any:
+    """퀴즈 목록/메타데이터/문제 캐시 예열 (관리자 전용, 백그라운드 실행)"""
+    background_tasks.add_task(run_warmup, quiz_ids)
+    return {"message": "캐시 예열을 시작했습니다", "quiz_ids": quiz_ids}
 
-    return quizzes
+# 퀴즈/문제 검색 (관리자만)
+@router.get("/search", response_model=SearchPage)
+def search_quizzes(
+        *,
+        db: Session = Depends(get_db),
+        q: str = Query(..., min_length=1, max_length=200, description="검색어 (단어별 접두어 일치, 모든 단어 포함)"),
+        target: Literal["questions", "quizzes"] = Query("questions", description="검색 대상"),
+        quiz_id: Optional[int] = Query(None, description="문제 검색 시 이 퀴즈의 문제만"),
+        limit: int = Query(20, ge=1, le=settings.MAX_PAGE_SIZE, description="페이지 크기"),
+        cursor: Optional[str] = Query(None, description="이전 페이지의 next_cursor"),
+        current_user: User = Depends(get_current_admin)
+) -> Any:
+    """퀴즈 제목/설명 또는 문제 내용/선택지 전문 검색 - 관련도 순, 커서로 다음 페이지 (관리자 전용)"""
+    try:
+        items, next_cursor = search.search(db, q, target, quiz_id, limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return {"items": items, "next_cursor": next_cursor}
 
 # 퀴즈 상세 조회
 @router.get("/{quiz_id}", response_model=QuizWithQuestions)
 def read_quiz(
         *,
+        request: Request,
         db: Session = Depends(get_db),
         quiz_id: int,
-        current_user: User = Depends(get_current_user)
+        user_id: str = Depends(get_token_user_id),
+        fields: Optional[str] = Query(
+            None, description="반환할 필드 (쉼표 구분, 문제 필드는 questions. 접두어 - 예: title,questions.id)"
+        ),
+        include: Optional[str] = Query(None, description="포함할 관계 (기본 questions, 빈 값이면 문제 제외)")
 ) -> Any:
-    """특정 퀴즈의 상세 정보 조회"""
-    quiz = db.query(Quiz).filter(Quiz.id == quiz_id, Quiz.is_active == True).first()
+    """특정 퀴즈의 상세 정보 조회 (If-None-Match/If-Modified-Since 지원)"""
+    quiz_fields, question_fields = parse_fieldset(fields, include)
+    full = quiz_fields == QUIZ_FIELDS and question_fields == QUESTION_FIELDS
+    # 필드 조합마다 본문이 다르므로 ETag 도 조합별로 색인
+    index_field = "detail" if full else f"fields:{','.join(quiz_fields)}:{','.join(question_fields or ['-'])}"
+
+    # 사용자 확인(삭제/비활성화된 사용자는 304 도 받지 못함) 후 색인된 ETag 와 같으면 퀴즈 조회/문제 로딩/직렬화 없이 304
+    load_current_user(db, user_id)
+    validators = get_validators(quiz_etag_key(quiz_id), index_field)
+    if validators and is_fresh(request, validators):
+        return not_modified(request, validators)
+    index_version = get_index_version(quiz_etag_key(quiz_id))
+
+    # 전체 필드면 문제를 selectinload 로 한 번에, 아니면 문제 관계는 noload 하고 고른 컬럼만 따로 조회
+    quiz = load_quiz_detail(db, quiz_id, quiz_fields, with_questions=full)
     if not quiz:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="퀴즈를 찾을 수 없습니다"
         )
-    return quiz
+
+    if not full:
+        # 고른 컬럼만 읽었으므로 시각 컬럼이 없을 수 있어 ETag 만 사용
+        body = render(Dict[str, Any], quiz_detail_dict(db, quiz, quiz_fields, question_fields))
+        return conditional_response(
+            request, body, index_key=quiz_etag_key(quiz_id), index_field=index_field, index_version=index_version
+        )
+
+    # 문제 추가는 퀴즈의 updated_at 을 바꾸지 않으므로 문제 시각까지 포함
+    last_modified = max(
+        filter(None, [quiz.updated_at, quiz.created_at]
+               + [question.updated_at or question.created_at for question in quiz.questions]),
+        default=None
+    )
+    return conditional_response(
+        request, render(QuizWithQuestions, quiz), last_modified=last_modified, index_key=quiz_etag_key(quiz_id),
+        index_version=index_version
+    )
 
 # 퀴즈 수정 (관리자만)
 @router.put("/{quiz_id}", response_model=QuizSchema)
@@ -88,6 +220,7 @@ def update_quiz(
         db: Session = Depends(get_db),
         quiz_id: int,
         quiz_in: QuizUpdate,
+        background_tasks: BackgroundTasks,
         current_user: User = Depends(get_current_admin)
 ) -> Any:
     """퀴즈 정보 수정 (관리자 전용)"""
@@ -101,10 +234,36 @@ def update_quiz(
     update_data = quiz_in.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(quiz, field, value)
+    validate_exam_window(quiz.starts_at, quiz.ends_at)
+    deadlines.validate_time_limit(quiz.time_limit_minutes)
+    if "blueprint" in update_data or "adaptive" in update_data:
+        # null 이나 빈 목록이면 블루프린트 해제
+        quiz.blueprint = blueprint.validate_blueprint(quiz.blueprint, quiz.adaptive) or None
+    if quiz.blueprint:
+        quiz.questions_count = sum(section["count"] for section in quiz.blueprint)
+        # 공개(활성) 상태가 되는 시점에 재고 검사
+        if quiz.is_active and ("blueprint" in update_data or "is_active" in update_data):
+            shortages = blueprint.check_stock(blueprint.load_index(db, quiz_id), quiz.blueprint)
+            if shortages:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail={"message": "블루프린트에 맞는 활성 문제가 부족합니다", "shortages": shortages}
+                )
+    if "starts_at" in update_data:
+        # 시작 시각이 바뀌면 다음 스케줄러 주기에 다시 일괄 생성
+        quiz.materialized_at = None
 
     db.add(quiz)
     db.commit()
     db.refresh(quiz)
+    invalidate_quiz(quiz_id)
+    # 제한 시간/종료 시각이 바뀌면 진행 중 응시의 마감을 다시 계산
+    if "time_limit_minutes" in update_data or "ends_at" in update_data:
+        deadlines.reschedule_quiz(db, quiz_id)
+
+    # 활성 여부가 바뀌면 스냅샷 대상 문제가 달라짐
+    if "is_active" in update_data:
+        background_tasks.add_task(request_rebuild)
     return quiz
 
 # 퀴즈 삭제 (관리자만)
@@ -113,6 +272,7 @@ def delete_quiz(
         *,
         db: Session = Depends(get_db),
         quiz_id: int,
+        background_tasks: BackgroundTasks,
         current_user: User = Depends(get_current_admin)
 ) -> None:
     """퀴즈 삭제 (관리자 전용)"""
@@ -124,6 +284,14 @@ def delete_quiz(
         )
     db.delete(quiz)
     db.commit()
+    invalidate_quiz(quiz_id, questions=True)
+    leaderboard.reset_quiz(quiz_id)
+    score_stats.reset_quiz(quiz_id)
+    dedup.reset_quiz(quiz_id)
+    adaptive.reset_quiz(quiz_id)
+    blueprint.reset_quiz(quiz_id)
+    exposure.reset_quiz(quiz_id)
+    background_tasks.add_task(request_rebuild)
 
 # 문제 생성 (관리자만)
 @router.post("/{quiz_id}/questions", response_model=QuestionSchema)
@@ -132,6 +300,8 @@ def create_question(
         db: Session = Depends(get_db),
         quiz_id: int,
         question_in: QuestionCreate,
+        background_tasks: BackgroundTasks,
+        check_duplicates: bool = Query(False, description="같은 퀴즈에 유사한 문제가 있으면 추가하지 않고 409"),
         current_user: User = Depends(get_current_admin)
 ) -> Any:
     """퀴즈에 문제 추가 (관리자 전용)"""
@@ -156,98 +326,261 @@ def create_question(
             detail="정답 인덱스가 유효하지 않습니다"
         )
 
+    # 블루프린트 가중치 검증
+    if question_in.weight <= 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="가중치는 0 보다 커야 합니다"
+        )
+
+    # 유사 문제 확인용 서명 (numpy 가 없으면 건너뜀, 나중에 일괄 계산)
+    signature = None
+    if dedup.available():
+        if check_duplicates:
+            signature, duplicates = dedup.find_duplicates(db, quiz_id, question_in.content, question_in.options)
+            if duplicates:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail={
+                        "message": "유사한 문제가 이미 있습니다",
+                        "duplicates": [
+                            {"question_id": question_id, "similarity": score} for question_id, score in duplicates
+                        ],
+                    }
+                )
+        else:
+            signature = dedup.get_hasher().signature(question_in.content, question_in.options)
+
     # 새 문제 생성
     question = Question(
         quiz_id=quiz_id,
         content=question_in.content,
         options=question_in.options,
         correct_answer=question_in.correct_answer,
-        order=question_in.order
+        order=question_in.order,
+        tags=blueprint.normalize_tags(question_in.tags),
+        difficulty=question_in.difficulty,
+        weight=question_in.weight
     )
+    if signature is not None:
+        question.signature = QuestionSignature(quiz_id=quiz_id, signature=dedup.to_bytes(signature))
     db.add(question)
     db.commit()
     db.refresh(question)
+    if signature is not None:
+        dedup.remember(quiz_id, question.id, signature)
+    adaptive.reset_quiz(quiz_id)
+    blueprint.reset_quiz(quiz_id)
+    invalidate_quiz(quiz_id, questions=True)
+    background_tasks.add_task(request_rebuild)
     return question
 
+# 시험 명단 추가 (관리자만)
+@router.put("/{quiz_id}/roster", response_model=RosterResult)
+def update_roster(
+        *,
+        db: Session = Depends(get_db),
+        quiz_id: int,
+        roster_in: RosterUpdate,
+        current_user: User = Depends(get_current_admin)
+) -> Any:
+    """예정된 시험의 응시 대상자 추가 (관리자 전용)"""
+    quiz = db.query(Quiz).filter(Quiz.id == quiz_id).first()
+    if not quiz:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="퀴즈를 찾을 수 없습니다"
+        )
+
+    added = add_to_roster(db, quiz, roster_in.user_ids)
+    total = db.query(QuizRoster).filter(QuizRoster.quiz_id == quiz_id).count()
+    return {"quiz_id": quiz_id, "added": added, "total": total}
+
+# 명단 응시 기록 일괄 생성 (관리자만)
+@router.post("/{quiz_id}/materialize", status_code=status.HTTP_202_ACCEPTED)
+def materialize_roster(
+        *,
+        db: Session = Depends(get_db),
+        quiz_id: int,
+        background_tasks: BackgroundTasks,
+        current_user: User = Depends(get_current_admin)
+) -> Any:
+    """명단 전체의 응시 기록과 문제 순서를 미리 생성 (관리자 전용, 백그라운드 실행)"""
+    quiz = db.query(Quiz).filter(Quiz.id == quiz_id).first()
+    if not quiz:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="퀴즈를 찾을 수 없습니다"
+        )
+    background_tasks.add_task(run_materialize, quiz_id)
+    return {"message": "응시 기록 일괄 생성을 시작했습니다", "quiz_id": quiz_id}
+
+# 리더보드 상위 N명
+@router.get("/{quiz_id}/leaderboard", response_model=List[LeaderboardEntry])
+def read_leaderboard(
+        *,
+        db: Session = Depends(get_db),
+        quiz_id: int,
+        limit: int = Query(10, ge=1, le=100, description="조회할 인원 수"),
+        current_user: User = Depends(get_current_user)
+) -> Any:
+    """사용자별 최고 점수 기준 상위 N명 (공동 순위)"""
+    quiz = get_quiz(db, quiz_id)
+    if not quiz:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="퀴즈를 찾을 수 없습니다"
+        )
+    entries = leaderboard.get_leaderboard().top(quiz_id, limit)
+    if entries:
+        usernames = dict(
+            db.query(User.id, User.username).filter(User.id.in_([entry["user_id"] for entry in entries])).all()
+        )
+        for entry in entries:
+            entry["username"] = usernames.get(entry["user_id"])
+    return entries
+
+# 내 순위/백분위
+@router.get("/{quiz_id}/leaderboard/me", response_model=LeaderboardRank)
+def read_my_rank(
+        *,
+        quiz_id: int,
+        current_user: User = Depends(get_current_user)
+) -> Any:
+    """현재 사용자의 최고 점수, 순위, 백분위"""
+    info = leaderboard.get_leaderboard().rank(quiz_id, current_user.id)
+    if info is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="채점된 제출이 없습니다"
+        )
+    return {"quiz_id": quiz_id, "user_id": current_user.id, **info}
+
+# 리더보드 다시 채우기 (관리자만)
+@router.post("/{quiz_id}/leaderboard/rebuild", status_code=status.HTTP_202_ACCEPTED)
+def rebuild_leaderboard(
+        *,
+        db: Session = Depends(get_db),
+        quiz_id: int,
+        background_tasks: BackgroundTasks,
+        reset: bool = Query(False, description="기존 리더보드를 비우고 다시 채움"),
+        current_user: User = Depends(get_current_admin)
+) -> Any:
+    """완료된 제출로 리더보드 재구성 (관리자 전용, 백그라운드 실행)"""
+    quiz = get_quiz(db, quiz_id)
+    if not quiz:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="퀴즈를 찾을 수 없습니다"
+        )
+    background_tasks.add_task(leaderboard.run_rebuild, quiz_id, reset)
+    return {"message": "리더보드 재구성을 시작했습니다", "quiz_id": quiz_id}
+
+# 점수 분포 통계 (관리자만)
+@router.get("/{quiz_id}/stats", response_model=ScoreDistribution)
+def read_score_stats(
+        *,
+        quiz_id: int,
+        start: Optional[date] = Query(None, description="시작일 (UTC, 생략 시 종료일 29일 전)"),
+        end: Optional[date] = Query(None, description="종료일 (UTC, 생략 시 오늘)"),
+        quantiles: str = Query("0.5,0.9", description="쉼표로 구분한 분위수 (0~1)"),
+        by_day: bool = Query(False, description="일별 분포도 함께 반환"),
+        current_user: User = Depends(get_current_admin)
+) -> Any:
+    """기간 내 채점된 점수의 분위수/히스토그램 (일별 요약을 합친 근사값, 관리자 전용)"""
+    end = end or datetime.now(timezone.utc).date()
+    start = start or end - timedelta(days=29)
+    try:
+        qs = [float(q) for q in quantiles.split(",") if q.strip()]
+    except ValueError:
+        qs = None
+    if not qs or any(not 0 <= q <= 1 for q in qs):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="quantiles 는 0~1 사이 숫자를 쉼표로 구분해 지정하세요"
+        )
+    if start > end or (end - start).days >= settings.SCORE_STATS_MAX_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"기간은 시작일 ≤ 종료일, 최대 {settings.SCORE_STATS_MAX_DAYS}일입니다"
+        )
+    return score_stats.get_distribution(quiz_id, start, end, qs, by_day)
+
+# 유사 문제 묶음 (관리자만)
+@router.get("/{quiz_id}/duplicates", response_model=List[DuplicateCluster])
+def read_duplicates(
+        *,
+        db: Session = Depends(get_db),
+        quiz_id: int,
+        threshold: float = Query(settings.DEDUP_THRESHOLD, ge=0.1, le=1.0, description="중복으로 볼 추정 유사도"),
+        current_user: User = Depends(get_current_admin)
+) -> Any:
+    """퀴즈의 활성 문제 중 내용/선택지가 거의 같은 문제 묶음 (MinHash/LSH 근사, 관리자 전용)"""
+    if not dedup.available():
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="유사 문제 탐지를 사용할 수 없습니다 (numpy 필요)"
+        )
+    return dedup.report(db, quiz_id, threshold)
+
+# 문항 분석 (관리자만)
+@router.get("/{quiz_id}/analysis", response_model=ItemAnalysis)
+def read_item_analysis(
+        *,
+        db: Session = Depends(get_db),
+        quiz_id: int,
+        current_user: User = Depends(get_current_admin)
+) -> Any:
+    """채점된 제출로 계산한 문제별 정답률/변별도/선택지 응답 수와 크론바흐 알파 (관리자 전용)"""
+    if not item_analysis.available():
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="문항 분석을 사용할 수 없습니다 (numpy 필요)"
+        )
+    if not get_quiz(db, quiz_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="퀴즈를 찾을 수 없습니다"
+        )
+    return item_analysis.analyze(db, quiz_id)
+
 # 퀴즈 응시 (문제 조회 - 랜덤 선택)
 @router.get("/{quiz_id}/take", response_model=List[QuestionSchema])
 def take_quiz(
         *,
         db: Session = Depends(get_db),
         quiz_id: int,
+        response: Response,
         current_user: User = Depends(get_current_user),
         page: int = Query(1, ge=1, description="페이지 번호")
 ) -> Any:
-    """퀴즈 응시를 위한 문제 조회 (페이지네이션 적용)"""
-    quiz = db.query(Quiz).filter(Quiz.id == quiz_id, Quiz.is_active == True).first()
-    if not quiz:
+    """퀴즈 응시를 위한 문제 조회 (페이지네이션 적용, 응시 기록 ID 는 X-Submission-Id 헤더)"""
+    quiz = get_quiz(db, quiz_id)
+    if not quiz or not quiz.is_active:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="퀴즈를 찾을 수 없습니다"
         )
+    check_exam_window(quiz)
 
-    # 응시 기록 확인 또는 생성
-    submission = db.query(Submission).filter(
-        Submission.quiz_id == quiz_id,
-        Submission.user_id == current_user.id,
-        Submission.is_completed == False
-    ).first()
+    # 응시 기록 확인 (예정된 시험은 미리 생성되어 있어 조회만 함)
+    submission = get_in_progress_submission(db, quiz_id, current_user.id)
+    if submission:
+        # 제한 시간이 지난 응시는 문제를 주지 않고 자동 제출 (다음 요청은 새 응시로 시작)
+        deadlines.check_time_limit(db, quiz, submission)
 
     if not submission:
-        # 전체 문제 가져오기
-        all_questions = db.query(Question).filter(
-            Question.quiz_id == quiz_id,
-            Question.is_active == True
-        ).all()
-
-        # 랜덤 문제 선택
-        if quiz.randomize_questions and len(all_questions) > quiz.questions_count:
-            selected_questions = random.sample(all_questions, quiz.questions_count)
-            question_ids = [q.id for q in selected_questions]
-        else:
-            question_ids = [q.id for q in all_questions[:quiz.questions_count]]
+        if not roster_allows(db, quiz_id, current_user.id):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="시험 응시 대상이 아닙니다"
+            )
+        # 새 응시 기록 생성 (동시 요청이 먼저 만들었으면 그 기록 사용)
+        submission = create_submission(db, quiz, current_user.id)
 
-        # 새 응시 기록 생성
-        submission = Submission(
-            quiz_id=quiz_id,
-            user_id=current_user.id,
-            question_order=question_ids,
-            is_completed=False
-        )
-        db.add(submission)
-        db.commit()
-        db.refresh(submission)
+    # 답안 저장/제출에 쓸 응시 기록 ID (제출 목록을 다시 조회하지 않도록)
+    response.headers["X-Submission-Id"] = str(submission.id)
 
     # 문제 페이징 처리
-    questions_per_page = quiz.questions_count // 3 if quiz.questions_count >= 3 else quiz.questions_count
-    total_pages = (len(submission.question_order) + questions_per_page - 1) // questions_per_page
-
-    if page > total_pages:
-        page = total_pages
-
-    start_idx = (page - 1) * questions_per_page
-    end_idx = min(start_idx + questions_per_page, len(submission.question_order))
-
-    # 현재 페이지에 해당하는 문제 ID 추출
-    current_question_ids = submission.question_order[start_idx:end_idx]
-
-    # 해당 문제들 조회
-    questions = []
-    for q_id in current_question_ids:
-        question = db.query(Question).filter(Question.id == q_id).first()
-        if question:
-            # 선택지 순서 랜덤화 처리
-            question_data = QuestionSchema.from_orm(question)
-            if quiz.randomize_options:
-                # 원래 정답 인덱스 기억
-                correct_option = question.options[question.correct_answer]
-                # 선택지 섞기
-                options = question.options.copy()
-                random.shuffle(options)
-                # 새로운 정답 인덱스 찾기
-                new_correct_idx = options.index(correct_option)
-                question_data.options = options
-                question_data.correct_answer = new_correct_idx
-            questions.append(question_data)
-
+    _, _, questions = build_page(db, quiz, submission.question_order, page)
     return questions
\ No newline at end of file
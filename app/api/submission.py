@@ -1,22 +1,38 @@
 # app/api/submission.py
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, WebSocket, status
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
-from datetime import datetime
+from datetime import datetime, timezone
 
-from app.api.deps import get_current_user, get_current_admin, get_pagination_params
+from app.api.deps import (
+    get_current_admin,
+    get_current_user,
+    get_pagination_params,
+    get_token_user_id,
+    load_current_user,
+)
 from app.db import get_db
 from app.models.user import User
 from app.models.quiz import Quiz
 from app.models.question import Question
-from app.models.submission import Submission, SubmissionAnswer
+from app.models.submission import AttemptSummary, Submission, SubmissionAnswer
+from app.config import settings
+from app.services import adaptive, attempts, deadlines, exam_channel, grading, leaderboard, packed_answers, score_stats
+from app.services.exam import check_exam_window
+from app.services.quiz_cache import get_quiz
+from app.utils.cache import get_index_version, submission_etag_key
+from app.utils.conditional import conditional_response, get_validators, is_fresh, not_modified, render
 from app.schemas.submission import (
+    AttemptSummary as AttemptSummarySchema,
+    GradingStatus,
     SubmissionCreate,
     SubmissionUpdate,
     Submission as SubmissionSchema,
     SubmissionWithAnswers,
     SubmissionAnswerCreate
 )
+from app.schemas.quiz import AdaptiveStep
 
 router = APIRouter()
 
@@ -46,15 +62,40 @@ def read_user_submissions(
     ).offset(skip).limit(limit).all()
     return submissions
 
+# 퀴즈별 내 응시 요약
+@router.get("/my/summary", response_model=List[AttemptSummarySchema])
+def read_user_attempt_summaries(
+        db: Session = Depends(get_db),
+        current_user: User = Depends(get_current_user),
+        skip: int = 0,
+        limit: int = 100,
+) -> Any:
+    """현재 사용자의 퀴즈별 응시 수/최고 점수/마지막 점수/진행 중 응시 (최근 응시 순)"""
+    rows = db.query(AttemptSummary, Quiz.title).join(Quiz, Quiz.id == AttemptSummary.quiz_id).filter(
+        AttemptSummary.user_id == current_user.id
+    ).order_by(AttemptSummary.last_attempt_at.desc(), AttemptSummary.quiz_id.desc()).offset(skip).limit(limit).all()
+    return [
+        {**AttemptSummarySchema.model_validate(summary).model_dump(), "quiz_title": title}
+        for summary, title in rows
+    ]
+
 # 제출 기록 조회
 @router.get("/{submission_id}", response_model=SubmissionWithAnswers)
 def read_submission(
         *,
+        request: Request,
         db: Session = Depends(get_db),
         submission_id: int,
-        current_user: User = Depends(get_current_user)
+        user_id: str = Depends(get_token_user_id)
 ) -> Any:
-    """특정 제출 기록 상세 조회"""
+    """특정 제출 기록 상세 조회 (If-None-Match/If-Modified-Since 지원)"""
+    # 채점이 끝난 제출은 바뀌지 않으므로 사용자 확인 후 색인된 ETag 와 같으면 제출 조회 없이 304 (본인 제출만)
+    current_user = load_current_user(db, user_id)
+    validators = get_validators(submission_etag_key(submission_id))
+    if validators and str(validators.get("user_id")) == user_id and is_fresh(request, validators):
+        return not_modified(request, validators)
+    index_version = get_index_version(submission_etag_key(submission_id))
+
     submission = db.query(Submission).filter(Submission.id == submission_id).first()
     if not submission:
         raise HTTPException(
@@ -69,7 +110,20 @@ def read_submission(
             detail="이 제출 기록에 접근할 권한이 없습니다"
         )
 
-    return submission
+    # 진행 중이거나 채점 대기 중인 제출은 답안 저장 시각을 알 수 없고 계속 바뀌므로 ETag 만 보내고 색인하지 않음
+    graded = submission.is_completed and submission.grading_status == grading.GRADED
+    data = {
+        **SubmissionSchema.model_validate(submission).model_dump(),
+        "answers": packed_answers.load_answers(db, submission),
+    }
+    return conditional_response(
+        request,
+        render(SubmissionWithAnswers, data),
+        last_modified=submission.graded_at if graded else None,
+        index_key=submission_etag_key(submission_id) if graded else None,
+        index_version=index_version,
+        owner_id=submission.user_id
+    )
 
 # 답안 제출
 @router.post("/{submission_id}/answers", status_code=status.HTTP_201_CREATED)
@@ -78,47 +132,70 @@ def submit_answers(
         db: Session = Depends(get_db),
         submission_id: int,
         answers: List[SubmissionAnswerCreate],
+        response: Response,
         current_user: User = Depends(get_current_user)
 ) -> Any:
-    """답안 제출"""
-    submission = db.query(Submission).filter(
+    """답안 제출 (ASYNC_GRADING 이면 답안만 저장하고 202 와 채점 상태 URL 반환)"""
+    # 제한 시간 검사에 필요한 퀴즈 값은 같은 쿼리에서 함께 읽음
+    row = db.query(Submission, Quiz.time_limit_minutes, Quiz.ends_at).join(Quiz, Quiz.id == Submission.quiz_id).filter(
         Submission.id == submission_id,
         Submission.user_id == current_user.id,
         Submission.is_completed == False
     ).first()
 
-    if not submission:
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="유효한 응시 기록을 찾을 수 없거나 이미 완료된 시험입니다"
         )
+    submission = row.Submission
+    # 제한 시간이 지난 응시는 저장된 답안으로 자동 제출하고 거부
+    deadlines.check_time_limit(db, row, submission)
 
-    # 문제 정보 가져오기
-    quiz = db.query(Quiz).filter(Quiz.id == submission.quiz_id).first()
+    if submission.ability is not None:
+        # 적응형 응시는 /next 에서 채점된 답이 최종 답안 (본문의 답안은 무시)
+        answers = [
+            SubmissionAnswerCreate(question_id=row.question_id, selected_option=row.selected_option)
+            for row in db.query(SubmissionAnswer.question_id, SubmissionAnswer.selected_option).filter(
+                SubmissionAnswer.submission_id == submission_id
+            )
+        ]
 
     # 기존 답안 삭제
     db.query(SubmissionAnswer).filter(SubmissionAnswer.submission_id == submission_id).delete()
 
-    # 새 답안 저장 및 채점
-    correct_count = 0
+    if settings.ASYNC_GRADING:
+        # 출제된 문제의 답안만 압축해 채점 전 상태로 저장 - 채점은 워커가 배치로 처리
+        submission.packed_options = packed_answers.pack_options(
+            submission.question_order, {answer.question_id: answer.selected_option for answer in answers}
+        )
 
-    for answer in answers:
-        question = db.query(Question).filter(Question.id == answer.question_id).first()
+        submission.submit_time = datetime.now()
+        submission.is_completed = True
+        submission.grading_status = grading.PENDING
+        attempts.record_submitted(db, submission_id, submission.quiz_id, submission.user_id)
+        db.commit()
+        deadlines.cancel(submission_id)
+        grading.enqueue(submission_id)
 
-        if not question:
-            continue
+        response.status_code = status.HTTP_202_ACCEPTED
+        return {
+            "message": "답안이 제출되었습니다. 채점이 끝나면 점수를 확인할 수 있습니다",
+            "grading_status": grading.PENDING,
+            "status_url": f"{settings.API_PREFIX}/submissions/{submission_id}/grading",
+        }
 
-        is_correct = (answer.selected_option == question.correct_answer)
-        if is_correct:
-            correct_count += 1
+    # 채점에 필요한 정답을 한 번에 조회
+    correct_answers = dict(
+        db.query(Question.id, Question.correct_answer).filter(
+            Question.id.in_([answer.question_id for answer in answers])
+        ).all()
+    )
 
-        submission_answer = SubmissionAnswer(
-            submission_id=submission_id,
-            question_id=answer.question_id,
-            selected_option=answer.selected_option,
-            is_correct=is_correct
-        )
-        db.add(submission_answer)
+    # 완료된 제출의 답안은 행 대신 제출에 압축해 저장하며 채점
+    correct_count = packed_answers.pack_submission(
+        submission, {answer.question_id: answer.selected_option for answer in answers}, correct_answers
+    )
 
     # 제출 정보 업데이트
     total_questions = len(submission.question_order)
@@ -127,11 +204,59 @@ def submit_answers(
     submission.submit_time = datetime.now()
     submission.is_completed = True
     submission.score = score
+    submission.grading_status = grading.GRADED
+    submission.graded_at = datetime.now(timezone.utc)
+    attempts.record_submitted(db, submission_id, submission.quiz_id, submission.user_id, score)
+    # 커밋하면 속성이 만료되므로 리더보드 반영 값은 미리 꺼내 둠 (재조회 방지)
+    result = (submission.quiz_id, submission.user_id, score)
 
     db.commit()
+    deadlines.cancel(submission_id)
+    leaderboard.record_results([result])
+    score_stats.record_results([result])
 
     return {"message": "답안이 성공적으로 제출되었습니다", "score": score}
 
+# 채점 상태 조회 (비동기 채점)
+@router.get("/{submission_id}/grading", response_model=GradingStatus)
+async def read_grading_status(
+        *,
+        submission_id: int,
+        wait: float = Query(0, ge=0, description="채점이 끝날 때까지 최대 대기할 시간(초)"),
+        current_user: User = Depends(get_current_user)
+) -> Any:
+    """채점 상태와 점수 조회 - wait 를 주면 채점이 끝날 때까지 기다렸다가 응답 (롱 폴링)"""
+    submission = await grading.wait_for_grading(submission_id, min(wait, settings.GRADING_MAX_WAIT))
+    if not submission:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="제출 기록을 찾을 수 없습니다"
+        )
+
+    # 관리자 또는 본인의 제출만 조회 가능
+    if not current_user.is_admin and submission.user_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="이 제출 기록에 접근할 권한이 없습니다"
+        )
+
+    return {
+        "submission_id": submission.id,
+        "grading_status": submission.grading_status,
+        "score": submission.score,
+        "graded_at": submission.graded_at,
+    }
+
+# 응시 채널 (WebSocket) - 한 번 인증 후 답안 변경분 저장과 페이지 조회를 메시지로 처리
+@router.websocket("/{submission_id}/ws")
+async def exam_channel_ws(
+        websocket: WebSocket,
+        submission_id: int,
+        token: Optional[str] = Query(None, description="액세스 토큰 (브라우저는 헤더를 보낼 수 없어 쿼리로 전달)")
+) -> None:
+    """진행 중인 응시의 자동 저장/페이지 이동 채널"""
+    await exam_channel.serve(websocket, submission_id, token)
+
 # 진행 중인 제출 답안 저장 (새로고침 대비)
 @router.post("/{submission_id}/save", status_code=status.HTTP_200_OK)
 def save_progress(
@@ -142,31 +267,83 @@ def save_progress(
         current_user: User = Depends(get_current_user)
 ) -> Any:
     """진행 중인 응시 상태 저장 (새로고침 대비)"""
-    submission = db.query(Submission).filter(
+    # 제한 시간 검사에 필요한 퀴즈 값은 같은 쿼리에서 함께 읽음
+    row = db.query(Submission, Quiz.time_limit_minutes, Quiz.ends_at).join(Quiz, Quiz.id == Submission.quiz_id).filter(
         Submission.id == submission_id,
         Submission.user_id == current_user.id,
         Submission.is_completed == False
     ).first()
 
-    if not submission:
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="유효한 응시 기록을 찾을 수 없거나 이미 완료된 시험입니다"
         )
+    submission = row.Submission
+    if submission.ability is not None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="적응형 응시는 /next 로 답합니다"
+        )
+    deadlines.check_time_limit(db, row, submission)
 
     # 기존 답안 삭제
     db.query(SubmissionAnswer).filter(SubmissionAnswer.submission_id == submission_id).delete()
 
     # 새 답안 저장 (채점하지 않음)
-    for answer in answers:
-        submission_answer = SubmissionAnswer(
-            submission_id=submission_id,
-            question_id=answer.question_id,
-            selected_option=answer.selected_option,
-            is_correct=None  # 채점하지 않음
-        )
-        db.add(submission_answer)
+    if answers:
+        db.execute(insert(SubmissionAnswer), [
+            {
+                "submission_id": submission_id,
+                "question_id": answer.question_id,
+                "selected_option": answer.selected_option,
+                "is_correct": None  # 채점하지 않음
+            }
+            for answer in answers
+        ])
 
     db.commit()
 
-    return {"message": "응시 진행상황이 저장되었습니다"}
\ No newline at end of file
+    return {"message": "응시 진행상황이 저장되었습니다"}
+# 적응형 응시 - 답하고 다음 문제 받기
+@router.post("/{submission_id}/next", response_model=AdaptiveStep)
+def adaptive_next(
+        *,
+        db: Session = Depends(get_db),
+        submission_id: int,
+        answer: Optional[SubmissionAnswerCreate] = None,
+        current_user: User = Depends(get_current_user)
+) -> Any:
+    """적응형 퀴즈에서 마지막으로 받은 문제에 답하고(본문 생략 시 답 없이) 능력 추정에 맞는 다음 문제 받기
+
+    답은 바로 채점되어 수정할 수 없습니다. 문제를 모두 받으면 question 이 null 이며, 기존처럼 /answers 로 제출합니다.
+    """
+    submission = db.query(Submission).filter(
+        Submission.id == submission_id,
+        Submission.user_id == current_user.id,
+        Submission.is_completed == False
+    ).with_for_update().first()
+
+    if not submission:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="유효한 응시 기록을 찾을 수 없거나 이미 완료된 시험입니다"
+        )
+
+    quiz = get_quiz(db, submission.quiz_id)
+    if not quiz or not quiz.adaptive:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="적응형 퀴즈가 아닙니다"
+        )
+    if not adaptive.available():
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="적응형 출제를 사용할 수 없습니다 (numpy 필요)"
+        )
+    check_exam_window(quiz)
+    deadlines.check_time_limit(db, quiz, submission)
+
+    if answer is None:
+        return adaptive.next_step(db, submission, quiz)
+    return adaptive.next_step(db, submission, quiz, answer.question_id, answer.selected_option)
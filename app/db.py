@@ -1,22 +1,73 @@
 # /app/db.py
 # 데이터베이스 연결 관리
+#
+# 엔진은 import 시점이 아니라 처음 필요할 때(또는 앱 lifespan 시작 시) 생성합니다.
+# `from app.db import engine` 은 기존과 같이 동작하며, 이때 엔진이 생성됩니다.
+
+import threading
 
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 from app.config import settings
+from app.utils.metrics import instrument_engine
 
 DATABASE_URL = settings.DATABASE_URL
 
-engine = create_engine(DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_engine():
+    """엔진 반환 (최초 호출 시 생성)"""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                connect_args = {}
+                if DATABASE_URL.startswith("postgresql"):
+                    connect_args["connect_timeout"] = settings.DATABASE_CONNECT_TIMEOUT
+                engine = create_engine(DATABASE_URL, connect_args=connect_args)
+                # 요청별 쿼리 수/DB 시간 측정
+                instrument_engine(engine)
+                _engine = engine
+    return _engine
+
+
+def dispose_engine() -> None:
+    """커넥션 풀 정리 (앱 종료 시)"""
+    global _engine
+    with _engine_lock:
+        if _engine is not None:
+            _engine.dispose()
+            _engine = None
+
+
+class LazySession(Session):
+    """bind 가 지정되지 않은 세션은 첫 쿼리 시점에 엔진을 가져옴"""
+
+    def get_bind(self, mapper=None, **kw):
+        if self.bind is None:
+            return get_engine()
+        return super().get_bind(mapper, **kw)
+
+
+SessionLocal = sessionmaker(class_=LazySession, autocommit=False, autoflush=False)
 
 Base = declarative_base()
 
+
+def __getattr__(name):
+    # 기존 코드 호환: `from app.db import engine`
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 # Dependency
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
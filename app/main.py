@@ -1,7 +1,68 @@
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager
+
+from fastapi import Depends, FastAPI
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from app.api import quiz, submission, user
+from app.api.deps import verify_metrics_access
 from app.config import settings
+from app.db import dispose_engine, get_engine
+from app.services import deadlines, exam, exposure, grading, retention, score_stats, warmup
+from app.utils.cache import close_cache, init_cache
+from app.utils.compression import CompressionMiddleware
+from app.utils.metrics import MetricsMiddleware, render_prometheus
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 외부 연결은 import 시점이 아니라 여기서 생성 (Redis 는 타임아웃 적용, 실패해도 캐싱 없이 기동)
+    get_engine()
+    cache_ready = await run_in_threadpool(init_cache)
+    # 캐시 예열은 기동을 막지 않도록 백그라운드에서 실행 (요청은 그동안 캐시 미스로 DB 에서 처리)
+    warmup_task = None
+    if cache_ready and settings.CACHE_WARMUP_ON_STARTUP:
+        warmup_task = asyncio.get_running_loop().run_in_executor(None, warmup.run_warmup)
+    # 예정된 시험의 응시 기록 미리 생성 (여러 워커가 동시에 실행해도 ON CONFLICT 로 중복 없음)
+    scheduler_stop = asyncio.Event()
+    scheduler_task = None
+    if settings.EXAM_SCHEDULER_ENABLED:
+        scheduler_task = asyncio.create_task(exam.scheduler_loop(scheduler_stop))
+    # 오래된 미완료 응시 정리 (배치 사이에 쉬므로 요청 처리와 함께 돌아도 잠금을 오래 잡지 않음)
+    retention_task = None
+    if settings.RETENTION_ENABLED:
+        retention_task = asyncio.create_task(retention.retention_loop(scheduler_stop))
+    # 출제된 문제 노출 수를 모아서 주기적으로 DB 에 더함 (종료할 때 남은 증가분도 저장)
+    exposure_task = None
+    if settings.EXPOSURE_CONTROL:
+        exposure_task = asyncio.create_task(exposure.flush_loop(scheduler_stop))
+    # 채점된 점수를 모아서 주기적으로 점수 분포 통계에 합침 (종료할 때 남은 점수도 저장)
+    score_stats_task = asyncio.create_task(score_stats.flush_loop(scheduler_stop))
+    # 비동기 채점 워커 시작 및 재시작 전에 채점하지 못한 제출 복구
+    if settings.ASYNC_GRADING:
+        await run_in_threadpool(grading.start_grading)
+    # 제한 시간 있는 진행 중 응시의 마감을 DB 에서 복구하고, 마감이 지나면 자동 제출/채점
+    if settings.DEADLINE_SCHEDULER_ENABLED:
+        await run_in_threadpool(deadlines.start_scheduler)
+    yield
+    deadlines.stop_scheduler()
+    grading.stop_grading()
+    scheduler_stop.set()
+    if scheduler_task is not None:
+        await scheduler_task
+    if retention_task is not None:
+        retention.stop()
+        await retention_task
+    if exposure_task is not None:
+        await exposure_task
+    await score_stats_task
+    if warmup_task is not None:
+        warmup.stop()
+        await warmup_task
+    close_cache()
+    dispose_engine()
+
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -10,6 +71,7 @@ app = FastAPI(
     openapi_url=f"{settings.API_PREFIX}/openapi.json",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 # CORS 설정
@@ -21,6 +83,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 응답 압축 (Accept-Encoding 협상, COMPRESSION_MIN_SIZE 미만은 그대로 전송)
+app.add_middleware(CompressionMiddleware)
+
+# 성능 지표 수집 (라우트별 지연 시간, 요청당 쿼리 수/DB 시간, 캐시 적중률)
+app.add_middleware(MetricsMiddleware)
+
 # API 라우터 등록
 app.include_router(quiz.router, prefix=f"{settings.API_PREFIX}/quizzes", tags=["quizzes"])
 app.include_router(submission.router, prefix=f"{settings.API_PREFIX}/submissions", tags=["submissions"])
@@ -30,6 +98,11 @@ app.include_router(user.router, prefix=f"{settings.API_PREFIX}/users", tags=["us
 async def root():
     return {"message": "퀴즈 응시 시스템에 오신 것을 환영합니다."}
 
+# Prometheus 수집용 지표 (METRICS_TOKEN 또는 관리자 토큰 필요)
+@app.get("/metrics", include_in_schema=False, dependencies=[Depends(verify_metrics_access)])
+async def metrics():
+    return PlainTextResponse(render_prometheus(), media_type="text/plain; version=0.0.4")
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
@@ -1,11 +1,14 @@
 # /app/models/question.py
 # 문제 모델
 
-from sqlalchemy import Boolean, Column, Integer, Text, DateTime, ForeignKey, JSON
+from sqlalchemy import Boolean, Column, Float, Integer, String, Text, DateTime, ForeignKey, JSON, LargeBinary
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db import Base
 
+DIFFICULTIES = ("easy", "medium", "hard")  # 문제 난이도 값 (블루프린트 출제, app.services.blueprint)
+
+
 class Question(Base):
     __tablename__ = "questions"
 
@@ -15,10 +18,48 @@ class Question(Base):
     options = Column(JSON, nullable=False)  # 선택지 목록 (JSON 형식)
     correct_answer = Column(Integer, nullable=False)  # 정답 인덱스
     order = Column(Integer)  # 문제 순서 (랜덤화 되지 않을 경우 사용)
+    tags = Column(JSON, nullable=False, default=list, server_default="[]")  # 태그 목록 (블루프린트 구간 조건)
+    difficulty = Column(String)  # 난이도 (easy/medium/hard, 없으면 null)
+    weight = Column(Float, nullable=False, default=1.0, server_default="1.0")  # 출제 추출 가중치 (블루프린트 구간/노출 조절 추출)
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     # 관계 설정
     quiz = relationship("Quiz", back_populates="questions")
-    answers = relationship("SubmissionAnswer", back_populates="question", cascade="all, delete-orphan")
\ No newline at end of file
+    answers = relationship("SubmissionAnswer", back_populates="question", cascade="all, delete-orphan")
+    signature = relationship("QuestionSignature", uselist=False, cascade="all, delete-orphan")
+    rating = relationship("QuestionRating", uselist=False, cascade="all, delete-orphan")
+    exposure = relationship("QuestionExposure", uselist=False, cascade="all, delete-orphan")
+
+
+class QuestionSignature(Base):
+    """문제 MinHash 서명 (app.services.dedup) - 내용/선택지로 한 번 계산해 저장, 유사 문제 탐지에 사용"""
+    __tablename__ = "question_signatures"
+
+    question_id = Column(Integer, ForeignKey("questions.id", ondelete="CASCADE"), primary_key=True)
+    quiz_id = Column(Integer, ForeignKey("quizzes.id", ondelete="CASCADE"), nullable=False, index=True)
+    signature = Column(LargeBinary, nullable=False)  # 해시 함수별 최솟값 (uint32 리틀 엔디언 × DEDUP_NUM_PERM)
+    computed_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class QuestionRating(Base):
+    """적응형 출제용 문제 난이도 (app.services.adaptive) - 채점된 답마다 Elo 방식으로 증분 갱신"""
+    __tablename__ = "question_ratings"
+
+    question_id = Column(Integer, ForeignKey("questions.id", ondelete="CASCADE"), primary_key=True)
+    quiz_id = Column(Integer, ForeignKey("quizzes.id", ondelete="CASCADE"), nullable=False, index=True)
+    rating = Column(Float, nullable=False, default=0.0)  # 난이도 (로짓 척도, 클수록 어려움)
+    responses = Column(Integer, nullable=False, default=0)  # 난이도 갱신에 쓴 답 수
+    exposures = Column(Integer, nullable=False, default=0)  # 출제된 횟수
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class QuestionExposure(Base):
+    """문제 노출 수 (app.services.exposure) - 출제 횟수를 메모리에 모았다가 주기적으로 더함"""
+    __tablename__ = "question_exposures"
+
+    question_id = Column(Integer, ForeignKey("questions.id", ondelete="CASCADE"), primary_key=True)
+    quiz_id = Column(Integer, ForeignKey("quizzes.id", ondelete="CASCADE"), nullable=False, index=True)
+    exposures = Column(Integer, nullable=False, default=0)  # 출제된 응시 기록 수
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
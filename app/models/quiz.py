@@ -1,7 +1,7 @@
 # /app/models/quiz.py
 # 퀴즈 모델
 
-from sqlalchemy import Boolean, Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Boolean, Column, Integer, String, Text, DateTime, ForeignKey, JSON
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db import Base
@@ -16,11 +16,31 @@ class Quiz(Base):
     questions_count = Column(Integer, default=10)  # 출제할 문제 수
     randomize_questions = Column(Boolean, default=True)  # 문제 순서 랜덤화 여부
     randomize_options = Column(Boolean, default=True)  # 선택지 순서 랜덤화 여부
+    blueprint = Column(JSON)  # 출제 블루프린트 - [{"tag", "difficulty", "count"}] 구간 목록 (app.services.blueprint)
+    adaptive = Column(Boolean, default=False)  # 적응형 출제 (답에 따라 다음 문제 선택, app.services.adaptive)
     is_active = Column(Boolean, default=True)
+    starts_at = Column(DateTime(timezone=True))  # 시험 시작 시각 (없으면 언제든 응시 가능)
+    ends_at = Column(DateTime(timezone=True))  # 시험 종료 시각
+    time_limit_minutes = Column(Integer)  # 응시 제한 시간(분) - 지나면 자동 제출 (app.services.deadlines)
+    materialized_at = Column(DateTime(timezone=True))  # 명단 응시 기록 일괄 생성 완료 시각
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     # 관계 설정
     creator = relationship("User", backref="created_quizzes")
     questions = relationship("Question", back_populates="quiz", cascade="all, delete-orphan")
-    submissions = relationship("Submission", back_populates="quiz", cascade="all, delete-orphan")
\ No newline at end of file
+    submissions = relationship("Submission", back_populates="quiz", cascade="all, delete-orphan")
+    roster = relationship("QuizRoster", back_populates="quiz", cascade="all, delete-orphan")
+    attempt_summaries = relationship("AttemptSummary", back_populates="quiz", cascade="all, delete-orphan")
+
+
+class QuizRoster(Base):
+    """예정된 시험의 응시 대상자 명단"""
+    __tablename__ = "quiz_rosters"
+
+    quiz_id = Column(Integer, ForeignKey("quizzes.id", ondelete="CASCADE"), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    # 관계 설정
+    quiz = relationship("Quiz", back_populates="roster")
\ No newline at end of file
@@ -1,7 +1,7 @@
 # /app/models/submission.py
 # 제출 모델
 
-from sqlalchemy import Boolean, Column, Integer, DateTime, ForeignKey, Float, JSON
+from sqlalchemy import Boolean, Column, Integer, String, DateTime, ForeignKey, Float, JSON, Index, LargeBinary, false
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db import Base
@@ -17,6 +17,12 @@ class Submission(Base):
     question_order = Column(JSON)  # 출제된 문제의 순서 (JSON으로 저장)
     score = Column(Float)  # 점수
     is_completed = Column(Boolean, default=False)  # 완료 여부
+    grading_status = Column(String(16), index=True)  # 채점 상태 (pending: 비동기 채점 대기, graded: 채점 완료)
+    graded_at = Column(DateTime(timezone=True))  # 채점 완료 시각
+    # 완료된 제출의 답안 (app.services.packed_answers) - 진행 중에는 submission_answers 행
+    packed_options = Column(LargeBinary)  # question_order 순서로 문제당 선택지 1바이트
+    correct_bitmap = Column(LargeBinary)  # question_order 순서 정답 여부 비트맵 (채점 후)
+    ability = Column(Float)  # 적응형 출제의 응시자 능력 추정값 (로짓 척도)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
@@ -25,12 +31,21 @@ class Submission(Base):
     user = relationship("User", back_populates="submissions")
     answers = relationship("SubmissionAnswer", back_populates="submission", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        # 퀴즈/사용자별 진행 중인 응시는 하나만 (동시 요청/일괄 생성 시 중복 방지)
+        Index(
+            "uq_submissions_in_progress", "quiz_id", "user_id", unique=True,
+            postgresql_where=(is_completed == false()),
+            sqlite_where=(is_completed == false()),
+        ),
+    )
+
 
 class SubmissionAnswer(Base):
     __tablename__ = "submission_answers"
 
     id = Column(Integer, primary_key=True, index=True)
-    submission_id = Column(Integer, ForeignKey("submissions.id"), nullable=False)
+    submission_id = Column(Integer, ForeignKey("submissions.id"), nullable=False, index=True)
     question_id = Column(Integer, ForeignKey("questions.id"), nullable=False)
     selected_option = Column(Integer)  # 사용자가 선택한 답안 인덱스
     is_correct = Column(Boolean)  # 정답 여부
@@ -40,4 +55,42 @@ class SubmissionAnswer(Base):
 
     # 관계 설정
     submission = relationship("Submission", back_populates="answers")
-    question = relationship("Question", back_populates="answers")
\ No newline at end of file
+    question = relationship("Question", back_populates="answers")
+
+
+class AttemptSummary(Base):
+    """사용자/퀴즈별 응시 요약 - 응시 시작/제출/채점 때 함께 갱신 (퀴즈 목록 응시 여부, 내 응시 기록)"""
+    __tablename__ = "attempt_summaries"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    quiz_id = Column(Integer, ForeignKey("quizzes.id", ondelete="CASCADE"), primary_key=True)
+    attempt_count = Column(Integer, nullable=False, default=0)  # 시작한 응시 수
+    completed_count = Column(Integer, nullable=False, default=0)  # 제출한 응시 수
+    best_score = Column(Float)  # 최고 점수
+    last_score = Column(Float)  # 마지막으로 채점된 점수
+    in_progress_submission_id = Column(Integer)  # 진행 중인 응시 (없으면 NULL)
+    last_attempt_at = Column(DateTime(timezone=True))  # 마지막 응시 시작 시각
+    last_submitted_at = Column(DateTime(timezone=True))  # 마지막 제출 시각
+
+    # 관계 설정
+    quiz = relationship("Quiz", back_populates="attempt_summaries")
+
+    __table_args__ = (
+        # 내 응시 기록 (최근 응시 순)
+        Index("ix_attempt_summaries_user_recent", "user_id", "last_attempt_at"),
+    )
+
+
+class ArchivedSubmission(Base):
+    """보관 정책으로 정리된 미완료 응시 (app.services.retention --archive) - 답안은 압축 형식으로 한 행에"""
+    __tablename__ = "archived_submissions"
+
+    id = Column(Integer, primary_key=True)  # 원래 제출 ID
+    quiz_id = Column(Integer, nullable=False, index=True)
+    user_id = Column(Integer, nullable=False)
+    start_time = Column(DateTime(timezone=True))
+    last_activity_at = Column(DateTime(timezone=True))  # 마지막 답안 저장 시각 (없으면 시작 시각)
+    question_order = Column(JSON)
+    packed_options = Column(LargeBinary)  # app.services.packed_answers 형식
+    answer_count = Column(Integer, nullable=False, default=0)
+    archived_at = Column(DateTime(timezone=True), server_default=func.now())
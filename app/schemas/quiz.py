@@ -1,7 +1,12 @@
 # app/schemas/quiz.py
 from pydantic import BaseModel
-from typing import Optional, List
-from datetime import datetime
+from typing import Dict, Literal, Optional, List
+from datetime import date, datetime
+
+from app.schemas.submission import AttemptSummary
+
+
+Difficulty = Literal["easy", "medium", "hard"]
 
 
 class QuestionBase(BaseModel):
@@ -9,6 +14,9 @@ class QuestionBase(BaseModel):
     options: List[str]
     correct_answer: int
     order: Optional[int] = None
+    tags: List[str] = []  # 블루프린트 구간 조건
+    difficulty: Optional[Difficulty] = None
+    weight: float = 1.0  # 무작위 출제 시 뽑힐 가중치 (0 보다 커야 함)
 
 class QuestionCreate(QuestionBase):
     pass
@@ -18,6 +26,9 @@ class QuestionUpdate(BaseModel):
     options: Optional[List[str]] = None
     correct_answer: Optional[int] = None
     order: Optional[int] = None
+    tags: Optional[List[str]] = None
+    difficulty: Optional[Difficulty] = None
+    weight: Optional[float] = None
     is_active: Optional[bool] = None
 
 
@@ -32,12 +43,23 @@ class Question(QuestionBase):
         from_attributes = True
 
 
+class BlueprintSection(BaseModel):
+    tag: Optional[str] = None  # 생략하면 태그를 따지지 않음
+    difficulty: Optional[Difficulty] = None  # 생략하면 난이도를 따지지 않음
+    count: int  # 이 구간에서 출제할 문제 수
+
+
 class QuizBase(BaseModel):
     title: str
     description: Optional[str] = None
     questions_count: int = 10
     randomize_questions: bool = True
     randomize_options: bool = True
+    adaptive: bool = False  # 적응형 출제 (문제를 하나씩 /submissions/{id}/next 로 받음)
+    blueprint: Optional[List[BlueprintSection]] = None  # 구간별 출제 (있으면 questions_count 는 구간 합계)
+    starts_at: Optional[datetime] = None  # 시험 시작 시각 (예정된 시험)
+    ends_at: Optional[datetime] = None  # 시험 종료 시각
+    time_limit_minutes: Optional[int] = None  # 응시 제한 시간(분) - 시작부터 이 시간이 지나면 저장된 답안으로 자동 제출
 
 
 class QuizCreate(QuizBase):
@@ -50,7 +72,12 @@ class QuizUpdate(BaseModel):
     questions_count: Optional[int] = None
     randomize_questions: Optional[bool] = None
     randomize_options: Optional[bool] = None
+    adaptive: Optional[bool] = None
+    blueprint: Optional[List[BlueprintSection]] = None  # 빈 목록이면 블루프린트 해제
     is_active: Optional[bool] = None
+    starts_at: Optional[datetime] = None
+    ends_at: Optional[datetime] = None
+    time_limit_minutes: Optional[int] = None
 
 
 class Quiz(QuizBase):
@@ -65,4 +92,92 @@ class Quiz(QuizBase):
 
 
 class QuizWithQuestions(Quiz):
-    questions: List[Question] = []
\ No newline at end of file
+    questions: List[Question] = []
+
+
+class QuizWithAttempt(Quiz):
+    attempt: Optional[AttemptSummary] = None  # 내 응시 요약 (응시한 적 없으면 null)
+
+
+class RosterUpdate(BaseModel):
+    user_ids: List[int]
+
+
+class RosterResult(BaseModel):
+    quiz_id: int
+    added: int
+    total: int
+
+class LeaderboardEntry(BaseModel):
+    rank: int
+    user_id: int
+    username: Optional[str] = None
+    score: float
+
+
+class LeaderboardRank(BaseModel):
+    quiz_id: int
+    user_id: int
+    score: float
+    rank: int
+    total: int
+    percentile: float
+
+
+class HistogramBucket(BaseModel):
+    lower: float
+    upper: float
+    count: int
+
+
+class ScoreDistribution(BaseModel):
+    start: date
+    end: date
+    count: int
+    mean: Optional[float] = None
+    min: Optional[float] = None
+    max: Optional[float] = None
+    quantiles: Dict[str, Optional[float]]
+    histogram: List[HistogramBucket]
+    days: Optional[List["ScoreDistribution"]] = None
+
+
+class SearchHit(BaseModel):
+    id: int
+    quiz_id: int
+    text: str  # 퀴즈 제목 또는 문제 내용
+    score: float  # 순위 점수 (클수록 관련도 높음)
+
+
+class SearchPage(BaseModel):
+    items: List[SearchHit]
+    next_cursor: Optional[str] = None  # 다음 페이지 커서 (마지막 페이지면 null)
+
+
+class DuplicateCluster(BaseModel):
+    question_ids: List[int]
+    similarity: float  # 묶음 안 가장 높은 추정 유사도 (자카드)
+
+
+class ItemStatistics(BaseModel):
+    question_id: int
+    seen: int  # 출제된 제출 수
+    p_value: Optional[float] = None  # 정답률
+    discrimination: Optional[float] = None  # 수정 점이연 상관 (나머지 문제 점수와의 상관)
+    options: List[int]  # 선택지별 응답 수
+    no_answer: int  # 답하지 않은 수
+
+
+class ItemAnalysis(BaseModel):
+    quiz_id: int
+    submissions: int  # 분석한 채점 완료 제출 수
+    alpha: Optional[float] = None  # 크론바흐 알파
+    items: List[ItemStatistics]
+
+
+class AdaptiveStep(BaseModel):
+    ability: float  # 현재 능력 추정값 (로짓 척도, 0 이 평균 난이도)
+    answered: int  # 채점된 문제 수
+    remaining: int  # 더 받을 문제 수
+    last_correct: Optional[bool] = None  # 방금 답한 문제의 정답 여부
+    question: Optional[Question] = None  # 다음 문제 (모두 받았으면 null, /answers 로 제출)
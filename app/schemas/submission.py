@@ -14,11 +14,11 @@ class SubmissionAnswerCreate(SubmissionAnswerBase):
 
 
 class SubmissionAnswer(SubmissionAnswerBase):
-    id: int
+    id: Optional[int] = None  # 압축 저장된 완료 제출의 답안은 행 ID 가 없음
     submission_id: int
     is_correct: Optional[bool] = None
     options_order: Optional[List[int]] = None
-    created_at: datetime
+    created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
 
     class Config:
@@ -47,6 +47,8 @@ class Submission(SubmissionBase):
     question_order: List[int]
     score: Optional[float] = None
     is_completed: bool
+    grading_status: Optional[str] = None
+    graded_at: Optional[datetime] = None
     created_at: datetime
     updated_at: Optional[datetime] = None
 
@@ -55,4 +57,25 @@ class Submission(SubmissionBase):
 
 
 class SubmissionWithAnswers(Submission):
-    answers: List[SubmissionAnswer] = []
\ No newline at end of file
+    answers: List[SubmissionAnswer] = []
+
+
+class GradingStatus(BaseModel):
+    submission_id: int
+    grading_status: Optional[str] = None
+    score: Optional[float] = None
+    graded_at: Optional[datetime] = None
+
+class AttemptSummary(BaseModel):
+    quiz_id: int
+    quiz_title: Optional[str] = None
+    attempt_count: int
+    completed_count: int
+    best_score: Optional[float] = None
+    last_score: Optional[float] = None
+    in_progress_submission_id: Optional[int] = None
+    last_attempt_at: Optional[datetime] = None
+    last_submitted_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
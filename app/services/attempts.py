@@ -0,0 +1,261 @@
+# app/services/attempts.py
+# 사용자/퀴즈별 응시 요약 (attempt_summaries) 유지
+#
+# 응시 기록 생성, 답안 제출, 비동기 채점이 같은 트랜잭션 안에서 요약 행을 UPSERT 합니다.
+# 퀴즈 목록의 응시 여부와 내 응시 기록은 submissions 를 훑지 않고 이 표만 읽습니다.
+#
+# 기존 제출로 다시 채우기 (사용자 ID 구간별로 지우고 submissions 에서 집계):
+#   python -m app.services.attempts
+import argparse
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import bindparam, case, delete, func, insert, literal, select, update
+from sqlalchemy.orm import Session, aliased
+
+from app.models.submission import AttemptSummary, Submission
+
+_columns = AttemptSummary.__table__.c
+
+
+class _Incoming:
+    """UPSERT 가 아닌 경로에서 excluded 대신 쓰는 값 묶음 (같은 갱신식을 재사용)"""
+
+    def __init__(self, row: Dict[str, Any]):
+        self._row = row
+
+    def __getattr__(self, name: str):
+        return literal(self._row.get(name), _columns[name].type)
+
+
+def _upsert(db: Session, rows: List[Dict[str, Any]], update_values: Callable[[Any], Dict[str, Any]]) -> None:
+    """요약 행 INSERT, (user_id, quiz_id) 가 이미 있으면 update_values(새 값) 로 갱신 (커밋은 호출한 쪽에서)"""
+    if not rows:
+        return
+    # 같은 행을 잠그는 트랜잭션끼리 교착하지 않도록 키 순서로
+    rows = sorted(rows, key=lambda row: (row["user_id"], row["quiz_id"]))
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        dialect_insert = None
+
+    if dialect_insert is None:
+        # ON CONFLICT 를 지원하지 않는 DB 는 한 행씩 UPDATE, 없으면 INSERT
+        for row in rows:
+            result = db.execute(update(AttemptSummary).where(
+                AttemptSummary.user_id == row["user_id"],
+                AttemptSummary.quiz_id == row["quiz_id"]
+            ).values(update_values(_Incoming(row))))
+            if result.rowcount == 0:
+                db.execute(insert(AttemptSummary).values(**row))
+        return
+
+    stmt = dialect_insert(AttemptSummary).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[AttemptSummary.user_id, AttemptSummary.quiz_id],
+        set_=update_values(stmt.excluded)
+    )
+    db.execute(stmt)
+
+
+def _best_score(new) -> Any:
+    """기존 최고 점수와 새 점수 중 큰 값 (NULL 은 무시)"""
+    return case(
+        (new.best_score.is_(None), AttemptSummary.best_score),
+        (AttemptSummary.best_score.is_(None), new.best_score),
+        (new.best_score > AttemptSummary.best_score, new.best_score),
+        else_=AttemptSummary.best_score
+    )
+
+
+def record_started(db: Session, submissions: Iterable[Tuple[int, int, int]], started_at: Optional[datetime] = None) -> None:
+    """새 진행 중 응시 (제출 ID, 퀴즈 ID, 사용자 ID) 반영 - 응시 수 +1, 진행 중 응시 교체"""
+    started_at = started_at or datetime.now(timezone.utc)
+    rows = [
+        {
+            "user_id": user_id,
+            "quiz_id": quiz_id,
+            "attempt_count": 1,
+            "completed_count": 0,
+            "in_progress_submission_id": submission_id,
+            "last_attempt_at": started_at,
+        }
+        for submission_id, quiz_id, user_id in submissions
+    ]
+    _upsert(db, rows, lambda new: {
+        "attempt_count": AttemptSummary.attempt_count + new.attempt_count,
+        "in_progress_submission_id": new.in_progress_submission_id,
+        "last_attempt_at": new.last_attempt_at,
+    })
+
+
+def record_submitted(
+        db: Session,
+        submission_id: int,
+        quiz_id: int,
+        user_id: int,
+        score: Optional[float] = None,
+        submitted_at: Optional[datetime] = None
+) -> None:
+    """응시 제출 반영 - 진행 중 응시 해제, 채점됐으면(score) 점수도 반영"""
+    submitted_at = submitted_at or datetime.now(timezone.utc)
+    row = {
+        "user_id": user_id,
+        "quiz_id": quiz_id,
+        # 요약 도입 전에 시작한 응시면 여기서 처음 생성
+        "attempt_count": 1,
+        "completed_count": 1,
+        "best_score": score,
+        "last_score": score,
+        "in_progress_submission_id": None,
+        "last_attempt_at": submitted_at,
+        "last_submitted_at": submitted_at,
+    }
+    _upsert(db, [row], lambda new: {
+        "completed_count": AttemptSummary.completed_count + 1,
+        "best_score": _best_score(new),
+        "last_score": func.coalesce(new.last_score, AttemptSummary.last_score),
+        # 그 사이 새 응시를 시작했으면 그대로 둠
+        "in_progress_submission_id": case(
+            (AttemptSummary.in_progress_submission_id == submission_id, None),
+            else_=AttemptSummary.in_progress_submission_id
+        ),
+        "last_submitted_at": new.last_submitted_at,
+    })
+
+
+def record_scores(db: Session, results: Iterable[Tuple[int, int, int, float]]) -> None:
+    """비동기 채점 결과 (제출 ID, 퀴즈 ID, 사용자 ID, 점수) 반영 - 최고 점수/마지막 점수 갱신"""
+    latest: Dict[Tuple[int, int], Tuple[int, float]] = {}
+    best: Dict[Tuple[int, int], float] = {}
+    for submission_id, quiz_id, user_id, score in results:
+        if score is None:
+            continue
+        key = (user_id, quiz_id)
+        # 한 배치에 같은 사용자의 제출이 여럿이면 한 행으로 (같은 행을 한 문장에서 두 번 갱신할 수 없음)
+        if key not in latest or submission_id > latest[key][0]:
+            latest[key] = (submission_id, score)
+        best[key] = max(best.get(key, score), score)
+    rows = [
+        {
+            "user_id": user_id,
+            "quiz_id": quiz_id,
+            "attempt_count": 1,
+            "completed_count": 1,
+            "best_score": best[(user_id, quiz_id)],
+            "last_score": score,
+        }
+        for (user_id, quiz_id), (_, score) in latest.items()
+    ]
+    _upsert(db, rows, lambda new: {
+        "best_score": _best_score(new),
+        "last_score": new.last_score,
+    })
+
+
+def record_removed(db: Session, submissions: Iterable[Tuple[int, int, int]]) -> None:
+    """삭제된 미완료 응시 (제출 ID, 퀴즈 ID, 사용자 ID) 반영 - 응시 수 감소, 진행 중 응시 해제, 빈 요약 삭제
+
+    재구성(rebuild)한 값과 같도록 응시 수에서도 뺍니다.
+    """
+    removed: Dict[Tuple[int, int], int] = {}
+    submission_ids = []
+    for submission_id, quiz_id, user_id in submissions:
+        removed[(user_id, quiz_id)] = removed.get((user_id, quiz_id), 0) + 1
+        submission_ids.append(submission_id)
+    if not removed:
+        return
+    db.execute(update(AttemptSummary).where(
+        AttemptSummary.in_progress_submission_id.in_(submission_ids)
+    ).values(in_progress_submission_id=None))
+    # 키마다 다른 값으로 빼므로 Core 표에 executemany (ORM 일괄 UPDATE 는 WHERE 조건을 받지 않음)
+    db.execute(
+        update(AttemptSummary.__table__).where(
+            _columns.user_id == bindparam("u"),
+            _columns.quiz_id == bindparam("q")
+        ).values(attempt_count=_columns.attempt_count - bindparam("n")),
+        [{"u": user_id, "q": quiz_id, "n": count} for (user_id, quiz_id), count in sorted(removed.items())]
+    )
+    db.execute(delete(AttemptSummary).where(
+        AttemptSummary.user_id.in_({user_id for user_id, _ in removed}),
+        AttemptSummary.attempt_count <= 0,
+        AttemptSummary.completed_count == 0
+    ))
+
+
+def get_summaries(db: Session, user_id: int, quiz_ids: List[int]) -> Dict[int, AttemptSummary]:
+    """한 사용자의 퀴즈별 요약 (퀴즈 목록 한 페이지를 쿼리 하나로)"""
+    if not quiz_ids:
+        return {}
+    return {
+        summary.quiz_id: summary
+        for summary in db.query(AttemptSummary).filter(
+            AttemptSummary.user_id == user_id,
+            AttemptSummary.quiz_id.in_(quiz_ids)
+        )
+    }
+
+
+def rebuild(db: Session, batch_size: int = 1000) -> int:
+    """submissions 로 요약 다시 채우기 - 사용자 ID 구간마다 지우고 집계해 넣음. 만든 요약 수 반환.
+
+    구간마다 커밋하므로 실행 중 갱신된 요약은 그 구간이 다시 채워질 때 집계값으로 바뀝니다.
+    """
+    latest = aliased(Submission)
+    last_score = select(latest.score).where(
+        latest.user_id == Submission.user_id,
+        latest.quiz_id == Submission.quiz_id,
+        latest.score.isnot(None)
+    ).order_by(latest.id.desc()).limit(1).scalar_subquery()
+
+    total, last_user_id = 0, 0
+    while True:
+        user_ids = [row[0] for row in db.query(Submission.user_id).filter(
+            Submission.user_id > last_user_id
+        ).distinct().order_by(Submission.user_id).limit(batch_size)]
+        if not user_ids:
+            break
+        low, high = user_ids[0], user_ids[-1]
+        db.execute(delete(AttemptSummary).where(AttemptSummary.user_id.between(low, high)))
+        aggregate = select(
+            Submission.user_id,
+            Submission.quiz_id,
+            func.count(),
+            func.count(case((Submission.is_completed == True, 1))),
+            func.max(Submission.score),
+            last_score,
+            func.max(case((Submission.is_completed == False, Submission.id))),
+            func.max(Submission.start_time),
+            func.max(Submission.submit_time),
+        ).where(Submission.user_id.between(low, high)).group_by(Submission.user_id, Submission.quiz_id)
+        result = db.execute(insert(AttemptSummary).from_select([
+            "user_id", "quiz_id", "attempt_count", "completed_count", "best_score", "last_score",
+            "in_progress_submission_id", "last_attempt_at", "last_submitted_at",
+        ], aggregate))
+        db.commit()
+        total += result.rowcount
+        last_user_id = high
+    return total
+
+
+def main():
+    import app.models.user, app.models.quiz, app.models.question  # noqa: F401 (관계 대상 모델 등록)
+    from app.db import SessionLocal
+
+    parser = argparse.ArgumentParser(description="제출 기록으로 사용자/퀴즈별 응시 요약 다시 채우기")
+    parser.add_argument("--batch-size", type=int, default=1000, help="한 번에 처리할 사용자 수")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        count = rebuild(db, args.batch_size)
+    finally:
+        db.close()
+    print(f"응시 요약 {count}개 생성")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,337 @@
+# app/services/blueprint.py
+# 블루프린트 출제 - 태그/난이도 구간별 문제 수를 정해 두고 구간마다 가중치 비복원 추출
+#
+# 퀴즈의 blueprint 는 [{"tag": "대수", "difficulty": "easy", "count": 5}, {"tag": "기하", "difficulty": "hard", "count": 3}]
+# 처럼 구간 목록입니다. tag/difficulty 를 생략한 구간은 그 조건을 따지지 않습니다.
+# 블루프린트가 없는 무작위 퀴즈도 노출 조절(EXPOSURE_CONTROL)이 켜져 있으면 (태그/난이도 무관) 구간 하나로 같은 색인에서 뽑습니다.
+#
+# - 퀴즈별로 프로세스 메모리에 (태그, 난이도) → 문제 ID 배열 + 가중치 펜윅 트리 색인을 둡니다 (BLUEPRINT_INDEX_TTL 마다 다시 읽음).
+#   구간마다 누적 가중치를 트리에서 탐색해 하나 뽑고 그 가중치를 0 으로 두는 것을 반복하므로 (가중치 비례 비복원 추출)
+#   문제 은행이 커도 응시 기록 하나를 만드는 데 O(questions_count · log n) 입니다.
+# - 노출 조절: 추출 가중치는 문제 가중치 × e^(-EXPOSURE_DECAY × 노출 수) 라서 덜 노출된 문제가 먼저 뽑히고,
+#   노출률(노출 수 / 응시 수)이 EXPOSURE_MAX_RATE 를 넘은 문제는 다른 문제가 남아 있는 한 뽑지 않습니다.
+#   뽑힌 문제는 바로 이 프로세스의 노출 수와 가중치에 반영하고, DB 에는 app.services.exposure 가 모아서 더합니다.
+# - 태그가 여러 개인 문제는 여러 구간에 걸치므로 재고가 적은 구간부터 뽑습니다.
+# - 퀴즈를 활성화하거나 활성 퀴즈의 블루프린트를 바꿀 때 재고를 검사해 모자라면 400 입니다 (check_stock).
+import logging
+import math
+import random
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.question import Question
+from app.models.submission import Submission
+from app.services import exposure
+
+logger = logging.getLogger(__name__)
+
+Section = Tuple[Optional[str], Optional[str], int]  # (태그, 난이도, 문제 수)
+
+
+def normalize_tags(tags: Optional[Iterable[str]]) -> List[str]:
+    """앞뒤 공백 제거, 빈 태그/중복 제거 (처음 나온 순서 유지)"""
+    result = []
+    for tag in tags or ():
+        tag = tag.strip()
+        if tag and tag not in result:
+            result.append(tag)
+    return result
+
+
+def sections_of(blueprint: Optional[Sequence[Any]]) -> List[Section]:
+    """블루프린트 구간 목록 (DB 의 dict 목록과 캐시된 스키마 객체 모두 받음)"""
+    sections = []
+    for section in blueprint or ():
+        if isinstance(section, dict):
+            sections.append((section.get("tag"), section.get("difficulty"), section["count"]))
+        else:
+            sections.append((section.tag, section.difficulty, section.count))
+    return sections
+
+
+def validate_blueprint(blueprint: Optional[Sequence[Any]], adaptive: bool = False) -> List[Dict[str, Any]]:
+    """구간 형식 검사 - 저장할 dict 목록 반환 (태그는 공백 제거, 같은 조건의 구간은 합침)"""
+    if blueprint and adaptive:
+        # 적응형은 답에 따라 문제를 하나씩 고르므로 구간을 정해 둘 수 없음
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="적응형 퀴즈에는 블루프린트를 설정할 수 없습니다"
+        )
+    merged: Dict[Tuple[Optional[str], Optional[str]], int] = {}
+    for tag, difficulty, count in sections_of(blueprint):
+        if count < 1:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="블루프린트 구간의 문제 수는 1 이상이어야 합니다"
+            )
+        if tag is not None:
+            tag = tag.strip() or None
+        merged[(tag, difficulty)] = merged.get((tag, difficulty), 0) + count
+    return [{"tag": tag, "difficulty": difficulty, "count": count} for (tag, difficulty), count in merged.items()]
+
+
+class Stratum:
+    """구간 하나의 문제 ID (ID 순)와 현재 추출 가중치 - 펜윅 트리로 누적합 탐색/가중치 갱신 모두 O(log n)"""
+    __slots__ = ("ids", "weights", "tree")
+
+    def __init__(self, ids: List[int], weights: List[float]):
+        self.ids = ids
+        self.weights = list(weights)
+        n = len(ids)
+        tree = [0.0] + self.weights
+        for i in range(1, n + 1):
+            parent = i + (i & -i)
+            if parent <= n:
+                tree[parent] += tree[i]
+        self.tree = tree
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def position(self, question_id: int) -> int:
+        return bisect_left(self.ids, question_id)
+
+    def total(self) -> float:
+        i, total = len(self.ids), 0.0
+        while i > 0:
+            total += self.tree[i]
+            i -= i & -i
+        return total
+
+    def set(self, i: int, weight: float) -> None:
+        delta = weight - self.weights[i]
+        self.weights[i] = weight
+        i += 1
+        while i < len(self.tree):
+            self.tree[i] += delta
+            i += i & -i
+
+    def find(self, target: float) -> int:
+        """누적 가중치가 target 을 처음 넘는 위치"""
+        n = len(self.ids)
+        position, step = 0, 1 << (n.bit_length() - 1)
+        while step:
+            following = position + step
+            if following <= n and self.tree[following] <= target:
+                position = following
+                target -= self.tree[following]
+            step >>= 1
+        return min(position, n - 1)
+
+
+class BlueprintIndex:
+    """퀴즈 활성 문제의 (태그, 난이도) 색인 - 조건을 생략한 구간용으로 None 키도 함께 둠
+
+    exposures 를 주면 노출 조절을 합니다 (추출 가중치에 노출 수 반영, 노출률 한도, 뽑을 때마다 노출 수 증가).
+    """
+
+    MAX_EXPONENT = 300.0  # e^(-300) 보다 작은 가중치는 만들지 않음 (0 이 되면 남은 문제 수를 셀 수 없음)
+    REBASE_EXPONENT = 20.0  # 가중치가 e^(-20) 아래로 내려가면 기준점을 옮김 (누적합의 부동소수점 오차보다 충분히 크게)
+
+    def __init__(
+            self,
+            questions: Iterable[Tuple[int, Optional[Sequence[str]], Optional[str], Optional[float]]],
+            exposures: Optional[Dict[int, int]] = None,
+            sessions: int = 0,
+            decay: float = 0.0,
+            max_rate: Optional[float] = None
+    ):
+        self.control = exposures is not None
+        self.exposures: Dict[int, int] = dict(exposures or {})
+        self.sessions = sessions  # 응시 수 (노출률 분모)
+        self.decay = decay if self.control else 0.0
+        self.max_rate = max_rate if self.control else None
+        self.base: Dict[int, float] = {}  # 문제 가중치
+        self.keys: Dict[int, List[Tuple[Optional[str], Optional[str]]]] = {}  # 문제가 속한 구간
+        self.offset = 0  # 노출 수 기준점 (가중치 지수가 너무 커지지 않게 가장 적게 노출된 문제의 노출 수)
+        self.recorded = 0  # 기준점을 옮긴 뒤 기록한 노출 수
+        self._lock = threading.Lock()
+
+        members: Dict[Tuple[Optional[str], Optional[str]], List[int]] = defaultdict(list)
+        for question_id, tags, difficulty, weight in sorted(questions):
+            self.base[question_id] = weight if weight and weight > 0 else 1.0
+            keys = [(tag, level) for tag in {None, *(tags or ())} for level in {None, difficulty}]
+            self.keys[question_id] = keys
+            for key in keys:
+                members[key].append(question_id)
+        if self.exposures and self.base:
+            self.offset = min(self.exposures.get(question_id, 0) for question_id in self.base)
+        self.strata = {
+            key: Stratum(ids, [self.weight(question_id) for question_id in ids]) for key, ids in members.items()
+        }
+        self.loaded_at = time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self.base)
+
+    def weight(self, question_id: int) -> float:
+        """현재 추출 가중치 - 문제 가중치 × e^(-decay × (노출 수 - 기준점))"""
+        if not self.decay:
+            return self.base[question_id]
+        exponent = self.decay * (self.exposures.get(question_id, 0) - self.offset)
+        return self.base[question_id] * math.exp(-min(exponent, self.MAX_EXPONENT))
+
+    def stratum(self, tag: Optional[str], difficulty: Optional[str]) -> Optional[Stratum]:
+        return self.strata.get((tag, difficulty))
+
+    def stock(self, tag: Optional[str], difficulty: Optional[str]) -> int:
+        stratum = self.stratum(tag, difficulty)
+        return len(stratum) if stratum is not None else 0
+
+    def _sample(self, stratum: Stratum, k: int, chosen: Set[int], rng: random.Random) -> List[int]:
+        """chosen 에 없는 문제 k 개를 가중치 비례로 비복원 추출 (모자라면 있는 만큼)
+
+        뽑은 문제는 가중치를 0 으로 둔 채 반환하므로 호출한 쪽에서 _refresh 로 되돌립니다.
+        """
+        picked: List[int] = []
+        skipped: List[Tuple[int, float]] = []  # 다른 구간에서 이미 뽑혔거나 노출 한도를 넘어 잠시 뺀 문제
+        capped: List[Tuple[int, float]] = []
+        limit = math.inf if self.max_rate is None else self.max_rate * max(self.sessions, 1)
+        available = len(stratum)
+        while len(picked) < k:
+            if not available:
+                if not capped:
+                    break
+                # 노출 한도를 넘은 문제만 남음 - 한도 무시
+                for i, weight in capped:
+                    stratum.set(i, weight)
+                available, capped, limit = len(capped), [], math.inf
+            i = stratum.find(rng.random() * stratum.total())
+            weight = stratum.weights[i]
+            if weight <= 0:
+                # 부동소수점 오차로 이미 뺀 문제에 닿음 - 남은 문제 중 첫 번째
+                i = next(j for j, value in enumerate(stratum.weights) if value > 0)
+                weight = stratum.weights[i]
+            stratum.set(i, 0.0)
+            available -= 1
+            question_id = stratum.ids[i]
+            if question_id in chosen:
+                skipped.append((i, weight))
+            elif self.exposures.get(question_id, 0) > limit:
+                capped.append((i, weight))
+            else:
+                chosen.add(question_id)
+                picked.append(question_id)
+        for i, weight in skipped + capped:
+            stratum.set(i, weight)
+        return picked
+
+    def _refresh(self, question_ids: Iterable[int]) -> None:
+        """문제들이 속한 모든 구간의 가중치를 현재 노출 수로 다시 계산"""
+        for question_id in question_ids:
+            weight = self.weight(question_id)
+            for key in self.keys[question_id]:
+                stratum = self.strata[key]
+                stratum.set(stratum.position(question_id), weight)
+
+    def _rebase(self) -> None:
+        """노출 수 기준점을 가장 적게 노출된 문제로 옮기고 모든 가중치 다시 계산"""
+        self.offset = min(self.exposures.get(question_id, 0) for question_id in self.base)
+        self.recorded = 0
+        for key, stratum in self.strata.items():
+            self.strata[key] = Stratum(stratum.ids, [self.weight(question_id) for question_id in stratum.ids])
+
+    def draw(self, blueprint: Sequence[Any], shuffle: bool = True, rng: random.Random = random) -> List[int]:
+        """블루프린트대로 문제 ID 를 뽑음 - shuffle 이 아니면 구간 순서대로, 구간 안은 ID 순
+
+        노출 조절 중이면 뽑힌 문제의 노출 수와 응시 수를 바로 올립니다 (DB 반영은 호출한 쪽에서 exposure.record).
+        """
+        sections = sections_of(blueprint)
+        chosen: Set[int] = set()
+        drawn: List[List[int]] = [[] for _ in sections]
+        with self._lock:
+            for i in sorted(range(len(sections)), key=lambda i: self.stock(*sections[i][:2])):
+                tag, difficulty, count = sections[i]
+                stratum = self.stratum(tag, difficulty)
+                drawn[i] = self._sample(stratum, count, chosen, rng) if stratum is not None else []
+                if len(drawn[i]) < count:
+                    logger.warning("블루프린트 구간 (%s, %s) 문제 부족: %d / %d", tag, difficulty, len(drawn[i]), count)
+
+            if self.control:
+                self.sessions += 1
+                for question_id in chosen:
+                    self.exposures[question_id] = self.exposures.get(question_id, 0) + 1
+                self.recorded += len(chosen)
+            if (self.decay and self.recorded >= len(self.base)
+                    and any(self.decay * (self.exposures[q] - self.offset) > self.REBASE_EXPONENT for q in chosen)):
+                # 모든 문제가 한 번씩 노출될 만큼 기록한 뒤에만 다시 계산 (노출 하나당 평균 O(1))
+                self._rebase()
+            else:
+                self._refresh(chosen)
+
+        if shuffle:
+            order = [question_id for part in drawn for question_id in part]
+            rng.shuffle(order)
+            return order
+        return [question_id for part in drawn for question_id in sorted(part)]
+
+
+def check_stock(index: BlueprintIndex, blueprint: Sequence[Any]) -> List[Dict[str, Any]]:
+    """재고가 모자란 구간 목록 (모두 충분하면 빈 목록)
+
+    구간별 재고와 함께, 여러 구간에 걸친 문제를 한 번만 셀 때 전체 합계도 검사합니다 (section 이 null).
+    """
+    sections = sections_of(blueprint)
+    shortages = []
+    union: Set[int] = set()
+    for i, (tag, difficulty, count) in enumerate(sections):
+        stratum = index.stratum(tag, difficulty)
+        stock = len(stratum) if stratum is not None else 0
+        if stock < count:
+            shortages.append({"section": i, "tag": tag, "difficulty": difficulty, "count": count, "stock": stock})
+        if stratum is not None:
+            union.update(stratum.ids)
+    total = sum(count for _, _, count in sections)
+    if not shortages and len(union) < total:
+        shortages.append({"section": None, "tag": None, "difficulty": None, "count": total, "stock": len(union)})
+    return shortages
+
+
+_indexes: Dict[int, BlueprintIndex] = {}
+_lock = threading.Lock()
+
+
+def load_index(db: Session, quiz_id: int) -> BlueprintIndex:
+    questions = [
+        (row.id, row.tags, row.difficulty, row.weight) for row in db.query(
+            Question.id, Question.tags, Question.difficulty, Question.weight
+        ).filter(
+            Question.quiz_id == quiz_id,
+            Question.is_active == True
+        )
+    ]
+    if not settings.EXPOSURE_CONTROL:
+        return BlueprintIndex(questions)
+    return BlueprintIndex(
+        questions,
+        exposures=exposure.load_counts(db, quiz_id),
+        sessions=db.query(func.count(Submission.id)).filter(Submission.quiz_id == quiz_id).scalar(),
+        decay=settings.EXPOSURE_DECAY,
+        max_rate=settings.EXPOSURE_MAX_RATE,
+    )
+
+
+def get_index(db: Session, quiz_id: int) -> BlueprintIndex:
+    """퀴즈의 블루프린트 색인 - BLUEPRINT_INDEX_TTL 이 지나면 다시 읽음 (다른 프로세스에서 추가한 문제 반영)"""
+    with _lock:
+        index = _indexes.get(quiz_id)
+    if index is not None and time.monotonic() - index.loaded_at < settings.BLUEPRINT_INDEX_TTL:
+        return index
+    index = load_index(db, quiz_id)
+    with _lock:
+        _indexes[quiz_id] = index
+    return index
+
+
+def reset_quiz(quiz_id: int) -> None:
+    """퀴즈 삭제/문제 추가 시 프로세스 내 색인 버림 (다음 조회 때 다시 읽음)"""
+    with _lock:
+        _indexes.pop(quiz_id, None)
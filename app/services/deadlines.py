@@ -0,0 +1,346 @@
+# app/services/deadlines.py
+# 제한 시간 - 진행 중인 응시의 마감 시각을 프로세스 메모리의 최소 힙에 두고, 마감이 지나면 자동 제출/채점
+#
+# 마감 시각 = 시작 시각 + 퀴즈의 time_limit_minutes (시험 종료 시각 ends_at 이 더 이르면 그 시각)
+# - 응시 기록을 만들 때 마감을 힙에 넣고, 제출하면 사전에서만 지움 (힙 항목은 꺼낼 때 건너뜀 - 지연 삭제)
+# - 스케줄러 스레드는 가장 이른 마감(+ DEADLINE_GRACE_SECONDS)을 DEADLINE_TICK_SECONDS 단위로 올린 시각까지 잠들었다가
+#   깨어나 지난 마감을 최대 DEADLINE_BATCH_SIZE 개씩 꺼내 한 트랜잭션에서 자동 제출하고 채점합니다.
+#   같은 틱 안의 마감은 한 번에 처리하므로(타이밍 휠의 칸과 같은 효과) 마감이 몰려도 틱마다 한 번만 깨어나고,
+#   submissions 를 주기적으로 훑지 않으며, 타이머가 10만 개여도 마감이 없는 동안은 깨어나지 않습니다.
+# - 더 이른 마감이 들어오면 그때만 스레드를 깨움
+# - 재시작하면 DB 의 진행 중 응시(제한 시간 있는 퀴즈)에서 힙을 다시 만듦
+# 자동 제출은 is_completed = false 인 행만 대상으로 하고 PostgreSQL 에서는 FOR UPDATE SKIP LOCKED 로 잠그므로
+# 여러 워커가 같은 마감을 들고 있어도 한 번만 제출됩니다. 다른 워커가 만든 응시는 그 워커가(또는 재시작 시) 처리하고,
+# 그 전에 사용자가 마감이 지난 응시로 요청하면 요청을 받은 워커가 바로 자동 제출합니다 (check_time_limit).
+import heapq
+import logging
+import math
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.quiz import Quiz
+from app.models.submission import Submission
+from app.services import attempts, grading
+
+logger = logging.getLogger(__name__)
+
+RETRY_DELAY = 5.0  # 자동 제출이 실패하면 다시 시도할 때까지(초)
+
+
+def _aware(value: Optional[datetime]) -> Optional[datetime]:
+    # SQLite 는 시간대 정보 없이 돌려주므로 UTC 로 간주
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def validate_time_limit(minutes: Optional[int]) -> None:
+    """제한 시간 설정 검사"""
+    if minutes is not None and minutes < 1:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="제한 시간은 1분 이상이어야 합니다"
+        )
+
+
+def deadline_for(time_limit_minutes: Optional[int], ends_at: Optional[datetime],
+                 start_time: Optional[datetime]) -> Optional[datetime]:
+    """응시 마감 시각 (제한 시간이 없는 퀴즈는 None)"""
+    if not time_limit_minutes:
+        return None
+    deadline = _aware(start_time or datetime.now(timezone.utc)) + timedelta(minutes=time_limit_minutes)
+    ends_at = _aware(ends_at)
+    return min(deadline, ends_at) if ends_at is not None else deadline
+
+
+def check_time_limit(db: Session, quiz: Any, submission: Any, now: Optional[datetime] = None) -> None:
+    """마감(+ 유예)이 지났으면 그 응시를 저장된 답안으로 바로 자동 제출/채점하고 403
+
+    스케줄러(응시를 만든 워커의 힙)를 기다리지 않으므로 스케줄러가 꺼져 있거나 멈춰도
+    마감이 지난 응시가 진행 중으로 남아 새 응시를 막지 않습니다.
+    """
+    deadline = deadline_for(quiz.time_limit_minutes, quiz.ends_at, submission.start_time)
+    now = now or datetime.now(timezone.utc)
+    if deadline is not None and now >= deadline + timedelta(seconds=settings.DEADLINE_GRACE_SECONDS):
+        expire_submissions(db, [submission.id], now=now)
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="제한 시간이 지나 저장된 답안으로 제출되었습니다"
+        )
+
+
+class DeadlineScheduler:
+    """마감 시각 최소 힙 + 가장 이른 마감까지 잠드는 스레드 (expire 에 지난 제출 ID 배치를 넘김)"""
+
+    def __init__(self, expire: Callable[[List[int]], None], batch_size: int, grace: float = 0.0, tick: float = 0.0):
+        self.expire = expire
+        self.batch_size = batch_size
+        self.grace = grace
+        self.tick = tick
+        self._heap: List[Tuple[float, int]] = []  # (마감 epoch 초, 제출 ID) - 취소/변경된 항목이 남아 있을 수 있음
+        self._deadlines: Dict[int, float] = {}  # 제출 ID → 현재 마감 (힙 항목과 다르면 버린 항목)
+        self._cond = threading.Condition()
+        self._stopped = False
+        self._thread: Optional[threading.Thread] = None
+
+    def __len__(self) -> int:
+        return len(self._deadlines)
+
+    def add(self, submission_id: int, deadline: float) -> None:
+        """마감 등록 (이미 있으면 새 마감으로 교체)"""
+        with self._cond:
+            earliest = self._heap[0][0] if self._heap else None
+            self._deadlines[submission_id] = deadline
+            heapq.heappush(self._heap, (deadline, submission_id))
+            self._compact()
+            if earliest is None or deadline < earliest:
+                self._cond.notify()
+
+    def add_many(self, entries: Iterable[Tuple[int, float]]) -> None:
+        """마감 여러 개 등록 - 힙을 한 번에 다시 만듦 (재시작 시 복구용)"""
+        with self._cond:
+            for submission_id, deadline in entries:
+                self._deadlines[submission_id] = deadline
+            self._heap = [(deadline, submission_id) for submission_id, deadline in self._deadlines.items()]
+            heapq.heapify(self._heap)
+            self._cond.notify()
+
+    def cancel(self, submission_id: int) -> None:
+        """제출된 응시의 마감 해제 (힙 항목은 꺼낼 때 버림)"""
+        with self._cond:
+            self._deadlines.pop(submission_id, None)
+
+    def next_deadline(self) -> Optional[float]:
+        with self._cond:
+            return self._peek()
+
+    def pop_due(self, now: float) -> List[int]:
+        """now 까지 마감된 제출 ID 를 최대 batch_size 개 꺼냄"""
+        with self._cond:
+            return self._pop_due(now)
+
+    def _peek(self) -> Optional[float]:
+        # 버린 항목은 맨 앞에 올 때 정리
+        while self._heap and self._deadlines.get(self._heap[0][1]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else None
+
+    def _pop_due(self, now: float) -> List[int]:
+        due = []
+        while len(due) < self.batch_size:
+            deadline = self._peek()
+            if deadline is None or deadline > now:
+                break
+            _, submission_id = heapq.heappop(self._heap)
+            del self._deadlines[submission_id]
+            due.append(submission_id)
+        return due
+
+    def _wake_at(self, deadline: float) -> float:
+        # 마감 + 유예를 틱 경계로 올림 (틱이 0 이면 마감마다)
+        at = deadline + self.grace
+        return math.ceil(at / self.tick) * self.tick if self.tick > 0 else at
+
+    def _compact(self) -> None:
+        # 버린 항목이 살아 있는 항목보다 많아지면 힙을 다시 만듦 (메모리를 타이머 수에 비례하게 유지)
+        if len(self._heap) > 2 * len(self._deadlines) + 1024:
+            self._heap = [(deadline, submission_id) for submission_id, deadline in self._deadlines.items()]
+            heapq.heapify(self._heap)
+
+    def start(self) -> None:
+        with self._cond:
+            self._stopped = False
+        self._thread = threading.Thread(target=self._run, name="deadline-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._stopped:
+                    deadline = self._peek()
+                    now = time.time()
+                    if deadline is not None and self._wake_at(deadline) <= now:
+                        break
+                    # 타이머가 없으면 등록될 때까지, 있으면 가장 이른 마감이 든 틱이 끝날 때까지 대기
+                    self._cond.wait(None if deadline is None else self._wake_at(deadline) - now)
+                if self._stopped:
+                    return
+                due = self._pop_due(now - self.grace)
+
+            try:
+                self.expire(due)
+            except Exception:
+                logger.exception("제한 시간이 지난 응시 자동 제출 실패 - 다시 시도합니다")
+                retry_at = time.time() + RETRY_DELAY - self.grace
+                with self._cond:
+                    # 그사이 새 마감으로 다시 등록된 응시는 그대로 둠
+                    for submission_id in due:
+                        if submission_id not in self._deadlines:
+                            self._deadlines[submission_id] = retry_at
+                            heapq.heappush(self._heap, (retry_at, submission_id))
+
+
+_scheduler: Optional[DeadlineScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def schedule(submission_id: int, deadline: Optional[datetime]) -> None:
+    """응시 마감 등록 (스케줄러가 꺼져 있거나 마감이 없으면 무시)"""
+    if _scheduler is not None and deadline is not None:
+        _scheduler.add(submission_id, deadline.timestamp())
+
+
+def cancel(submission_id: int) -> None:
+    """제출된 응시의 마감 해제"""
+    if _scheduler is not None:
+        _scheduler.cancel(submission_id)
+
+
+def load_deadlines(db: Session, quiz_id: Optional[int] = None) -> List[Tuple[int, float]]:
+    """제한 시간 있는 퀴즈의 진행 중 응시 (제출 ID, 마감 epoch 초) - quiz_id 를 주면 그 퀴즈만"""
+    query = db.query(
+        Submission.id, Submission.start_time, Quiz.time_limit_minutes, Quiz.ends_at
+    ).join(Quiz, Quiz.id == Submission.quiz_id).filter(
+        Submission.is_completed == False,
+        Quiz.time_limit_minutes.isnot(None)
+    )
+    if quiz_id is not None:
+        query = query.filter(Submission.quiz_id == quiz_id)
+    return [
+        (row.id, deadline_for(row.time_limit_minutes, row.ends_at, row.start_time).timestamp())
+        for row in query.yield_per(10_000)
+    ]
+
+
+def reschedule_quiz(db: Session, quiz_id: int) -> None:
+    """퀴즈의 제한 시간/종료 시각이 바뀌면 진행 중 응시의 마감을 다시 계산 (제한 시간을 없애면 해제)"""
+    if _scheduler is None:
+        return
+    entries = load_deadlines(db, quiz_id)
+    if not entries:
+        for row in db.query(Submission.id).filter(Submission.quiz_id == quiz_id, Submission.is_completed == False):
+            _scheduler.cancel(row.id)
+        return
+    for submission_id, deadline in entries:
+        _scheduler.add(submission_id, deadline)
+
+
+def expire_submissions(db: Session, submission_ids: List[int], now: Optional[datetime] = None) -> Dict[int, float]:
+    """마감(+ 유예)이 지난 진행 중 응시들을 한 트랜잭션에서 자동 제출하고 채점, 제출 ID → 점수 반환
+
+    저장된 답안(submission_answers 행)으로 채점합니다. 그사이 제한 시간이 늘어난 응시는 새 마감으로 다시 등록합니다.
+    """
+    now = now or datetime.now(timezone.utc)
+    grace = timedelta(seconds=settings.DEADLINE_GRACE_SECONDS)
+    rows = db.query(
+        Submission.id, Submission.quiz_id, Submission.user_id, Submission.start_time,
+        Quiz.time_limit_minutes, Quiz.ends_at
+    ).join(Quiz, Quiz.id == Submission.quiz_id).filter(
+        Submission.id.in_(submission_ids),
+        Submission.is_completed == False
+    ).order_by(Submission.id).with_for_update(of=Submission, skip_locked=True).all()
+
+    due = []
+    for row in rows:
+        deadline = deadline_for(row.time_limit_minutes, row.ends_at, row.start_time)
+        if deadline is None:
+            continue
+        if deadline + grace > now:
+            schedule(row.id, deadline)
+        else:
+            due.append(row)
+    if not due:
+        db.commit()
+        return {}
+
+    # 그사이 사용자가 제출했거나 다른 워커가 먼저 제출한 응시는 빠짐 (잡은 응시만 요약/채점에 반영)
+    claimed = set(_close(db, [row.id for row in due], now))
+    if not claimed:
+        db.commit()
+        return {}
+    for row in due:
+        if row.id in claimed:
+            attempts.record_submitted(db, row.id, row.quiz_id, row.user_id, submitted_at=now)
+    # 채점까지 같은 트랜잭션 (grade_pending 이 커밋)
+    return grading.grade_pending(db, sorted(claimed))
+
+
+def _close(db: Session, submission_ids: List[int], now: datetime) -> List[int]:
+    """진행 중인 응시를 채점 대기로 제출 처리하고 실제로 바뀐 제출 ID 반환"""
+    values = {"is_completed": True, "submit_time": now, "grading_status": grading.PENDING}
+    stmt = update(Submission).where(
+        Submission.id.in_(submission_ids),
+        Submission.is_completed == False
+    ).values(**values).execution_options(synchronize_session=False)
+    if db.get_bind().dialect.update_returning:
+        return [row.id for row in db.execute(stmt.returning(Submission.id))]
+
+    # RETURNING 을 지원하지 않는 DB 는 한 행씩 바꾸고 영향받은 행 수로 확인
+    return [
+        submission_id for submission_id in submission_ids
+        if db.execute(update(Submission).where(
+            Submission.id == submission_id,
+            Submission.is_completed == False
+        ).values(**values).execution_options(synchronize_session=False)).rowcount
+    ]
+
+
+def run_expire(submission_ids: List[int]) -> None:
+    """새 세션으로 자동 제출 실행 (스케줄러 스레드용, 실패하면 예외를 그대로 올려 다시 시도)"""
+    from app.db import SessionLocal
+
+    db = SessionLocal()
+    try:
+        scores = expire_submissions(db, submission_ids)
+        if scores:
+            logger.info("제한 시간이 지난 응시 %d개 자동 제출", len(scores))
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def start_scheduler() -> int:
+    """lifespan 시작 시 DB 의 진행 중 응시로 마감을 복구하고 스케줄러 시작, 복구한 타이머 수 반환"""
+    global _scheduler
+    from app.db import SessionLocal
+
+    scheduler = DeadlineScheduler(
+        run_expire, settings.DEADLINE_BATCH_SIZE, settings.DEADLINE_GRACE_SECONDS, settings.DEADLINE_TICK_SECONDS
+    )
+    # 복구하는 동안 새로 생긴 응시도 놓치지 않도록 먼저 등록 대상으로 둠
+    with _scheduler_lock:
+        _scheduler = scheduler
+    db = SessionLocal()
+    try:
+        scheduler.add_many(load_deadlines(db))
+    finally:
+        db.close()
+    scheduler.start()
+    if len(scheduler):
+        logger.info("진행 중 응시 %d개의 마감을 복구했습니다", len(scheduler))
+    return len(scheduler)
+
+
+def stop_scheduler() -> None:
+    global _scheduler
+    with _scheduler_lock:
+        scheduler, _scheduler = _scheduler, None
+    if scheduler is not None:
+        scheduler.stop()
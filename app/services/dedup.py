@@ -0,0 +1,338 @@
+# app/services/dedup.py
+# 유사 문제 탐지 - MinHash 서명 + LSH 밴드 버킷
+#
+# 문제 내용과 선택지(순서 무관)를 정규화해 글자 DEDUP_SHINGLE_SIZE-gram 으로 나누고, DEDUP_NUM_PERM 개 해시 함수의
+# 최솟값(MinHash)을 서명으로 question_signatures 에 저장합니다. 두 서명에서 같은 자리의 비율이 자카드 유사도의 추정값입니다.
+# 서명을 DEDUP_BANDS 개 밴드로 나눠 밴드가 하나라도 같은 문제만 후보로 비교하므로(LSH) 모든 쌍을 비교하지 않습니다.
+# (밴드당 r 행, b 밴드면 유사도 s 인 쌍이 후보가 될 확률 1 - (1 - s^r)^b, 기본 r=8, b=16 은 s≈0.7 부터 급격히 올라감)
+#
+# - 문제 추가 시 서명을 함께 저장하고(check_duplicates 면 추가 전에 같은 퀴즈의 유사 문제 확인),
+#   퀴즈별 LSH 색인은 프로세스 메모리에 두고 조회할 때 새로 저장된 서명만 이어서 읽습니다.
+# - 서명이 없는 문제(일괄 적재 등)는 배치로 계산해 저장합니다.
+#
+# 사용법:
+#   python -m app.services.dedup                  # 서명이 없는 문제 계산 후 퀴즈별 중복 묶음 출력
+#   python -m app.services.dedup --quiz-id 1 --threshold 0.7
+#   python -m app.services.dedup --recompute      # 서명 설정(DEDUP_*)을 바꾼 뒤 전부 다시 계산
+import argparse
+import json
+import logging
+import re
+import threading
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import delete, func, insert
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.question import Question, QuestionSignature
+from app.utils import optional
+
+np = None  # numpy (선택 의존성) - 임포트가 무거워 available() 에서 처음 쓸 때 불러옴
+
+logger = logging.getLogger(__name__)
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_SEED = 1  # 저장된 서명과 같은 해시 함수를 쓰도록 고정
+_ROLLING_BASE = 1_000_003
+
+
+def available() -> bool:
+    global np
+    if np is None:
+        np = optional.numpy()
+    return np is not None
+
+
+class MinHasher:
+    """글자 n-gram MinHash 서명 계산 (numpy 벡터 연산)"""
+
+    def __init__(self, num_perm: int, shingle_size: int, seed: int = _SEED):
+        available()
+        rng = np.random.RandomState(seed)
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        # (a * x + b) mod p 형태의 해시 함수들 (uint64 곱셈은 2^64 에서 감기지만 해시 용도로는 충분)
+        self._a = rng.randint(1, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+        self._powers = np.array(
+            [pow(_ROLLING_BASE, shingle_size - 1 - i, 1 << 64) for i in range(shingle_size)], dtype=np.uint64
+        )
+
+    @staticmethod
+    def normalize(content: str, options: Iterable[str] = ()) -> str:
+        """소문자, 문장 부호 제거, 공백 하나로 - 선택지는 순서와 무관하도록 정렬해 붙임"""
+        text = " ".join([content, *sorted(options or ())]).lower()
+        return " ".join(re.findall(r"\w+", text))
+
+    def shingles(self, text: str) -> "np.ndarray":
+        """글자 n-gram 의 32비트 해시 (중복 제거)"""
+        codes = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+        if len(codes) < self.shingle_size:
+            codes = np.pad(codes, (0, self.shingle_size - len(codes)))
+        windows = np.lib.stride_tricks.sliding_window_view(codes, self.shingle_size)
+        return np.unique((windows * self._powers).sum(axis=1) & np.uint64(_MAX_HASH))
+
+    def signature(self, content: str, options: Iterable[str] = ()) -> "np.ndarray":
+        hashes = self.shingles(self.normalize(content, options))
+        values = (np.outer(hashes, self._a) + self._b) % np.uint64(_MERSENNE_PRIME) & np.uint64(_MAX_HASH)
+        return values.min(axis=0).astype(np.uint32)
+
+
+def to_bytes(signature: "np.ndarray") -> bytes:
+    return signature.astype("<u4").tobytes()
+
+
+def from_bytes(raw: bytes) -> "np.ndarray":
+    available()
+    return np.frombuffer(raw, dtype="<u4").astype(np.uint32)
+
+
+def similarity(left: "np.ndarray", right: "np.ndarray") -> float:
+    """서명으로 추정한 자카드 유사도"""
+    return float(np.count_nonzero(left == right)) / len(left)
+
+
+class LSHIndex:
+    """밴드별 버킷 - 밴드가 하나라도 같은 서명을 후보로"""
+
+    def __init__(self, bands: int):
+        self.bands = bands
+        self.buckets: Dict[Tuple[int, bytes], List[int]] = defaultdict(list)
+        self.signatures: Dict[int, "np.ndarray"] = {}
+        self.last_id = 0  # 이어서 읽을 위치 (저장된 서명 중 마지막으로 읽은 문제 ID)
+
+    def _keys(self, signature: "np.ndarray"):
+        rows = len(signature) // self.bands
+        for band in range(self.bands):
+            yield band, signature[band * rows:(band + 1) * rows].tobytes()
+
+    def add(self, question_id: int, signature: "np.ndarray") -> None:
+        if question_id in self.signatures:
+            return
+        self.signatures[question_id] = signature
+        for key in self._keys(signature):
+            self.buckets[key].append(question_id)
+
+    def query(self, signature: "np.ndarray", threshold: float) -> List[Tuple[int, float]]:
+        """추정 유사도가 threshold 이상인 (문제 ID, 유사도), 유사도 내림차순"""
+        candidates = {question_id for key in self._keys(signature) for question_id in self.buckets.get(key, ())}
+        matches = [
+            (question_id, similarity(self.signatures[question_id], signature)) for question_id in candidates
+        ]
+        return sorted(
+            ((question_id, score) for question_id, score in matches if score >= threshold),
+            key=lambda match: (-match[1], match[0])
+        )
+
+    def candidate_pairs(self, only: Optional[set] = None):
+        """밴드를 공유하는 (작은 ID, 큰 ID) 쌍 - only 를 주면 그 문제들끼리만"""
+        seen = set()
+        for members in self.buckets.values():
+            if only is not None:
+                members = [m for m in members if m in only]
+            for i in range(len(members)):
+                for j in range(i + 1, len(members)):
+                    pair = (members[i], members[j]) if members[i] < members[j] else (members[j], members[i])
+                    if pair not in seen:
+                        seen.add(pair)
+                        yield pair
+
+    def clusters(self, threshold: float, only: Optional[set] = None) -> List[Dict[str, Any]]:
+        """추정 유사도 threshold 이상인 쌍을 이어 만든 묶음 (크기, 최고 유사도 순)"""
+        parent: Dict[int, int] = {}
+
+        def find(x: int) -> int:
+            while parent.get(x, x) != x:
+                x = parent[x]
+            return x
+
+        best: Dict[int, float] = {}
+        for left, right in self.candidate_pairs(only):
+            score = similarity(self.signatures[left], self.signatures[right])
+            if score < threshold:
+                continue
+            root_left, root_right = find(left), find(right)
+            if root_left != root_right:
+                parent[max(root_left, root_right)] = min(root_left, root_right)
+            best[left] = max(best.get(left, 0.0), score)
+            best[right] = max(best.get(right, 0.0), score)
+
+        groups: Dict[int, List[int]] = defaultdict(list)
+        for question_id in best:
+            groups[find(question_id)].append(question_id)
+        clusters = [
+            {"question_ids": sorted(members), "similarity": max(best[m] for m in members)}
+            for members in groups.values()
+        ]
+        return sorted(clusters, key=lambda c: (-len(c["question_ids"]), -c["similarity"], c["question_ids"][0]))
+
+
+_hasher: Optional[MinHasher] = None
+_indexes: Dict[int, LSHIndex] = {}
+_lock = threading.Lock()
+
+
+def get_hasher() -> MinHasher:
+    global _hasher
+    if _hasher is None:
+        _hasher = MinHasher(settings.DEDUP_NUM_PERM, settings.DEDUP_SHINGLE_SIZE)
+    return _hasher
+
+
+def get_index(db: Session, quiz_id: int) -> LSHIndex:
+    """퀴즈의 LSH 색인 - 저장된 서명 수가 달라졌을 때만 새 서명을 이어서 읽음 (다른 프로세스가 추가한 문제 포함)
+
+    비활성 문제도 색인에 두며(추가할 문제와 겹치는지 확인), 묶음 보고에서만 제외합니다.
+    """
+    with _lock:
+        index = _indexes.setdefault(quiz_id, LSHIndex(settings.DEDUP_BANDS))
+    stored = db.query(func.count(QuestionSignature.question_id)).filter(QuestionSignature.quiz_id == quiz_id).scalar()
+    if stored == len(index.signatures):
+        return index
+    if stored < len(index.signatures):
+        # 문제가 삭제됨 - 처음부터 다시 읽음
+        with _lock:
+            index = _indexes[quiz_id] = LSHIndex(settings.DEDUP_BANDS)
+    query = db.query(QuestionSignature.question_id, QuestionSignature.signature).filter(
+        QuestionSignature.quiz_id == quiz_id
+    )
+    rows = query.filter(QuestionSignature.question_id > index.last_id).all()
+    if stored > len(index.signatures) + len(rows):
+        # 마지막으로 읽은 ID 보다 앞선 문제의 서명이 나중에 계산됨 (일괄 계산) - 빠진 것만 추가
+        rows = query.all()
+    with _lock:
+        for question_id, raw in rows:
+            index.add(question_id, from_bytes(raw))
+            index.last_id = max(index.last_id, question_id)
+    return index
+
+
+def reset_quiz(quiz_id: int) -> None:
+    """퀴즈 삭제/문제 변경 시 프로세스 내 색인 버림 (다음 조회 때 다시 읽음)"""
+    with _lock:
+        _indexes.pop(quiz_id, None)
+
+
+def find_duplicates(
+        db: Session,
+        quiz_id: int,
+        content: str,
+        options: Sequence[str],
+        threshold: Optional[float] = None
+) -> Tuple["np.ndarray", List[Tuple[int, float]]]:
+    """새 문제의 서명과 같은 퀴즈의 유사 문제 (문제 ID, 추정 유사도) - 문제 추가/일괄 가져오기 전에 확인"""
+    signature = get_hasher().signature(content, options)
+    threshold = settings.DEDUP_THRESHOLD if threshold is None else threshold
+    return signature, get_index(db, quiz_id).query(signature, threshold)
+
+
+def remember(quiz_id: int, question_id: int, signature: "np.ndarray") -> None:
+    """커밋된 새 문제를 이 프로세스의 색인에 바로 반영"""
+    with _lock:
+        index = _indexes.get(quiz_id)
+        if index is not None:
+            index.add(question_id, signature)
+
+
+def _upsert_signatures(db: Session, rows: List[Dict[str, Any]]) -> None:
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        # ON CONFLICT 를 지원하지 않는 DB 는 지우고 넣음
+        db.execute(delete(QuestionSignature).where(QuestionSignature.question_id.in_([r["question_id"] for r in rows])))
+        db.execute(insert(QuestionSignature), rows)
+        return
+    stmt = dialect_insert(QuestionSignature).values(rows)
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=[QuestionSignature.question_id],
+        set_={"quiz_id": stmt.excluded.quiz_id, "signature": stmt.excluded.signature}
+    ))
+
+
+def sync_signatures(db: Session, quiz_id: Optional[int] = None, batch_size: int = 1000) -> int:
+    """서명이 없는 문제를 문제 ID 키셋 배치로 계산해 저장 (배치마다 커밋), 계산한 수 반환"""
+    hasher = get_hasher()
+    total, last_id = 0, 0
+    while True:
+        query = db.query(Question.id, Question.quiz_id, Question.content, Question.options).outerjoin(
+            QuestionSignature, QuestionSignature.question_id == Question.id
+        ).filter(Question.id > last_id, QuestionSignature.question_id.is_(None))
+        if quiz_id is not None:
+            query = query.filter(Question.quiz_id == quiz_id)
+        batch = query.order_by(Question.id).limit(batch_size).all()
+        if not batch:
+            break
+        _upsert_signatures(db, [
+            {
+                "question_id": row.id,
+                "quiz_id": row.quiz_id,
+                "signature": to_bytes(hasher.signature(row.content, row.options or ())),
+            }
+            for row in batch
+        ])
+        db.commit()
+        total += len(batch)
+        last_id = batch[-1].id
+        logger.info("문제 서명 %d개 계산 (마지막 ID %d)", total, last_id)
+    return total
+
+
+def clear_signatures(db: Session, quiz_id: Optional[int] = None) -> None:
+    """저장된 서명 삭제 (서명 설정을 바꾼 뒤 다시 계산할 때)"""
+    stmt = delete(QuestionSignature)
+    if quiz_id is not None:
+        stmt = stmt.where(QuestionSignature.quiz_id == quiz_id)
+    db.execute(stmt)
+    db.commit()
+    with _lock:
+        if quiz_id is None:
+            _indexes.clear()
+        else:
+            _indexes.pop(quiz_id, None)
+
+
+def report(db: Session, quiz_id: int, threshold: Optional[float] = None) -> List[Dict[str, Any]]:
+    """퀴즈의 활성 문제 중 유사 문제 묶음 (서명이 없는 문제는 먼저 계산)"""
+    sync_signatures(db, quiz_id)
+    threshold = settings.DEDUP_THRESHOLD if threshold is None else threshold
+    active = {
+        row[0] for row in db.query(Question.id).filter(Question.quiz_id == quiz_id, Question.is_active == True)
+    }
+    return get_index(db, quiz_id).clusters(threshold, active)
+
+
+def main():
+    import app.models.user, app.models.quiz, app.models.submission  # noqa: F401 (관계 대상 모델 등록)
+    from app.db import SessionLocal
+
+    parser = argparse.ArgumentParser(description="문제 MinHash 서명 계산 및 퀴즈별 유사 문제 묶음 출력")
+    parser.add_argument("--quiz-id", type=int, action="append", help="대상 퀴즈 (생략 시 전체)")
+    parser.add_argument("--threshold", type=float, default=settings.DEDUP_THRESHOLD, help="중복으로 볼 추정 유사도")
+    parser.add_argument("--batch-size", type=int, default=1000, help="한 트랜잭션에서 서명을 계산할 문제 수")
+    parser.add_argument("--recompute", action="store_true", help="저장된 서명을 지우고 다시 계산")
+    args = parser.parse_args()
+    if not available():
+        parser.error("numpy 가 필요합니다 (pip install \"lsk-quiz[dedup]\")")
+
+    db = SessionLocal()
+    try:
+        quiz_ids = args.quiz_id or [row[0] for row in db.query(Question.quiz_id).distinct().order_by(Question.quiz_id)]
+        if args.recompute:
+            for quiz_id in args.quiz_id or [None]:
+                clear_signatures(db, quiz_id)
+        for quiz_id in args.quiz_id or [None]:
+            sync_signatures(db, quiz_id, args.batch_size)
+        result = {str(quiz_id): report(db, quiz_id, args.threshold) for quiz_id in quiz_ids}
+    finally:
+        db.close()
+    print(json.dumps({quiz_id: clusters for quiz_id, clusters in result.items() if clusters}, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
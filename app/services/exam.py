@@ -0,0 +1,289 @@
+# app/services/exam.py
+# 예정된 시험 - 응시 기간 검사, 응시 기록 생성, 명단 응시 기록 일괄 생성
+#
+# 시작 시각 전에 명단 전체의 Submission(문제 순서 포함)을 일괄 INSERT 해 두면
+# 시험 시작 직후 첫 /take 요청은 조회만 하게 됩니다.
+# 생성은 모두 (quiz_id, user_id) WHERE is_completed = false 부분 유니크 인덱스에 기대는
+# INSERT ... ON CONFLICT DO NOTHING 이므로 동시 요청/여러 워커가 겹쳐도 진행 중 응시는 하나만 생깁니다.
+import asyncio
+import logging
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import exists, false, insert, or_
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.question import Question
+from app.models.quiz import Quiz, QuizRoster
+from app.models.submission import Submission
+from app.services import attempts, blueprint, deadlines, exposure
+from app.services.quiz_cache import get_active_question_ids
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 1000
+
+
+def _aware(value: Optional[datetime]) -> Optional[datetime]:
+    # SQLite 는 시간대 정보 없이 돌려주므로 UTC 로 간주
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def validate_exam_window(starts_at: Optional[datetime], ends_at: Optional[datetime]) -> None:
+    """시험 기간 설정 검사"""
+    if starts_at is not None and ends_at is not None and _aware(ends_at) <= _aware(starts_at):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="시험 종료 시각은 시작 시각 이후여야 합니다"
+        )
+
+
+def check_exam_window(quiz: Any, now: Optional[datetime] = None) -> None:
+    """응시 기간 밖이면 403"""
+    now = now or datetime.now(timezone.utc)
+    starts_at = _aware(quiz.starts_at)
+    ends_at = _aware(quiz.ends_at)
+    if starts_at is not None and now < starts_at:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="시험 시작 전입니다"
+        )
+    if ends_at is not None and now >= ends_at:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="시험이 종료되었습니다"
+        )
+
+
+def pick_question_order(quiz: Any, all_question_ids: List[int], rng: random.Random = random) -> List[int]:
+    """출제할 문제 ID 순서 결정 (적응형은 빈 순서로 시작해 답할 때마다 이어 붙임)"""
+    if quiz.adaptive:
+        return []
+    if quiz.randomize_questions and len(all_question_ids) > quiz.questions_count:
+        return rng.sample(all_question_ids, quiz.questions_count)
+    return all_question_ids[:quiz.questions_count]
+
+
+def draw_question_order(
+        db: Session,
+        quiz: Any,
+        all_question_ids: Optional[List[int]] = None,
+        rng: random.Random = random
+) -> List[int]:
+    """응시 기록의 문제 순서 - 블루프린트가 있거나 노출 조절 중인 무작위 퀴즈는 색인에서 가중치 추출,
+    아니면 활성 문제 ID 목록(생략 시 조회)에서 선택"""
+    if quiz.adaptive:
+        return []
+    if quiz.blueprint or (settings.EXPOSURE_CONTROL and quiz.randomize_questions):
+        index = blueprint.get_index(db, quiz.id)
+        if quiz.blueprint or len(index) > quiz.questions_count:
+            return index.draw(quiz.blueprint or [{"count": quiz.questions_count}], quiz.randomize_questions, rng)
+    if all_question_ids is None:
+        all_question_ids = get_active_question_ids(db, quiz.id)
+    return pick_question_order(quiz, all_question_ids, rng)
+
+
+def _insert_ignoring_in_progress(db: Session, rows: List[Dict[str, Any]]) -> List[Tuple[int, int, int]]:
+    """진행 중 응시가 이미 있는 행은 건너뛰고 INSERT (생성된 (제출 ID, 퀴즈 ID, 사용자 ID) 반환)"""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        dialect_insert = None
+
+    if dialect_insert is None:
+        # ON CONFLICT 를 지원하지 않는 DB 는 한 행씩 넣고 유니크 위반을 무시
+        from sqlalchemy.exc import IntegrityError
+
+        ids = []
+        for row in rows:
+            try:
+                with db.begin_nested():
+                    submission_id = db.execute(insert(Submission).values(**row)).inserted_primary_key[0]
+                ids.append((submission_id, row["quiz_id"], row["user_id"]))
+            except IntegrityError:
+                pass
+        return ids
+
+    stmt = dialect_insert(Submission).values(rows).on_conflict_do_nothing(
+        index_elements=[Submission.quiz_id, Submission.user_id],
+        index_where=Submission.is_completed == false(),
+    ).returning(Submission.id, Submission.quiz_id, Submission.user_id)
+    return [tuple(inserted) for inserted in db.execute(stmt)]
+
+
+def _record_exposures(quiz: Any, rows: List[Dict[str, Any]], inserted: List[Tuple[int, int, int]]) -> None:
+    """실제로 만든 응시 기록의 문제만 노출 수에 더함 (진행 중 응시가 있어 버려진 순서는 세지 않음)"""
+    if not settings.EXPOSURE_CONTROL or not (quiz.blueprint or quiz.randomize_questions):
+        return
+    created = {user_id for _, _, user_id in inserted}
+    for row in rows:
+        if row["user_id"] in created:
+            exposure.record(quiz.id, row["question_order"])
+
+
+def get_in_progress_submission(db: Session, quiz_id: int, user_id: int) -> Optional[Submission]:
+    return db.query(Submission).filter(
+        Submission.quiz_id == quiz_id,
+        Submission.user_id == user_id,
+        Submission.is_completed == False
+    ).first()
+
+
+def create_submission(
+        db: Session,
+        quiz: Any,
+        user_id: int,
+        all_question_ids: Optional[List[int]] = None
+) -> Submission:
+    """진행 중 응시 기록 생성 - 동시에 다른 요청이 만들었으면 그 기록을 반환"""
+    row = {
+        "quiz_id": quiz.id,
+        "user_id": user_id,
+        "question_order": draw_question_order(db, quiz, all_question_ids),
+        "is_completed": False,
+    }
+    inserted = _insert_ignoring_in_progress(db, [row])
+    attempts.record_started(db, inserted)
+    db.commit()
+    _record_exposures(quiz, [row], inserted)
+    if inserted:
+        submission = db.get(Submission, inserted[0][0])
+        # 제한 시간이 있으면 마감 등록 (시작 시각은 DB 기본값)
+        deadline = deadlines.deadline_for(quiz.time_limit_minutes, quiz.ends_at, submission.start_time)
+        deadlines.schedule(submission.id, deadline)
+        return submission
+    return get_in_progress_submission(db, quiz.id, user_id)
+
+
+def roster_allows(db: Session, quiz_id: int, user_id: int) -> bool:
+    """명단이 없는 퀴즈는 누구나, 명단이 있으면 명단에 있는 사용자만 응시 가능"""
+    # 본인 행을 먼저 정렬해 한 행만 읽음: 행이 없으면 명단 없음, 첫 행이 본인이 아니면 명단에 없음
+    first = db.query(QuizRoster.user_id).filter(
+        QuizRoster.quiz_id == quiz_id
+    ).order_by((QuizRoster.user_id == user_id).desc()).limit(1).first()
+    return first is None or first.user_id == user_id
+
+
+def add_to_roster(db: Session, quiz: Quiz, user_ids: Iterable[int]) -> int:
+    """명단에 사용자 추가 (이미 있는 사용자는 건너뜀), 추가된 수 반환"""
+    user_ids = set(user_ids)
+    existing = {
+        row.user_id for row in db.query(QuizRoster.user_id).filter(
+            QuizRoster.quiz_id == quiz.id,
+            QuizRoster.user_id.in_(user_ids)
+        )
+    } if user_ids else set()
+    new_ids = sorted(user_ids - existing)
+    if new_ids:
+        db.execute(insert(QuizRoster), [{"quiz_id": quiz.id, "user_id": user_id} for user_id in new_ids])
+        # 이미 일괄 생성된 시험이면 다음 스케줄러 주기에 새 인원만 다시 생성
+        quiz.materialized_at = None
+    db.commit()
+    return len(new_ids)
+
+
+def materialize_submissions(db: Session, quiz: Quiz, batch_size: int = BATCH_SIZE) -> int:
+    """명단 전체의 응시 기록을 일괄 생성, 생성된 수 반환
+
+    이미 이 퀴즈에 응시 기록(진행 중/완료)이 있는 사용자는 건너뜁니다. 여러 번 실행해도 결과는 같습니다.
+    """
+    # 블루프린트 퀴즈는 전체 ID 목록 대신 구간 색인에서 뽑음
+    all_question_ids = None if quiz.blueprint else [
+        row.id for row in db.query(Question.id).filter(
+            Question.quiz_id == quiz.id,
+            Question.is_active == True
+        ).order_by(Question.id)
+    ]
+    user_ids = [
+        row.user_id for row in db.query(QuizRoster.user_id).filter(
+            QuizRoster.quiz_id == quiz.id,
+            ~exists().where(
+                Submission.quiz_id == QuizRoster.quiz_id,
+                Submission.user_id == QuizRoster.user_id
+            )
+        ).order_by(QuizRoster.user_id)
+    ]
+
+    created = 0
+    for i in range(0, len(user_ids), batch_size):
+        rows = [
+            {
+                "quiz_id": quiz.id,
+                "user_id": user_id,
+                "question_order": draw_question_order(db, quiz, all_question_ids),
+                "is_completed": False,
+                "start_time": quiz.starts_at,
+            }
+            for user_id in user_ids[i:i + batch_size]
+        ]
+        inserted = _insert_ignoring_in_progress(db, rows)
+        attempts.record_started(db, inserted, quiz.starts_at)
+        created += len(inserted)
+        db.commit()  # 배치마다 커밋해 잠금/트랜잭션을 짧게 유지
+        _record_exposures(quiz, rows, inserted)
+        # 미리 만든 응시는 모두 시험 시작 시각부터 제한 시간을 셈
+        deadline = deadlines.deadline_for(quiz.time_limit_minutes, quiz.ends_at, quiz.starts_at)
+        for submission_id, _, _ in inserted:
+            deadlines.schedule(submission_id, deadline)
+
+    quiz.materialized_at = datetime.now(timezone.utc)
+    db.commit()
+    return created
+
+
+def materialize_due_quizzes(db: Session, now: Optional[datetime] = None) -> Dict[int, int]:
+    """곧 시작하는(또는 진행 중인) 예정 시험 중 아직 일괄 생성하지 않은 시험 처리"""
+    now = now or datetime.now(timezone.utc)
+    lead = timedelta(minutes=settings.EXAM_MATERIALIZE_LEAD_MINUTES)
+    quizzes = db.query(Quiz).filter(
+        Quiz.is_active == True,
+        Quiz.starts_at.isnot(None),
+        Quiz.starts_at <= now + lead,
+        or_(Quiz.ends_at.is_(None), Quiz.ends_at > now),
+        Quiz.materialized_at.is_(None)
+    ).all()
+
+    results = {}
+    for quiz in quizzes:
+        results[quiz.id] = materialize_submissions(db, quiz)
+        logger.info("시험 %d 응시 기록 %d개 일괄 생성", quiz.id, results[quiz.id])
+    return results
+
+
+def run_materialize(quiz_id: Optional[int] = None) -> None:
+    """새 세션으로 일괄 생성 실행 (관리자 엔드포인트/스케줄러 공용)"""
+    from app.db import SessionLocal
+
+    db = SessionLocal()
+    try:
+        if quiz_id is None:
+            materialize_due_quizzes(db)
+        else:
+            quiz = db.query(Quiz).filter(Quiz.id == quiz_id).first()
+            if quiz:
+                count = materialize_submissions(db, quiz)
+                logger.info("시험 %d 응시 기록 %d개 일괄 생성", quiz_id, count)
+    except Exception:
+        db.rollback()
+        logger.exception("응시 기록 일괄 생성 실패")
+    finally:
+        db.close()
+
+
+async def scheduler_loop(stop_event: asyncio.Event) -> None:
+    """lifespan 에서 실행하는 주기 작업 - 시작이 임박한 시험의 응시 기록을 미리 생성"""
+    while not stop_event.is_set():
+        await run_in_threadpool(run_materialize)
+        try:
+            await asyncio.wait_for(stop_event.wait(), timeout=settings.EXAM_SCHEDULER_INTERVAL)
+        except asyncio.TimeoutError:
+            pass
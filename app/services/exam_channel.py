@@ -0,0 +1,220 @@
+# app/services/exam_channel.py
+# 응시 중인 제출 하나에 대한 WebSocket 채널
+#
+# 연결할 때 한 번만 토큰/사용자/응시 기록/퀴즈를 확인하고 그 정보를 연결 동안 유지합니다.
+# 이후 메시지는 JSON 한 줄씩 주고받습니다.
+#   → {"type": "answer", "question_id": 1, "selected_option": 2, "seq": 7}
+#   ← {"type": "ack", "seq": 7}                   (메모리에 반영됨)
+#   ← {"type": "saved", "seq": 7}                 (DB 에 저장됨 - 일정 간격/개수마다 모아서 저장)
+#   → {"type": "page", "page": 2}
+#   ← {"type": "page", "page": 2, "total_pages": 3, "questions": [...]}
+#   → {"type": "ping"}  ← {"type": "pong"}
+# DB 세션은 연결 동안 잡지 않고 저장/페이지 조회 때만 짧게 열어 연결 수가 커넥션 풀 크기에 묶이지 않습니다.
+import asyncio
+import json
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from fastapi import WebSocket, WebSocketDisconnect, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import insert, update
+
+from app.api.deps import decode_user_id
+from app.config import settings
+from app.models.submission import Submission, SubmissionAnswer
+from app.models.user import User
+from app.services import deadlines
+from app.services.exam import check_exam_window
+from app.services.quiz import build_page
+from app.services.quiz_cache import get_quiz
+
+
+class ChannelClosed(Exception):
+    """응시가 더 이상 진행 중이 아님 (다른 경로로 제출됨 등)"""
+
+
+class ExamChannel:
+    """연결 하나의 응시 상태 - 현재 답안과 아직 저장하지 않은 변경분"""
+
+    def __init__(self, submission_id: int, quiz: Any, question_order, answers: Dict[int, Optional[int]]):
+        self.submission_id = submission_id
+        self.quiz = quiz
+        self.question_order = question_order
+        self.question_ids = set(question_order)
+        self.answers = answers
+        self.pending: Dict[int, Optional[int]] = {}
+        self.pending_seq: Optional[int] = None
+        self.last_flush = time.monotonic()
+
+    @classmethod
+    def open(cls, token: Optional[str], submission_id: int) -> "ExamChannel":
+        """연결 시 한 번만 하는 인증/권한 확인 (실패 시 WebSocket 종료 코드와 함께 PermissionError)"""
+        from app.db import SessionLocal
+
+        user_id = decode_user_id(token) if token else None
+        if user_id is None or not str(user_id).isdigit():
+            raise PermissionError(status.WS_1008_POLICY_VIOLATION, "토큰 인증에 실패했습니다")
+
+        db = SessionLocal()
+        try:
+            row = db.query(Submission, User.is_active).join(User, User.id == Submission.user_id).filter(
+                Submission.id == submission_id,
+                Submission.user_id == int(user_id),
+                Submission.is_completed == False
+            ).first()
+            if row is None or not row.is_active:
+                raise PermissionError(status.WS_1008_POLICY_VIOLATION, "유효한 응시 기록을 찾을 수 없거나 이미 완료된 시험입니다")
+            submission = row.Submission
+
+            quiz = get_quiz(db, submission.quiz_id)
+            if quiz is None:
+                raise PermissionError(status.WS_1008_POLICY_VIOLATION, "퀴즈를 찾을 수 없습니다")
+            try:
+                check_exam_window(quiz)
+                deadlines.check_time_limit(db, quiz, submission)
+            except Exception as e:
+                raise PermissionError(status.WS_1008_POLICY_VIOLATION, getattr(e, "detail", str(e)))
+
+            answers = dict(
+                db.query(SubmissionAnswer.question_id, SubmissionAnswer.selected_option).filter(
+                    SubmissionAnswer.submission_id == submission_id
+                ).all()
+            )
+            return cls(submission_id, quiz, list(submission.question_order), answers)
+        finally:
+            db.close()
+
+    def record_answer(self, question_id: int, selected_option: Optional[int], seq: Optional[int]) -> bool:
+        if question_id not in self.question_ids:
+            return False
+        if selected_option is not None and (not isinstance(selected_option, int) or isinstance(selected_option, bool)):
+            return False
+        self.answers[question_id] = selected_option
+        self.pending[question_id] = selected_option
+        self.pending_seq = seq
+        return True
+
+    def should_flush(self) -> bool:
+        return bool(self.pending) and (
+            len(self.pending) >= settings.WS_FLUSH_MAX_ANSWERS
+            or time.monotonic() - self.last_flush >= settings.WS_FLUSH_INTERVAL
+        )
+
+    def flush(self) -> Optional[int]:
+        """모아 둔 변경분을 한 트랜잭션으로 저장, 저장된 마지막 seq 반환"""
+        from app.db import SessionLocal
+
+        self.last_flush = time.monotonic()
+        if not self.pending:
+            return None
+        pending, seq = self.pending, self.pending_seq
+        self.pending, self.pending_seq = {}, None
+
+        db = SessionLocal()
+        try:
+            # 다른 경로로 제출되었으면 저장하지 않음
+            touched = db.execute(
+                update(Submission).where(
+                    Submission.id == self.submission_id,
+                    Submission.is_completed == False
+                ).values(updated_at=datetime.now(timezone.utc))
+            ).rowcount
+            if not touched:
+                db.rollback()
+                raise ChannelClosed()
+
+            db.query(SubmissionAnswer).filter(
+                SubmissionAnswer.submission_id == self.submission_id,
+                SubmissionAnswer.question_id.in_(list(pending))
+            ).delete(synchronize_session=False)
+            db.execute(insert(SubmissionAnswer), [
+                {
+                    "submission_id": self.submission_id,
+                    "question_id": question_id,
+                    "selected_option": selected_option,
+                    "is_correct": None  # 채점하지 않음
+                }
+                for question_id, selected_option in pending.items()
+            ])
+            db.commit()
+            return seq
+        finally:
+            db.close()
+
+    def page(self, page: int) -> Dict[str, Any]:
+        from app.db import SessionLocal
+
+        db = SessionLocal()
+        try:
+            page, total_pages, questions = build_page(db, self.quiz, self.question_order, page)
+        finally:
+            db.close()
+
+        payload = []
+        for question in questions:
+            data = question.model_dump(mode="json")
+            if question.id in self.answers:
+                data["selected_option"] = self.answers[question.id]
+            payload.append(data)
+        return {"type": "page", "page": page, "total_pages": total_pages, "questions": payload}
+
+
+async def _flush(websocket: WebSocket, channel: ExamChannel) -> None:
+    seq = await run_in_threadpool(channel.flush)
+    if seq is not None:
+        await websocket.send_json({"type": "saved", "seq": seq})
+
+
+async def serve(websocket: WebSocket, submission_id: int, token: Optional[str]) -> None:
+    """WebSocket 연결 처리"""
+    try:
+        channel = await run_in_threadpool(ExamChannel.open, token, submission_id)
+    except PermissionError as e:
+        code, reason = e.args
+        await websocket.close(code=code, reason=reason)
+        return
+
+    await websocket.accept()
+    try:
+        while True:
+            # 저장할 변경분이 있으면 저장 간격만큼만 기다림
+            timeout = settings.WS_FLUSH_INTERVAL if channel.pending else None
+            try:
+                text = await asyncio.wait_for(websocket.receive_text(), timeout)
+            except asyncio.TimeoutError:
+                await _flush(websocket, channel)
+                continue
+            try:
+                message = json.loads(text)
+            except ValueError:
+                message = None
+
+            kind = message.get("type") if isinstance(message, dict) else None
+            if kind == "answer":
+                seq = message.get("seq")
+                if channel.record_answer(message.get("question_id"), message.get("selected_option"), seq):
+                    await websocket.send_json({"type": "ack", "seq": seq})
+                else:
+                    await websocket.send_json({"type": "error", "seq": seq, "detail": "출제되지 않은 문제이거나 올바르지 않은 답안입니다"})
+                if channel.should_flush():
+                    await _flush(websocket, channel)
+            elif kind == "page":
+                page = message.get("page", 1)
+                if not isinstance(page, int) or page < 1:
+                    await websocket.send_json({"type": "error", "detail": "페이지 번호가 올바르지 않습니다"})
+                    continue
+                # 페이지를 넘기기 전에 변경분 저장
+                await _flush(websocket, channel)
+                await websocket.send_json(await run_in_threadpool(channel.page, page))
+            elif kind == "ping":
+                await websocket.send_json({"type": "pong"})
+            else:
+                await websocket.send_json({"type": "error", "detail": "알 수 없는 메시지입니다"})
+    except WebSocketDisconnect:
+        try:
+            await run_in_threadpool(channel.flush)
+        except ChannelClosed:
+            pass
+    except ChannelClosed:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="이미 완료된 시험입니다")
@@ -0,0 +1,135 @@
+# app/services/exposure.py
+# 문제 노출 수 - 출제 횟수를 프로세스 메모리에 모았다가 주기적으로 한 번에 DB 에 더함
+#
+# 응시 기록을 만들 때마다 문제 행을 UPDATE 하면 시험 시작 직후(명단 일괄 생성, 동시 /take) 같은 행에 쓰기가 몰립니다.
+# 여기서는 증가분만 메모리에 쌓아 두고 EXPOSURE_FLUSH_INTERVAL 마다(그리고 종료 시) question_exposures 에
+# 문제 ID 순으로 정렬한 INSERT ... ON CONFLICT DO UPDATE 한 번으로 더합니다 (여러 워커가 동시에 더해도 잃지 않음).
+# 출제에 쓰는 노출 수는 블루프린트 색인(app.services.blueprint)이 DB 값 + 아직 쓰지 않은 증가분으로 읽어 두고
+# 자기 프로세스의 출제는 바로 반영합니다. 다른 워커의 출제는 BLUEPRINT_INDEX_TTL 안에 반영됩니다.
+import asyncio
+import logging
+import threading
+from collections import Counter
+from typing import Dict, Iterable, List
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import func, insert, update
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.question import Question, QuestionExposure
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 1000
+
+_pending: Dict[int, Counter] = {}  # 퀴즈 ID → 문제 ID 별 아직 DB 에 더하지 않은 노출 수
+_lock = threading.Lock()
+
+
+def record(quiz_id: int, question_ids: Iterable[int]) -> None:
+    """출제된 문제의 노출 수 증가 (메모리에만, flush 때 DB 에 더함)"""
+    with _lock:
+        _pending.setdefault(quiz_id, Counter()).update(question_ids)
+
+
+def pending_for(quiz_id: int) -> Dict[int, int]:
+    """퀴즈의 아직 DB 에 더하지 않은 노출 수"""
+    with _lock:
+        return dict(_pending.get(quiz_id, ()))
+
+
+def reset_quiz(quiz_id: int) -> None:
+    """퀴즈 삭제 시 쌓아 둔 증가분 버림"""
+    with _lock:
+        _pending.pop(quiz_id, None)
+
+
+def load_counts(db: Session, quiz_id: int) -> Dict[int, int]:
+    """퀴즈 문제별 노출 수 (DB 값 + 이 프로세스의 아직 쓰지 않은 증가분)"""
+    counts = Counter({
+        row.question_id: row.exposures for row in db.query(
+            QuestionExposure.question_id, QuestionExposure.exposures
+        ).filter(QuestionExposure.quiz_id == quiz_id)
+    })
+    counts.update(pending_for(quiz_id))
+    return dict(counts)
+
+
+def _add_exposures(db: Session, rows: List[Dict[str, int]]) -> None:
+    """question_exposures 에 노출 수를 더함 (행이 없으면 새로, 커밋은 호출한 쪽에서)"""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        # ON CONFLICT 를 지원하지 않는 DB 는 한 행씩 UPDATE, 없으면 INSERT
+        for row in rows:
+            result = db.execute(update(QuestionExposure).where(
+                QuestionExposure.question_id == row["question_id"]
+            ).values(exposures=QuestionExposure.exposures + row["exposures"]))
+            if result.rowcount == 0:
+                db.execute(insert(QuestionExposure).values(**row))
+        return
+
+    stmt = dialect_insert(QuestionExposure).values(rows)
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=[QuestionExposure.question_id],
+        set_={"exposures": QuestionExposure.exposures + stmt.excluded.exposures, "updated_at": func.now()}
+    ))
+
+
+def flush(db: Session) -> int:
+    """쌓아 둔 노출 수를 DB 에 더하고 더한 문제 수 반환 (실패하면 증가분을 되돌려 다음에 다시 시도)"""
+    with _lock:
+        pending = dict(_pending)
+        _pending.clear()
+    rows = sorted(
+        ({"question_id": question_id, "quiz_id": quiz_id, "exposures": count}
+         for quiz_id, counts in pending.items() for question_id, count in counts.items()),
+        key=lambda row: row["question_id"]
+    )
+    try:
+        written = 0
+        for i in range(0, len(rows), BATCH_SIZE):
+            batch = rows[i:i + BATCH_SIZE]
+            # 그사이 삭제된 문제는 건너뜀 (외래 키 위반으로 배치 전체가 실패하지 않게)
+            existing = {
+                row.id for row in db.query(Question.id).filter(Question.id.in_([row["question_id"] for row in batch]))
+            }
+            batch = [row for row in batch if row["question_id"] in existing]
+            if batch:
+                _add_exposures(db, batch)
+                written += len(batch)
+        db.commit()
+        return written
+    except Exception:
+        db.rollback()
+        with _lock:
+            for quiz_id, counts in pending.items():
+                _pending.setdefault(quiz_id, Counter()).update(counts)
+        raise
+
+
+def run_flush() -> None:
+    """새 세션으로 flush 실행"""
+    from app.db import SessionLocal
+
+    db = SessionLocal()
+    try:
+        flush(db)
+    except Exception:
+        logger.exception("문제 노출 수 저장 실패")
+    finally:
+        db.close()
+
+
+async def flush_loop(stop_event: asyncio.Event) -> None:
+    """lifespan 에서 실행하는 주기 작업 - EXPOSURE_FLUSH_INTERVAL 초마다, 종료할 때 한 번 더 저장"""
+    while not stop_event.is_set():
+        try:
+            await asyncio.wait_for(stop_event.wait(), timeout=settings.EXPOSURE_FLUSH_INTERVAL)
+        except asyncio.TimeoutError:
+            pass
+        await run_in_threadpool(run_flush)
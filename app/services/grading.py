@@ -0,0 +1,333 @@
+# app/services/grading.py
+# 비동기 채점 - 제출 요청은 답안만 저장하고, 채점 워커가 큐에서 제출 ID 를 배치로 꺼내 한 트랜잭션에서 채점
+#
+# 큐 구현
+#   local : 프로세스 내 queue.Queue (단일 워커 프로세스/테스트용)
+#   redis : Redis Streams + 소비자 그룹 (여러 워커 프로세스가 나눠서 처리)
+# 어느 쪽이든 채점 대상의 원본은 DB 의 grading_status = 'pending' 이므로, 재시작 시 DB 에서 다시 큐에 넣어 복구합니다.
+# 채점할 제출은 UPDATE ... SET grading_status = 'grading' WHERE grading_status = 'pending' 으로 먼저 잡고
+# 잡은 제출만 채점/집계하므로, 같은 ID 가 여러 워커(복구, 제한 시간 자동 제출 포함)에 동시에 들어와도 한 번만 반영됩니다.
+# 'grading' 은 채점 트랜잭션 안에서만 보이는 상태입니다 (실패하면 롤백되어 pending 으로 남음).
+import asyncio
+import logging
+import os
+import queue
+import socket
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.question import Question
+from app.models.submission import Submission, SubmissionAnswer
+from app.services import attempts, leaderboard, packed_answers, score_stats
+from app.utils.metrics import record_grading
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+GRADING = "grading"  # 채점 트랜잭션이 잡은 제출 (커밋 전까지만)
+GRADED = "graded"
+
+# (메시지 ID, 제출 ID, 큐에 넣은 시각)
+Message = Tuple[str, int, float]
+
+
+def _claim_pending(db: Session, submission_ids: List[int]) -> List[int]:
+    """채점 대기 중인 제출을 이 트랜잭션의 채점 대상으로 잡음 - 다른 트랜잭션이 먼저 잡은 제출은 빠짐"""
+    stmt = update(Submission).where(
+        Submission.id.in_(submission_ids),
+        Submission.grading_status == PENDING
+    ).values(grading_status=GRADING).execution_options(synchronize_session=False)
+    if db.get_bind().dialect.update_returning:
+        return [row.id for row in db.execute(stmt.returning(Submission.id))]
+
+    # RETURNING 을 지원하지 않는 DB 는 한 행씩 잡고 영향받은 행 수로 확인
+    claimed = []
+    for submission_id in sorted(set(submission_ids)):
+        if db.execute(update(Submission).where(
+            Submission.id == submission_id,
+            Submission.grading_status == PENDING
+        ).values(grading_status=GRADING).execution_options(synchronize_session=False)).rowcount:
+            claimed.append(submission_id)
+    return claimed
+
+
+def grade_pending(db: Session, submission_ids: List[int]) -> Dict[int, float]:
+    """채점 대기 중인 제출들을 한 트랜잭션에서 채점, 제출 ID → 점수 반환 (이 호출이 잡은 제출만)"""
+    claimed = _claim_pending(db, submission_ids)
+    if not claimed:
+        return {}
+    pending = db.query(
+        Submission.id, Submission.question_order, Submission.quiz_id, Submission.user_id, Submission.packed_options
+    ).filter(Submission.id.in_(claimed)).all()
+
+    # 답안 - 제출 시 압축해 둔 답안, 압축 저장 전에 제출된 것은 답안 행에서 읽어 압축
+    packed = {row.id: row.packed_options for row in pending if row.packed_options is not None}
+    row_ids = [row.id for row in pending if row.packed_options is None]
+    if row_ids:
+        selected = defaultdict(dict)
+        for submission_id, question_id, selected_option in db.query(
+            SubmissionAnswer.submission_id, SubmissionAnswer.question_id, SubmissionAnswer.selected_option
+        ).filter(SubmissionAnswer.submission_id.in_(row_ids)).order_by(SubmissionAnswer.id):
+            selected[submission_id][question_id] = selected_option
+        for row in pending:
+            if row.packed_options is None:
+                packed[row.id] = packed_answers.pack_options(row.question_order or [], selected[row.id])
+
+    # 출제된 문제의 정답을 한 번에 조회
+    question_ids = {question_id for row in pending for question_id in row.question_order or []}
+    correct_answers = dict(
+        db.query(Question.id, Question.correct_answer).filter(Question.id.in_(question_ids)).all()
+    ) if question_ids else {}
+
+    now = datetime.now(timezone.utc)
+    scores = {}
+    updates = []
+    for row in pending:
+        total_questions = len(row.question_order or [])
+        bitmap, correct_count = packed_answers.grade_packed(row.question_order or [], packed[row.id], correct_answers)
+        scores[row.id] = (correct_count / total_questions) * 100 if total_questions > 0 else 0
+        updates.append({
+            "id": row.id,
+            "score": scores[row.id],
+            "grading_status": GRADED,
+            "graded_at": now,
+            "packed_options": packed[row.id],
+            "correct_bitmap": bitmap,
+        })
+
+    db.execute(update(Submission), updates)
+    if row_ids:
+        db.query(SubmissionAnswer).filter(SubmissionAnswer.submission_id.in_(row_ids)).delete(synchronize_session=False)
+    attempts.record_scores(db, [(row.id, row.quiz_id, row.user_id, scores[row.id]) for row in pending])
+    db.commit()
+    results = [(row.quiz_id, row.user_id, scores[row.id]) for row in pending]
+    leaderboard.record_results(results)
+    score_stats.record_results(results)
+    return scores
+
+
+class LocalGradingQueue:
+    """프로세스 내 큐 (Redis 없이 동작, 테스트용 대역)"""
+
+    def __init__(self):
+        self._queue: "queue.Queue[Message]" = queue.Queue()
+        self._seq = 0
+        self._lock = threading.Lock()
+
+    def put(self, submission_id: int, enqueued_at: Optional[float] = None) -> None:
+        with self._lock:
+            self._seq += 1
+            message_id = str(self._seq)
+        self._queue.put((message_id, submission_id, enqueued_at or time.time()))
+
+    def get_batch(self, size: int, timeout: float) -> List[Message]:
+        try:
+            batch = [self._queue.get(timeout=timeout)]
+        except queue.Empty:
+            return []
+        while len(batch) < size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def ack(self, message_ids: List[str]) -> None:
+        pass
+
+    def retry(self, messages: List[Message]) -> None:
+        for _, submission_id, enqueued_at in messages:
+            self.put(submission_id, enqueued_at)
+
+
+class RedisGradingQueue:
+    """Redis Streams 큐 - 소비자 그룹으로 여러 프로세스가 나눠서 처리"""
+
+    GROUP = "graders"
+
+    def __init__(self, client, stream: str):
+        import redis
+
+        self.client = client
+        self.stream = stream
+        self.consumer = f"{socket.gethostname()}-{os.getpid()}"
+        try:
+            client.xgroup_create(stream, self.GROUP, id="0", mkstream=True)
+        except redis.exceptions.ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    def put(self, submission_id: int, enqueued_at: Optional[float] = None) -> None:
+        self.client.xadd(self.stream, {"id": submission_id, "t": enqueued_at or time.time()})
+
+    def get_batch(self, size: int, timeout: float) -> List[Message]:
+        # 블로킹 시간은 클라이언트 소켓 타임아웃보다 짧아야 함
+        block_ms = int(min(timeout, settings.REDIS_SOCKET_TIMEOUT / 2) * 1000)
+        response = self.client.xreadgroup(self.GROUP, self.consumer, {self.stream: ">"}, count=size, block=block_ms)
+        batch = []
+        for _, entries in response or []:
+            for message_id, fields in entries:
+                batch.append((message_id, int(fields["id"]), float(fields["t"])))
+        return batch
+
+    def ack(self, message_ids: List[str]) -> None:
+        if message_ids:
+            self.client.xack(self.stream, self.GROUP, *message_ids)
+            self.client.xdel(self.stream, *message_ids)
+
+    def retry(self, messages: List[Message]) -> None:
+        # 처리하지 못한 메시지는 새로 넣고 기존 메시지는 확인 처리
+        for _, submission_id, enqueued_at in messages:
+            self.put(submission_id, enqueued_at)
+        self.ack([message_id for message_id, _, _ in messages])
+
+
+class GradingWorkerPool:
+    """큐를 비우는 채점 워커 스레드 묶음"""
+
+    def __init__(self, grading_queue, workers: int, batch_size: int):
+        self.queue = grading_queue
+        self.workers = workers
+        self.batch_size = batch_size
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def start(self) -> None:
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f"grading-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads.clear()
+
+    def _run(self) -> None:
+        from app.db import SessionLocal
+
+        while not self._stop.is_set():
+            try:
+                messages = self.queue.get_batch(self.batch_size, timeout=0.2)
+            except Exception as e:
+                logger.warning("채점 큐 조회 오류: %s", e)
+                self._stop.wait(1.0)
+                continue
+            if not messages:
+                continue
+
+            db = SessionLocal()
+            try:
+                grade_pending(db, list({submission_id for _, submission_id, _ in messages}))
+            except Exception:
+                db.rollback()
+                logger.exception("채점 실패 - 다시 큐에 넣습니다")
+                self.queue.retry(messages)
+                self._stop.wait(1.0)
+                continue
+            finally:
+                db.close()
+
+            self.queue.ack([message_id for message_id, _, _ in messages])
+            finished = time.time()
+            record_grading(finished - enqueued_at for _, _, enqueued_at in messages)
+
+
+_pool: Optional[GradingWorkerPool] = None
+_pool_lock = threading.Lock()
+
+
+def _create_queue():
+    if settings.GRADING_QUEUE == "redis":
+        from app.utils.cache import get_redis
+
+        client = get_redis()
+        if client is not None:
+            return RedisGradingQueue(client, settings.GRADING_STREAM)
+        logger.warning("Redis 를 사용할 수 없어 프로세스 내 채점 큐를 사용합니다")
+    return LocalGradingQueue()
+
+
+def get_pool() -> GradingWorkerPool:
+    """채점 워커 풀 (처음 사용할 때 시작)"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                pool = GradingWorkerPool(_create_queue(), settings.GRADING_WORKERS, settings.GRADING_BATCH_SIZE)
+                pool.start()
+                _pool = pool
+    return _pool
+
+
+def enqueue(submission_id: int) -> None:
+    """채점 대기열에 제출 추가 (답안 커밋 이후에 호출)"""
+    get_pool().queue.put(submission_id)
+
+
+def recover_pending(db: Session) -> int:
+    """재시작 등으로 채점되지 않은 제출을 다시 큐에 넣음"""
+    submission_ids = [
+        row.id for row in db.query(Submission.id).filter(Submission.grading_status == PENDING).order_by(Submission.id)
+    ]
+    pool = get_pool()
+    for submission_id in submission_ids:
+        pool.queue.put(submission_id)
+    return len(submission_ids)
+
+
+def start_grading() -> None:
+    """lifespan 시작 시 워커 풀 시작 및 미채점 제출 복구"""
+    from app.db import SessionLocal
+
+    db = SessionLocal()
+    try:
+        count = recover_pending(db)
+        if count:
+            logger.info("채점 대기 중이던 제출 %d개를 다시 큐에 넣었습니다", count)
+    finally:
+        db.close()
+
+
+def stop_grading() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.stop()
+            _pool = None
+
+
+def get_grading_status(submission_id: int) -> Optional[Submission]:
+    """채점 상태 조회 (짧은 세션 사용 - 대기 중 반복 호출)"""
+    from app.db import SessionLocal
+
+    db = SessionLocal()
+    try:
+        return db.query(Submission).filter(Submission.id == submission_id).first()
+    finally:
+        db.close()
+
+
+async def wait_for_grading(submission_id: int, wait: float) -> Optional[Submission]:
+    """채점이 끝나거나 wait 초가 지날 때까지 대기 (롱 폴링, 다른 프로세스의 워커가 채점해도 동작)"""
+    from fastapi.concurrency import run_in_threadpool
+
+    submission = await run_in_threadpool(get_grading_status, submission_id)
+    deadline = time.monotonic() + wait
+    delay = 0.05
+    while submission is not None and submission.grading_status == PENDING:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        await asyncio.sleep(min(delay, remaining))
+        delay = min(delay * 2, 0.5)
+        submission = await run_in_threadpool(get_grading_status, submission_id)
+    return submission
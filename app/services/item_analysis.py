@@ -0,0 +1,275 @@
+# app/services/item_analysis.py
+# 문항 분석 - 문제별 정답률(p), 변별도(수정 점이연 상관), 선택지별 응답 수, 퀴즈 크론바흐 알파
+#
+# 채점이 끝난 제출(압축 저장, app.services.packed_answers)을 서버 측 커서로 청크씩 읽어
+# 청크마다 (제출 × 문제) 정답/출제 여부 행렬을 만들고, 통계에 필요한 합계만 누적합니다 (한 번 훑기, 청크 크기만큼의 메모리).
+# 제출마다 출제된 문제가 다를 수 있으므로 출제되지 않은 칸은 마스크로 빼고 계산합니다.
+#   - 정답률 p = 맞힌 수 / 출제 수
+#   - 변별도 = 문제 정답 여부와 나머지 문제 정답률의 상관 (해당 문제를 뺀 점수라 문제 수가 적어도 부풀지 않음)
+#   - 크론바흐 알파 = k/(k-1) (1 - Σ분산 / (Σ분산 + Σ공분산)), 공분산은 두 문제를 함께 받은 제출로 계산
+#     (모두 같은 문제를 받으면 일반적인 알파와 같음, 문제 수가 ITEM_ANALYSIS_MAX_ALPHA_ITEMS 보다 많으면 생략)
+# 결과는 퀴즈 버전(채점된 제출 수/마지막 ID, 문제 수)과 함께 캐시하고, 버전이 같으면 다시 계산하지 않습니다.
+#
+# 사용법 (압축되지 않은 예전 제출은 python -m app.services.packed_answers 로 먼저 압축):
+#   python -m app.services.item_analysis --quiz-id 1
+import argparse
+import json
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import Text, cast, func, select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.question import Question
+from app.models.submission import Submission
+from app.utils import optional
+from app.utils.cache import get_cache, item_analysis_key, set_cache
+
+np = None  # numpy (선택 의존성) - 임포트가 무거워 available() 에서 처음 쓸 때 불러옴
+
+
+def available() -> bool:
+    global np
+    if np is None:
+        np = optional.numpy()
+    return np is not None
+
+
+class ItemStatistics:
+    """제출 청크를 받아 문항 통계용 합계를 누적 (문제 ID 순 열)"""
+
+    def __init__(self, question_ids: List[int], option_counts: List[int], with_alpha: bool):
+        available()
+        self.question_ids = np.asarray(question_ids, dtype=np.int64)
+        self.option_counts = option_counts
+        size = len(question_ids)
+        self.buckets = max(option_counts, default=0) + 1  # 선택지별 + 무응답
+        self.submissions = 0
+        self.seen = np.zeros(size)
+        self.correct = np.zeros(size)
+        self.rest = np.zeros(size)  # 나머지 문제 정답률 합
+        self.rest_squared = np.zeros(size)
+        self.correct_rest = np.zeros(size)
+        self.choices = np.zeros(size * self.buckets, dtype=np.int64)
+        self.pair_correct = np.zeros((size, size)) if with_alpha else None  # Σ x_i x_j
+        self.pair_seen = np.zeros((size, size)) if with_alpha else None  # 함께 받은 제출 수
+        self.pair_marginal = np.zeros((size, size)) if with_alpha else None  # Σ x_i (j 도 받은 제출)
+        # 문제 ID → 열 번호 표 (ID 범위가 문제 수에 비해 너무 넓으면 이진 탐색)
+        self._offset = int(self.question_ids[0]) if size else 0
+        span = int(self.question_ids[-1]) - self._offset + 1 if size else 0
+        self._lookup = None
+        if span <= max(64 * size, 1 << 16):
+            self._lookup = np.full(span, -1, dtype=np.int64)
+            self._lookup[self.question_ids - self._offset] = np.arange(size)
+
+    def columns_of(self, ids: "np.ndarray") -> "np.ndarray":
+        """문제 ID 배열의 열 번호 (이 퀴즈 문제가 아니면 -1)"""
+        if self._lookup is not None:
+            position = ids - self._offset
+            inside = (position >= 0) & (position < len(self._lookup))
+            return np.where(inside, self._lookup[np.where(inside, position, 0)], -1)
+        columns = np.searchsorted(self.question_ids, ids)
+        found = columns < len(self.question_ids)
+        found[found] = self.question_ids[columns[found]] == ids[found]
+        return np.where(found, columns, -1)
+
+    def update(self, lengths: "np.ndarray", ids: "np.ndarray", packed: List[bytes], bitmaps: List[bytes]) -> None:
+        """제출 청크 반영 - lengths 는 제출별 출제 문제 수, ids 는 question_order 를 이어 붙인 문제 ID"""
+        rows = len(lengths)
+        if not rows:
+            return
+        total = int(lengths.sum())
+        options = np.frombuffer(b"".join(packed), dtype=np.uint8)
+        bits = np.unpackbits(np.frombuffer(b"".join(bitmaps), dtype=np.uint8), bitorder="little")
+
+        # 평탄화한 칸마다 (제출 행, 문제 열, 비트 위치)
+        row_index = np.repeat(np.arange(rows), lengths)
+        row_start = np.repeat(np.cumsum(lengths) - lengths, lengths)
+        bitmap_bits = (lengths + 7) // 8 * 8
+        bit_start = np.repeat(np.cumsum(bitmap_bits) - bitmap_bits, lengths)
+        flags = bits[bit_start + np.arange(total) - row_start].astype(bool)
+        columns = self.columns_of(ids)
+        known = columns >= 0
+        row_index, columns, flags, options = row_index[known], columns[known], flags[known], options[known]
+
+        seen = np.zeros((rows, len(self.question_ids)), dtype=np.float32)
+        correct = np.zeros_like(seen)
+        seen[row_index, columns] = 1.0
+        correct[row_index, columns] = flags
+
+        choice = np.minimum(options, self.buckets - 1)  # NULL_OPTION/NO_ANSWER 는 마지막 칸
+        self.choices += np.bincount(columns * self.buckets + choice, minlength=len(self.choices))
+
+        # 나머지 문제 정답률 (자기 문제를 뺀 점수) - 출제된 칸만
+        answered = correct.sum(axis=1, keepdims=True)
+        served = np.maximum(seen.sum(axis=1, keepdims=True) - 1.0, 1.0)
+        rest = (answered - correct) / served * seen
+
+        self.submissions += rows
+        self.seen += seen.sum(axis=0)
+        self.correct += correct.sum(axis=0)
+        self.rest += rest.sum(axis=0)
+        self.rest_squared += (rest * rest).sum(axis=0)
+        self.correct_rest += (correct * rest).sum(axis=0)
+        if self.pair_correct is not None:
+            self.pair_correct += correct.T @ correct
+            self.pair_seen += seen.T @ seen
+            self.pair_marginal += correct.T @ seen
+
+    def alpha(self) -> Optional[float]:
+        if self.pair_correct is None:
+            return None
+        used = np.diag(self.pair_seen) > 1
+        k = int(used.sum())
+        if k < 2:
+            return None
+        seen = self.pair_seen[np.ix_(used, used)]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean_i = self.pair_marginal[np.ix_(used, used)] / seen  # j 도 받은 제출에서 i 의 정답률
+            covariance = self.pair_correct[np.ix_(used, used)] / seen - mean_i * mean_i.T
+        covariance = np.where(seen > 1, covariance, 0.0)
+        variances = np.diag(covariance).sum()
+        total = covariance.sum()
+        if total <= 0:
+            return None
+        return float(k / (k - 1) * (1.0 - variances / total))
+
+    def report(self) -> List[Dict[str, Any]]:
+        items = []
+        choices = self.choices.reshape(len(self.question_ids), self.buckets)
+        for i, question_id in enumerate(self.question_ids.tolist()):
+            n = self.seen[i]
+            p_value = discrimination = None
+            if n > 0:
+                p_value = self.correct[i] / n
+                mean_rest = self.rest[i] / n
+                covariance = self.correct_rest[i] / n - p_value * mean_rest
+                variance = p_value * (1.0 - p_value) * (self.rest_squared[i] / n - mean_rest * mean_rest)
+                if n > 1 and variance > 1e-12:
+                    discrimination = float(covariance / np.sqrt(variance))
+                p_value = float(p_value)
+            items.append({
+                "question_id": question_id,
+                "seen": int(n),
+                "p_value": p_value,
+                "discrimination": discrimination,
+                "options": choices[i, :self.option_counts[i]].tolist(),
+                "no_answer": int(choices[i, self.option_counts[i]:].sum()),
+            })
+        return items
+
+
+def parse_orders(texts: List[str]) -> Tuple["np.ndarray", "np.ndarray"]:
+    """JSON 문자열 question_order 목록 → (제출별 문제 수, 이어 붙인 문제 ID) - 행마다 json.loads 하지 않고 한 번에 파싱"""
+    available()
+    bodies = [text.strip()[1:-1].strip() for text in texts]
+    lengths = np.fromiter((body.count(",") + 1 if body else 0 for body in bodies), dtype=np.int64, count=len(bodies))
+    joined = ",".join(body for body in bodies if body)
+    ids = np.fromstring(joined, dtype=np.int64, sep=",") if joined else np.zeros(0, dtype=np.int64)
+    return lengths, ids
+
+
+def quiz_version(db: Session, quiz_id: int) -> str:
+    """채점된 제출/문제가 바뀌면 달라지는 값 (캐시 무효화 기준)"""
+    count, last_id = db.query(func.count(Submission.id), func.max(Submission.id)).filter(
+        Submission.quiz_id == quiz_id,
+        Submission.correct_bitmap.isnot(None)
+    ).one()
+    questions = db.query(func.count(Question.id)).filter(Question.quiz_id == quiz_id).scalar()
+    return f"{count}:{last_id or 0}:{questions}"
+
+
+def compute(db: Session, quiz_id: int) -> Dict[str, Any]:
+    """채점된 제출을 청크로 훑어 문항 통계 계산"""
+    started = time.perf_counter()
+    questions = db.query(Question.id, Question.options).filter(Question.quiz_id == quiz_id).order_by(Question.id).all()
+    question_ids = [row.id for row in questions]
+    stats = ItemStatistics(
+        question_ids,
+        [len(row.options or ()) for row in questions],
+        with_alpha=0 < len(question_ids) <= settings.ITEM_ANALYSIS_MAX_ALPHA_ITEMS
+    )
+
+    chunk = max(100, settings.ITEM_ANALYSIS_CHUNK_CELLS // max(len(question_ids), 1))
+    # question_order 는 JSON 을 풀지 않고 문자열로 받아 청크 단위로 파싱
+    result = db.execute(
+        select(cast(Submission.question_order, Text), Submission.packed_options, Submission.correct_bitmap).where(
+            Submission.quiz_id == quiz_id,
+            Submission.correct_bitmap.isnot(None),
+            Submission.packed_options.isnot(None)
+        ).execution_options(yield_per=chunk)
+    )
+    for partition in result.partitions():
+        texts, packed, bitmaps = [], [], []
+        for order, options, bitmap in partition:
+            if order:
+                texts.append(order)
+                packed.append(options)
+                bitmaps.append(bitmap)
+        lengths, ids = parse_orders(texts)
+        # 형식이 맞지 않는 행(다른 경로로 수정된 제출)은 건너뜀
+        valid = (np.fromiter(map(len, packed), dtype=np.int64, count=len(packed)) == lengths) & (
+            np.fromiter(map(len, bitmaps), dtype=np.int64, count=len(bitmaps)) == (lengths + 7) // 8
+        )
+        if not valid.all():
+            keep = np.repeat(valid, lengths)
+            packed = [value for value, ok in zip(packed, valid) if ok]
+            bitmaps = [value for value, ok in zip(bitmaps, valid) if ok]
+            lengths, ids = lengths[valid], ids[keep]
+        stats.update(lengths, ids, packed, bitmaps)
+
+    return {
+        "quiz_id": quiz_id,
+        "submissions": stats.submissions,
+        "alpha": stats.alpha(),
+        "items": stats.report(),
+        "seconds": time.perf_counter() - started,
+    }
+
+
+_reports: Dict[int, Dict[str, Any]] = {}
+_lock = threading.Lock()
+
+
+def analyze(db: Session, quiz_id: int, use_cache: bool = True) -> Dict[str, Any]:
+    """퀴즈 문항 분석 - 퀴즈 버전이 같으면 캐시된 결과 (프로세스 내 → Redis 순)"""
+    version = quiz_version(db, quiz_id)
+    if use_cache:
+        with _lock:
+            cached = _reports.get(quiz_id)
+        if cached is None or cached["version"] != version:
+            cached = get_cache(item_analysis_key(quiz_id))
+        if cached is not None and cached.get("version") == version:
+            with _lock:
+                _reports[quiz_id] = cached
+            return cached["report"]
+    cached = {"version": version, "report": compute(db, quiz_id)}
+    with _lock:
+        _reports[quiz_id] = cached
+    set_cache(item_analysis_key(quiz_id), cached, settings.ITEM_ANALYSIS_CACHE_TTL)
+    return cached["report"]
+
+
+def main():
+    import app.models.user, app.models.quiz  # noqa: F401 (관계 대상 모델 등록)
+    from app.db import SessionLocal
+
+    parser = argparse.ArgumentParser(description="퀴즈 문항 분석 (정답률, 변별도, 선택지별 응답 수, 크론바흐 알파)")
+    parser.add_argument("--quiz-id", type=int, required=True)
+    parser.add_argument("--no-cache", action="store_true", help="캐시를 무시하고 다시 계산")
+    args = parser.parse_args()
+    if not available():
+        parser.error("numpy 가 필요합니다 (pip install \"lsk-quiz[analysis]\")")
+
+    db = SessionLocal()
+    try:
+        report = analyze(db, args.quiz_id, use_cache=not args.no_cache)
+    finally:
+        db.close()
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,296 @@
+# app/services/leaderboard.py
+# 퀴즈별 리더보드 - 사용자별 최고 점수 기준 상위 N명, 순위, 백분위
+#
+# 저장소
+#   redis : 퀴즈마다 정렬 집합(ZSET) 하나, 멤버 = 사용자 ID, 점수 = 최고 점수 (ZADD GT 로 더 높을 때만 갱신)
+#   local : 프로세스 내 펜윅 트리(점수 구간별 인원 수) - Redis 를 쓸 수 없을 때의 대역 (프로세스마다 따로 유지)
+#           재시작 직후에는 비어 있으므로 퀴즈마다 처음 조회할 때 완료된 제출로 한 번 채웁니다
+# 어느 쪽이든 순위/백분위 조회는 O(log n) 이고, 채점이 끝날 때마다 갱신합니다.
+# 순위는 공동 순위(더 높은 점수의 인원 수 + 1), 백분위는 자신보다 낮은 최고 점수를 가진 참가자 비율(%)입니다.
+#
+# 기존 제출로 다시 채우기 (사용자별 최고 점수를 배치로 집계해 병합, --reset 이면 비우고 다시 채움):
+#   python -m app.services.leaderboard --quiz-id 1 --reset
+import argparse
+import logging
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import distinct, func
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.submission import Submission
+from app.utils.cache import leaderboard_key
+
+logger = logging.getLogger(__name__)
+
+# (퀴즈 ID, 사용자 ID, 점수)
+Result = Tuple[int, int, float]
+# 로컬 리더보드 점수 해상도 (0.01점 단위 구간)
+SCORE_SCALE = 100
+MAX_SCORE = 100
+
+
+def _rank_info(score: float, higher: int, lower: int, total: int) -> Dict[str, float]:
+    return {
+        "score": score,
+        "rank": higher + 1,
+        "total": total,
+        "percentile": lower / total * 100 if total else 0.0,
+    }
+
+
+def _with_ranks(entries: List[Tuple[int, float]]) -> List[Dict[str, float]]:
+    """점수 내림차순 목록에 공동 순위 부여"""
+    ranked = []
+    for i, (user_id, score) in enumerate(entries):
+        rank = ranked[-1]["rank"] if ranked and ranked[-1]["score"] == score else i + 1
+        ranked.append({"rank": rank, "user_id": user_id, "score": score})
+    return ranked
+
+
+class _FenwickBoard:
+    """퀴즈 하나의 로컬 리더보드 - 점수 구간별 인원 수를 펜윅 트리로 유지"""
+
+    def __init__(self):
+        self.size = MAX_SCORE * SCORE_SCALE + 1
+        self.tree = [0] * (self.size + 1)
+        self.best: Dict[int, float] = {}
+        self.members: Dict[int, Set[int]] = {}  # 구간 → 사용자 (상위 N명 조회용)
+
+    def _bucket(self, score: float) -> int:
+        return min(max(int(round(score * SCORE_SCALE)), 0), self.size - 1)
+
+    def _add(self, bucket: int, delta: int) -> None:
+        i = bucket + 1
+        while i <= self.size:
+            self.tree[i] += delta
+            i += i & -i
+
+    def _count_below(self, bucket: int) -> int:
+        """bucket 미만 구간의 인원 수"""
+        total, i = 0, bucket
+        while i > 0:
+            total += self.tree[i]
+            i -= i & -i
+        return total
+
+    def record(self, user_id: int, score: float) -> None:
+        previous = self.best.get(user_id)
+        if previous is not None:
+            if score <= previous:
+                return
+            bucket = self._bucket(previous)
+            self._add(bucket, -1)
+            self.members[bucket].discard(user_id)
+        bucket = self._bucket(score)
+        self._add(bucket, 1)
+        self.members.setdefault(bucket, set()).add(user_id)
+        self.best[user_id] = score
+
+    def rank(self, user_id: int) -> Optional[Dict[str, float]]:
+        score = self.best.get(user_id)
+        if score is None:
+            return None
+        bucket = self._bucket(score)
+        total = len(self.best)
+        lower = self._count_below(bucket)
+        higher = total - self._count_below(bucket + 1)
+        return _rank_info(score, higher, lower, total)
+
+    def top(self, limit: int) -> List[Tuple[int, float]]:
+        entries = []
+        for bucket in sorted((b for b, users in self.members.items() if users), reverse=True):
+            entries.extend(sorted(
+                ((user_id, self.best[user_id]) for user_id in self.members[bucket]),
+                key=lambda entry: (-entry[1], entry[0])
+            ))
+            if len(entries) >= limit:
+                break
+        return entries[:limit]
+
+
+class LocalLeaderboard:
+    """프로세스 내 리더보드 (Redis 없이 동작)
+
+    loader 가 있으면 퀴즈마다 처음 조회할 때 loader(quiz_id) 로 완료된 제출을 채웁니다.
+    채우기는 최고 점수 병합이므로 그 사이 채점 결과가 먼저 반영돼도 잃지 않습니다.
+    """
+
+    def __init__(self, loader: Optional[Callable[[int], object]] = None):
+        self._boards: Dict[int, _FenwickBoard] = {}
+        self._lock = threading.Lock()
+        self._loader = loader
+        self._loaded: Set[int] = set()
+        self._load_lock = threading.Lock()
+
+    def _ensure_loaded(self, quiz_id: int) -> None:
+        if self._loader is None or quiz_id in self._loaded:
+            return
+        with self._load_lock:
+            if quiz_id in self._loaded:
+                return
+            # 실패하면 표시하지 않고 다음 조회에서 다시 시도
+            self._loader(quiz_id)
+            self._loaded.add(quiz_id)
+
+    def record_many(self, results: Iterable[Result]) -> None:
+        with self._lock:
+            for quiz_id, user_id, score in results:
+                self._boards.setdefault(quiz_id, _FenwickBoard()).record(user_id, score)
+
+    def top(self, quiz_id: int, limit: int) -> List[Dict[str, float]]:
+        self._ensure_loaded(quiz_id)
+        with self._lock:
+            board = self._boards.get(quiz_id)
+            return _with_ranks(board.top(limit)) if board else []
+
+    def rank(self, quiz_id: int, user_id: int) -> Optional[Dict[str, float]]:
+        self._ensure_loaded(quiz_id)
+        with self._lock:
+            board = self._boards.get(quiz_id)
+            return board.rank(user_id) if board else None
+
+    def reset(self, quiz_id: int) -> None:
+        with self._lock:
+            self._boards.pop(quiz_id, None)
+
+
+class RedisLeaderboard:
+    """Redis 정렬 집합 리더보드 - 여러 워커 프로세스가 같은 순위를 봄"""
+
+    def __init__(self, client):
+        self.client = client
+
+    def record_many(self, results: Iterable[Result]) -> None:
+        pipe = self.client.pipeline(transaction=False)
+        for quiz_id, user_id, score in results:
+            # GT: 기존 점수보다 높을 때만 갱신 (최고 점수 유지)
+            pipe.zadd(leaderboard_key(quiz_id), {str(user_id): score}, gt=True)
+        pipe.execute()
+
+    def top(self, quiz_id: int, limit: int) -> List[Dict[str, float]]:
+        entries = self.client.zrevrange(leaderboard_key(quiz_id), 0, limit - 1, withscores=True)
+        return _with_ranks([(int(user_id), score) for user_id, score in entries])
+
+    def rank(self, quiz_id: int, user_id: int) -> Optional[Dict[str, float]]:
+        key = leaderboard_key(quiz_id)
+        score = self.client.zscore(key, str(user_id))
+        if score is None:
+            return None
+        pipe = self.client.pipeline(transaction=False)
+        pipe.zcard(key)
+        pipe.zcount(key, f"({score}", "+inf")
+        pipe.zcount(key, "-inf", f"({score}")
+        total, higher, lower = pipe.execute()
+        return _rank_info(score, higher, lower, total)
+
+    def reset(self, quiz_id: int) -> None:
+        self.client.delete(leaderboard_key(quiz_id))
+
+
+_board = None
+_board_lock = threading.Lock()
+
+
+def get_leaderboard():
+    """리더보드 저장소 (처음 사용할 때 결정 - Redis 를 쓸 수 없으면 로컬)"""
+    global _board
+    if _board is None:
+        with _board_lock:
+            if _board is None:
+                board = None
+                if settings.LEADERBOARD_BACKEND == "redis":
+                    from app.utils.cache import get_redis
+
+                    client = get_redis()
+                    if client is not None:
+                        board = RedisLeaderboard(client)
+                    else:
+                        logger.warning("Redis 를 사용할 수 없어 프로세스 내 리더보드를 사용합니다")
+                _board = board or LocalLeaderboard(loader=run_rebuild)
+    return _board
+
+
+def record_results(results: Iterable[Result]) -> None:
+    """채점 결과 반영 (커밋 이후 호출, 실패해도 제출은 유지 - 재구성 작업으로 복구)"""
+    results = [(quiz_id, user_id, score) for quiz_id, user_id, score in results if score is not None]
+    if not results:
+        return
+    try:
+        get_leaderboard().record_many(results)
+    except Exception as e:
+        logger.warning("리더보드 갱신 오류: %s", e)
+
+
+def record_result(quiz_id: int, user_id: int, score: Optional[float]) -> None:
+    record_results([(quiz_id, user_id, score)])
+
+
+def reset_quiz(quiz_id: int) -> None:
+    """퀴즈 삭제 시 리더보드 삭제"""
+    try:
+        get_leaderboard().reset(quiz_id)
+    except Exception as e:
+        logger.warning("리더보드 삭제 오류: %s", e)
+
+
+def rebuild(db: Session, quiz_id: Optional[int] = None, batch_size: Optional[int] = None, reset: bool = False) -> int:
+    """완료된 제출로 리더보드 채우기 - 퀴즈별로 사용자 ID 키셋 배치마다 최고 점수를 집계해 병합
+
+    병합(최고 점수만 반영)이므로 요청 경로의 갱신과 동시에 실행해도 됩니다. 반영한 사용자 수 반환.
+    """
+    batch_size = batch_size or settings.LEADERBOARD_REBUILD_BATCH
+    board = get_leaderboard()
+    if quiz_id is not None:
+        quiz_ids = [quiz_id]
+    else:
+        quiz_ids = [row[0] for row in db.query(distinct(Submission.quiz_id)).order_by(Submission.quiz_id)]
+
+    total = 0
+    for current_quiz_id in quiz_ids:
+        if reset:
+            board.reset(current_quiz_id)
+        last_user_id = 0
+        while True:
+            rows = db.query(Submission.user_id, func.max(Submission.score)).filter(
+                Submission.quiz_id == current_quiz_id,
+                Submission.is_completed == True,
+                Submission.score.isnot(None),
+                Submission.user_id > last_user_id
+            ).group_by(Submission.user_id).order_by(Submission.user_id).limit(batch_size).all()
+            if not rows:
+                break
+            board.record_many((current_quiz_id, user_id, score) for user_id, score in rows)
+            total += len(rows)
+            last_user_id = rows[-1][0]
+            # 배치 사이에 스냅샷/잠금을 오래 잡지 않도록 트랜잭션 종료
+            db.commit()
+    return total
+
+
+def run_rebuild(quiz_id: Optional[int] = None, reset: bool = False) -> int:
+    """백그라운드 작업/CLI 용 (세션 직접 관리)"""
+    from app.db import SessionLocal
+
+    db = SessionLocal()
+    try:
+        return rebuild(db, quiz_id, reset=reset)
+    finally:
+        db.close()
+
+
+def main():
+    import app.models.user, app.models.quiz, app.models.question  # noqa: F401 (관계 대상 모델 등록)
+
+    parser = argparse.ArgumentParser(description="완료된 제출로 리더보드 다시 채우기")
+    parser.add_argument("--quiz-id", type=int, help="대상 퀴즈 (생략 시 전체)")
+    parser.add_argument("--reset", action="store_true", help="기존 리더보드를 비우고 다시 채움")
+    args = parser.parse_args()
+
+    count = run_rebuild(args.quiz_id, reset=args.reset)
+    print(f"리더보드에 반영한 사용자 수: {count} ({type(get_leaderboard()).__name__})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+# app/services/packed_answers.py
+# 완료된 제출의 답안 압축 저장
+#
+# 진행 중인 응시는 답안을 submission_answers 행으로 저장하고(중간 저장/WebSocket 이 행 단위로 갱신),
+# 제출하면 행 대신 Submission 에 두 컬럼으로 압축해 저장합니다.
+#   packed_options : question_order 순서로 문제당 1바이트 - 선택지 번호, 0xFE 선택 없이 제출, 0xFF 답안 없음
+#   correct_bitmap : question_order 순서 정답 여부 비트맵 (i 번째 문제 = i // 8 바이트의 i % 8 비트, 채점 후)
+# 문제 30개 제출이면 답안 행 30개(행마다 ID, 시각 2개, JSON, 인덱스 항목) 대신 34바이트입니다.
+# options_order 는 저장하는 곳이 없어 항상 NULL 이므로 압축 형식에는 두지 않습니다.
+#
+# 압축 전에 완료된 제출을 배치로 압축 (채점된 제출만, 압축 후 해당 답안 행 삭제):
+#   python -m app.services.packed_answers --batch-size 500
+import argparse
+import logging
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.models.submission import Submission, SubmissionAnswer
+from app.utils.cache import invalidate_index, submission_etag_key
+
+logger = logging.getLogger(__name__)
+
+NULL_OPTION = 0xFE  # 답안은 있으나 선택지 없음 (selected_option NULL)
+NO_ANSWER = 0xFF  # 답안 없음
+
+
+def pack_options(question_order: List[int], selected: Dict[int, Optional[int]]) -> bytes:
+    """문제 ID → 선택지 번호를 question_order 순서 바이트 배열로 (출제되지 않은 문제의 답안은 버림)"""
+    packed = bytearray(NO_ANSWER for _ in question_order)
+    for i, question_id in enumerate(question_order):
+        if question_id in selected:
+            option = selected[question_id]
+            if option is None:
+                packed[i] = NULL_OPTION
+            elif 0 <= option < NULL_OPTION:
+                packed[i] = option
+            # 범위 밖 선택지는 있을 수 없는 답안이므로 미응답으로 저장
+    return bytes(packed)
+
+
+def unpack_options(question_order: List[int], packed: bytes) -> Dict[int, Optional[int]]:
+    """pack_options 의 역 - 답안이 있는 문제만"""
+    return {
+        question_id: None if value == NULL_OPTION else value
+        for question_id, value in zip(question_order, packed)
+        if value != NO_ANSWER
+    }
+
+
+def pack_correct(flags: Iterable[bool]) -> bytes:
+    bitmap = bytearray()
+    for i, flag in enumerate(flags):
+        if i % 8 == 0:
+            bitmap.append(0)
+        if flag:
+            bitmap[-1] |= 1 << (i % 8)
+    return bytes(bitmap)
+
+
+def is_correct_at(bitmap: bytes, index: int) -> bool:
+    return bool(bitmap[index // 8] >> (index % 8) & 1)
+
+
+def grade_packed(question_order: List[int], packed: bytes, correct_answers: Dict[int, int]) -> Tuple[bytes, int]:
+    """압축된 답안 채점 - (정답 비트맵, 맞힌 수)"""
+    flags = [
+        value < NULL_OPTION and correct_answers.get(question_id) == value
+        for question_id, value in zip(question_order, packed)
+    ]
+    return pack_correct(flags), sum(flags)
+
+
+def pack_submission(submission: Submission, selected: Dict[int, Optional[int]], correct_answers: Dict[int, int]) -> int:
+    """제출 시 답안을 압축해 채점 결과와 함께 Submission 에 기록, 맞힌 수 반환"""
+    question_order = submission.question_order or []
+    submission.packed_options = pack_options(question_order, selected)
+    submission.correct_bitmap, correct_count = grade_packed(question_order, submission.packed_options, correct_answers)
+    return correct_count
+
+
+def expand(submission: Submission) -> List[Dict[str, Any]]:
+    """압축된 답안을 SubmissionAnswer 스키마 형태로 (행 ID 없음, 작성 시각은 제출 시각)"""
+    question_order = submission.question_order or []
+    bitmap = submission.correct_bitmap
+    answers = []
+    for i, (question_id, value) in enumerate(zip(question_order, submission.packed_options)):
+        if value == NO_ANSWER:
+            continue
+        answers.append({
+            "id": None,
+            "submission_id": submission.id,
+            "question_id": question_id,
+            "selected_option": None if value == NULL_OPTION else value,
+            "is_correct": is_correct_at(bitmap, i) if bitmap is not None else None,
+            "options_order": None,
+            "created_at": submission.submit_time,
+            "updated_at": None,
+        })
+    return answers
+
+
+def load_answers(db: Session, submission: Submission) -> List[Any]:
+    """제출의 답안 목록 - 압축 여부와 관계없이 같은 형태 (압축되지 않았으면 행 조회 한 번)"""
+    if submission.packed_options is not None:
+        return expand(submission)
+    return db.query(SubmissionAnswer).filter(SubmissionAnswer.submission_id == submission.id).all()
+
+
+def compact(db: Session, batch_size: int = 500, limit: Optional[int] = None) -> int:
+    """압축 전에 채점이 끝난 제출을 배치로 압축하고 답안 행 삭제 (제출 ID 키셋, 배치마다 커밋). 압축한 수 반환.
+
+    저장된 is_correct 를 그대로 옮기므로 이후 정답이 바뀐 문제도 당시 채점 결과가 유지됩니다.
+    """
+    total, last_id = 0, 0
+    while limit is None or total < limit:
+        size = batch_size if limit is None else min(batch_size, limit - total)
+        batch = db.query(Submission.id, Submission.question_order).filter(
+            Submission.id > last_id,
+            Submission.is_completed == True,
+            Submission.score.isnot(None),
+            Submission.packed_options.is_(None)
+        ).order_by(Submission.id).limit(size).all()
+        if not batch:
+            break
+        ids = [row.id for row in batch]
+
+        answers = defaultdict(dict)
+        correct = defaultdict(set)
+        for submission_id, question_id, selected_option, is_correct in db.query(
+            SubmissionAnswer.submission_id,
+            SubmissionAnswer.question_id,
+            SubmissionAnswer.selected_option,
+            SubmissionAnswer.is_correct
+        ).filter(SubmissionAnswer.submission_id.in_(ids)).order_by(SubmissionAnswer.id):
+            answers[submission_id][question_id] = selected_option
+            if is_correct:
+                correct[submission_id].add(question_id)
+            else:
+                correct[submission_id].discard(question_id)
+
+        db.execute(update(Submission), [
+            {
+                "id": row.id,
+                "packed_options": pack_options(row.question_order or [], answers[row.id]),
+                "correct_bitmap": pack_correct(question_id in correct[row.id] for question_id in row.question_order or []),
+            }
+            for row in batch
+        ])
+        db.query(SubmissionAnswer).filter(SubmissionAnswer.submission_id.in_(ids)).delete(synchronize_session=False)
+        db.commit()
+        # 색인된 ETag 는 행 형식 본문 기준이므로 삭제 (다음 조회에서 다시 색인)
+        for submission_id in ids:
+            invalidate_index(submission_etag_key(submission_id))
+
+        total += len(batch)
+        last_id = ids[-1]
+        logger.info("제출 %d개 답안 압축 (마지막 ID %d)", total, last_id)
+    return total
+
+
+def main():
+    import app.models.user, app.models.quiz, app.models.question  # noqa: F401 (관계 대상 모델 등록)
+    from app.db import SessionLocal
+
+    parser = argparse.ArgumentParser(description="완료된 제출의 답안을 압축 형식으로 옮기기")
+    parser.add_argument("--batch-size", type=int, default=500, help="한 트랜잭션에서 압축할 제출 수")
+    parser.add_argument("--limit", type=int, help="이번 실행에서 압축할 최대 제출 수")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        count = compact(db, args.batch_size, args.limit)
+    finally:
+        db.close()
+    print(f"답안을 압축한 제출 수: {count}")
+
+
+if __name__ == "__main__":
+    main()
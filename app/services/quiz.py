@@ -1,14 +1,135 @@
 # app/services/quiz.py
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 import random
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, load_only, noload, selectinload
 from fastapi import HTTPException, status
 
 from app.models.quiz import Quiz
 from app.models.question import Question
 from app.models.submission import Submission, SubmissionAnswer
 from app.models.user import User
-from app.schemas.quiz import QuizCreate, QuestionCreate, QuizUpdate
+from app.schemas.quiz import QuizCreate, QuestionCreate, QuizUpdate, Question as QuestionSchema, Quiz as QuizSchema
+from app.services.exam import check_exam_window, create_submission, get_in_progress_submission
+from app.services.quiz_cache import load_questions
+
+
+def build_page(db: Session, quiz: Any, question_order: List[int], page: int) -> Tuple[int, int, List[QuestionSchema]]:
+    """응시 페이지 구성 - (보정된 페이지 번호, 전체 페이지 수, 문제 목록) 반환 (/take 와 WebSocket 공용)"""
+    questions_per_page = quiz.questions_count // 3 if quiz.questions_count >= 3 else quiz.questions_count
+    total_pages = (len(question_order) + questions_per_page - 1) // questions_per_page
+
+    if page > total_pages:
+        page = total_pages
+
+    start_idx = (page - 1) * questions_per_page
+    end_idx = min(start_idx + questions_per_page, len(question_order))
+
+    # 현재 페이지에 해당하는 문제 ID 추출
+    current_question_ids = question_order[start_idx:end_idx]
+
+    # 해당 문제들을 한 번에 조회 (스냅샷이 있으면 DB 조회 없이 스냅샷에서 읽음)
+    question_map = load_questions(db, current_question_ids)
+
+    questions = []
+    for q_id in current_question_ids:
+        question = question_map.get(q_id)
+        if question:
+            # 선택지 순서 랜덤화 처리
+            question_data = QuestionSchema.from_orm(question)
+            if quiz.randomize_options:
+                # 원래 정답 인덱스 기억
+                correct_option = question.options[question.correct_answer]
+                # 선택지 섞기
+                options = question.options.copy()
+                random.shuffle(options)
+                # 새로운 정답 인덱스 찾기
+                new_correct_idx = options.index(correct_option)
+                question_data.options = options
+                question_data.correct_answer = new_correct_idx
+            questions.append(question_data)
+
+    return page, total_pages, questions
+
+# 퀴즈 상세에서 고를 수 있는 필드 (응답 스키마 순서)
+QUIZ_FIELDS: Tuple[str, ...] = tuple(QuizSchema.model_fields)
+QUESTION_FIELDS: Tuple[str, ...] = tuple(QuestionSchema.model_fields)
+INCLUDES = ("questions",)
+
+
+def parse_fieldset(fields: Optional[str], include: Optional[str]) -> Tuple[Tuple[str, ...], Optional[Tuple[str, ...]]]:
+    """fields/include 쿼리 파라미터 해석 - (퀴즈 필드, 문제 필드 또는 None(문제 제외)) 반환
+
+    fields 는 쉼표로 구분하며 문제 필드는 "questions." 접두어를 붙입니다 (예: title,questions.id,questions.content).
+    퀴즈 필드를 하나도 고르지 않으면 퀴즈 필드는 모두, 문제 필드를 고르지 않으면 문제 필드는 모두 반환합니다.
+    include 를 생략하면 questions 를 포함하고, 빈 값(include=)이면 문제를 불러오지 않습니다.
+    """
+    includes = {name.strip() for name in (include if include is not None else "questions").split(",") if name.strip()}
+    unknown = includes.difference(INCLUDES)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"포함할 수 없는 관계입니다: {', '.join(sorted(unknown))}"
+        )
+
+    quiz_fields, question_fields = set(), set()
+    for name in (fields or "").split(","):
+        name = name.strip()
+        if not name:
+            continue
+        prefix, _, field = name.rpartition(".")
+        if prefix == "" and name in QUIZ_FIELDS:
+            quiz_fields.add(name)
+        elif prefix == "questions" and field in QUESTION_FIELDS:
+            if "questions" not in includes:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="문제 필드를 고르려면 include 에 questions 가 있어야 합니다"
+                )
+            question_fields.add(field)
+        else:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"알 수 없는 필드입니다: {name}"
+            )
+
+    quiz_fields = tuple(f for f in QUIZ_FIELDS if f in quiz_fields) or QUIZ_FIELDS
+    if "questions" not in includes:
+        return quiz_fields, None
+    return quiz_fields, tuple(f for f in QUESTION_FIELDS if f in question_fields) or QUESTION_FIELDS
+
+
+def load_quiz_detail(
+        db: Session,
+        quiz_id: int,
+        quiz_fields: Tuple[str, ...] = QUIZ_FIELDS,
+        with_questions: bool = True
+) -> Optional[Quiz]:
+    """활성 퀴즈 조회 - 요청한 컬럼만 SELECT, 문제는 selectinload(한 번에) 또는 noload(불러오지 않음)"""
+    return db.query(Quiz).options(
+        load_only(*[getattr(Quiz, name) for name in quiz_fields]),
+        selectinload(Quiz.questions) if with_questions else noload(Quiz.questions)
+    ).filter(Quiz.id == quiz_id, Quiz.is_active == True).first()
+
+
+def load_question_columns(db: Session, quiz_id: int, question_fields: Tuple[str, ...]) -> List[Dict[str, Any]]:
+    """퀴즈 문제의 고른 컬럼만 조회 (ORM 객체를 만들지 않고 행을 바로 dict 로)"""
+    rows = db.query(*[getattr(Question, name) for name in question_fields]).filter(
+        Question.quiz_id == quiz_id
+    ).order_by(Question.id)
+    return [dict(zip(question_fields, row)) for row in rows]
+
+
+def quiz_detail_dict(
+        db: Session,
+        quiz: Quiz,
+        quiz_fields: Tuple[str, ...],
+        question_fields: Optional[Tuple[str, ...]]
+) -> Dict[str, Any]:
+    """고른 필드만 담은 퀴즈 상세 (불러오지 않은 컬럼에는 접근하지 않음)"""
+    data = {name: getattr(quiz, name) for name in quiz_fields}
+    if question_fields is not None:
+        data["questions"] = load_question_columns(db, quiz.id, question_fields)
+    return data
 
 class QuizService:
     @staticmethod
@@ -20,6 +141,8 @@ class QuizService:
             questions_count=quiz_in.questions_count,
             randomize_questions=quiz_in.randomize_questions,
             randomize_options=quiz_in.randomize_options,
+            starts_at=quiz_in.starts_at,
+            ends_at=quiz_in.ends_at,
             created_by=user_id
         )
         db.add(quiz)
@@ -105,12 +228,8 @@ class QuizService:
     @staticmethod
     def get_or_create_submission(db: Session, quiz_id: int, user_id: int) -> Submission:
         """응시 정보 조회 또는 생성"""
-        # 진행 중인 응시 기록 조회
-        submission = db.query(Submission).filter(
-            Submission.quiz_id == quiz_id,
-            Submission.user_id == user_id,
-            Submission.is_completed == False
-        ).first()
+        # 진행 중인 응시 기록 조회 (예정된 시험은 미리 생성되어 있음)
+        submission = get_in_progress_submission(db, quiz_id, user_id)
 
         # 진행 중인 응시가 없으면 새로 생성
         if not submission:
@@ -120,30 +239,10 @@ class QuizService:
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail="퀴즈를 찾을 수 없습니다"
                 )
+            check_exam_window(quiz)
 
-            # 전체 문제 가져오기
-            all_questions = db.query(Question).filter(
-                Question.quiz_id == quiz_id,
-                Question.is_active == True
-            ).all()
-
-            # 랜덤 문제 선택
-            if quiz.randomize_questions and len(all_questions) > quiz.questions_count:
-                selected_questions = random.sample(all_questions, quiz.questions_count)
-                question_ids = [q.id for q in selected_questions]
-            else:
-                question_ids = [q.id for q in all_questions[:quiz.questions_count]]
-
-            # 새 응시 기록 생성
-            submission = Submission(
-                quiz_id=quiz_id,
-                user_id=user_id,
-                question_order=question_ids,
-                is_completed=False
-            )
-            db.add(submission)
-            db.commit()
-            db.refresh(submission)
+            # 새 응시 기록 생성 (문제 ID 는 캐시/블루프린트 색인에서, 동시 요청이 먼저 만들었으면 그 기록 사용)
+            submission = create_submission(db, quiz, user_id)
 
         return submission
 
@@ -178,9 +277,11 @@ class QuizService:
             ).all()
         }
 
-        # 해당 문제들 조회
+        # 해당 문제들을 한 번에 조회 (스냅샷 우선)
+        question_map = load_questions(db, current_question_ids)
+
         for q_id in current_question_ids:
-            question = db.query(Question).filter(Question.id == q_id).first()
+            question = question_map.get(q_id)
             if not question:
                 continue
 
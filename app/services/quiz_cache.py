@@ -0,0 +1,106 @@
+# app/services/quiz_cache.py
+# 퀴즈/문제 조회용 캐시 계층 (cache-aside)
+#
+# 조회 순서: 문제 스냅샷(mmap) → Redis → DB. DB 에서 읽은 값은 Redis 에 채워 둡니다.
+# 캐시 값은 응답 스키마의 JSON 형태로 저장하고, 꺼낼 때 스키마 객체로 되돌려 ORM 객체처럼 속성으로 접근합니다.
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.question import Question
+from app.models.quiz import Quiz
+from app.schemas.quiz import Quiz as QuizSchema, Question as QuestionSchema
+from app.services.snapshot import get_snapshot
+from app.utils.cache import (
+    active_quizzes_key,
+    delete_cache,
+    get_cache,
+    get_many_cache,
+    invalidate_index,
+    question_ids_key,
+    question_key,
+    quiz_etag_key,
+    quiz_key,
+    quiz_list_etag_key,
+    set_cache,
+    set_many_cache,
+)
+
+
+def serialize_quiz(quiz: Quiz) -> Dict[str, Any]:
+    return QuizSchema.model_validate(quiz).model_dump(mode="json")
+
+
+def serialize_question(question: Question) -> Dict[str, Any]:
+    return QuestionSchema.model_validate(question).model_dump(mode="json")
+
+
+def get_quiz(db: Session, quiz_id: int) -> Optional[QuizSchema]:
+    """퀴즈 기본 정보 조회"""
+    data = get_cache(quiz_key(quiz_id))
+    if data is None:
+        quiz = db.query(Quiz).filter(Quiz.id == quiz_id).first()
+        if not quiz:
+            return None
+        data = serialize_quiz(quiz)
+        set_cache(quiz_key(quiz_id), data, settings.CACHE_TTL_SECONDS)
+    return QuizSchema.model_validate(data)
+
+
+def get_active_quizzes(db: Session) -> List[Dict[str, Any]]:
+    """활성 퀴즈 목록 (ID 순)"""
+    data = get_cache(active_quizzes_key())
+    if data is None:
+        quizzes = db.query(Quiz).filter(Quiz.is_active == True).order_by(Quiz.id).all()
+        data = [serialize_quiz(quiz) for quiz in quizzes]
+        set_cache(active_quizzes_key(), data, settings.CACHE_TTL_SECONDS)
+    return data
+
+
+def get_active_question_ids(db: Session, quiz_id: int) -> List[int]:
+    """퀴즈의 활성 문제 ID 목록 (응시 기록 생성 시 문제 선택에 사용)"""
+    data = get_cache(question_ids_key(quiz_id))
+    if data is None:
+        data = [
+            row.id for row in db.query(Question.id).filter(
+                Question.quiz_id == quiz_id,
+                Question.is_active == True
+            ).order_by(Question.id).all()
+        ]
+        set_cache(question_ids_key(quiz_id), data, settings.CACHE_TTL_SECONDS)
+    return data
+
+
+def load_questions(db: Session, question_ids: List[int]) -> Dict[int, Any]:
+    """문제 ID 목록 조회 - 스냅샷, Redis 순으로 찾고 없는 문제만 DB 에서 한 번에 조회"""
+    results: Dict[int, Any] = {}
+    snapshot = get_snapshot()
+    if snapshot is not None:
+        results = snapshot.get_many(question_ids)
+
+    missing = [question_id for question_id in question_ids if question_id not in results]
+    if missing:
+        for question_id, data in zip(missing, get_many_cache([question_key(q_id) for q_id in missing])):
+            if data is not None:
+                results[question_id] = QuestionSchema.model_validate(data)
+
+    missing = [question_id for question_id in question_ids if question_id not in results]
+    if missing:
+        loaded = {}
+        for question in db.query(Question).filter(Question.id.in_(missing)).all():
+            results[question.id] = question
+            loaded[question_key(question.id)] = serialize_question(question)
+        set_many_cache(loaded, settings.CACHE_TTL_SECONDS)
+    return results
+
+
+def invalidate_quiz(quiz_id: int, questions: bool = False) -> None:
+    """퀴즈 변경 시 관련 캐시 삭제"""
+    delete_cache(quiz_key(quiz_id))
+    delete_cache(active_quizzes_key())
+    # 조건부 요청용 ETag 색인도 함께 삭제 (다음 요청에서 새 본문으로 다시 색인, 읽는 중이던 요청의 색인은 버려짐)
+    invalidate_index(quiz_etag_key(quiz_id))
+    invalidate_index(quiz_list_etag_key())
+    if questions:
+        delete_cache(question_ids_key(quiz_id))
@@ -0,0 +1,204 @@
+# app/services/retention.py
+# 미완료 응시 정리 - 시작만 하고 끝내지 않은 응시(is_completed = false)와 자동 저장된 답안 행을 삭제(또는 보관 후 삭제)
+#
+# 마지막 활동(시작 시각, 답안 저장 시각)이 기준 시각보다 오래된 응시가 대상입니다.
+# - 제출 ID 키셋 순서로 작은 배치마다 커밋하고 배치 사이에 쉬어, 잠금을 오래 잡거나 요청 경로의 I/O 를 밀어내지 않음
+# - PostgreSQL 은 대상 행을 FOR UPDATE SKIP LOCKED 로 잠그므로 그 순간 사용 중인 응시는 건너뛰고,
+#   여러 워커에서 동시에 실행해도 같은 행을 두 번 처리하지 않음
+# - 보관하면 답안을 packed_answers 형식으로 압축해 archived_submissions 에 한 행으로 남김
+# - 응시 요약(attempt_summaries)의 응시 수/진행 중 응시를 같은 트랜잭션에서 갱신
+#
+# 사용법:
+#   python -m app.services.retention --older-than-days 30 --batch-size 500 --pause 0.2
+#   python -m app.services.retention --older-than-days 90 --archive --limit 100000
+# RETENTION_ENABLED=True 이면 앱이 RETENTION_INTERVAL 초마다 실행합니다.
+import argparse
+import asyncio
+import json
+import logging
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import exists, func, insert
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.submission import ArchivedSubmission, Submission, SubmissionAnswer
+from app.services import attempts, packed_answers
+
+logger = logging.getLogger(__name__)
+
+# 종료 시 진행 중인 정리를 배치 경계에서 멈추기 위한 신호
+_stop = threading.Event()
+
+
+def stop() -> None:
+    _stop.set()
+
+
+def cutoff_for(days: float, now: Optional[datetime] = None) -> datetime:
+    return (now or datetime.now(timezone.utc)) - timedelta(days=days)
+
+
+def _answer_activity():
+    return func.coalesce(SubmissionAnswer.updated_at, SubmissionAnswer.created_at)
+
+
+def purge_abandoned(
+        db: Session,
+        cutoff: datetime,
+        batch_size: int = 500,
+        pause: float = 0.0,
+        archive: bool = False,
+        limit: Optional[int] = None,
+) -> Dict[str, float]:
+    """cutoff 이후 활동이 없는 미완료 응시를 배치로 정리하고 처리량 반환
+
+    반환값: 정리한 응시 수(submissions), 삭제한 답안 행 수(answers), 보관한 응시 수(archived),
+    배치 수, 소요 시간(초), 초당 처리 행 수(응시 + 답안 행, 배치 사이 대기 포함).
+    """
+    report = {"submissions": 0, "answers": 0, "archived": 0, "batches": 0}
+    started = time.perf_counter()
+    last_id = 0
+    while limit is None or report["submissions"] < limit:
+        size = batch_size if limit is None else min(batch_size, limit - report["submissions"])
+        # 진행 중 응시만 보도록 부분 유니크 인덱스 조건(is_completed = false)을 그대로 사용
+        batch = db.query(
+            Submission.id, Submission.quiz_id, Submission.user_id, Submission.start_time, Submission.question_order
+        ).filter(
+            Submission.id > last_id,
+            Submission.is_completed == False,
+            Submission.start_time < cutoff,
+            ~exists().where(
+                SubmissionAnswer.submission_id == Submission.id,
+                _answer_activity() >= cutoff
+            )
+        ).order_by(Submission.id).limit(size).with_for_update(skip_locked=True).all()
+        if not batch:
+            break
+        ids = [row.id for row in batch]
+
+        if archive:
+            selected = defaultdict(dict)
+            last_activity = {}
+            for submission_id, question_id, selected_option, activity in db.query(
+                SubmissionAnswer.submission_id,
+                SubmissionAnswer.question_id,
+                SubmissionAnswer.selected_option,
+                _answer_activity()
+            ).filter(SubmissionAnswer.submission_id.in_(ids)).order_by(SubmissionAnswer.id):
+                selected[submission_id][question_id] = selected_option
+                if activity is not None and (submission_id not in last_activity or activity > last_activity[submission_id]):
+                    last_activity[submission_id] = activity
+            db.execute(insert(ArchivedSubmission), [
+                {
+                    "id": row.id,
+                    "quiz_id": row.quiz_id,
+                    "user_id": row.user_id,
+                    "start_time": row.start_time,
+                    "last_activity_at": last_activity.get(row.id, row.start_time),
+                    "question_order": row.question_order,
+                    "packed_options": packed_answers.pack_options(row.question_order or [], selected[row.id]),
+                    "answer_count": len(selected[row.id]),
+                }
+                for row in batch
+            ])
+            report["archived"] += len(batch)
+
+        answer_count = db.query(SubmissionAnswer).filter(
+            SubmissionAnswer.submission_id.in_(ids)
+        ).delete(synchronize_session=False)
+        db.query(Submission).filter(
+            Submission.id.in_(ids),
+            Submission.is_completed == False
+        ).delete(synchronize_session=False)
+        attempts.record_removed(db, [(row.id, row.quiz_id, row.user_id) for row in batch])
+        db.commit()
+
+        report["submissions"] += len(batch)
+        report["answers"] += answer_count
+        report["batches"] += 1
+        last_id = ids[-1]
+        elapsed = time.perf_counter() - started
+        logger.info(
+            "미완료 응시 %d개, 답안 %d행 정리 (마지막 ID %d, %.0f행/초)",
+            report["submissions"], report["answers"], last_id,
+            (report["submissions"] + report["answers"]) / elapsed if elapsed > 0 else 0.0
+        )
+        if len(batch) < size:
+            break
+        # 배치 사이에 쉬면서 종료 신호 확인
+        if _stop.wait(pause) if pause > 0 else _stop.is_set():
+            break
+
+    report["seconds"] = time.perf_counter() - started
+    rows = report["submissions"] + report["answers"]
+    report["rows_per_second"] = rows / report["seconds"] if report["seconds"] > 0 else 0.0
+    return report
+
+
+def run_retention() -> Optional[Dict[str, float]]:
+    """설정값으로 새 세션에서 정리 실행 (스케줄러용, 실패는 로그만)"""
+    from app.db import SessionLocal
+
+    db = SessionLocal()
+    try:
+        report = purge_abandoned(
+            db,
+            cutoff_for(settings.RETENTION_MAX_AGE_DAYS),
+            settings.RETENTION_BATCH_SIZE,
+            settings.RETENTION_BATCH_PAUSE,
+            settings.RETENTION_ARCHIVE,
+        )
+        if report["submissions"]:
+            logger.info("미완료 응시 정리 완료: %s", report)
+        return report
+    except Exception:
+        db.rollback()
+        logger.exception("미완료 응시 정리 실패")
+        return None
+    finally:
+        db.close()
+
+
+async def retention_loop(stop_event: asyncio.Event) -> None:
+    """lifespan 에서 실행하는 주기 작업 - RETENTION_INTERVAL 초마다 미완료 응시 정리"""
+    _stop.clear()
+    while not stop_event.is_set():
+        await run_in_threadpool(run_retention)
+        try:
+            await asyncio.wait_for(stop_event.wait(), timeout=settings.RETENTION_INTERVAL)
+        except asyncio.TimeoutError:
+            pass
+
+
+def main():
+    import app.models.user, app.models.quiz, app.models.question  # noqa: F401 (관계 대상 모델 등록)
+    from app.db import SessionLocal
+
+    parser = argparse.ArgumentParser(description="오래된 미완료 응시와 답안 행 정리")
+    parser.add_argument("--older-than-days", type=float, default=settings.RETENTION_MAX_AGE_DAYS,
+                        help="마지막 활동이 이 일수보다 오래된 응시를 정리")
+    parser.add_argument("--batch-size", type=int, default=settings.RETENTION_BATCH_SIZE, help="한 트랜잭션에서 정리할 응시 수")
+    parser.add_argument("--pause", type=float, default=settings.RETENTION_BATCH_PAUSE, help="배치 사이 대기(초)")
+    parser.add_argument("--archive", action="store_true", default=settings.RETENTION_ARCHIVE,
+                        help="삭제 전에 archived_submissions 에 보관")
+    parser.add_argument("--limit", type=int, help="이번 실행에서 정리할 최대 응시 수")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        report = purge_abandoned(
+            db, cutoff_for(args.older_than_days), args.batch_size, args.pause, args.archive, args.limit
+        )
+    finally:
+        db.close()
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
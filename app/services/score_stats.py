@@ -0,0 +1,353 @@
+# app/services/score_stats.py
+# 퀴즈 점수 분포 통계 - 퀴즈/일(UTC)별 요약을 채점 때마다 갱신하고, 조회할 때 기간 내 요약을 합침
+#
+# 요약 하나 = KLL 분위수 스케치 + 고정 구간 히스토그램 + 합계 (app.utils.sketch)
+# 점수를 전부 정렬하지 않고도 기간/일별 중앙값, p90, 히스토그램을 구하며, 일 요약은 점수 수와 관계없이 수 KB 입니다.
+#
+# 저장소
+#   redis : 일 요약마다 JSON 키 하나 (stats:quiz:{id}:{YYYY-MM-DD}), WATCH 로 읽고-합치고-쓰기
+#   local : 프로세스 내 dict - Redis 를 쓸 수 없을 때의 대역 (프로세스마다 따로 유지)
+# 채점 요청에서는 점수를 프로세스 메모리의 요약에만 더하고, SCORE_STATS_FLUSH_INTERVAL 마다(그리고 종료 시) 저장소에 합칩니다.
+# 마감 직후처럼 제출이 몰려도 같은 키의 WATCH 경쟁은 워커당 주기마다 한 번이고, 합치지 못한 요약은 버리지 않고 다음 주기에 다시 씁니다.
+# 조회할 때는 이 프로세스의 아직 쓰지 않은 요약도 합치므로 자기 채점은 바로 보이고, 다른 워커의 채점은 주기 안에 반영됩니다.
+#
+# 기존 제출로 다시 계산 (대상 퀴즈의 요약을 지우고 다시 채움):
+#   python -m app.services.score_stats --quiz-id 1
+import argparse
+import asyncio
+import json
+import logging
+import threading
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.submission import Submission
+from app.utils.cache import delete_pattern, score_stats_key
+from app.utils.sketch import Histogram, KLLSketch
+
+logger = logging.getLogger(__name__)
+
+# (퀴즈 ID, 사용자 ID, 점수) - leaderboard.Result 와 같은 형태
+Result = Tuple[int, int, float]
+DEFAULT_QUANTILES = (0.5, 0.9)
+# 동시 갱신 충돌 시 재시도 횟수
+MAX_RETRIES = 10
+
+
+class ScoreSummary:
+    """점수 묶음 하나의 요약 (병합 가능)"""
+
+    def __init__(self, sketch: Optional[KLLSketch] = None, histogram: Optional[Histogram] = None, total: float = 0.0):
+        self.sketch = sketch or KLLSketch(settings.SCORE_SKETCH_K)
+        self.histogram = histogram or Histogram(settings.SCORE_HISTOGRAM_WIDTH)
+        self.total = total
+
+    @classmethod
+    def of(cls, scores: Iterable[float]) -> "ScoreSummary":
+        summary = cls()
+        for score in scores:
+            summary.update(score)
+        return summary
+
+    @property
+    def count(self) -> int:
+        return self.sketch.n
+
+    def update(self, score: float) -> None:
+        self.sketch.update(score)
+        self.histogram.update(score)
+        self.total += score
+
+    def merge(self, other: "ScoreSummary") -> None:
+        self.sketch.merge(other.sketch)
+        self.histogram.merge(other.histogram)
+        self.total += other.total
+
+    def describe(self, quantiles: Iterable[float]) -> dict:
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else None,
+            "min": self.sketch.min,
+            "max": self.sketch.max,
+            "quantiles": {f"p{q * 100:g}": value for q, value in self.sketch.quantiles(quantiles).items()},
+            "histogram": self.histogram.buckets(),
+        }
+
+    def to_json(self) -> str:
+        return json.dumps({"sketch": self.sketch.to_dict(), "histogram": self.histogram.to_dict(), "total": self.total})
+
+    @classmethod
+    def from_json(cls, raw: str) -> "ScoreSummary":
+        data = json.loads(raw)
+        return cls(KLLSketch.from_dict(data["sketch"]), Histogram.from_dict(data["histogram"]), data["total"])
+
+
+class LocalScoreStats:
+    """프로세스 내 일 요약 저장소"""
+
+    def __init__(self):
+        self._summaries: Dict[Tuple[int, str], ScoreSummary] = {}
+        self._lock = threading.Lock()
+
+    def merge(self, quiz_id: int, day: str, summary: ScoreSummary) -> None:
+        with self._lock:
+            current = self._summaries.get((quiz_id, day))
+            if current is None:
+                self._summaries[(quiz_id, day)] = ScoreSummary.from_json(summary.to_json())
+            else:
+                current.merge(summary)
+
+    def replace(self, quiz_id: int, day: str, summary: ScoreSummary) -> None:
+        with self._lock:
+            self._summaries[(quiz_id, day)] = summary
+
+    def load(self, quiz_id: int, days: List[str]) -> List[Optional[ScoreSummary]]:
+        with self._lock:
+            # 조회 쪽에서 합치므로 사본 반환
+            return [
+                ScoreSummary.from_json(summary.to_json()) if summary else None
+                for summary in (self._summaries.get((quiz_id, day)) for day in days)
+            ]
+
+    def reset(self, quiz_id: int) -> None:
+        with self._lock:
+            for key in [key for key in self._summaries if key[0] == quiz_id]:
+                del self._summaries[key]
+
+
+class RedisScoreStats:
+    """Redis 일 요약 저장소 - 여러 워커 프로세스가 같은 요약을 갱신"""
+
+    def __init__(self, client):
+        self.client = client
+
+    def merge(self, quiz_id: int, day: str, summary: ScoreSummary) -> None:
+        import redis
+
+        key = score_stats_key(quiz_id, day)
+        with self.client.pipeline() as pipe:
+            for _ in range(MAX_RETRIES):
+                try:
+                    pipe.watch(key)
+                    raw = pipe.get(key)
+                    current = ScoreSummary.from_json(raw) if raw else ScoreSummary()
+                    current.merge(summary)
+                    pipe.multi()
+                    pipe.set(key, current.to_json())
+                    pipe.execute()
+                    return
+                except redis.WatchError:
+                    continue
+        # 호출한 쪽(flush)이 요약을 되돌려 다음 주기에 다시 씀
+        raise RuntimeError(f"점수 통계 갱신 충돌로 {key} 에 {summary.count}건을 반영하지 못했습니다")
+
+    def replace(self, quiz_id: int, day: str, summary: ScoreSummary) -> None:
+        self.client.set(score_stats_key(quiz_id, day), summary.to_json())
+
+    def load(self, quiz_id: int, days: List[str]) -> List[Optional[ScoreSummary]]:
+        if not days:
+            return []
+        raws = self.client.mget([score_stats_key(quiz_id, day) for day in days])
+        return [ScoreSummary.from_json(raw) if raw else None for raw in raws]
+
+    def reset(self, quiz_id: int) -> None:
+        delete_pattern(score_stats_key(quiz_id, "*"))
+
+
+_stats = None
+_stats_lock = threading.Lock()
+
+
+def get_score_stats():
+    """점수 통계 저장소 (처음 사용할 때 결정 - Redis 를 쓸 수 없으면 로컬)"""
+    global _stats
+    if _stats is None:
+        with _stats_lock:
+            if _stats is None:
+                stats = None
+                if settings.SCORE_STATS_BACKEND == "redis":
+                    from app.utils.cache import get_redis
+
+                    client = get_redis()
+                    if client is not None:
+                        stats = RedisScoreStats(client)
+                    else:
+                        logger.warning("Redis 를 사용할 수 없어 프로세스 내 점수 통계를 사용합니다")
+                _stats = stats or LocalScoreStats()
+    return _stats
+
+
+def _today() -> str:
+    return datetime.now(timezone.utc).date().isoformat()
+
+
+_pending: Dict[Tuple[int, str], ScoreSummary] = {}  # (퀴즈 ID, 날짜) → 아직 저장소에 합치지 않은 요약
+_pending_lock = threading.Lock()
+
+
+def record_results(results: Iterable[Result]) -> None:
+    """채점 결과를 오늘(UTC) 요약에 반영 (커밋 이후 호출) - 메모리에만 더하고 저장소에는 flush 가 합침"""
+    day = _today()
+    with _pending_lock:
+        for quiz_id, _, score in results:
+            if score is not None:
+                _pending.setdefault((quiz_id, day), ScoreSummary()).update(score)
+
+
+def _restore(pending: Dict[Tuple[int, str], ScoreSummary]) -> None:
+    with _pending_lock:
+        for key, summary in pending.items():
+            current = _pending.get(key)
+            if current is None:
+                _pending[key] = summary
+            else:
+                current.merge(summary)
+
+
+def flush() -> int:
+    """쌓아 둔 요약을 저장소에 합치고 합친 점수 수 반환 (합치지 못한 요약은 되돌려 다음에 다시 시도)"""
+    with _pending_lock:
+        pending = dict(_pending)
+        _pending.clear()
+    if not pending:
+        return 0
+    stats = get_score_stats()
+    written = 0
+    failed: Dict[Tuple[int, str], ScoreSummary] = {}
+    for (quiz_id, day), summary in pending.items():
+        try:
+            stats.merge(quiz_id, day, summary)
+            written += summary.count
+        except Exception as e:
+            logger.warning("점수 통계 갱신 오류 (다음 주기에 다시 시도): %s", e)
+            failed[(quiz_id, day)] = summary
+    if failed:
+        _restore(failed)
+    return written
+
+
+async def flush_loop(stop_event: asyncio.Event) -> None:
+    """lifespan 에서 실행하는 주기 작업 - SCORE_STATS_FLUSH_INTERVAL 초마다, 종료할 때 한 번 더 저장"""
+    while not stop_event.is_set():
+        try:
+            await asyncio.wait_for(stop_event.wait(), timeout=settings.SCORE_STATS_FLUSH_INTERVAL)
+        except asyncio.TimeoutError:
+            pass
+        await run_in_threadpool(flush)
+
+
+def _discard_pending(quiz_ids: Iterable[int]) -> None:
+    quiz_ids = set(quiz_ids)
+    with _pending_lock:
+        for key in [key for key in _pending if key[0] in quiz_ids]:
+            del _pending[key]
+
+
+def reset_quiz(quiz_id: int) -> None:
+    """퀴즈 삭제 시 통계 삭제"""
+    _discard_pending([quiz_id])
+    try:
+        get_score_stats().reset(quiz_id)
+    except Exception as e:
+        logger.warning("점수 통계 삭제 오류: %s", e)
+
+
+def date_range(start: date, end: date) -> List[str]:
+    return [(start + timedelta(days=i)).isoformat() for i in range((end - start).days + 1)]
+
+
+def get_distribution(
+        quiz_id: int,
+        start: date,
+        end: date,
+        quantiles: Iterable[float] = DEFAULT_QUANTILES,
+        by_day: bool = False
+) -> dict:
+    """기간 [start, end] 의 일 요약을 합친 분포 (by_day 면 점수가 있는 날의 분포도 함께)"""
+    quantiles = list(quantiles)
+    days = date_range(start, end)
+    merged = ScoreSummary()
+    daily = []
+    with _pending_lock:
+        pending = {day: _pending[(quiz_id, day)].to_json() for day in days if (quiz_id, day) in _pending}
+    for day, summary in zip(days, get_score_stats().load(quiz_id, days)):
+        if day in pending:
+            # 이 프로세스에서 채점했지만 아직 저장소에 합치지 않은 점수
+            local = ScoreSummary.from_json(pending[day])
+            if summary is None:
+                summary = local
+            else:
+                summary.merge(local)
+        if summary is None:
+            continue
+        if by_day:
+            daily.append({"start": day, "end": day, **summary.describe(quantiles)})
+        merged.merge(summary)
+    result = {"start": start, "end": end, **merged.describe(quantiles)}
+    if by_day:
+        result["days"] = daily
+    return result
+
+
+def rebuild(db: Session, quiz_id: Optional[int] = None, batch_size: int = 10000) -> int:
+    """완료된 제출의 점수로 퀴즈/일 요약을 다시 계산해 교체 (제출 ID 키셋 배치). 반영한 제출 수 반환.
+
+    실행 중에 채점된 제출은 덮어쓰기 전후에 따라 빠지거나 두 번 세어질 수 있으므로 한산할 때 실행하세요.
+    """
+    graded_at = func.coalesce(Submission.graded_at, Submission.submit_time, Submission.created_at)
+    summaries: Dict[Tuple[int, str], ScoreSummary] = defaultdict(ScoreSummary)
+    last_id, total = 0, 0
+    while True:
+        query = db.query(Submission.id, Submission.quiz_id, Submission.score, graded_at).filter(
+            Submission.is_completed == True,
+            Submission.score.isnot(None),
+            Submission.id > last_id
+        )
+        if quiz_id is not None:
+            query = query.filter(Submission.quiz_id == quiz_id)
+        rows = query.order_by(Submission.id).limit(batch_size).all()
+        if not rows:
+            break
+        for _, row_quiz_id, score, at in rows:
+            if isinstance(at, str):  # SQLite 의 coalesce 결과는 문자열
+                at = datetime.fromisoformat(at)
+            day = (at.astimezone(timezone.utc) if at.tzinfo else at).date().isoformat()
+            summaries[(row_quiz_id, day)].update(score)
+        total += len(rows)
+        last_id = rows[-1][0]
+        db.commit()
+
+    stats = get_score_stats()
+    # 다시 계산한 퀴즈의 아직 쓰지 않은 요약은 DB 에서 이미 읽었으므로 버림 (두 번 세지 않도록)
+    _discard_pending(quiz_id for quiz_id, _ in summaries)
+    for current_quiz_id in {key[0] for key in summaries}:
+        stats.reset(current_quiz_id)
+    for (current_quiz_id, day), summary in summaries.items():
+        stats.replace(current_quiz_id, day, summary)
+    return total
+
+
+def main():
+    import app.models.user, app.models.quiz, app.models.question  # noqa: F401 (관계 대상 모델 등록)
+    from app.db import SessionLocal
+
+    parser = argparse.ArgumentParser(description="완료된 제출로 퀴즈 점수 분포 통계 다시 계산")
+    parser.add_argument("--quiz-id", type=int, help="대상 퀴즈 (생략 시 전체)")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        count = rebuild(db, args.quiz_id)
+    finally:
+        db.close()
+    print(f"점수 통계에 반영한 제출 수: {count} ({type(get_score_stats()).__name__})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+# app/services/search.py
+# 퀴즈(제목/설명)와 문제(내용/선택지) 전문 검색
+#
+# 색인
+#   PostgreSQL : 표마다 search_vector(tsvector) 컬럼 + GIN 인덱스, BEFORE INSERT/UPDATE 트리거가 갱신
+#   SQLite     : 표마다 FTS5 가상 테이블(contentless, rowid = 원래 ID), INSERT/UPDATE/DELETE 트리거가 갱신
+#   그 밖의 DB  : 색인 없이 LIKE 로 찾음 (순위 없음)
+# 트리거로 갱신하므로 ORM, 일괄 INSERT, datagen 적재 어느 경로로 써도 색인이 따라갑니다.
+# 검색어는 단어별 접두어 일치(모든 단어 포함)이고, 순위(PostgreSQL ts_rank, SQLite bm25) 내림차순 + ID 순으로
+# (순위, ID) 키셋 커서를 사용해 페이지를 넘깁니다.
+#
+# 새 DB 는 create_all 때 색인을 함께 만들고, 기존 DB 는 색인 구조를 만든 뒤 배치로 채웁니다:
+#   python -m app.services.search --batch-size 2000
+import argparse
+import base64
+import logging
+import re
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app.db import Base
+
+logger = logging.getLogger(__name__)
+
+TARGETS = ("questions", "quizzes")
+MAX_TERMS = 8
+
+# 표별 색인 대상 - (컬럼, PostgreSQL 식, SQLite 식, PostgreSQL 가중치), {p} 는 행 접두어(트리거의 NEW./OLD.)
+_COLUMNS = {
+    "quizzes": [
+        ("title", "{p}title", "{p}title", "A"),
+        ("description", "{p}description", "{p}description", "B"),
+    ],
+    "questions": [
+        ("content", "{p}content", "{p}content", "A"),
+        (
+            "options",
+            "(SELECT string_agg(value, ' ') FROM json_array_elements_text({p}options) AS value)",
+            "(SELECT group_concat(value, ' ') FROM json_each({p}options))",
+            "B",
+        ),
+    ],
+}
+# 결과로 돌려줄 컬럼 (ID, 퀴즈 ID, 본문)
+_RESULT_COLUMNS = {
+    "quizzes": ("id", "id", "title"),
+    "questions": ("id", "quiz_id", "content"),
+}
+# SQLite bm25 컬럼 가중치 (제목/내용을 설명/선택지보다 높게)
+_BM25_WEIGHTS = "2.0, 1.0"
+
+
+def _names(table: str) -> str:
+    return ", ".join(name for name, _, _, _ in _COLUMNS[table])
+
+
+def _pg_vector(table: str, prefix: str = "") -> str:
+    return " || ".join(
+        f"setweight(to_tsvector('simple', coalesce({expression.format(p=prefix)}, '')), '{weight}')"
+        for _, expression, _, weight in _COLUMNS[table]
+    )
+
+
+def _sqlite_values(table: str, prefix: str) -> str:
+    return ", ".join(expression.format(p=prefix) for _, _, expression, _ in _COLUMNS[table])
+
+
+def _install_postgresql(connection: Connection, create_index: bool) -> None:
+    for table in TARGETS:
+        connection.execute(text(f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector"))
+        connection.execute(text(
+            f"CREATE OR REPLACE FUNCTION {table}_search_vector() RETURNS trigger AS $$ "
+            f"BEGIN NEW.search_vector := {_pg_vector(table, 'NEW.')}; RETURN NEW; END "
+            f"$$ LANGUAGE plpgsql"
+        ))
+        connection.execute(text(f"DROP TRIGGER IF EXISTS {table}_search_vector ON {table}"))
+        connection.execute(text(
+            f"CREATE TRIGGER {table}_search_vector BEFORE INSERT OR UPDATE OF {_names(table)} ON {table} "
+            f"FOR EACH ROW EXECUTE FUNCTION {table}_search_vector()"
+        ))
+        if create_index:
+            connection.execute(text(
+                f"CREATE INDEX IF NOT EXISTS ix_{table}_search_vector ON {table} USING GIN (search_vector)"
+            ))
+
+
+def _install_sqlite(connection: Connection) -> None:
+    for table in TARGETS:
+        names, new_values, old_values = _names(table), _sqlite_values(table, "new."), _sqlite_values(table, "old.")
+        connection.execute(text(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {table}_fts USING fts5({names}, content='', tokenize='unicode61')"
+        ))
+        delete = f"INSERT INTO {table}_fts({table}_fts, rowid, {names}) VALUES ('delete', old.id, {old_values});"
+        insert = f"INSERT INTO {table}_fts(rowid, {names}) VALUES (new.id, {new_values});"
+        connection.execute(text(f"CREATE TRIGGER IF NOT EXISTS {table}_fts_ai AFTER INSERT ON {table} BEGIN {insert} END"))
+        connection.execute(text(f"CREATE TRIGGER IF NOT EXISTS {table}_fts_ad AFTER DELETE ON {table} BEGIN {delete} END"))
+        connection.execute(text(
+            f"CREATE TRIGGER IF NOT EXISTS {table}_fts_au AFTER UPDATE OF {names} ON {table} BEGIN {delete} {insert} END"
+        ))
+
+
+def install(connection: Connection, create_index: bool = True) -> None:
+    """색인 구조(컬럼/가상 테이블, 트리거, 인덱스) 생성 - 이미 있으면 그대로 (여러 번 실행해도 같음)
+
+    기존 PostgreSQL DB 는 create_index=False 로 만든 뒤 채우고 나서 GIN 인덱스를 CONCURRENTLY 로 만듭니다.
+    """
+    dialect = connection.dialect.name
+    if dialect == "postgresql":
+        _install_postgresql(connection, create_index)
+    elif dialect == "sqlite":
+        _install_sqlite(connection)
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _create_search_index(target, connection: Connection, **kw) -> None:
+    # create_all 로 만든 새 DB 는 빈 표이므로 인덱스까지 바로 생성
+    tables = {table.name for table in kw.get("tables") or target.sorted_tables}
+    if set(TARGETS) <= tables:
+        install(connection)
+
+
+def _next_bound(db: Session, table: str, last_id: int, batch_size: int) -> Optional[int]:
+    """ID 키셋 - last_id 다음 batch_size 개 행의 마지막 ID"""
+    return db.execute(text(
+        f"SELECT max(id) FROM (SELECT id FROM {table} WHERE id > :last_id ORDER BY id LIMIT :size) batch"
+    ), {"last_id": last_id, "size": batch_size}).scalar()
+
+
+def backfill(db: Session, table: str, batch_size: int = 2000, pause: float = 0.0) -> int:
+    """색인되지 않은 기존 행을 ID 구간 배치로 색인 (배치마다 커밋), 색인한 행 수 반환"""
+    dialect = db.get_bind().dialect.name
+    if dialect not in ("postgresql", "sqlite"):
+        return 0
+    total, last_id = 0, 0
+    while True:
+        high = _next_bound(db, table, last_id, batch_size)
+        if high is None:
+            break
+        params = {"low": last_id, "high": high}
+        if dialect == "postgresql":
+            result = db.execute(text(
+                f"UPDATE {table} SET search_vector = {_pg_vector(table)} "
+                f"WHERE id > :low AND id <= :high AND search_vector IS NULL"
+            ), params)
+        else:
+            names, values = _names(table), _sqlite_values(table, f"{table}.")
+            # 트리거가 이미 색인한 행(채우는 중에 추가된 행 포함)은 건너뜀
+            result = db.execute(text(
+                f"INSERT INTO {table}_fts(rowid, {names}) SELECT id, {values} FROM {table} "
+                f"WHERE id > :low AND id <= :high "
+                f"AND NOT EXISTS (SELECT 1 FROM {table}_fts WHERE {table}_fts.rowid = {table}.id)"
+            ), params)
+        db.commit()
+        total += max(result.rowcount, 0)
+        last_id = high
+        logger.info("%s 색인 %d행 (마지막 ID %d)", table, total, last_id)
+        if pause > 0:
+            time.sleep(pause)
+    return total
+
+
+def query_terms(q: str) -> List[str]:
+    """검색어를 단어로 (문장 부호 제거, 소문자, 최대 MAX_TERMS 개)"""
+    return re.findall(r"\w+", q.lower())[:MAX_TERMS]
+
+
+def encode_cursor(score: float, row_id: int) -> str:
+    return base64.urlsafe_b64encode(f"{score!r}:{row_id}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[float, int]:
+    """encode_cursor 의 역 - 형식이 잘못되면 ValueError"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        score, row_id = raw.rsplit(":", 1)
+        return float(score), int(row_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError("잘못된 커서입니다") from e
+
+
+def _ranked_sql(dialect: str, table: str, quiz_filter: bool) -> Tuple[str, Any]:
+    """(순위 포함 검색 SELECT, 검색어 변환 함수)"""
+    id_column, quiz_column, text_column = _RESULT_COLUMNS[table]
+    if dialect == "postgresql":
+        sql = (
+            f"SELECT t.{id_column} AS id, t.{quiz_column} AS quiz_id, t.{text_column} AS text, "
+            f"ts_rank(t.search_vector, query) AS score "
+            f"FROM {table} t, to_tsquery('simple', :query) query WHERE t.search_vector @@ query"
+        )
+        to_query = lambda terms: " & ".join(f"{term}:*" for term in terms)
+    elif dialect == "sqlite":
+        sql = (
+            f"SELECT t.{id_column} AS id, t.{quiz_column} AS quiz_id, t.{text_column} AS text, "
+            f"-bm25({table}_fts, {_BM25_WEIGHTS}) AS score "
+            f"FROM {table}_fts JOIN {table} t ON t.id = {table}_fts.rowid WHERE {table}_fts MATCH :query"
+        )
+        to_query = lambda terms: " ".join(f'"{term}"*' for term in terms)
+    else:
+        # 색인이 없는 DB - 모든 단어를 포함하는 행을 ID 순으로 (순위 0)
+        sql = (
+            f"SELECT t.{id_column} AS id, t.{quiz_column} AS quiz_id, t.{text_column} AS text, 0.0 AS score "
+            f"FROM {table} t WHERE lower(t.{text_column}) LIKE :query"
+        )
+        to_query = lambda terms: "%" + "%".join(terms) + "%"
+    if quiz_filter:
+        sql += " AND t.quiz_id = :quiz_id"
+    return sql, to_query
+
+
+def search(
+        db: Session,
+        q: str,
+        target: str = "questions",
+        quiz_id: Optional[int] = None,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """검색 결과 한 페이지와 다음 페이지 커서 (없으면 None)
+
+    잘못된 대상/커서는 ValueError. 검색어에 단어가 없으면 빈 결과입니다.
+    """
+    if target not in TARGETS:
+        raise ValueError(f"검색 대상은 {', '.join(TARGETS)} 중 하나여야 합니다")
+    terms = query_terms(q)
+    if not terms:
+        return [], None
+
+    ranked, to_query = _ranked_sql(db.get_bind().dialect.name, target, quiz_id is not None and target == "questions")
+    params: Dict[str, Any] = {"query": to_query(terms), "quiz_id": quiz_id, "limit": limit + 1}
+    sql = f"SELECT id, quiz_id, text, score FROM ({ranked}) hits"
+    if cursor:
+        params["after_score"], params["after_id"] = decode_cursor(cursor)
+        sql += " WHERE score < :after_score OR (score = :after_score AND id > :after_id)"
+    sql += " ORDER BY score DESC, id LIMIT :limit"
+
+    rows = [dict(row._mapping) for row in db.execute(text(sql), params)]
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1]["score"], rows[-1]["id"])
+    return rows, next_cursor
+
+
+def main():
+    import app.models.user, app.models.quiz, app.models.question  # noqa: F401 (관계 대상 모델 등록)
+    from app.db import SessionLocal, get_engine
+
+    parser = argparse.ArgumentParser(description="기존 퀴즈/문제 검색 색인 생성 및 채우기")
+    parser.add_argument("--batch-size", type=int, default=2000, help="한 트랜잭션에서 색인할 행 수")
+    parser.add_argument("--pause", type=float, default=0.0, help="배치 사이 대기(초)")
+    args = parser.parse_args()
+
+    engine = get_engine()
+    with engine.begin() as connection:
+        install(connection, create_index=False)
+
+    db = SessionLocal()
+    try:
+        for table in TARGETS:
+            count = backfill(db, table, args.batch_size, args.pause)
+            print(f"{table}: {count}행 색인")
+    finally:
+        db.close()
+
+    if engine.dialect.name == "postgresql":
+        # 채운 뒤 쓰기를 막지 않도록 CONCURRENTLY (트랜잭션 밖에서 실행)
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+            for table in TARGETS:
+                connection.execute(text(
+                    f"CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_{table}_search_vector ON {table} USING GIN (search_vector)"
+                ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,343 @@
+# app/services/snapshot.py
+# 활성 문제 스냅샷 - 워커 간 공유되는 mmap 바이너리 파일
+#
+# 활성 퀴즈의 활성 문제를 ID 순으로 정렬해 고정 길이 배열 + 문자열 영역으로 직렬화합니다.
+# 각 uvicorn 워커는 같은 파일을 mmap 으로 열어 OS 페이지 캐시를 공유하므로
+# 워커 수가 늘어도 문제 데이터의 메모리 사용량은 늘어나지 않습니다.
+#
+# 파일 구조 (리틀 엔디언)
+#   헤더      : magic(4s) version(H) reserved(H) count(Q) built_at(d) blob_size(Q)
+#   배열      : ids(q×n) quiz_ids(q×n) orders(q×n) created_at(d×n) updated_at(d×n) weights(d×n)
+#               correct_answer(B×n) option_count(B×n) difficulty(B×n) tag_count(B×n)
+#               [8바이트 정렬 패딩] offsets(Q×(n+1))
+#   문자열 영역: 레코드마다 content_len(I) option_len(I×option_count) tag_len(I×tag_count) content options... tags...
+#   difficulty 는 0 = 없음, 1 부터 DIFFICULTIES 순서
+#
+# 새 스냅샷은 임시 파일에 쓴 뒤 os.replace 로 교체하므로 읽는 쪽은 항상 완전한 파일만 봅니다.
+import argparse
+import logging
+import math
+import mmap
+import os
+import shutil
+import struct
+import sys
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.question import DIFFICULTIES, Question
+from app.models.quiz import Quiz
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"LSKQ"
+VERSION = 2
+HEADER = struct.Struct("<4sHHQdQ")
+NO_ORDER = -(2 ** 63)  # order 가 없는 문제
+
+
+class SnapshotQuestion:
+    """스냅샷에서 읽은 문제 (Question 모델과 같은 속성 이름)"""
+    __slots__ = (
+        "id", "quiz_id", "content", "options", "correct_answer", "order", "tags", "difficulty", "weight",
+        "is_active", "created_at", "updated_at",
+    )
+
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            setattr(self, name, fields.get(name))
+
+
+def _timestamp(value: Optional[datetime]) -> float:
+    if value is None:
+        return math.nan
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def _datetime(value: float) -> Optional[datetime]:
+    if math.isnan(value):
+        return None
+    return datetime.fromtimestamp(value, tz=timezone.utc)
+
+
+def _difficulty_code(value: Optional[str]) -> int:
+    return DIFFICULTIES.index(value) + 1 if value in DIFFICULTIES else 0
+
+
+def write_snapshot(questions: Iterable[Question], path: str) -> int:
+    """ID 오름차순 문제 목록을 스냅샷 파일로 저장 (임시 파일 작성 후 원자적 교체)
+
+    행을 받는 대로 문자열 영역은 옆 임시 파일에 쓰고 배열 값만 고정 길이 array 에 모으므로
+    문제 객체를 메모리에 쌓아두지 않습니다.
+    """
+    ids, quiz_ids, orders = array("q"), array("q"), array("q")
+    created_at, updated_at, weights = array("d"), array("d"), array("d")
+    correct_answers, option_counts, difficulties, tag_counts = array("B"), array("B"), array("B"), array("B")
+    offsets = array("Q", [0])
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp-{os.getpid()}-{threading.get_ident()}"
+    try:
+        with open(f"{tmp_path}.blob", "w+b") as blob:
+            blob_size = 0
+            for question in questions:
+                if ids and question.id <= ids[-1]:
+                    raise ValueError("스냅샷 문제는 ID 오름차순이어야 합니다")
+                content = question.content.encode("utf-8")
+                options = [str(option).encode("utf-8") for option in question.options]
+                tags = [str(tag).encode("utf-8") for tag in question.tags or ()]
+                record = struct.pack(
+                    f"<I{len(options)}I{len(tags)}I", len(content), *(len(o) for o in options), *(len(t) for t in tags)
+                ) + content + b"".join(options) + b"".join(tags)
+                blob.write(record)
+                blob_size += len(record)
+                offsets.append(blob_size)
+
+                ids.append(question.id)
+                quiz_ids.append(question.quiz_id)
+                orders.append(NO_ORDER if question.order is None else question.order)
+                created_at.append(_timestamp(question.created_at))
+                updated_at.append(_timestamp(question.updated_at))
+                weights.append(1.0 if question.weight is None else question.weight)
+                correct_answers.append(question.correct_answer)
+                option_counts.append(len(options))
+                difficulties.append(_difficulty_code(question.difficulty))
+                tag_counts.append(len(tags))
+
+            count = len(ids)
+            with open(tmp_path, "wb") as f:
+                f.write(HEADER.pack(MAGIC, VERSION, 0, count, time.time(), blob_size))
+                written = 0
+                for column in (
+                    ids, quiz_ids, orders, created_at, updated_at, weights,
+                    correct_answers, option_counts, difficulties, tag_counts,
+                ):
+                    written += _write_column(f, column)
+                f.write(b"\0" * (-written % 8))
+                _write_column(f, offsets)
+                blob.seek(0)
+                shutil.copyfileobj(blob, f)
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    finally:
+        for leftover in (f"{tmp_path}.blob", tmp_path):
+            if os.path.exists(leftover):
+                os.remove(leftover)
+    return count
+
+
+def _write_column(f, column: array) -> int:
+    """배열을 리틀 엔디언으로 기록하고 바이트 수 반환"""
+    if sys.byteorder != "little":
+        column = array(column.typecode, column)
+        column.byteswap()
+    data = column.tobytes()
+    f.write(data)
+    return len(data)
+
+
+def build_snapshot(db: Session, path: str) -> int:
+    """활성 퀴즈의 활성 문제로 스냅샷 생성 (ID 순으로 받아 바로 기록)"""
+    questions = db.query(Question).join(Quiz, Quiz.id == Question.quiz_id).filter(
+        Quiz.is_active == True,
+        Question.is_active == True
+    ).order_by(Question.id).yield_per(5000)
+    return write_snapshot(questions, path)
+
+
+class QuestionSnapshot:
+    """mmap 으로 연 스냅샷 파일 - 문제 ID 로 이진 탐색"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            self.identity = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        buffer = memoryview(self._mmap)
+        magic, version, _, count, self.built_at, blob_size = HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"지원하지 않는 스냅샷 형식입니다: {path}")
+
+        self.count = count
+        position = HEADER.size
+
+        def take(fmt: str, length: int):
+            nonlocal position
+            size = struct.calcsize(fmt) * length
+            view = buffer[position:position + size].cast(fmt)
+            position += size
+            return view
+
+        self.ids = take("q", count)
+        self.quiz_ids = take("q", count)
+        self.orders = take("q", count)
+        self.created_at = take("d", count)
+        self.updated_at = take("d", count)
+        self.weights = take("d", count)
+        self.correct_answers = take("B", count)
+        self.option_counts = take("B", count)
+        self.difficulties = take("B", count)
+        self.tag_counts = take("B", count)
+        position += -position % 8
+        self.offsets = take("Q", count + 1)
+        self.blob = buffer[position:position + blob_size]
+
+    def __len__(self) -> int:
+        return self.count
+
+    def index_of(self, question_id: int) -> Optional[int]:
+        i = bisect_left(self.ids, question_id)
+        if i < self.count and self.ids[i] == question_id:
+            return i
+        return None
+
+    def record(self, question_id: int) -> Optional[memoryview]:
+        """복사 없이 레코드 바이트 영역 반환"""
+        i = self.index_of(question_id)
+        if i is None:
+            return None
+        return self.blob[self.offsets[i]:self.offsets[i + 1]]
+
+    def get(self, question_id: int) -> Optional[SnapshotQuestion]:
+        i = self.index_of(question_id)
+        if i is None:
+            return None
+
+        start = self.offsets[i]
+        option_count = self.option_counts[i]
+        tag_count = self.tag_counts[i]
+        lengths = struct.unpack_from(f"<I{option_count + tag_count}I", self.blob, start)
+        position = start + 4 * len(lengths)
+        strings = []
+        for length in lengths:
+            strings.append(str(self.blob[position:position + length], "utf-8"))
+            position += length
+
+        order = self.orders[i]
+        return SnapshotQuestion(
+            id=question_id,
+            quiz_id=self.quiz_ids[i],
+            content=strings[0],
+            options=strings[1:option_count + 1],
+            correct_answer=self.correct_answers[i],
+            order=None if order == NO_ORDER else order,
+            tags=strings[option_count + 1:],
+            difficulty=DIFFICULTIES[self.difficulties[i] - 1] if self.difficulties[i] else None,
+            weight=self.weights[i],
+            is_active=True,
+            created_at=_datetime(self.created_at[i]),
+            updated_at=_datetime(self.updated_at[i]),
+        )
+
+    def get_many(self, question_ids: Iterable[int]) -> Dict[int, SnapshotQuestion]:
+        results = {}
+        for question_id in question_ids:
+            question = self.get(question_id)
+            if question is not None:
+                results[question_id] = question
+        return results
+
+
+# 워커별로 열린 스냅샷 (파일이 교체되면 다시 엶)
+_snapshot: Optional[QuestionSnapshot] = None
+_checked_at = 0.0
+_open_lock = threading.Lock()
+
+
+def get_snapshot() -> Optional[QuestionSnapshot]:
+    """현재 스냅샷 반환 (설정되지 않았거나 파일이 없으면 None)"""
+    global _snapshot, _checked_at
+    path = settings.QUESTION_SNAPSHOT_PATH
+    if not path:
+        return None
+
+    now = time.monotonic()
+    if _snapshot is not None and now - _checked_at < settings.QUESTION_SNAPSHOT_CHECK_INTERVAL:
+        return _snapshot
+
+    with _open_lock:
+        _checked_at = now
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            _snapshot = None
+            return None
+
+        identity = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        if _snapshot is None or _snapshot.identity != identity:
+            try:
+                _snapshot = QuestionSnapshot(path)
+            except (OSError, ValueError) as e:
+                logger.warning("문제 스냅샷을 열 수 없습니다: %s", e)
+                _snapshot = None
+        return _snapshot
+
+
+# 스냅샷 재생성 요청 병합 (생성 중에 다시 요청되면 끝난 뒤 한 번 더 생성)
+_rebuild_lock = threading.Lock()
+_rebuild_pending = False
+
+
+def request_rebuild() -> None:
+    """문제 변경 후 스냅샷 재생성 (BackgroundTasks 에서 호출)"""
+    global _rebuild_pending
+    path = settings.QUESTION_SNAPSHOT_PATH
+    if not path:
+        return
+
+    from app.db import SessionLocal
+
+    _rebuild_pending = True
+    while _rebuild_pending:
+        if not _rebuild_lock.acquire(blocking=False):
+            return  # 다른 스레드가 생성 중 - 잠금을 놓은 뒤 pending 을 다시 확인함
+        try:
+            while _rebuild_pending:
+                _rebuild_pending = False
+                db = SessionLocal()
+                try:
+                    count = build_snapshot(db, path)
+                    logger.info("문제 스냅샷 갱신: %d개", count)
+                except Exception:
+                    logger.exception("문제 스냅샷 생성 실패")
+                finally:
+                    db.close()
+        finally:
+            _rebuild_lock.release()
+        # 안쪽 확인과 잠금 해제 사이에 들어온 요청은 acquire 에 실패하고 돌아갔으므로 여기서 다시 확인
+
+
+def main():
+    from app.db import SessionLocal
+    import app.models.user, app.models.submission  # noqa: F401 (관계 대상 모델 등록)
+
+    parser = argparse.ArgumentParser(description="문제 스냅샷 생성")
+    parser.add_argument("--path", default=settings.QUESTION_SNAPSHOT_PATH, help="스냅샷 파일 경로")
+    args = parser.parse_args()
+    if not args.path:
+        parser.error("--path 또는 QUESTION_SNAPSHOT_PATH 환경변수가 필요합니다")
+
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        count = build_snapshot(db, args.path)
+        print(f"문제 {count}개 스냅샷 생성 완료: {args.path} ({time.perf_counter() - started:.2f}초)")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 # app/services/submission.py
 from typing import List, Optional, Dict, Any, Tuple
-from datetime import datetime
+from datetime import datetime, timezone
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 
@@ -9,6 +10,8 @@ from app.models.question import Question
 from app.models.submission import Submission, SubmissionAnswer
 from app.models.user import User
 from app.schemas.submission import SubmissionAnswerCreate
+from app.services import attempts, leaderboard, packed_answers, score_stats
+from app.services.grading import GRADED
 
 class SubmissionService:
     @staticmethod
@@ -52,29 +55,18 @@ class SubmissionService:
         # 기존 답안 삭제
         db.query(SubmissionAnswer).filter(SubmissionAnswer.submission_id == submission_id).delete()
 
-        # 새 답안 저장 및 채점
-        correct_count = 0
-        total_questions = len(submission.question_order)
-
-        for answer in answers:
-            question = db.query(Question).filter(Question.id == answer.question_id).first()
-
-            if not question:
-                continue
+        # 채점에 필요한 정답을 한 번에 조회
+        correct_answers = dict(
+            db.query(Question.id, Question.correct_answer).filter(
+                Question.id.in_([answer.question_id for answer in answers])
+            ).all()
+        )
 
-            # 정답 체크
-            is_correct = (answer.selected_option == question.correct_answer)
-            if is_correct:
-                correct_count += 1
-
-            # 답안 저장
-            submission_answer = SubmissionAnswer(
-                submission_id=submission_id,
-                question_id=answer.question_id,
-                selected_option=answer.selected_option,
-                is_correct=is_correct
-            )
-            db.add(submission_answer)
+        # 답안은 행 대신 제출에 압축해 저장하며 채점
+        total_questions = len(submission.question_order)
+        correct_count = packed_answers.pack_submission(
+            submission, {answer.question_id: answer.selected_option for answer in answers}, correct_answers
+        )
 
         # 점수 계산
         score = (correct_count / total_questions) * 100 if total_questions > 0 else 0
@@ -83,8 +75,15 @@ class SubmissionService:
         submission.submit_time = datetime.now()
         submission.is_completed = True
         submission.score = score
+        submission.grading_status = GRADED
+        submission.graded_at = datetime.now(timezone.utc)
+        attempts.record_submitted(db, submission_id, submission.quiz_id, submission.user_id, score)
+        # 커밋하면 속성이 만료되므로 리더보드 반영 값은 미리 꺼내 둠 (재조회 방지)
+        result = (submission.quiz_id, submission.user_id, score)
 
         db.commit()
+        leaderboard.record_results([result])
+        score_stats.record_results([result])
 
         return True, score
 
@@ -113,14 +112,16 @@ class SubmissionService:
         db.query(SubmissionAnswer).filter(SubmissionAnswer.submission_id == submission_id).delete()
 
         # 새 답안 저장 (채점하지 않음)
-        for answer in answers:
-            submission_answer = SubmissionAnswer(
-                submission_id=submission_id,
-                question_id=answer.question_id,
-                selected_option=answer.selected_option,
-                is_correct=None  # 채점하지 않음
-            )
-            db.add(submission_answer)
+        if answers:
+            db.execute(insert(SubmissionAnswer), [
+                {
+                    "submission_id": submission_id,
+                    "question_id": answer.question_id,
+                    "selected_option": answer.selected_option,
+                    "is_correct": None  # 채점하지 않음
+                }
+                for answer in answers
+            ])
 
         db.commit()
         return True
@@ -142,24 +143,36 @@ class SubmissionService:
         # 퀴즈 정보 조회
         quiz = db.query(Quiz).filter(Quiz.id == submission.quiz_id).first()
 
-        # 답안 정보 조회
-        answers = db.query(SubmissionAnswer).filter(
-            SubmissionAnswer.submission_id == submission_id
-        ).all()
+        # 답안과 문제 정보를 한 번에 조회 (압축된 제출은 답안을 풀고 문제만 조회)
+        if submission.packed_options is not None:
+            answers = packed_answers.expand(submission)
+            questions = {
+                question.id: question for question in db.query(Question).filter(
+                    Question.id.in_([answer["question_id"] for answer in answers])
+                )
+            } if answers else {}
+            rows = [
+                (answer["selected_option"], answer["is_correct"], questions[answer["question_id"]])
+                for answer in answers if answer["question_id"] in questions
+            ]
+        else:
+            rows = db.query(SubmissionAnswer.selected_option, SubmissionAnswer.is_correct, Question).join(
+                Question, Question.id == SubmissionAnswer.question_id
+            ).filter(
+                SubmissionAnswer.submission_id == submission_id
+            ).all()
 
         # 상세 정보 수집
         answer_details = []
-        for answer in answers:
-            question = db.query(Question).filter(Question.id == answer.question_id).first()
-            if question:
-                answer_details.append({
-                    "question_id": question.id,
-                    "question_content": question.content,
-                    "options": question.options,
-                    "correct_answer": question.correct_answer,
-                    "selected_option": answer.selected_option,
-                    "is_correct": answer.is_correct
-                })
+        for selected_option, is_correct, question in rows:
+            answer_details.append({
+                "question_id": question.id,
+                "question_content": question.content,
+                "options": question.options,
+                "correct_answer": question.correct_answer,
+                "selected_option": selected_option,
+                "is_correct": is_correct
+            })
 
         # 결과 구성
         result = {
@@ -0,0 +1,203 @@
+# app/services/warmup.py
+# 캐시 예열 - 배포/재시작 직후 첫 시험 트래픽이 DB 로 몰리지 않도록 미리 Redis 를 채움
+#
+# 예열 대상: 활성 퀴즈 목록, 퀴즈 메타데이터, 퀴즈별 활성 문제 ID 목록, 문제 데이터
+# - DB 는 배치 단위(문제는 ID 키셋 페이지네이션)로 읽고, Redis 는 파이프라인으로 한 번에 씀
+# - 이미 있는 키는 덮어쓰지 않으므로(SET NX) 트래픽이 들어오는 중에 실행해도 요청 경로가 채운 값과 충돌하지 않음
+# - 여러 워커가 동시에 기동해도 Redis 잠금으로 한 곳에서만 실행됨
+#
+# 사용법:
+#   python -m app.services.warmup                 # 모든 활성 퀴즈
+#   python -m app.services.warmup --quiz-id 1 --quiz-id 2
+import argparse
+import logging
+import threading
+import time
+import uuid
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.question import Question
+from app.models.quiz import Quiz
+from app.services.quiz_cache import serialize_question, serialize_quiz
+from app.utils.cache import (
+    active_quizzes_key,
+    get_redis,
+    question_ids_key,
+    question_key,
+    quiz_key,
+    set_many_cache,
+)
+
+logger = logging.getLogger(__name__)
+
+LOCK_KEY = "warmup:lock"
+LOCK_TTL_SECONDS = 300
+BATCH_SIZE = 1000
+
+# 종료 시 진행 중인 예열을 배치 경계에서 멈추기 위한 신호
+_stop = threading.Event()
+
+Progress = Callable[[str, int, int], None]
+
+
+def stop() -> None:
+    _stop.set()
+
+
+def _chunks(values: List[int], size: int):
+    for i in range(0, len(values), size):
+        yield values[i:i + size]
+
+
+def warm_up(
+        db: Session,
+        quiz_ids: Optional[List[int]] = None,
+        batch_size: int = BATCH_SIZE,
+        progress: Optional[Progress] = None,
+) -> Dict[str, float]:
+    """캐시 예열 실행 후 단계별 건수/소요 시간 반환
+
+    quiz_ids 를 지정하면 해당 퀴즈(활성 퀴즈 중)의 문제만 예열합니다. 퀴즈 목록/메타데이터는 항상 예열합니다.
+    progress(stage, done, total) 는 배치마다 호출됩니다.
+    """
+    ttl = settings.CACHE_TTL_SECONDS
+    report: Dict[str, float] = {}
+    started = time.perf_counter()
+
+    # 1. 활성 퀴즈 목록과 퀴즈별 메타데이터
+    quizzes = [serialize_quiz(quiz) for quiz in db.query(Quiz).filter(Quiz.is_active == True).order_by(Quiz.id)]
+    items = {active_quizzes_key(): quizzes}
+    items.update((quiz_key(quiz["id"]), quiz) for quiz in quizzes)
+    set_many_cache(items, ttl, only_if_missing=True)
+    db.commit()  # 배치 사이에는 트랜잭션을 닫아 긴 스냅샷을 잡지 않음
+    report["quizzes"] = len(quizzes)
+    report["quizzes_seconds"] = time.perf_counter() - started
+    if progress:
+        progress("quizzes", len(quizzes), len(quizzes))
+
+    active_ids = [quiz["id"] for quiz in quizzes]
+    if quiz_ids is not None:
+        wanted = set(quiz_ids)
+        active_ids = [quiz_id for quiz_id in active_ids if quiz_id in wanted]
+
+    # 2. 퀴즈별 활성 문제 ID 목록 (퀴즈 여러 개를 한 쿼리로)
+    stage_started = time.perf_counter()
+    done = 0
+    quiz_batch_size = max(1, batch_size // 10)
+    for chunk in _chunks(active_ids, quiz_batch_size):
+        if _stop.is_set():
+            break
+        question_ids = defaultdict(list)
+        for quiz_id, question_id in db.query(Question.quiz_id, Question.id).filter(
+                Question.quiz_id.in_(chunk),
+                Question.is_active == True
+        ).order_by(Question.quiz_id, Question.id):
+            question_ids[quiz_id].append(question_id)
+        set_many_cache(
+            {question_ids_key(quiz_id): question_ids[quiz_id] for quiz_id in chunk}, ttl, only_if_missing=True
+        )
+        db.commit()
+        done += len(chunk)
+        if progress:
+            progress("question_ids", done, len(active_ids))
+    report["question_id_sets"] = done
+    report["question_ids_seconds"] = time.perf_counter() - stage_started
+
+    # 3. 문제 데이터 (ID 키셋 페이지네이션)
+    stage_started = time.perf_counter()
+    total = db.query(Question.id).filter(
+        Question.quiz_id.in_(active_ids),
+        Question.is_active == True
+    ).count() if active_ids else 0
+    done = 0
+    last_id = 0
+    while active_ids and not _stop.is_set():
+        batch = db.query(Question).filter(
+            Question.quiz_id.in_(active_ids),
+            Question.is_active == True,
+            Question.id > last_id
+        ).order_by(Question.id).limit(batch_size).all()
+        if not batch:
+            break
+        set_many_cache(
+            {question_key(question.id): serialize_question(question) for question in batch}, ttl, only_if_missing=True
+        )
+        last_id = batch[-1].id
+        done += len(batch)
+        db.commit()
+        db.expunge_all()
+        if progress:
+            progress("questions", done, total)
+    report["questions"] = done
+    report["questions_seconds"] = time.perf_counter() - stage_started
+
+    report["seconds"] = time.perf_counter() - started
+    return report
+
+
+def run_warmup(quiz_ids: Optional[List[int]] = None, progress: Optional[Progress] = None) -> Optional[Dict[str, float]]:
+    """잠금을 잡고 새 세션으로 예열 실행 (lifespan/관리자 엔드포인트/CLI 공용)
+
+    Redis 를 쓸 수 없거나 다른 곳에서 이미 예열 중이면 None 을 반환합니다.
+    """
+    from app.db import SessionLocal
+
+    redis_client = get_redis()
+    if redis_client is None:
+        logger.info("Redis 를 사용할 수 없어 캐시 예열을 건너뜁니다")
+        return None
+
+    token = uuid.uuid4().hex
+    try:
+        if not redis_client.set(LOCK_KEY, token, nx=True, ex=LOCK_TTL_SECONDS):
+            logger.info("다른 프로세스에서 캐시 예열이 진행 중입니다")
+            return None
+    except Exception as e:
+        logger.warning("캐시 예열 잠금 오류: %s", e)
+        return None
+
+    _stop.clear()
+    db = SessionLocal()
+    try:
+        report = warm_up(db, quiz_ids, progress=progress)
+        logger.info(
+            "캐시 예열 완료: 퀴즈 %d개, 문제 ID 목록 %d개, 문제 %d개 (%.2f초)",
+            report["quizzes"], report["question_id_sets"], report["questions"], report["seconds"]
+        )
+        return report
+    except Exception:
+        logger.exception("캐시 예열 실패")
+        return None
+    finally:
+        db.close()
+        try:
+            if redis_client.get(LOCK_KEY) == token:
+                redis_client.delete(LOCK_KEY)
+        except Exception:
+            pass
+
+
+def main():
+    import app.models.user, app.models.submission  # noqa: F401 (관계 대상 모델 등록)
+
+    parser = argparse.ArgumentParser(description="Redis 캐시 예열")
+    parser.add_argument("--quiz-id", type=int, action="append", dest="quiz_ids", help="문제까지 예열할 퀴즈 ID (여러 번 지정 가능)")
+    args = parser.parse_args()
+
+    def print_progress(stage: str, done: int, total: int):
+        print(f"[{stage}] {done}/{total}")
+
+    report = run_warmup(args.quiz_ids, progress=print_progress)
+    if report is None:
+        print("캐시 예열을 실행하지 않았습니다 (Redis 연결 불가 또는 다른 프로세스에서 실행 중)")
+        return
+    for name, value in report.items():
+        print(f"{name}: {value:.3f}" if name.endswith("seconds") else f"{name}: {int(value)}")
+
+
+if __name__ == "__main__":
+    main()
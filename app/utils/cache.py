@@ -1,43 +1,89 @@
 # app/utils/cache.py
 import json
-from typing import Any, Optional
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional
 import redis
 from functools import wraps
 
 from app.config import settings
+from app.utils.metrics import record_cache
 
-# Redis 클라이언트 초기화
-try:
-    redis_client = redis.Redis(
-        host="localhost",  # settings에서 가져올 수도 있음
-        port=6379,
-        db=0,
-        decode_responses=True
-    )
-    # 연결 테스트
-    redis_client.ping()
-    REDIS_AVAILABLE = True
-except redis.exceptions.ConnectionError:
-    REDIS_AVAILABLE = False
-    print("Redis 서버에 연결할 수 없습니다. 캐싱이 비활성화됩니다.")
+logger = logging.getLogger(__name__)
+
+# Redis 클라이언트 - import 시점에 연결하지 않고 처음 사용할 때(또는 앱 lifespan 시작 시) 생성
+_redis_client: Optional[redis.Redis] = None
+_retry_at = 0.0
+_client_lock = threading.Lock()
+
+
+def get_redis() -> Optional[redis.Redis]:
+    """Redis 클라이언트 반환 (연결할 수 없으면 None, 일정 시간 후 재시도)"""
+    global _redis_client, _retry_at
+    if _redis_client is not None:
+        return _redis_client
+    if time.monotonic() < _retry_at:
+        return None
+
+    with _client_lock:
+        if _redis_client is not None:
+            return _redis_client
+        if time.monotonic() < _retry_at:
+            return None
+
+        client = redis.Redis.from_url(
+            settings.REDIS_URL,
+            decode_responses=True,
+            socket_connect_timeout=settings.REDIS_CONNECT_TIMEOUT,
+            socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+        )
+        try:
+            # 연결 테스트
+            client.ping()
+        except redis.exceptions.RedisError as e:
+            _retry_at = time.monotonic() + settings.REDIS_RETRY_INTERVAL
+            client.close()
+            logger.warning("Redis 서버에 연결할 수 없습니다. 캐싱이 비활성화됩니다: %s", e)
+            return None
+
+        _redis_client = client
+        return _redis_client
+
+
+def init_cache() -> bool:
+    """앱 시작 시 Redis 연결 시도"""
+    return get_redis() is not None
+
+
+def close_cache() -> None:
+    """앱 종료 시 Redis 연결 정리"""
+    global _redis_client
+    with _client_lock:
+        if _redis_client is not None:
+            _redis_client.close()
+            _redis_client = None
 
 def get_cache(key: str) -> Optional[Any]:
     """Redis 캐시에서 값을 가져옵니다."""
-    if not REDIS_AVAILABLE:
+    redis_client = get_redis()
+    if redis_client is None:
         return None
 
     try:
         data = redis_client.get(key)
+        record_cache(bool(data))
         if data:
             return json.loads(data)
         return None
     except Exception as e:
-        print(f"캐시 조회 오류: {e}")
+        logger.warning("캐시 조회 오류: %s", e)
         return None
 
 def set_cache(key: str, value: Any, expire_seconds: int = 600) -> bool:
     """Redis 캐시에 값을 저장합니다."""
-    if not REDIS_AVAILABLE:
+    redis_client = get_redis()
+    if redis_client is None:
         return False
 
     try:
@@ -45,24 +91,148 @@ def set_cache(key: str, value: Any, expire_seconds: int = 600) -> bool:
         redis_client.setex(key, expire_seconds, serialized)
         return True
     except Exception as e:
-        print(f"캐시 저장 오류: {e}")
+        logger.warning("캐시 저장 오류: %s", e)
+        return False
+
+def get_many_cache(keys: List[str]) -> List[Optional[Any]]:
+    """여러 키를 한 번에 조회합니다 (MGET). 없는 키는 None."""
+    redis_client = get_redis()
+    if redis_client is None or not keys:
+        return [None] * len(keys)
+
+    try:
+        values = redis_client.mget(keys)
+        results = []
+        for data in values:
+            record_cache(bool(data))
+            results.append(json.loads(data) if data else None)
+        return results
+    except Exception as e:
+        logger.warning("캐시 일괄 조회 오류: %s", e)
+        return [None] * len(keys)
+
+def set_many_cache(items: Dict[str, Any], expire_seconds: int = 600, only_if_missing: bool = False) -> bool:
+    """여러 키를 파이프라인으로 한 번에 저장합니다.
+
+    only_if_missing=True 이면 이미 있는 키는 덮어쓰지 않습니다 (SET NX).
+    """
+    redis_client = get_redis()
+    if redis_client is None:
+        return False
+    if not items:
+        return True
+
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        for key, value in items.items():
+            pipe.set(key, json.dumps(value), ex=expire_seconds, nx=only_if_missing)
+        pipe.execute()
+        return True
+    except Exception as e:
+        logger.warning("캐시 일괄 저장 오류: %s", e)
+        return False
+
+def get_hash_cache(key: str, field: str) -> Optional[Any]:
+    """해시 키의 필드 하나를 조회합니다 (HGET)."""
+    redis_client = get_redis()
+    if redis_client is None:
+        return None
+
+    try:
+        data = redis_client.hget(key, field)
+        record_cache(bool(data))
+        return json.loads(data) if data else None
+    except Exception as e:
+        logger.warning("캐시 조회 오류: %s", e)
+        return None
+
+def set_hash_cache(key: str, field: str, value: Any, expire_seconds: int = 600) -> bool:
+    """해시 키의 필드 하나를 저장합니다. 만료 시간은 키 전체에 적용됩니다."""
+    redis_client = get_redis()
+    if redis_client is None:
+        return False
+
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.hset(key, field, json.dumps(value))
+        pipe.expire(key, expire_seconds)
+        pipe.execute()
+        return True
+    except Exception as e:
+        logger.warning("캐시 저장 오류: %s", e)
+        return False
+
+def get_index_version(key: str) -> Optional[int]:
+    """색인 키의 무효화 버전 조회 (없으면 0, Redis 를 쓸 수 없으면 None)
+
+    본문을 읽기 전에 조회해 두었다가 set_hash_cache_if_version 에 넘깁니다.
+    """
+    redis_client = get_redis()
+    if redis_client is None:
+        return None
+
+    try:
+        return int(redis_client.get(index_version_key(key)) or 0)
+    except Exception as e:
+        logger.warning("캐시 조회 오류: %s", e)
+        return None
+
+def set_hash_cache_if_version(key: str, field: str, value: Any, version: int, expire_seconds: int = 600) -> bool:
+    """무효화 버전이 version 그대로일 때만 해시 필드를 저장합니다 (WATCH - 그 사이 무효화됐으면 버림)."""
+    redis_client = get_redis()
+    if redis_client is None:
+        return False
+
+    try:
+        with redis_client.pipeline() as pipe:
+            pipe.watch(index_version_key(key))
+            if int(pipe.get(index_version_key(key)) or 0) != version:
+                return False
+            pipe.multi()
+            pipe.hset(key, field, json.dumps(value))
+            pipe.expire(key, expire_seconds)
+            pipe.execute()
+        return True
+    except redis.exceptions.WatchError:
+        return False
+    except Exception as e:
+        logger.warning("캐시 저장 오류: %s", e)
+        return False
+
+def invalidate_index(key: str) -> bool:
+    """색인 키를 삭제하고 무효화 버전을 올립니다 (이전 버전으로 읽은 요청의 색인 저장을 막음)."""
+    redis_client = get_redis()
+    if redis_client is None:
+        return False
+
+    try:
+        pipe = redis_client.pipeline(transaction=True)
+        pipe.incr(index_version_key(key))
+        pipe.expire(index_version_key(key), settings.CACHE_TTL_SECONDS)
+        pipe.delete(key)
+        pipe.execute()
+        return True
+    except Exception as e:
+        logger.warning("캐시 삭제 오류: %s", e)
         return False
 
 def delete_cache(key: str) -> bool:
     """Redis 캐시에서 키를 삭제합니다."""
-    if not REDIS_AVAILABLE:
+    redis_client = get_redis()
+    if redis_client is None:
         return False
 
     try:
         redis_client.delete(key)
         return True
     except Exception as e:
-        print(f"캐시 삭제 오류: {e}")
+        logger.warning("캐시 삭제 오류: %s", e)
         return False
 
 def delete_pattern(pattern: str) -> bool:
     """주어진 패턴과 일치하는 모든 키를 삭제합니다."""
-    if not REDIS_AVAILABLE:
+    redis_client = get_redis()
+    if redis_client is None:
         return False
 
     try:
@@ -75,7 +245,7 @@ def delete_pattern(pattern: str) -> bool:
                 break
         return True
     except Exception as e:
-        print(f"패턴 캐시 삭제 오류: {e}")
+        logger.warning("패턴 캐시 삭제 오류: %s", e)
         return False
 
 # 캐시 데코레이터 - 함수 결과를 캐싱하는 데 사용
@@ -84,7 +254,7 @@ def cached(prefix: str, expire_seconds: int = 600):
     def decorator(func):
         @wraps(func)
         async def wrapper(*args, **kwargs):
-            if not REDIS_AVAILABLE:
+            if get_redis() is None:
                 return await func(*args, **kwargs)
 
             # 함수 이름과 인자를 기반으로 캐시 키 생성
@@ -119,4 +289,34 @@ def user_submissions_key(user_id: int) -> str:
     return f"user:{user_id}:submissions"
 
 def quiz_list_key(page: int, limit: int) -> str:
-    return f"quiz:list:page:{page}:limit:{limit}"
\ No newline at end of file
+    return f"quiz:list:page:{page}:limit:{limit}"
+
+def active_quizzes_key() -> str:
+    return "quiz:list:active"
+
+def question_ids_key(quiz_id: int) -> str:
+    return f"quiz:{quiz_id}:question_ids"
+
+def question_key(question_id: int) -> str:
+    return f"question:{question_id}"
+
+def quiz_etag_key(quiz_id: int) -> str:
+    return f"etag:quiz:{quiz_id}"
+
+def quiz_list_etag_key() -> str:
+    return "etag:quiz:list:active"
+
+def submission_etag_key(submission_id: int) -> str:
+    return f"etag:submission:{submission_id}"
+
+def index_version_key(key: str) -> str:
+    return f"{key}:version"
+
+def leaderboard_key(quiz_id: int) -> str:
+    return f"leaderboard:quiz:{quiz_id}"
+
+def score_stats_key(quiz_id: int, day: str) -> str:
+    return f"stats:quiz:{quiz_id}:{day}"
+
+def item_analysis_key(quiz_id: int) -> str:
+    return f"analysis:quiz:{quiz_id}"
@@ -0,0 +1,173 @@
+# app/utils/compression.py
+# 응답 압축 (Accept-Encoding 협상: zstd, gzip)
+#
+# - CompressionMiddleware : 임계값 이상인 JSON/텍스트 응답을 요청마다 압축
+# - compress_cached       : ETag 가 있는(바뀌지 않거나 드물게 바뀌는) 본문은 압축 결과를 ETag 별로 보관해
+#                           같은 퀴즈를 학생마다 다시 압축하지 않음 (conditional_response 에서 사용)
+# zstd 는 zstandard 패키지가 있을 때만 사용합니다.
+import gzip
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from app.config import settings
+from app.utils.metrics import record_compression
+
+try:
+    import zstandard
+except ImportError:  # 선택 의존성
+    zstandard = None
+
+# 서버 선호 순서 (클라이언트 q 값이 같으면 앞쪽 선택)
+ENCODINGS: Tuple[str, ...] = ("zstd", "gzip") if zstandard is not None else ("gzip",)
+COMPRESSIBLE_TYPES = ("application/json", "text/")
+
+# ZstdCompressor 는 스레드 간에 공유할 수 없어 스레드마다 생성
+_local = threading.local()
+
+
+def negotiate(accept_encoding: Optional[str]) -> Optional[str]:
+    """Accept-Encoding 에서 사용할 인코딩 선택 (없으면 None - 압축하지 않음)"""
+    if not accept_encoding:
+        return None
+    weights = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name.strip().lower()] = q
+
+    best, best_q = None, 0.0
+    for encoding in ENCODINGS:
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    started = time.perf_counter()
+    if encoding == "zstd":
+        compressor = getattr(_local, "zstd", None)
+        if compressor is None:
+            compressor = _local.zstd = zstandard.ZstdCompressor(level=settings.ZSTD_LEVEL)
+        data = compressor.compress(body)
+    else:
+        # mtime 고정 - 같은 본문이면 항상 같은 바이트
+        data = gzip.compress(body, compresslevel=settings.GZIP_LEVEL, mtime=0)
+    record_compression(encoding, len(body), len(data), time.perf_counter() - started)
+    return data
+
+
+class CompressedCache:
+    """(ETag, 인코딩) → 압축된 본문 LRU (전체 크기 제한)"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._items: "OrderedDict[Tuple[str, str], bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple[str, str]) -> Optional[bytes]:
+        with self._lock:
+            data = self._items.get(key)
+            if data is not None:
+                self._items.move_to_end(key)
+            return data
+
+    def put(self, key: Tuple[str, str], data: bytes) -> None:
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._items.pop(key, None)
+            if previous is not None:
+                self.size -= len(previous)
+            self._items[key] = data
+            self.size += len(data)
+            while self.size > self.max_bytes:
+                _, evicted = self._items.popitem(last=False)
+                self.size -= len(evicted)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self.size = 0
+
+
+_cache = CompressedCache(settings.COMPRESSION_CACHE_BYTES)
+
+
+def compress_cached(etag: str, body: bytes, encoding: str) -> bytes:
+    """ETag 가 같으면 본문도 같으므로 압축 결과를 재사용"""
+    key = (etag, encoding)
+    data = _cache.get(key)
+    if data is None:
+        data = compress(body, encoding)
+        _cache.put(key, data)
+    else:
+        record_compression(encoding, len(body), len(data), 0.0, cached=True)
+    return data
+
+
+def should_compress(size: int, content_type: Optional[str]) -> bool:
+    return size >= settings.COMPRESSION_MIN_SIZE and (content_type or "").startswith(COMPRESSIBLE_TYPES)
+
+
+class CompressionMiddleware:
+    """임계값 이상인 응답을 협상된 인코딩으로 압축하는 ASGI 미들웨어
+
+    이미 Content-Encoding 이 있는 응답(미리 압축된 본문)과 스트리밍 응답은 그대로 보냅니다.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+
+        async def send_wrapper(message):
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                # 본문 크기를 볼 때까지 보류
+                start_message = message
+                return
+            if start_message is None or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            start, start_message = start_message, None
+            headers = MutableHeaders(scope=start)
+            body = message.get("body", b"")
+            if (
+                message.get("more_body", False)
+                or "content-encoding" in headers
+                or not should_compress(len(body), headers.get("content-type"))
+            ):
+                await send(start)
+                await send(message)
+                return
+
+            body = compress(body, encoding)
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(body))
+            headers.add_vary_header("Accept-Encoding")
+            await send(start)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_wrapper)
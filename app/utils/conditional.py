@@ -0,0 +1,147 @@
+# app/utils/conditional.py
+# HTTP 조건부 요청 (ETag / Last-Modified)
+#
+# 응답 본문의 해시로 강한 ETag 를 만들고, 검증자(ETag, Last-Modified, 본문 크기)를 Redis 해시에 색인해 둡니다.
+# 다음 요청의 If-None-Match/If-Modified-Since 가 색인과 맞으면 DB 조회와 직렬화 없이 304 로 응답합니다.
+# 색인은 리소스가 바뀔 때 삭제하고(invalidate_quiz 등), 없으면 전체 경로로 응답하면서 다시 채웁니다.
+# 삭제할 때 키별 무효화 버전도 올리고, 다시 채울 때는 본문을 읽기 전에 본 버전 그대로일 때만 저장하므로
+# 읽는 도중 리소스가 바뀌면 이전 본문의 ETag 가 색인에 남지 않습니다.
+# 압축된 표현은 ETag 에 인코딩을 붙여 구분하고("<해시>-gzip"), 압축 결과는 ETag 별로 재사용합니다.
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+from fastapi import Request, Response, status
+from pydantic import TypeAdapter
+
+from app.config import settings
+from app.utils.cache import get_hash_cache, set_hash_cache_if_version
+from app.utils.compression import ENCODINGS, compress, compress_cached, negotiate, should_compress
+from app.utils.metrics import record_not_modified
+
+# 인증이 필요한 응답이므로 공유 캐시에는 저장하지 않고, 브라우저는 매번 재검증
+CACHE_CONTROL = "private, no-cache"
+
+
+@lru_cache(maxsize=None)
+def _adapter(model: Any) -> TypeAdapter:
+    return TypeAdapter(model)
+
+
+def render(model: Any, content: Any) -> bytes:
+    """응답 스키마로 검증한 JSON 본문 (response_model 과 같은 결과)"""
+    adapter = _adapter(model)
+    return adapter.dump_json(adapter.validate_python(content, from_attributes=True))
+
+
+def make_etag(body: bytes) -> str:
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def format_http_date(value: datetime) -> str:
+    if value.tzinfo is None:
+        # SQLite 는 시간대 없이 돌려주므로 UTC 로 간주
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def _base_etag(tag: str) -> str:
+    """W/ 접두어와 압축 표현의 인코딩 접미사를 뗀 ETag"""
+    tag = tag.strip().removeprefix("W/")
+    for encoding in ENCODINGS:
+        suffix = f'-{encoding}"'
+        if tag.endswith(suffix):
+            return tag[:-len(suffix)] + '"'
+    return tag
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    # If-None-Match 는 약한 비교 (같은 본문의 다른 인코딩 표현도 일치로 봄)
+    if if_none_match.strip() == "*":
+        return True
+    return _base_etag(etag) in {_base_etag(tag) for tag in if_none_match.split(",")}
+
+
+def _not_modified_since(if_modified_since: str, last_modified: str) -> bool:
+    try:
+        return parsedate_to_datetime(last_modified) <= parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+
+
+def is_fresh(request: Request, validators: Dict[str, Any]) -> bool:
+    """클라이언트가 가진 사본이 최신인지 (If-None-Match 가 있으면 If-Modified-Since 는 무시)"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, validators["etag"])
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is not None and validators.get("last_modified"):
+        return _not_modified_since(if_modified_since, validators["last_modified"])
+    return False
+
+
+def _encoding(request: Request, validators: Dict[str, Any]) -> Optional[str]:
+    """이 요청에 보낼 표현의 인코딩 (압축하지 않으면 None)"""
+    if not should_compress(validators.get("size", 0), "application/json"):
+        return None
+    return negotiate(request.headers.get("accept-encoding"))
+
+
+def _headers(validators: Dict[str, Any], encoding: Optional[str]) -> Dict[str, str]:
+    etag = validators["etag"]
+    headers = {"Cache-Control": CACHE_CONTROL, "Vary": "Accept-Encoding"}
+    if encoding is not None:
+        etag = etag[:-1] + f'-{encoding}"'
+        headers["Content-Encoding"] = encoding
+    headers["ETag"] = etag
+    if validators.get("last_modified"):
+        headers["Last-Modified"] = validators["last_modified"]
+    return headers
+
+
+def not_modified(request: Request, validators: Dict[str, Any]) -> Response:
+    record_not_modified(validators.get("size", 0))
+    headers = _headers(validators, _encoding(request, validators))
+    # 304 는 본문이 없으므로 Content-Encoding 없이 선택된 표현의 ETag 만 보냄
+    headers.pop("Content-Encoding", None)
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+
+def get_validators(key: str, field: str = "detail") -> Optional[Dict[str, Any]]:
+    """색인된 검증자 조회 (없거나 Redis 를 쓸 수 없으면 None)"""
+    return get_hash_cache(key, field)
+
+
+def conditional_response(
+        request: Request,
+        body: bytes,
+        *,
+        last_modified: Optional[datetime] = None,
+        index_key: Optional[str] = None,
+        index_field: str = "detail",
+        index_version: Optional[int] = None,
+        owner_id: Optional[int] = None
+) -> Response:
+    """본문으로 검증자를 만들어 200 또는 304 응답 (index_key 가 있으면 다음 요청을 위해 색인)
+
+    index_version 은 본문을 읽기 전에 get_index_version 으로 조회한 값이며, 그 사이 무효화됐으면 색인하지 않습니다.
+    owner_id 를 함께 색인하면 색인만으로 304 를 보낼 때 본인 확인에 사용합니다.
+    """
+    validators: Dict[str, Any] = {"etag": make_etag(body), "size": len(body)}
+    if last_modified is not None:
+        validators["last_modified"] = format_http_date(last_modified)
+    if owner_id is not None:
+        validators["user_id"] = owner_id
+    if index_key is not None and index_version is not None:
+        set_hash_cache_if_version(index_key, index_field, validators, index_version, settings.CACHE_TTL_SECONDS)
+
+    if is_fresh(request, validators):
+        return not_modified(request, validators)
+
+    encoding = _encoding(request, validators)
+    if encoding is not None:
+        # 색인되는(바뀌지 않거나 드물게 바뀌는) 본문만 압축 결과를 보관
+        body = compress_cached(validators["etag"], body, encoding) if index_key is not None else compress(body, encoding)
+    return Response(content=body, media_type="application/json", headers=_headers(validators, encoding))
@@ -0,0 +1,286 @@
+# app/utils/metrics.py
+# 요청 단위 성능 지표 수집 및 Prometheus 텍스트 포맷 출력
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Dict, Iterable, Optional, Tuple
+
+# 지연 시간 히스토그램 구간 (초)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# 요청당 쿼리 수 히스토그램 구간
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250)
+
+
+class Histogram:
+    """누적 구간 히스토그램 (Prometheus histogram 형식)"""
+    __slots__ = ("buckets", "counts", "total", "count")
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # 마지막 칸은 +Inf
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+
+class RequestStats:
+    """요청 하나 동안 누적되는 DB/캐시 통계"""
+    __slots__ = ("query_count", "db_time", "cache_hits", "cache_misses")
+
+    def __init__(self):
+        self.query_count = 0
+        self.db_time = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+
+# 현재 요청의 통계 (동기 엔드포인트는 스레드풀에서 실행되지만 컨텍스트가 복사되므로 같은 객체를 공유함)
+_current_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+_lock = threading.Lock()
+_latency: Dict[Tuple[str, str], Histogram] = {}
+_db_queries: Dict[Tuple[str, str], Histogram] = {}
+_db_seconds: Dict[Tuple[str, str], Histogram] = {}
+_responses: Dict[Tuple[str, str, int], int] = {}
+_grading_lag = Histogram(LATENCY_BUCKETS)
+_grading_batch = Histogram(QUERY_COUNT_BUCKETS)
+_compression: Dict[str, Dict[str, float]] = {}
+_totals = {
+    "db_queries": 0,
+    "db_seconds": 0.0,
+    "cache_hits": 0,
+    "cache_misses": 0,
+    "not_modified": 0,
+    "not_modified_bytes": 0,
+}
+
+
+def current_stats() -> Optional[RequestStats]:
+    """현재 요청의 통계 객체 (요청 밖에서는 None)"""
+    return _current_stats.get()
+
+
+def totals() -> Dict[str, float]:
+    """프로세스 전체 누적 DB/캐시 지표 (벤치마크에서 구간별 차이 계산용)"""
+    with _lock:
+        return dict(_totals)
+
+
+def record_query(elapsed: float) -> None:
+    """SQL 실행 1회 기록"""
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.query_count += 1
+        stats.db_time += elapsed
+    with _lock:
+        _totals["db_queries"] += 1
+        _totals["db_seconds"] += elapsed
+
+
+def record_cache(hit: bool) -> None:
+    """캐시 조회 결과 기록"""
+    stats = _current_stats.get()
+    key = "cache_hits" if hit else "cache_misses"
+    if stats is not None:
+        if hit:
+            stats.cache_hits += 1
+        else:
+            stats.cache_misses += 1
+    with _lock:
+        _totals[key] += 1
+
+
+def record_request(method: str, route: str, status_code: int, elapsed: float, stats: RequestStats) -> None:
+    """요청 완료 시 라우트별 지표 기록"""
+    key = (method, route)
+    with _lock:
+        histogram = _latency.get(key)
+        if histogram is None:
+            histogram = _latency[key] = Histogram(LATENCY_BUCKETS)
+            _db_queries[key] = Histogram(QUERY_COUNT_BUCKETS)
+            _db_seconds[key] = Histogram(LATENCY_BUCKETS)
+        histogram.observe(elapsed)
+        _db_queries[key].observe(stats.query_count)
+        _db_seconds[key].observe(stats.db_time)
+        response_key = (method, route, status_code)
+        _responses[response_key] = _responses.get(response_key, 0) + 1
+
+
+def record_grading(lags: Iterable[float]) -> None:
+    """비동기 채점 배치 1회 기록 (제출 → 채점 완료까지의 지연 시간)"""
+    lags = list(lags)
+    with _lock:
+        for lag in lags:
+            _grading_lag.observe(lag)
+        _grading_batch.observe(len(lags))
+
+
+def record_not_modified(bytes_saved: int) -> None:
+    """조건부 요청에 304 로 응답 (본문을 보내지 않아 절약한 바이트 수)"""
+    with _lock:
+        _totals["not_modified"] += 1
+        _totals["not_modified_bytes"] += bytes_saved
+
+
+def record_compression(encoding: str, raw_bytes: int, compressed_bytes: int, elapsed: float, cached: bool = False) -> None:
+    """응답 압축 1회 기록 (cached=True 면 미리 압축해 둔 본문을 재사용)"""
+    with _lock:
+        stats = _compression.setdefault(encoding, {
+            "responses": 0, "cache_hits": 0, "raw_bytes": 0, "compressed_bytes": 0, "seconds": 0.0
+        })
+        stats["responses"] += 1
+        stats["cache_hits"] += cached
+        stats["raw_bytes"] += raw_bytes
+        stats["compressed_bytes"] += compressed_bytes
+        stats["seconds"] += elapsed
+
+
+def reset() -> None:
+    """수집된 지표 초기화 (테스트/벤치마크용)"""
+    global _grading_lag, _grading_batch
+    with _lock:
+        _grading_lag = Histogram(LATENCY_BUCKETS)
+        _grading_batch = Histogram(QUERY_COUNT_BUCKETS)
+        _latency.clear()
+        _db_queries.clear()
+        _db_seconds.clear()
+        _responses.clear()
+        _compression.clear()
+        for key in _totals:
+            _totals[key] = 0
+
+
+# SQLAlchemy 엔진 이벤트 핸들러
+def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._query_start_time = time.perf_counter()
+
+
+def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    record_query(time.perf_counter() - context._query_start_time)
+
+
+def instrument_engine(engine) -> None:
+    """엔진에 쿼리 수/DB 시간 측정 이벤트 등록"""
+    from sqlalchemy import event
+
+    if not event.contains(engine, "before_cursor_execute", before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", after_cursor_execute)
+
+
+class MetricsMiddleware:
+    """라우트별 지연 시간과 요청당 DB/캐시 통계를 기록하는 ASGI 미들웨어
+
+    BaseHTTPMiddleware 대신 순수 ASGI로 구현하여 요청당 오버헤드를 수 마이크로초로 유지합니다.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current_stats.set(stats)
+        status_holder = [500]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status_holder[0] = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            _current_stats.reset(token)
+            # 매칭된 라우트의 경로 템플릿 사용 (예: /api/quizzes/{quiz_id}) - 라벨 수 폭증 방지
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or "unmatched"
+            record_request(scope["method"], route_path, status_holder[0], elapsed, stats)
+
+
+def _format_labels(**labels) -> str:
+    inner = ",".join(f'{name}="{value}"' for name, value in labels.items())
+    return "{" + inner + "}"
+
+
+def _render_series(lines, name: str, histogram: Histogram, **labels) -> None:
+    cumulative = 0
+    for bound, count in zip(histogram.buckets, histogram.counts):
+        cumulative += count
+        lines.append(f"{name}_bucket{_format_labels(**labels, le=f'{bound:g}')} {cumulative}")
+    lines.append(f"{name}_bucket{_format_labels(**labels, le='+Inf')} {histogram.count}")
+    suffix = _format_labels(**labels) if labels else ""
+    lines.append(f"{name}_sum{suffix} {histogram.total:.6f}")
+    lines.append(f"{name}_count{suffix} {histogram.count}")
+
+
+def _render_histogram(lines, name: str, help_text: str, series: Dict[Tuple[str, str], Histogram]) -> None:
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} histogram")
+    for (method, route), histogram in sorted(series.items()):
+        _render_series(lines, name, histogram, method=method, route=route)
+
+
+def render_prometheus() -> str:
+    """수집된 지표를 Prometheus 텍스트 포맷(0.0.4)으로 변환"""
+    lines = []
+    with _lock:
+        _render_histogram(lines, "http_request_duration_seconds", "HTTP 요청 처리 시간", _latency)
+        _render_histogram(lines, "http_request_db_queries", "요청당 실행된 SQL 수", _db_queries)
+        _render_histogram(lines, "http_request_db_seconds", "요청당 DB 소요 시간", _db_seconds)
+
+        lines.append("# HELP http_responses_total 라우트/상태 코드별 응답 수")
+        lines.append("# TYPE http_responses_total counter")
+        for (method, route, status_code), count in sorted(_responses.items()):
+            labels = _format_labels(method=method, route=route, status=status_code)
+            lines.append(f"http_responses_total{labels} {count}")
+
+        lines.append("# HELP db_queries_total 실행된 전체 SQL 수")
+        lines.append("# TYPE db_queries_total counter")
+        lines.append(f"db_queries_total {_totals['db_queries']}")
+        lines.append("# HELP db_query_seconds_total 전체 DB 소요 시간")
+        lines.append("# TYPE db_query_seconds_total counter")
+        lines.append(f"db_query_seconds_total {_totals['db_seconds']:.6f}")
+
+        lines.append("# HELP cache_requests_total 캐시 조회 결과별 횟수")
+        lines.append("# TYPE cache_requests_total counter")
+        lines.append(f'cache_requests_total{{result="hit"}} {_totals["cache_hits"]}')
+        lines.append(f'cache_requests_total{{result="miss"}} {_totals["cache_misses"]}')
+
+        lines.append("# HELP http_not_modified_total 조건부 요청에 304 로 응답한 수")
+        lines.append("# TYPE http_not_modified_total counter")
+        lines.append(f"http_not_modified_total {_totals['not_modified']}")
+        lines.append("# HELP http_not_modified_bytes_saved_total 304 응답으로 보내지 않은 본문 바이트 수")
+        lines.append("# TYPE http_not_modified_bytes_saved_total counter")
+        lines.append(f"http_not_modified_bytes_saved_total {_totals['not_modified_bytes']}")
+
+        for name, key, help_text in (
+            ("compression_responses_total", "responses", "압축해서 보낸 응답 수"),
+            ("compression_cache_hits_total", "cache_hits", "미리 압축해 둔 본문을 재사용한 응답 수"),
+            ("compression_raw_bytes_total", "raw_bytes", "압축 전 본문 바이트 수"),
+            ("compression_compressed_bytes_total", "compressed_bytes", "압축 후 본문 바이트 수"),
+            ("compression_seconds_total", "seconds", "압축에 사용한 CPU 시간"),
+        ):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} counter")
+            for encoding, stats in sorted(_compression.items()):
+                lines.append(f"{name}{_format_labels(encoding=encoding)} {stats[key]:g}")
+
+        lines.append("# HELP grading_lag_seconds 제출부터 비동기 채점 완료까지의 시간")
+        lines.append("# TYPE grading_lag_seconds histogram")
+        _render_series(lines, "grading_lag_seconds", _grading_lag)
+        lines.append("# HELP grading_batch_size 채점 트랜잭션 하나에서 채점한 제출 수")
+        lines.append("# TYPE grading_batch_size histogram")
+        _render_series(lines, "grading_batch_size", _grading_batch)
+
+    return "\n".join(lines) + "\n"
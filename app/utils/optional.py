@@ -0,0 +1,15 @@
+# app/utils/optional.py
+# 선택 의존성 지연 로딩 - 임포트가 무거운 패키지는 서버 시작 시가 아니라 처음 쓸 때 한 번만 불러옴
+from functools import lru_cache
+from types import ModuleType
+from typing import Optional
+
+
+@lru_cache(maxsize=None)
+def numpy() -> Optional[ModuleType]:
+    """numpy 모듈 (설치되지 않았으면 None, 결과는 프로세스에 한 번만 계산)"""
+    try:
+        import numpy as np
+    except ImportError:
+        return None
+    return np
@@ -0,0 +1,112 @@
+# benchmarks/bench_blueprint.py
+# 블루프린트 출제 - 응시 기록 하나의 문제 추출 지연 (구간 색인 + 가중치 추출 vs 전체 문제를 걸러 뽑기)
+#
+# 사용법:
+#   python -m benchmarks.bench_blueprint --questions 1000000 --tags 20 --draws 2000
+#
+# 태그 --tags 개, 난이도 3단계, 가중치 0.5~2 인 문제 --questions 개로
+#   - 색인 생성 시간(초)과 블루프린트 "5 easy tag-0, 3 hard tag-1, 2 medium (태그 무관)" 추출 p50/p95(ms)
+#   - 비교 기준: 매번 전체 문제 목록에서 구간 조건으로 걸러 random.choices 로 가중치 비복원 추출한 p50/p95(ms)
+# 를 DB 없이 메모리에서 측정해 JSON 으로 출력합니다.
+import argparse
+import json
+import random
+import time
+from datetime import datetime, timezone
+
+from app.models.question import DIFFICULTIES
+from app.services import blueprint
+from benchmarks.load_test import current_commit, percentile
+
+SECTIONS = [
+    {"tag": "tag-0", "difficulty": "easy", "count": 5},
+    {"tag": "tag-1", "difficulty": "hard", "count": 3},
+    {"tag": None, "difficulty": "medium", "count": 2},
+]
+
+
+def filtered_draw(questions, rng: random.Random):
+    """비교 기준 - 구간마다 전체 문제를 훑어 후보를 만들고 가중치로 하나씩 뽑음"""
+    chosen = []
+    for section in SECTIONS:
+        candidates = [
+            (question_id, weight) for question_id, tags, difficulty, weight in questions
+            if (section["tag"] is None or section["tag"] in tags) and difficulty == section["difficulty"]
+            and question_id not in chosen
+        ]
+        for _ in range(section["count"]):
+            i = rng.choices(range(len(candidates)), weights=[weight for _, weight in candidates])[0]
+            chosen.append(candidates.pop(i)[0])
+    return chosen
+
+
+def run(args) -> dict:
+    rng = random.Random(args.seed)
+    questions = [
+        (
+            question_id,
+            rng.sample([f"tag-{i}" for i in range(args.tags)], rng.randint(1, 2)),
+            rng.choice(DIFFICULTIES),
+            rng.uniform(0.5, 2.0),
+        )
+        for question_id in range(1, args.questions + 1)
+    ]
+
+    started = time.perf_counter()
+    index = blueprint.BlueprintIndex(questions)
+    build_seconds = time.perf_counter() - started
+
+    latencies = []
+    for _ in range(args.draws):
+        started = time.perf_counter()
+        order = index.draw(SECTIONS, rng=rng)
+        latencies.append((time.perf_counter() - started) * 1000)
+        assert len(order) == 10
+    latencies.sort()
+
+    baseline = []
+    for _ in range(args.baseline_draws):
+        started = time.perf_counter()
+        filtered_draw(questions, rng)
+        baseline.append((time.perf_counter() - started) * 1000)
+    baseline.sort()
+
+    return {
+        "commit": current_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "scenario": {
+            "questions": args.questions,
+            "tags": args.tags,
+            "sections": SECTIONS,
+            "stock": [index.stock(section["tag"], section["difficulty"]) for section in SECTIONS],
+        },
+        "results": {
+            "index_build_seconds": build_seconds,
+            "draw_p50_ms": percentile(latencies, 50),
+            "draw_p95_ms": percentile(latencies, 95),
+            "baseline_p50_ms": percentile(baseline, 50),
+            "baseline_p95_ms": percentile(baseline, 95),
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="블루프린트 출제 - 구간 색인 추출 vs 전체 문제 필터링")
+    parser.add_argument("--questions", type=int, default=1_000_000)
+    parser.add_argument("--tags", type=int, default=20)
+    parser.add_argument("--draws", type=int, default=2000, help="색인 추출 횟수")
+    parser.add_argument("--baseline-draws", type=int, default=20, help="비교 기준 추출 횟수")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    report = run(args)
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
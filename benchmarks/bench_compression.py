@@ -0,0 +1,112 @@
+# benchmarks/bench_compression.py
+# 응답 종류별 압축 CPU 비용 vs 절약한 전송량
+#
+# 사용법:
+#   python -m benchmarks.bench_compression --questions 500 --repeat 200
+#   python -m benchmarks.bench_compression --base-url http://localhost:8000
+#
+# 퀴즈 상세/목록, 응시 페이지(/take), 채점된 제출 상세의 실제 응답 본문을 받아
+# 인코딩(gzip, zstandard 가 있으면 zstd)별로 --repeat 번 압축해 평균 압축 시간, 압축률, 절약 바이트,
+# 1KB 절약당 CPU 시간과 미리 압축해 둔 본문을 재사용할 때의 조회 시간을 JSON 으로 출력합니다.
+import argparse
+import asyncio
+import json
+import time
+from datetime import datetime, timezone
+
+from app.config import settings
+from app.utils.compression import ENCODINGS, CompressedCache, compress
+from benchmarks.bench_conditional import prepare_submission
+from benchmarks.load_test import API_PREFIX, current_commit, make_client, prepare_quiz
+
+
+async def fetch_payloads(args) -> dict:
+    async with make_client(args.base_url, args.timeout) as client:
+        quiz_id = await prepare_quiz(client, args.questions, args.admin_user, args.admin_password)
+        headers, submission_id = await prepare_submission(client, quiz_id)
+        headers = {**headers, "Accept-Encoding": "identity"}
+        urls = {
+            "quiz_detail": f"{API_PREFIX}/quizzes/{quiz_id}",
+            "quiz_list": f"{API_PREFIX}/quizzes/?page_size=100",
+            "take_page": f"{API_PREFIX}/quizzes/{quiz_id}/take",
+            "submission_detail": f"{API_PREFIX}/submissions/{submission_id}",
+        }
+        payloads = {}
+        for name, url in urls.items():
+            response = await client.get(url, headers=headers)
+            response.raise_for_status()
+            payloads[name] = response.content
+        return payloads
+
+
+def measure(body: bytes, encoding: str, repeat: int) -> dict:
+    started = time.process_time()
+    for _ in range(repeat):
+        data = compress(body, encoding)
+    compress_ms = (time.process_time() - started) / repeat * 1000
+
+    cache = CompressedCache(settings.COMPRESSION_CACHE_BYTES)
+    cache.put(("etag", encoding), data)
+    started = time.perf_counter()
+    for _ in range(repeat):
+        cache.get(("etag", encoding))
+    lookup_us = (time.perf_counter() - started) / repeat * 1_000_000
+
+    saved = len(body) - len(data)
+    return {
+        "compressed_bytes": len(data),
+        "ratio": len(data) / len(body) if body else None,
+        "saved_bytes": saved,
+        "compress_cpu_ms": compress_ms,
+        "cpu_ms_per_kb_saved": compress_ms / (saved / 1024) if saved > 0 else None,
+        "cached_lookup_us": lookup_us,
+        # 임계값 미만이면 실제 응답은 압축하지 않음
+        "compressed_in_app": len(body) >= settings.COMPRESSION_MIN_SIZE,
+    }
+
+
+def run(args) -> dict:
+    payloads = asyncio.run(fetch_payloads(args))
+    results = {
+        name: {
+            "raw_bytes": len(body),
+            "encodings": {encoding: measure(body, encoding, args.repeat) for encoding in ENCODINGS},
+        }
+        for name, body in payloads.items()
+    }
+    return {
+        "commit": current_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "target": args.base_url or "asgi",
+        "scenario": {
+            "questions": args.questions,
+            "repeat": args.repeat,
+            "min_size": settings.COMPRESSION_MIN_SIZE,
+            "gzip_level": settings.GZIP_LEVEL,
+            "zstd_level": settings.ZSTD_LEVEL if "zstd" in ENCODINGS else None,
+        },
+        "results": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="응답 종류별 압축 CPU 비용 vs 절약한 전송량")
+    parser.add_argument("--base-url", help="실행 중인 서버 주소 (생략 시 프로세스 내 ASGI 앱 사용)")
+    parser.add_argument("--questions", type=int, default=500, help="퀴즈 문제 수 (퀴즈 상세 본문 크기)")
+    parser.add_argument("--repeat", type=int, default=200, help="인코딩별 압축 반복 횟수")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--admin-user", default="admin")
+    parser.add_argument("--admin-password", default="admin1234")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    report = run(args)
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+# benchmarks/bench_conditional.py
+# 조건부 요청(ETag) 재검증 vs 전체 응답 비교 - 퀴즈 상세/목록, 채점된 제출 상세
+#
+# 사용법:
+#   python -m benchmarks.bench_conditional --questions 100 --requests 2000
+#   python -m benchmarks.bench_conditional --base-url http://localhost:8000
+#
+# 대상마다 같은 요청을 --requests 번 보냅니다.
+# - full       : 검증자 없이 요청 (매번 200 과 전체 본문)
+# - revalidate : 첫 응답의 ETag 를 If-None-Match 로 보냄 (Redis 에 색인이 있으면 DB 조회 없이 304)
+# 결과는 대상/모드별 p50/p95/p99 지연 시간(ms), 요청당 본문 바이트, 요청당 SQL 수를 담은 JSON 입니다.
+import argparse
+import asyncio
+import json
+from datetime import datetime, timezone
+
+from app.utils import metrics
+from benchmarks.load_test import (
+    API_PREFIX,
+    STUDENT_PASSWORD,
+    Recorder,
+    current_commit,
+    login,
+    make_client,
+    prepare_quiz,
+    prepare_students,
+)
+
+
+async def prepare_submission(client, quiz_id: int) -> tuple:
+    """학생 한 명이 응시하고 제출해 채점된 제출 기록을 만듦"""
+    username = (await prepare_students(client, 1, 1))[0]
+    headers = await login(client, username, STUDENT_PASSWORD)
+    questions = (await client.get(f"{API_PREFIX}/quizzes/{quiz_id}/take", headers=headers)).json()
+    submissions = (await client.get(f"{API_PREFIX}/submissions/my", headers=headers)).json()
+    submission_id = next(s["id"] for s in submissions if s["quiz_id"] == quiz_id and not s["is_completed"])
+    answers = [{"question_id": q["id"], "selected_option": 0} for q in questions]
+    response = await client.post(f"{API_PREFIX}/submissions/{submission_id}/answers", headers=headers, json=answers)
+    response.raise_for_status()
+    if response.status_code == 202:
+        # 비동기 채점이면 채점이 끝난 뒤부터 색인됨
+        await client.get(response.json()["status_url"], headers=headers, params={"wait": 30})
+    return headers, submission_id
+
+
+async def measure(client, url: str, headers: dict, revalidate: bool, requests: int, concurrency: int) -> dict:
+    first = await client.get(url, headers=headers)
+    first.raise_for_status()
+    if revalidate:
+        headers = {**headers, "If-None-Match": first.headers["ETag"]}
+
+    recorder = Recorder()
+    sizes = []
+    statuses = {}
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            response = await recorder.request(client, "request", "GET", url, headers=headers)
+            sizes.append(len(response.content))
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    before = metrics.totals()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    after = metrics.totals()
+
+    stats = recorder.report()["endpoints"]["request"]
+    return {
+        "statuses": statuses,
+        "body_bytes_per_request": sum(sizes) / len(sizes),
+        "full_body_bytes": len(first.content),
+        "db_queries_per_request": (after["db_queries"] - before["db_queries"]) / requests,
+        **{key: stats[key] for key in ("rps", "p50_ms", "p95_ms", "p99_ms")},
+    }
+
+
+async def run(args) -> dict:
+    async with make_client(args.base_url, args.timeout) as client:
+        quiz_id = await prepare_quiz(client, args.questions, args.admin_user, args.admin_password)
+        headers, submission_id = await prepare_submission(client, quiz_id)
+        targets = {
+            "quiz_detail": f"{API_PREFIX}/quizzes/{quiz_id}",
+            "quiz_list": f"{API_PREFIX}/quizzes/",
+            "submission_detail": f"{API_PREFIX}/submissions/{submission_id}",
+        }
+
+        results = {}
+        for name, url in targets.items():
+            results[name] = {
+                mode: await measure(client, url, headers, mode == "revalidate", args.requests, args.concurrency)
+                for mode in ("full", "revalidate")
+            }
+            if args.base_url:
+                # 원격 서버 대상이면 이 프로세스에서 SQL 을 세지 못함
+                for mode in results[name].values():
+                    mode["db_queries_per_request"] = None
+
+    return {
+        "commit": current_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "target": args.base_url or "asgi",
+        "scenario": {"questions": args.questions, "requests": args.requests, "concurrency": args.concurrency},
+        "results": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="조건부 요청(ETag) 재검증 vs 전체 응답 비교")
+    parser.add_argument("--base-url", help="실행 중인 서버 주소 (생략 시 프로세스 내 ASGI 앱 사용)")
+    parser.add_argument("--questions", type=int, default=100, help="퀴즈 문제 수 (퀴즈 상세 본문 크기)")
+    parser.add_argument("--requests", type=int, default=2000, help="대상/모드별 요청 수")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--admin-user", default="admin")
+    parser.add_argument("--admin-password", default="admin1234")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
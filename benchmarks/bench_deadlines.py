@@ -0,0 +1,161 @@
+# benchmarks/bench_deadlines.py
+# 제한 시간 스케줄러 - 타이머 --timers 개의 등록/취소 비용, 마감 처리 지연, 대기 중 CPU 사용량 (마감 힙 vs 주기적 전체 스캔)
+#
+# 사용법:
+#   python -m benchmarks.bench_deadlines --timers 100000 --spread 20 --idle 5
+#
+# 타이머 --timers 개를 지금부터 --spread 초 사이에 고르게 마감되도록 등록하고 10% 를 취소한 뒤
+#   - 등록/취소 1건당 비용(µs), 마감이 지나 자동 제출 콜백에 넘어가기까지의 지연 p50/p95/max(ms), 콜백(배치) 수
+#     (--tick 0 이면 마감마다 깨어남)
+#   - 실행하는 동안 쓴 CPU 시간(초) - 마감이 모두 --idle 초 뒤인 타이머만 있을 때의 대기 CPU 도 따로
+#   - 비교 기준: --poll-interval 초마다 전체 마감 목록을 훑어 지난 것을 고르는 방식의 CPU 시간과 지연
+# 을 DB 없이 메모리에서 측정해 JSON 으로 출력합니다 (자동 제출 콜백은 ID 만 기록).
+import argparse
+import json
+import random
+import threading
+import time
+from datetime import datetime, timezone
+
+from app.config import settings
+from app.services import deadlines
+from benchmarks.load_test import current_commit, percentile
+
+
+def run_heap(deadline_of: dict, cancelled: set, batch_size: int, tick: float) -> dict:
+    lags = []
+    batches = []
+    done = threading.Event()
+    expected = len(deadline_of) - len(cancelled)
+
+    def expire(submission_ids):
+        fired = time.time()
+        batches.append(len(submission_ids))
+        lags.extend((fired - deadline_of[submission_id]) * 1000 for submission_id in submission_ids)
+        if len(lags) >= expected:
+            done.set()
+
+    scheduler = deadlines.DeadlineScheduler(expire, batch_size, tick=tick)
+    started = time.perf_counter()
+    for submission_id, deadline in deadline_of.items():
+        scheduler.add(submission_id, deadline)
+    add_us = (time.perf_counter() - started) / len(deadline_of) * 1e6
+    started = time.perf_counter()
+    for submission_id in cancelled:
+        scheduler.cancel(submission_id)
+    cancel_us = (time.perf_counter() - started) / max(len(cancelled), 1) * 1e6
+
+    cpu = time.process_time()
+    wall = time.perf_counter()
+    scheduler.start()
+    done.wait()
+    scheduler.stop()
+    lags.sort()
+    return {
+        "add_us": add_us,
+        "cancel_us": cancel_us,
+        "fired": len(lags),
+        "batches": len(batches),
+        "lag_p50_ms": percentile(lags, 50),
+        "lag_p95_ms": percentile(lags, 95),
+        "lag_max_ms": lags[-1] if lags else None,
+        "cpu_seconds": time.process_time() - cpu,
+        "wall_seconds": time.perf_counter() - wall,
+    }
+
+
+def run_idle(count: int, idle: float) -> float:
+    """마감이 모두 idle 초 뒤인 타이머만 있을 때 idle 초 동안의 CPU 시간"""
+    scheduler = deadlines.DeadlineScheduler(lambda submission_ids: None, settings.DEADLINE_BATCH_SIZE)
+    far = time.time() + 3600
+    scheduler.add_many((submission_id, far) for submission_id in range(count))
+    scheduler.start()
+    cpu = time.process_time()
+    time.sleep(idle)
+    cpu = time.process_time() - cpu
+    scheduler.stop()
+    return cpu
+
+
+def run_polling(deadline_of: dict, cancelled: set, interval: float) -> dict:
+    """비교 기준 - interval 초마다 진행 중인 전체 마감을 훑어 지난 것을 처리"""
+    pending = {submission_id: deadline for submission_id, deadline in deadline_of.items() if submission_id not in cancelled}
+    lags = []
+    scans = 0
+    cpu = time.process_time()
+    wall = time.perf_counter()
+    while pending:
+        time.sleep(interval)
+        now = time.time()
+        scans += 1
+        due = [submission_id for submission_id, deadline in pending.items() if deadline <= now]
+        for submission_id in due:
+            lags.append((now - pending.pop(submission_id)) * 1000)
+    lags.sort()
+    return {
+        "scans": scans,
+        "rows_scanned": None if not scans else scans * len(deadline_of),
+        "lag_p50_ms": percentile(lags, 50),
+        "lag_p95_ms": percentile(lags, 95),
+        "lag_max_ms": lags[-1] if lags else None,
+        "cpu_seconds": time.process_time() - cpu,
+        "wall_seconds": time.perf_counter() - wall,
+    }
+
+
+def run(args) -> dict:
+    rng = random.Random(args.seed)
+    ids = list(range(1, args.timers + 1))
+    cancelled = set(rng.sample(ids, args.timers // 10))
+
+    start = time.time() + 1
+    heap = run_heap(
+        {submission_id: start + rng.uniform(0, args.spread) for submission_id in ids}, cancelled, args.batch_size, args.tick
+    )
+    start = time.time() + 1
+    polling = run_polling(
+        {submission_id: start + rng.uniform(0, args.spread) for submission_id in ids}, cancelled, args.poll_interval
+    )
+
+    return {
+        "commit": current_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "scenario": {
+            "timers": args.timers,
+            "cancelled": len(cancelled),
+            "spread_seconds": args.spread,
+            "batch_size": args.batch_size,
+            "tick": args.tick,
+            "poll_interval": args.poll_interval,
+        },
+        "results": {
+            "heap": heap,
+            "idle_cpu_seconds": run_idle(args.timers, args.idle),
+            "idle_seconds": args.idle,
+            "polling": polling,
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="제한 시간 스케줄러 - 마감 힙 vs 주기적 전체 스캔")
+    parser.add_argument("--timers", type=int, default=100_000)
+    parser.add_argument("--spread", type=float, default=20, help="마감이 퍼져 있는 구간(초)")
+    parser.add_argument("--batch-size", type=int, default=settings.DEADLINE_BATCH_SIZE)
+    parser.add_argument("--tick", type=float, default=settings.DEADLINE_TICK_SECONDS, help="마감을 묶어 처리하는 간격(초)")
+    parser.add_argument("--poll-interval", type=float, default=1.0, help="비교 기준 스캔 간격(초)")
+    parser.add_argument("--idle", type=float, default=5, help="대기 CPU 측정 시간(초)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    report = run(args)
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
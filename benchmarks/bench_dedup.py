@@ -0,0 +1,140 @@
+# benchmarks/bench_dedup.py
+# 유사 문제 탐지(MinHash/LSH) 속도와 정확도 - 합성 문제 은행에 일부러 넣은 유사 문제를 얼마나 찾는지
+#
+# 사용법:
+#   python -m benchmarks.bench_dedup --questions 50000 --duplicate-rate 0.02 --checks 1000
+#
+# datagen 과 같은 형식의 문제 --questions 개 중 --duplicate-rate 비율은 다른 문제를 조금 고친 사본
+# (단어 하나 교체, 문장 부호/선택지 순서 변경)으로 만들고, DB 없이 메모리에서
+#   - 서명 계산 시간(문제당 µs), LSH 색인 구성 시간, 전체 묶음 계산 시간(모든 쌍 비교 없이)
+#   - 새 문제 중복 확인(색인 조회 + 후보 검증) p50/p95(ms)
+#   - 넣은 유사 쌍의 재현율, 보고된 쌍 중 실제 자카드 유사도가 임계값 - 0.1 이상인 비율(정밀도)
+# 을 JSON 으로 출력합니다. 모든 쌍을 비교하면 5만 개 기준 약 12억 쌍입니다.
+import argparse
+import json
+import random
+import time
+from datetime import datetime, timezone
+
+from app.config import settings
+from app.services import dedup
+from benchmarks.load_test import current_commit, percentile
+
+
+def generate(rng: random.Random, count: int, duplicate_rate: float):
+    """(문제 내용, 선택지, 원본 인덱스 또는 None) 목록"""
+    questions = []
+    for i in range(count):
+        if questions and rng.random() < duplicate_rate:
+            source = rng.randrange(len(questions))
+            content, options, _ = questions[source]
+            words = content.split()
+            words[rng.randrange(1, len(words))] = f"단어{rng.randint(0, 5000)}"
+            content = " ".join(words) + rng.choice(["", "?", "."])
+            options = rng.sample(options, len(options))
+            questions.append((content, options, source))
+            continue
+        content = f"문제 {i + 1}: " + " ".join(f"단어{rng.randint(0, 5000)}" for _ in range(rng.randint(8, 30)))
+        options = [f"보기{rng.randint(0, 999)}" for _ in range(4)]
+        questions.append((content, options, None))
+    return questions
+
+
+def jaccard(hasher, left, right) -> float:
+    a = set(hasher.shingles(hasher.normalize(*left[:2])).tolist())
+    b = set(hasher.shingles(hasher.normalize(*right[:2])).tolist())
+    return len(a & b) / len(a | b)
+
+
+def run(args) -> dict:
+    rng = random.Random(args.seed)
+    questions = generate(rng, args.questions, args.duplicate_rate)
+    hasher = dedup.get_hasher()
+    threshold = args.threshold
+
+    started = time.perf_counter()
+    signatures = [hasher.signature(content, options) for content, options, _ in questions]
+    signature_us = (time.perf_counter() - started) / len(questions) * 1_000_000
+
+    started = time.perf_counter()
+    index = dedup.LSHIndex(settings.DEDUP_BANDS)
+    for question_id, signature in enumerate(signatures):
+        index.add(question_id, signature)
+    build_ms = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    clusters = index.clusters(threshold)
+    cluster_ms = (time.perf_counter() - started) * 1000
+
+    # 새 문제 중복 확인 - 서명 계산 + 색인 조회 (넣은 사본 절반, 새 문제 절반)
+    latencies = []
+    for i in range(args.checks):
+        if i % 2:
+            content, options, _ = questions[rng.randrange(len(questions))]
+            content += " 다시"
+        else:
+            content = " ".join(f"새단어{rng.randint(0, 5000)}" for _ in range(20))
+            options = [f"보기{rng.randint(0, 999)}" for _ in range(4)]
+        started = time.perf_counter()
+        index.query(hasher.signature(content, options), threshold)
+        latencies.append((time.perf_counter() - started) * 1000)
+    latencies.sort()
+
+    reported = {
+        (min(a, b), max(a, b))
+        for cluster in clusters for a in cluster["question_ids"] for b in cluster["question_ids"] if a != b
+    }
+    planted = [
+        (min(i, source), max(i, source)) for i, (_, _, source) in enumerate(questions)
+        if source is not None and jaccard(hasher, questions[i], questions[source]) >= threshold
+    ]
+    found = sum(1 for pair in planted if pair in reported)
+    sample = rng.sample(sorted(reported), min(len(reported), 2000))
+    precise = sum(1 for a, b in sample if jaccard(hasher, questions[a], questions[b]) >= threshold - 0.1)
+
+    return {
+        "commit": current_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "scenario": {
+            "questions": args.questions,
+            "duplicate_rate": args.duplicate_rate,
+            "threshold": threshold,
+            "num_perm": settings.DEDUP_NUM_PERM,
+            "bands": settings.DEDUP_BANDS,
+            "shingle_size": settings.DEDUP_SHINGLE_SIZE,
+        },
+        "results": {
+            "signature_us_per_question": signature_us,
+            "index_build_ms": build_ms,
+            "clusters_ms": cluster_ms,
+            "clusters": len(clusters),
+            "check_p50_ms": percentile(latencies, 50),
+            "check_p95_ms": percentile(latencies, 95),
+            "planted_pairs_above_threshold": len(planted),
+            "recall": found / len(planted) if planted else None,
+            "precision": precise / len(sample) if sample else None,
+            "all_pairs": args.questions * (args.questions - 1) // 2,
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="유사 문제 탐지(MinHash/LSH) 속도와 정확도")
+    parser.add_argument("--questions", type=int, default=50_000)
+    parser.add_argument("--duplicate-rate", type=float, default=0.02, help="다른 문제를 조금 고친 사본 비율")
+    parser.add_argument("--checks", type=int, default=1000, help="새 문제 중복 확인 횟수")
+    parser.add_argument("--threshold", type=float, default=settings.DEDUP_THRESHOLD)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    report = run(args)
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
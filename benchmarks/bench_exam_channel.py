@@ -0,0 +1,224 @@
+# benchmarks/bench_exam_channel.py
+# 응시 WebSocket 채널 vs 요청마다 인증하는 HTTP(/save, /take) 경로의 메시지당 비용 비교
+#
+# 사용법:
+#   python -m benchmarks.bench_exam_channel --students 1000 --rounds 5
+#   python -m benchmarks.bench_exam_channel --base-url http://localhost:8000 --students 1000   # 실제 서버 (websockets 패키지 필요)
+#
+# 학생마다 rounds 번 "답안 저장 + 다음 페이지 조회"를 수행합니다.
+# - HTTP : POST /save (지금까지의 전체 답안) + GET /take?page=N  → 요청마다 JWT 검증/사용자/응시 기록 조회
+# - WS   : answer 메시지(변경분 1개) + page 메시지             → 연결 시 한 번만 인증
+# 결과는 작업별 p50/p95/p99 지연 시간(ms), 처리량, 작업당 SQL 수를 담은 JSON 입니다.
+import argparse
+import asyncio
+import json
+import time
+from datetime import datetime, timezone
+from typing import List, Optional
+
+import httpx
+
+from app.utils import metrics
+from benchmarks.load_test import (
+    API_PREFIX,
+    STUDENT_PASSWORD,
+    Recorder,
+    current_commit,
+    login,
+    make_client,
+    prepare_quiz,
+    prepare_students,
+)
+
+
+class AsgiWebSocket:
+    """네트워크 없이 ASGI 앱에 직접 붙는 WebSocket 클라이언트 (연결 수천 개를 한 프로세스에서 구동)"""
+
+    def __init__(self, app, path: str, query: str):
+        self.app = app
+        self.scope = {
+            "type": "websocket",
+            "asgi": {"version": "3.0"},
+            "scheme": "ws",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": query.encode(),
+            "root_path": "",
+            "headers": [(b"host", b"testserver")],
+            "server": ("testserver", 80),
+            "client": ("127.0.0.1", 0),
+            "subprotocols": [],
+        }
+        self.to_app: asyncio.Queue = asyncio.Queue()
+        self.from_app: asyncio.Queue = asyncio.Queue()
+        self.task: Optional[asyncio.Task] = None
+
+    async def connect(self) -> None:
+        self.task = asyncio.create_task(self.app(self.scope, self.to_app.get, self.from_app.put))
+        await self.to_app.put({"type": "websocket.connect"})
+        message = await self.from_app.get()
+        if message["type"] != "websocket.accept":
+            raise ConnectionError(f"연결 거부: {message}")
+
+    async def send(self, text: str) -> None:
+        await self.to_app.put({"type": "websocket.receive", "text": text})
+
+    async def recv(self) -> str:
+        message = await self.from_app.get()
+        if message["type"] == "websocket.close":
+            raise ConnectionError(f"연결 종료: {message}")
+        return message["text"]
+
+    async def close(self) -> None:
+        await self.to_app.put({"type": "websocket.disconnect", "code": 1000})
+        await self.task
+
+
+async def open_channel(base_url: Optional[str], submission_id: int, token: str):
+    path = f"{API_PREFIX}/submissions/{submission_id}/ws"
+    if base_url:
+        import websockets
+
+        url = base_url.replace("http", "ws", 1) + f"{path}?token={token}"
+        return await websockets.connect(url, max_queue=None)
+
+    from app.main import app
+    channel = AsgiWebSocket(app, path, f"token={token}")
+    await channel.connect()
+    return channel
+
+
+async def receive_type(channel, kind: str) -> dict:
+    """원하는 종류의 메시지가 올 때까지 수신 (중간의 saved 알림 등은 건너뜀)"""
+    while True:
+        message = json.loads(await channel.recv())
+        if message["type"] == kind:
+            return message
+        if message["type"] == "error":
+            raise RuntimeError(message)
+
+
+async def start_student(client: httpx.AsyncClient, username: str, quiz_id: int) -> tuple:
+    token = (await login(client, username, STUDENT_PASSWORD))["Authorization"].split()[1]
+    headers = {"Authorization": f"Bearer {token}"}
+    questions = (await client.get(f"{API_PREFIX}/quizzes/{quiz_id}/take", headers=headers)).json()
+    submissions = (await client.get(f"{API_PREFIX}/submissions/my", headers=headers)).json()
+    submission_id = next(s["id"] for s in submissions if s["quiz_id"] == quiz_id and not s["is_completed"])
+    return token, headers, submission_id, [q["id"] for q in questions]
+
+
+async def run_http(client, recorder: Recorder, student: tuple, quiz_id: int, rounds: int, pages: int) -> None:
+    _, headers, submission_id, question_ids = student
+    answers = []
+    for i in range(rounds):
+        answers.append({"question_id": question_ids[i % len(question_ids)], "selected_option": i % 4})
+        await recorder.request(
+            client, "http_save", "POST", f"{API_PREFIX}/submissions/{submission_id}/save", headers=headers, json=answers
+        )
+        await recorder.request(
+            client, "http_take", "GET", f"{API_PREFIX}/quizzes/{quiz_id}/take",
+            headers=headers, params={"page": i % pages + 1}
+        )
+
+
+async def run_ws(base_url, recorder: Recorder, student: tuple, rounds: int, pages: int) -> None:
+    token, _, submission_id, question_ids = student
+    started = time.perf_counter()
+    channel = await open_channel(base_url, submission_id, token)
+    recorder.observe("ws_connect", (time.perf_counter() - started) * 1000)
+    try:
+        for i in range(rounds):
+            started = time.perf_counter()
+            await channel.send(json.dumps({
+                "type": "answer", "question_id": question_ids[i % len(question_ids)],
+                "selected_option": i % 4, "seq": i,
+            }))
+            await receive_type(channel, "ack")
+            recorder.observe("ws_answer", (time.perf_counter() - started) * 1000)
+
+            started = time.perf_counter()
+            await channel.send(json.dumps({"type": "page", "page": i % pages + 1}))
+            await receive_type(channel, "page")
+            recorder.observe("ws_page", (time.perf_counter() - started) * 1000)
+    finally:
+        await channel.close()
+
+
+async def measure(name: str, coroutines) -> dict:
+    before = metrics.totals()
+    recorder_started = time.perf_counter()
+    await asyncio.gather(*coroutines)
+    wall_time = time.perf_counter() - recorder_started
+    after = metrics.totals()
+    return {"phase": name, "wall_time_s": wall_time, "db_queries": after["db_queries"] - before["db_queries"]}
+
+
+async def run(args) -> dict:
+    async with make_client(args.base_url, args.timeout) as client:
+        quiz_id = await prepare_quiz(client, args.questions, args.admin_user, args.admin_password)
+        usernames = await prepare_students(client, args.students, args.concurrency)
+        questions_per_page = args.questions // 3 if args.questions >= 3 else args.questions
+        pages = (args.questions + questions_per_page - 1) // questions_per_page
+
+        semaphore = asyncio.Semaphore(args.concurrency)
+
+        async def start(username):
+            async with semaphore:
+                return await start_student(client, username, quiz_id)
+
+        students: List[tuple] = await asyncio.gather(*(start(username) for username in usernames))
+
+        http_recorder = Recorder()
+        http = await measure("http", [
+            run_http(client, http_recorder, student, quiz_id, args.rounds, pages) for student in students
+        ])
+        ws_recorder = Recorder()
+        ws = await measure("ws", [
+            run_ws(args.base_url, ws_recorder, student, args.rounds, pages) for student in students
+        ])
+
+    operations = args.students * args.rounds * 2
+    report = {
+        "commit": current_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "target": args.base_url or "asgi",
+        "scenario": {"students": args.students, "rounds": args.rounds, "questions": args.questions},
+    }
+    for phase, recorder in ((http, http_recorder), (ws, ws_recorder)):
+        endpoints = recorder.report()["endpoints"]
+        report[phase["phase"]] = {
+            "wall_time_s": phase["wall_time_s"],
+            "operations_per_s": operations / phase["wall_time_s"],
+            # 원격 서버 대상이면 이 프로세스에서 SQL 을 세지 못함
+            "db_queries_per_operation": phase["db_queries"] / operations if not args.base_url else None,
+            "operations": {
+                name: {key: stats[key] for key in ("count", "errors", "p50_ms", "p95_ms", "p99_ms")}
+                for name, stats in endpoints.items()
+            },
+        }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="응시 WebSocket 채널 vs HTTP 자동 저장/페이지 조회 비교")
+    parser.add_argument("--base-url", help="실행 중인 서버 주소 (생략 시 프로세스 내 ASGI 앱 사용)")
+    parser.add_argument("--students", type=int, default=1000, help="동시 연결 수")
+    parser.add_argument("--rounds", type=int, default=5, help="학생당 저장+페이지 이동 횟수")
+    parser.add_argument("--questions", type=int, default=30)
+    parser.add_argument("--concurrency", type=int, default=50, help="계정 생성/로그인 동시 요청 수")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--admin-user", default="admin")
+    parser.add_argument("--admin-password", default="admin1234")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+# benchmarks/bench_exposure.py
+# 노출 조절 - 덜 노출된 문제 우선 추출 vs random.sample 의 문제별 노출률 분포와 추출 지연
+#
+# 사용법:
+#   python -m benchmarks.bench_exposure --questions 200 --count 20 --sessions 20000
+#
+# 문제 --questions 개에서 --count 개씩 --sessions 번 뽑을 때
+#   - 노출 조절 색인(EXPOSURE_DECAY, EXPOSURE_MAX_RATE) 추출 p50/p95(ms), 노출률 최대/최소/변동계수
+#   - 비교 기준: random.sample 로 뽑을 때의 노출률 최대/최소/변동계수
+#   - 응시 --sessions 개의 노출 수를 DB 에 더할 때 문 수: 응시마다 UPDATE 하면 --sessions × --count, 모아서 더하면 문제 수만큼의 행 1 배치
+# 를 DB 없이 메모리에서 측정해 JSON 으로 출력합니다.
+import argparse
+import json
+import random
+import statistics
+import time
+from datetime import datetime, timezone
+
+from app.config import settings
+from app.services import blueprint
+from benchmarks.load_test import current_commit, percentile
+
+
+def rates(counts, sessions: int) -> dict:
+    values = [count / sessions for count in counts]
+    mean = statistics.fmean(values)
+    return {
+        "max_rate": max(values),
+        "min_rate": min(values),
+        "rate_cv": statistics.pstdev(values) / mean if mean else None,
+    }
+
+
+def run(args) -> dict:
+    rng = random.Random(args.seed)
+    ids = list(range(1, args.questions + 1))
+    index = blueprint.BlueprintIndex(
+        [(question_id, [], None, 1.0) for question_id in ids],
+        exposures={},
+        decay=settings.EXPOSURE_DECAY,
+        max_rate=settings.EXPOSURE_MAX_RATE,
+    )
+
+    latencies = []
+    for _ in range(args.sessions):
+        started = time.perf_counter()
+        index.draw([{"count": args.count}], rng=rng)
+        latencies.append((time.perf_counter() - started) * 1000)
+    latencies.sort()
+
+    uniform = dict.fromkeys(ids, 0)
+    for _ in range(args.sessions):
+        for question_id in rng.sample(ids, args.count):
+            uniform[question_id] += 1
+
+    return {
+        "commit": current_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "scenario": {
+            "questions": args.questions,
+            "count": args.count,
+            "sessions": args.sessions,
+            "decay": settings.EXPOSURE_DECAY,
+            "max_rate": settings.EXPOSURE_MAX_RATE,
+        },
+        "results": {
+            "draw_p50_ms": percentile(latencies, 50),
+            "draw_p95_ms": percentile(latencies, 95),
+            "controlled": rates([index.exposures.get(question_id, 0) for question_id in ids], args.sessions),
+            "random_sample": rates(list(uniform.values()), args.sessions),
+            "per_submission_updates": args.sessions * args.count,
+            "batched_rows": len(index.exposures),
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="노출 조절 - 덜 노출된 문제 우선 추출 vs random.sample")
+    parser.add_argument("--questions", type=int, default=200)
+    parser.add_argument("--count", type=int, default=20, help="응시 기록당 문제 수")
+    parser.add_argument("--sessions", type=int, default=20_000, help="응시 기록 수")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    report = run(args)
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+# benchmarks/bench_fieldsets.py
+# 퀴즈 상세의 fields/include 조합별 조회 비용 (문제 5,000개 퀴즈)
+#
+# 사용법:
+#   python -m benchmarks.bench_fieldsets --questions 5000 --requests 50
+#   python -m benchmarks.bench_fieldsets --base-url http://localhost:8000 --quiz-id 1
+#
+# 변형마다 GET /api/quizzes/{id} 를 --requests 번 보내 p50/p95 지연 시간(ms), 응답 바이트, 요청당 SQL 수를 비교합니다.
+# 프로세스 내 실행이면 fields/include 도입 전 방식(lazy 관계 로딩 + 전체 스키마 직렬화)도 HTTP 계층 없이 직접 측정합니다.
+# 압축과 조건부 요청의 영향을 빼기 위해 Accept-Encoding: identity 로 요청하고 검증자는 보내지 않습니다.
+import argparse
+import asyncio
+import json
+import time
+from datetime import datetime, timezone
+
+from app.utils import metrics
+from benchmarks.load_test import API_PREFIX, Recorder, current_commit, login, make_client, percentile
+
+VARIANTS = {
+    "full": {},
+    "summary": {"fields": "id,title,description,questions_count", "include": ""},
+    "question_ids": {"fields": "id,title,questions.id"},
+    "question_text": {"fields": "id,questions.id,questions.content,questions.options"},
+}
+
+
+def insert_questions(quiz_id: int, count: int) -> None:
+    """문제를 API 대신 DB 에 바로 적재 (문제 수천 개를 요청 하나씩 만들면 준비가 측정보다 오래 걸림)"""
+    import app.models.submission, app.models.user  # noqa: F401 (관계 대상 모델 등록)
+    from sqlalchemy import insert
+
+    from app.db import SessionLocal
+    from app.models.question import Question
+    from app.services.quiz_cache import invalidate_quiz
+
+    db = SessionLocal()
+    try:
+        for start in range(0, count, 1000):
+            db.execute(insert(Question), [
+                {
+                    "quiz_id": quiz_id,
+                    "content": f"필드 선택 벤치마크 문제 {i + 1} - 보기 중 알맞은 것을 고르시오",
+                    "options": [f"선택지 {n}" for n in range(1, 5)],
+                    "correct_answer": i % 4,
+                    "order": i,
+                }
+                for i in range(start, min(start + 1000, count))
+            ])
+        db.commit()
+    finally:
+        db.close()
+    invalidate_quiz(quiz_id, questions=True)
+
+
+def measure_baseline(quiz_id: int, requests: int) -> dict:
+    """도입 전 방식 - 퀴즈 전체 컬럼 조회 후 lazy 로딩, QuizWithQuestions 전체 직렬화"""
+    from app.db import SessionLocal
+    from app.models.quiz import Quiz
+    from app.schemas.quiz import QuizWithQuestions
+    from app.utils.conditional import render
+
+    latencies, size = [], 0
+    before = metrics.totals()
+    for _ in range(requests):
+        started = time.perf_counter()
+        db = SessionLocal()
+        try:
+            quiz = db.query(Quiz).filter(Quiz.id == quiz_id, Quiz.is_active == True).first()
+            size = len(render(QuizWithQuestions, quiz))
+        finally:
+            db.close()
+        latencies.append((time.perf_counter() - started) * 1000)
+    after = metrics.totals()
+    latencies.sort()
+    return {
+        "params": None,
+        "body_bytes": size,
+        "db_queries_per_request": (after["db_queries"] - before["db_queries"]) / requests,
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+    }
+
+
+async def run(args) -> dict:
+    async with make_client(args.base_url, args.timeout) as client:
+        headers = await login(client, args.admin_user, args.admin_password)
+        quiz_id = args.quiz_id
+        if quiz_id is None:
+            if args.base_url:
+                raise SystemExit("--base-url 을 쓰면 --quiz-id 로 문제가 많은 퀴즈를 지정하세요")
+            response = await client.post(
+                f"{API_PREFIX}/quizzes/",
+                headers=headers,
+                json={"title": f"필드 선택 벤치마크 ({args.questions}문항)", "questions_count": 30},
+            )
+            response.raise_for_status()
+            quiz_id = response.json()["id"]
+            insert_questions(quiz_id, args.questions)
+
+        headers = {**headers, "Accept-Encoding": "identity"}
+        url = f"{API_PREFIX}/quizzes/{quiz_id}"
+        results = {}
+        for name, params in VARIANTS.items():
+            recorder = Recorder()
+            size = 0
+            before = metrics.totals()
+            for _ in range(args.requests):
+                response = await recorder.request(client, name, "GET", url, headers=headers, params=params)
+                response.raise_for_status()
+                size = len(response.content)
+            after = metrics.totals()
+            stats = recorder.report()["endpoints"][name]
+            results[name] = {
+                "params": params,
+                "body_bytes": size,
+                "db_queries_per_request": (
+                    (after["db_queries"] - before["db_queries"]) / args.requests if not args.base_url else None
+                ),
+                "p50_ms": stats["p50_ms"],
+                "p95_ms": stats["p95_ms"],
+            }
+
+    if not args.base_url:
+        results["baseline_lazy_full"] = measure_baseline(quiz_id, args.requests)
+
+    return {
+        "commit": current_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "target": args.base_url or "asgi",
+        "scenario": {"quiz_id": quiz_id, "questions": args.questions, "requests": args.requests},
+        "results": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="퀴즈 상세 fields/include 조합별 조회 비용")
+    parser.add_argument("--base-url", help="실행 중인 서버 주소 (생략 시 프로세스 내 ASGI 앱 사용)")
+    parser.add_argument("--quiz-id", type=int, help="측정할 퀴즈 (생략 시 새로 만들어 문제를 적재)")
+    parser.add_argument("--questions", type=int, default=5000)
+    parser.add_argument("--requests", type=int, default=50, help="변형별 요청 수")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--admin-user", default="admin")
+    parser.add_argument("--admin-password", default="admin1234")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
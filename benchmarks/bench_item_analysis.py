@@ -0,0 +1,101 @@
+# benchmarks/bench_item_analysis.py
+# 문항 분석 - 청크 스트리밍 + 벡터 연산 vs 제출마다 답안을 파이썬 객체로 펼쳐 집계
+#
+# 사용법 (datagen 으로 퀴즈 하나에 채점된 제출 약 100만 개를 채운 DB 에서):
+#   python -m benchmarks.datagen --users 120000 --quizzes 1 --questions-per-quiz 200 --submissions-per-user 10
+#   python -m benchmarks.bench_item_analysis --baseline-limit 50000
+#
+# 제출이 가장 많은 퀴즈(또는 --quiz-id)에 대해
+#   - 문항 분석 전체 계산 시간, 초당 처리 제출 수, 최대 RSS 증가량(MB)
+#   - 같은 버전에서 다시 조회(캐시, Redis 가 있을 때)
+#   - 비교 기준: 제출 --baseline-limit 개를 packed_answers.expand 로 답안 dict 목록으로 펼쳐 정답률만 집계한 초당 처리 수
+# 를 JSON 으로 출력합니다.
+import argparse
+import json
+import resource
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+
+from benchmarks.load_test import current_commit
+
+
+def max_rss_mb() -> float:
+    # 리눅스는 KB 단위
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run(args) -> dict:
+    import app.models.user, app.models.quiz  # noqa: F401 (관계 대상 모델 등록)
+    from sqlalchemy import func
+
+    from app.db import SessionLocal, get_engine
+    from app.models.submission import Submission
+    from app.services import item_analysis, packed_answers
+
+    db = SessionLocal()
+    try:
+        quiz_id = args.quiz_id or db.query(Submission.quiz_id).filter(
+            Submission.correct_bitmap.isnot(None)
+        ).group_by(Submission.quiz_id).order_by(func.count(Submission.id).desc()).limit(1).scalar()
+
+        rss_before = max_rss_mb()
+        started = time.perf_counter()
+        report = item_analysis.analyze(db, quiz_id, use_cache=False)
+        analysis_seconds = time.perf_counter() - started
+        rss_growth = max_rss_mb() - rss_before
+
+        started = time.perf_counter()
+        item_analysis.analyze(db, quiz_id)
+        cached_ms = (time.perf_counter() - started) * 1000
+
+        # 비교 기준 - 제출마다 답안을 펼쳐 문제별 정답 수를 dict 로 집계
+        started = time.perf_counter()
+        seen, correct = defaultdict(int), defaultdict(int)
+        rows = db.query(Submission).filter(
+            Submission.quiz_id == quiz_id,
+            Submission.correct_bitmap.isnot(None)
+        ).order_by(Submission.id).limit(args.baseline_limit).all()
+        for submission in rows:
+            for answer in packed_answers.expand(submission):
+                seen[answer["question_id"]] += 1
+                correct[answer["question_id"]] += bool(answer["is_correct"])
+        baseline_seconds = time.perf_counter() - started
+        baseline_rows = len(rows)
+    finally:
+        db.close()
+
+    return {
+        "commit": current_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "dialect": get_engine().dialect.name,
+        "scenario": {"quiz_id": quiz_id, "submissions": report["submissions"], "questions": len(report["items"])},
+        "results": {
+            "analysis_seconds": analysis_seconds,
+            "analysis_submissions_per_second": report["submissions"] / analysis_seconds if analysis_seconds else None,
+            "analysis_rss_growth_mb": rss_growth,
+            "cached_ms": cached_ms,
+            "alpha": report["alpha"],
+            "baseline_submissions": baseline_rows,
+            "baseline_submissions_per_second": baseline_rows / baseline_seconds if baseline_seconds else None,
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="문항 분석 - 청크 스트리밍 벡터 연산 vs 답안 객체 집계")
+    parser.add_argument("--quiz-id", type=int, help="대상 퀴즈 (생략 시 채점된 제출이 가장 많은 퀴즈)")
+    parser.add_argument("--baseline-limit", type=int, default=50_000, help="비교 기준으로 펼칠 제출 수")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    report = run(args)
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
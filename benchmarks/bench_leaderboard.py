@@ -0,0 +1,151 @@
+# benchmarks/bench_leaderboard.py
+# 퀴즈 순위/백분위 조회 - 리더보드 vs submissions 집계 쿼리
+#
+# 사용법:
+#   python -m benchmarks.bench_leaderboard --users 20000 --attempts 2 --lookups 200
+#
+# 새 퀴즈에 사용자 --users 명, 사용자당 완료된 제출 --attempts 개를 DB 에 바로 적재한 뒤
+#   - 재구성 작업(rebuild --reset) 소요 시간
+#   - 같은 사용자 --lookups 명의 순위/백분위를 리더보드(설정된 저장소)와 SQL(사용자별 최고 점수 집계 후 비교)로 조회한 p50/p95(ms)
+# 와 두 방식의 결과가 일치하는지를 JSON 으로 출력합니다.
+import argparse
+import json
+import random
+import time
+from datetime import datetime, timezone
+
+from benchmarks.load_test import current_commit, percentile
+
+
+def prepare(users: int, attempts: int, seed: int) -> int:
+    """퀴즈, 사용자, 완료된 제출을 DB 에 바로 적재하고 퀴즈 ID 반환"""
+    import app.models.question  # noqa: F401 (관계 대상 모델 등록)
+    from sqlalchemy import insert
+
+    from app.db import SessionLocal
+    from app.models.quiz import Quiz
+    from app.models.submission import Submission
+    from app.models.user import User
+
+    rng = random.Random(seed)
+    tag = f"lb{int(time.time())}"
+    db = SessionLocal()
+    try:
+        quiz = Quiz(title=f"리더보드 벤치마크 ({users}명)", questions_count=20)
+        db.add(quiz)
+        db.flush()
+        quiz_id = quiz.id
+        for start in range(0, users, 1000):
+            rows = [
+                {"username": f"{tag}_{i}", "email": f"{tag}_{i}@example.com", "hashed_password": "-"}
+                for i in range(start, min(start + 1000, users))
+            ]
+            user_ids = db.execute(insert(User).returning(User.id), rows).scalars().all()
+            db.execute(insert(Submission), [
+                {
+                    "quiz_id": quiz_id,
+                    "user_id": user_id,
+                    "question_order": [],
+                    # 20문항 기준 5점 단위 점수 - 공동 순위가 많이 생기는 실제 분포에 가깝게
+                    "score": rng.randint(0, 20) * 5.0,
+                    "is_completed": True,
+                    "grading_status": "graded",
+                }
+                for user_id in user_ids for _ in range(attempts)
+            ])
+        db.commit()
+    finally:
+        db.close()
+    return quiz_id
+
+
+def sql_rank(db, quiz_id: int, user_id: int) -> dict:
+    """리더보드 도입 전 방식 - 사용자별 최고 점수를 매번 집계해 비교"""
+    from sqlalchemy import func
+
+    from app.models.submission import Submission
+
+    best = db.query(Submission.user_id, func.max(Submission.score).label("score")).filter(
+        Submission.quiz_id == quiz_id,
+        Submission.is_completed == True,
+        Submission.score.isnot(None)
+    ).group_by(Submission.user_id).subquery()
+    score = db.query(best.c.score).filter(best.c.user_id == user_id).scalar()
+    total, higher, lower = db.query(
+        func.count(),
+        func.count().filter(best.c.score > score),
+        func.count().filter(best.c.score < score),
+    ).select_from(best).one()
+    return {"score": score, "rank": higher + 1, "total": total, "percentile": lower / total * 100}
+
+
+def timed(fn, user_ids) -> tuple:
+    latencies, results = [], {}
+    for user_id in user_ids:
+        started = time.perf_counter()
+        results[user_id] = fn(user_id)
+        latencies.append((time.perf_counter() - started) * 1000)
+    latencies.sort()
+    return {"p50_ms": percentile(latencies, 50), "p95_ms": percentile(latencies, 95)}, results
+
+
+def run(args) -> dict:
+    from sqlalchemy import distinct
+
+    from app.db import SessionLocal
+    from app.models.submission import Submission
+    from app.services import leaderboard
+
+    quiz_id = prepare(args.users, args.attempts, args.seed)
+    board = leaderboard.get_leaderboard()
+
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        leaderboard.rebuild(db, quiz_id, reset=True)
+        rebuild_ms = (time.perf_counter() - started) * 1000
+
+        user_ids = [row[0] for row in db.query(distinct(Submission.user_id)).filter(Submission.quiz_id == quiz_id)]
+        sample = random.Random(args.seed).sample(user_ids, min(args.lookups, len(user_ids)))
+        board_stats, board_results = timed(lambda user_id: board.rank(quiz_id, user_id), sample)
+        sql_stats, sql_results = timed(lambda user_id: sql_rank(db, quiz_id, user_id), sample)
+        started = time.perf_counter()
+        board.top(quiz_id, 10)
+        top_ms = (time.perf_counter() - started) * 1000
+    finally:
+        db.close()
+
+    return {
+        "commit": current_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "backend": type(board).__name__,
+        "scenario": {"quiz_id": quiz_id, "users": args.users, "attempts": args.attempts, "lookups": len(sample)},
+        "results": {
+            "rebuild_ms": rebuild_ms,
+            "top10_ms": top_ms,
+            "rank_leaderboard": board_stats,
+            "rank_sql_scan": sql_stats,
+            "consistent": board_results == sql_results,
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="퀴즈 순위/백분위 조회 - 리더보드 vs 집계 쿼리")
+    parser.add_argument("--users", type=int, default=20000)
+    parser.add_argument("--attempts", type=int, default=2, help="사용자당 완료된 제출 수")
+    parser.add_argument("--lookups", type=int, default=200, help="순위를 조회할 사용자 수")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    report = run(args)
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
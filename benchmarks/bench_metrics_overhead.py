@@ -0,0 +1,95 @@
+# benchmarks/bench_metrics_overhead.py
+# 지표 수집 미들웨어/엔진 이벤트의 요청당 오버헤드 측정
+#
+# 사용법: python -m benchmarks.bench_metrics_overhead [--iterations 200000]
+import argparse
+import asyncio
+import json
+import time
+
+from sqlalchemy import create_engine, text
+
+from app.utils import metrics
+
+
+async def _plain_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b""})
+
+
+async def _receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def _send(message):
+    pass
+
+
+async def _run_asgi(app, iterations: int) -> float:
+    scope = {"type": "http", "method": "GET", "path": "/bench", "headers": []}
+    started = time.perf_counter()
+    for _ in range(iterations):
+        await app(dict(scope), _receive, _send)
+    return time.perf_counter() - started
+
+
+def bench_middleware(iterations: int) -> dict:
+    """미들웨어 유무에 따른 ASGI 호출 시간 차이"""
+    wrapped = metrics.MetricsMiddleware(_plain_app)
+    loop = asyncio.new_event_loop()
+    try:
+        # 워밍업
+        loop.run_until_complete(_run_asgi(_plain_app, 1000))
+        loop.run_until_complete(_run_asgi(wrapped, 1000))
+        base = loop.run_until_complete(_run_asgi(_plain_app, iterations))
+        instrumented = loop.run_until_complete(_run_asgi(wrapped, iterations))
+    finally:
+        loop.close()
+    metrics.reset()
+    return {
+        "iterations": iterations,
+        "baseline_us": base / iterations * 1e6,
+        "instrumented_us": instrumented / iterations * 1e6,
+        "overhead_us": (instrumented - base) / iterations * 1e6,
+    }
+
+
+def bench_engine_events(iterations: int) -> dict:
+    """쿼리 측정 이벤트 유무에 따른 SQL 실행 시간 차이 (SQLite 메모리 DB)"""
+    results = {}
+    for label, instrument in (("baseline", False), ("instrumented", True)):
+        engine = create_engine("sqlite://")
+        if instrument:
+            metrics.instrument_engine(engine)
+        with engine.connect() as conn:
+            statement = text("SELECT 1")
+            for _ in range(1000):
+                conn.execute(statement)
+            started = time.perf_counter()
+            for _ in range(iterations):
+                conn.execute(statement)
+            results[label] = time.perf_counter() - started
+        engine.dispose()
+    metrics.reset()
+    return {
+        "iterations": iterations,
+        "baseline_us": results["baseline"] / iterations * 1e6,
+        "instrumented_us": results["instrumented"] / iterations * 1e6,
+        "overhead_us": (results["instrumented"] - results["baseline"]) / iterations * 1e6,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="지표 수집 오버헤드 측정")
+    parser.add_argument("--iterations", type=int, default=200_000)
+    args = parser.parse_args()
+
+    report = {
+        "middleware": bench_middleware(args.iterations),
+        "engine_events": bench_engine_events(args.iterations // 10),
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+# benchmarks/bench_score_sketch.py
+# 점수 분포 스케치(KLL) 정확도/메모리 - 합성 점수 1,000만 개를 정확한 계산과 비교
+#
+# 사용법:
+#   python -m benchmarks.bench_score_sketch --scores 10000000 --days 30
+#   SCORE_SKETCH_K=400 python -m benchmarks.bench_score_sketch --scores 1000000
+#
+# 문항 수(20~50)와 난이도가 날마다 다른 시험 점수를 --days 일에 나눠 일별 요약(ScoreSummary)으로 만들고,
+# 조회할 때처럼 전부 합친 뒤 분위수별 순위 오차(정확한 분포 대비, %p), 히스토그램 일치 여부,
+# 요약 크기(보관 표본 수, 저장되는 JSON 바이트)와 갱신/병합/조회 시간을 JSON 으로 출력합니다.
+# 점수는 (맞힌 수 / 문항 수) * 100 이라 서로 다른 값이 적으므로 정확한 분포는 값별 개수로 계산합니다.
+import argparse
+import bisect
+import json
+import random
+import time
+from collections import Counter
+from datetime import datetime, timezone
+
+from app.config import settings
+from app.services.score_stats import ScoreSummary
+from benchmarks.load_test import current_commit
+
+QUANTILES = (0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99)
+
+
+def generate(rng: random.Random, count: int):
+    """하루치 점수 - 그날 시험의 문항 수와 평균 정답률을 정하고 학생마다 이항 분포에 가깝게"""
+    questions = rng.randint(20, 50)
+    ability = rng.uniform(0.45, 0.85)
+    for _ in range(count):
+        p = min(max(rng.gauss(ability, 0.12), 0.0), 1.0)
+        correct = min(max(int(round(rng.gauss(p * questions, (questions * p * (1 - p)) ** 0.5))), 0), questions)
+        yield correct / questions * 100
+
+
+def rank_error(values, counts, total, q, estimate) -> float:
+    """estimate 의 실제 순위 구간 [미만 비율, 이하 비율] 에서 q 까지의 거리 (%p)"""
+    index = bisect.bisect_left(values, estimate)
+    below = counts[index - 1] if index else 0
+    upto = counts[index] if index < len(values) and values[index] == estimate else below
+    low, high = below / total, upto / total
+    return 0.0 if low <= q <= high else min(abs(q - low), abs(q - high)) * 100
+
+
+def run(args) -> dict:
+    rng = random.Random(args.seed)
+    exact = Counter()
+    daily = []
+    per_day = args.scores // args.days
+    update_seconds = 0.0
+    for day in range(args.days):
+        count = per_day + (args.scores % args.days if day == args.days - 1 else 0)
+        scores = list(generate(rng, count))
+        exact.update(scores)
+        started = time.perf_counter()
+        daily.append(ScoreSummary.of(scores))
+        update_seconds += time.perf_counter() - started
+
+    started = time.perf_counter()
+    # 조회 경로와 같이 저장 형식(JSON)에서 읽어 합침
+    stored = [summary.to_json() for summary in daily]
+    merged = ScoreSummary()
+    for raw in stored:
+        merged.merge(ScoreSummary.from_json(raw))
+    merge_ms = (time.perf_counter() - started) * 1000
+    started = time.perf_counter()
+    described = merged.describe(QUANTILES)
+    query_ms = (time.perf_counter() - started) * 1000
+
+    values = sorted(exact)
+    counts, running = [], 0
+    for value in values:
+        running += exact[value]
+        counts.append(running)
+    total = running
+    errors = {
+        f"p{q * 100:g}": {
+            "estimate": estimate,
+            "exact": values[bisect.bisect_left(counts, q * total)],
+            "rank_error_pct": rank_error(values, counts, total, q, estimate),
+        }
+        for q, estimate in merged.sketch.quantiles(QUANTILES).items()
+    }
+    exact_histogram = [0] * len(merged.histogram.counts)
+    for value, count in exact.items():
+        exact_histogram[merged.histogram._index(value)] += count
+
+    return {
+        "commit": current_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "scenario": {
+            "scores": args.scores,
+            "days": args.days,
+            "sketch_k": settings.SCORE_SKETCH_K,
+            "histogram_width": settings.SCORE_HISTOGRAM_WIDTH,
+        },
+        "results": {
+            "count": described["count"],
+            "mean_error": abs(described["mean"] - sum(v * c for v, c in exact.items()) / total),
+            "quantiles": errors,
+            "max_rank_error_pct": max(e["rank_error_pct"] for e in errors.values()),
+            "histogram_exact": merged.histogram.counts == exact_histogram,
+            "retained_items_merged": merged.sketch.retained,
+            "stored_bytes_per_day": sum(len(raw) for raw in stored) / len(stored),
+            "raw_bytes_float64": args.scores * 8,
+            "update_us_per_score": update_seconds / args.scores * 1_000_000,
+            "merge_ms": merge_ms,
+            "query_ms": query_ms,
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="점수 분포 스케치 정확도/메모리 (정확한 계산과 비교)")
+    parser.add_argument("--scores", type=int, default=10_000_000)
+    parser.add_argument("--days", type=int, default=30, help="점수를 나눌 일 요약 수 (조회 시 모두 병합)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    report = run(args)
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+# benchmarks/bench_search.py
+# 문제 검색 - 전문 검색 색인(tsvector/FTS5) vs LIKE '%단어%' 전체 스캔
+#
+# 사용법 (datagen 으로 문제 은행을 채운 DB 에서):
+#   python -m benchmarks.datagen --users 1000 --quizzes 25 --questions-per-quiz 2000
+#   python -m benchmarks.bench_search --queries 200
+#
+# 색인되지 않은 행을 배치로 채운 시간(backfill_ms), 문제 내용에서 뽑은 두 단어 검색어 --queries 개를
+#   - 색인 검색 첫 페이지(관련도 순, --limit 개)
+#   - 색인 검색 다음 페이지(커서)
+#   - LIKE 스캔 (ID 순 --limit 개, 순위 없음)
+# 으로 조회한 p50/p95(ms)를 JSON 으로 출력합니다.
+import argparse
+import json
+import random
+import time
+from datetime import datetime, timezone
+
+from benchmarks.load_test import current_commit, percentile
+
+
+def timed(fn, terms) -> dict:
+    latencies = []
+    for term in terms:
+        started = time.perf_counter()
+        fn(term)
+        latencies.append((time.perf_counter() - started) * 1000)
+    latencies.sort()
+    return {"p50_ms": percentile(latencies, 50), "p95_ms": percentile(latencies, 95)}
+
+
+def run(args) -> dict:
+    import app.models.user, app.models.quiz, app.models.submission  # noqa: F401 (관계 대상 모델 등록)
+    from sqlalchemy import func, text
+
+    from app.db import SessionLocal, get_engine
+    from app.models.question import Question
+    from app.services import search
+
+    engine = get_engine()
+    with engine.begin() as connection:
+        search.install(connection)
+
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        indexed = search.backfill(db, "questions", args.batch_size)
+        backfill_ms = (time.perf_counter() - started) * 1000
+        questions = db.query(func.count(Question.id)).scalar()
+
+        # 실제 문제 하나에서 뽑은 두 단어 (관리자가 기억하는 문구로 찾는 경우, 뒷단어는 접두어만)
+        rng = random.Random(args.seed)
+        sample = [row[0] for row in db.query(Question.content).order_by(Question.id).limit(5000)]
+        terms = []
+        for _ in range(args.queries):
+            words = [word for word in search.query_terms(rng.choice(sample)) if len(word) >= 3]
+            first, second = rng.sample(words, 2)
+            terms.append(f"{first} {second[:-1]}")
+
+        cursors = {}
+
+        def first_page(term):
+            items, cursors[term] = search.search(db, term, limit=args.limit)
+            return items
+
+        def next_page(term):
+            if cursors.get(term):
+                search.search(db, term, limit=args.limit, cursor=cursors[term])
+
+        def like_scan(term):
+            words = term.split()
+            where = " AND ".join(f"lower(content) LIKE :w{i}" for i in range(len(words)))
+            params = {f"w{i}": f"%{word}%" for i, word in enumerate(words)}
+            return db.execute(text(
+                f"SELECT id, quiz_id, content FROM questions WHERE {where} ORDER BY id LIMIT :limit"
+            ), {**params, "limit": args.limit}).all()
+
+        results = {
+            "backfill_rows": indexed,
+            "backfill_ms": backfill_ms,
+            "search_first_page": timed(first_page, terms),
+            "search_next_page": timed(next_page, terms),
+            "like_scan": timed(like_scan, terms),
+        }
+    finally:
+        db.close()
+
+    return {
+        "commit": current_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "dialect": engine.dialect.name,
+        "scenario": {"questions": questions, "queries": args.queries, "limit": args.limit},
+        "results": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="문제 검색 - 전문 검색 색인 vs LIKE 스캔")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=20, help="페이지 크기")
+    parser.add_argument("--batch-size", type=int, default=2000, help="색인 채우기 배치 크기")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    report = run(args)
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
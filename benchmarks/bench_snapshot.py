@@ -0,0 +1,118 @@
+# benchmarks/bench_snapshot.py
+# 문제 스냅샷(mmap) vs ORM 로딩: 워커당 메모리 사용량과 페이지 구성 시간 비교
+#
+# 사용법: python -m benchmarks.bench_snapshot [--questions 50000] [--page-size 10]
+#
+# 임시 SQLite DB 에 문제를 채운 뒤 측정합니다.
+# - ORM: 워커가 모든 활성 문제를 메모리에 올려두는 경우의 파이썬 힙 사용량, 페이지마다 IN 쿼리로 읽는 경우의 지연 시간
+# - 스냅샷: mmap 으로 연 경우의 파이썬 힙 사용량(파일 자체는 페이지 캐시로 워커 간 공유), 페이지 구성 지연 시간
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.db import Base
+from app.models.question import Question
+from app.models.quiz import Quiz
+from app.models.user import User  # noqa: F401 (관계 설정용)
+from app.models.submission import Submission  # noqa: F401
+from app.schemas.quiz import Question as QuestionSchema
+from app.services.snapshot import QuestionSnapshot, build_snapshot
+
+
+def populate(session, questions: int) -> None:
+    session.execute(insert(Quiz), [{"id": 1, "title": "스냅샷 벤치마크", "questions_count": 30, "is_active": True}])
+    rng = random.Random(0)
+    batch = []
+    for i in range(questions):
+        batch.append({
+            "quiz_id": 1,
+            "content": f"문제 {i}: " + " ".join(f"단어{rng.randint(0, 9999)}" for _ in range(20)),
+            "options": [f"보기 {k} {rng.randint(0, 9999)}" for k in range(4)],
+            "correct_answer": rng.randrange(4),
+            "order": i,
+            "is_active": True,
+        })
+        if len(batch) == 5000:
+            session.execute(insert(Question), batch)
+            batch = []
+    if batch:
+        session.execute(insert(Question), batch)
+    session.commit()
+
+
+def measure_heap(fn):
+    tracemalloc.start()
+    result = fn()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current
+
+
+def main():
+    parser = argparse.ArgumentParser(description="문제 스냅샷 벤치마크")
+    parser.add_argument("--questions", type=int, default=50_000)
+    parser.add_argument("--page-size", type=int, default=10)
+    parser.add_argument("--pages", type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        Session = sessionmaker(bind=engine)
+        session = Session()
+        populate(session, args.questions)
+
+        snapshot_path = os.path.join(tmp, "questions.snap")
+        started = time.perf_counter()
+        build_snapshot(session, snapshot_path)
+        build_seconds = time.perf_counter() - started
+
+        # 메모리: 모든 문제를 ORM 객체로 보관 vs 스냅샷 mmap
+        session.expunge_all()
+        orm_cache, orm_bytes = measure_heap(lambda: session.query(Question).all())
+        snapshot, snapshot_bytes = measure_heap(lambda: QuestionSnapshot(snapshot_path))
+        del orm_cache
+        session.expunge_all()
+
+        rng = random.Random(1)
+        ids = [snapshot.ids[i] for i in range(len(snapshot))]
+        pages = [rng.sample(ids, args.page_size) for _ in range(args.pages)]
+
+        started = time.perf_counter()
+        for page in pages:
+            rows = {q.id: q for q in session.query(Question).filter(Question.id.in_(page)).all()}
+            [QuestionSchema.model_validate(rows[q_id]) for q_id in page]
+            session.expunge_all()
+        orm_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for page in pages:
+            rows = snapshot.get_many(page)
+            [QuestionSchema.model_validate(rows[q_id]) for q_id in page]
+        snapshot_seconds = time.perf_counter() - started
+
+        report = {
+            "questions": args.questions,
+            "page_size": args.page_size,
+            "snapshot_file_bytes": os.path.getsize(snapshot_path),
+            "snapshot_build_s": build_seconds,
+            "orm_cache_heap_bytes": orm_bytes,
+            "snapshot_heap_bytes": snapshot_bytes,
+            "orm_page_us": orm_seconds / args.pages * 1e6,
+            "snapshot_page_us": snapshot_seconds / args.pages * 1e6,
+        }
+        session.close()
+        engine.dispose()
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+# benchmarks/bench_startup.py
+# 워커 기동 시간 측정: app.main import 시간 + lifespan 시작 시간
+#
+# 사용법: python -m benchmarks.bench_startup [--redis-url redis://10.255.255.1:6379/0] [--runs 5]
+#
+# 매 측정마다 새 파이썬 프로세스를 띄워 import 캐시 영향을 없앱니다.
+# 기본 Redis 주소는 응답이 없는(blackhole) 주소로, Redis 장애 상황의 기동 시간을 측정합니다.
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+TARGET_MS = 300
+
+_CHILD = r"""
+import asyncio, json, time
+started = time.perf_counter()
+from app.main import app
+imported = time.perf_counter()
+
+async def boot():
+    async with app.router.lifespan_context(app):
+        return time.perf_counter()
+
+booted = asyncio.run(boot())
+print(json.dumps({"import_ms": (imported - started) * 1000, "lifespan_ms": (booted - imported) * 1000}))
+"""
+
+
+def measure_once(env: dict) -> dict:
+    result = subprocess.run([sys.executable, "-c", _CHILD], capture_output=True, text=True, env=env, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="워커 기동 시간 측정")
+    parser.add_argument("--redis-url", default="redis://10.255.255.1:6379/0", help="측정에 사용할 Redis 주소")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    env = dict(os.environ, REDIS_URL=args.redis_url)
+    runs = [measure_once(env) for _ in range(args.runs)]
+    totals = [run["import_ms"] + run["lifespan_ms"] for run in runs]
+
+    report = {
+        "redis_url": args.redis_url,
+        "runs": runs,
+        "import_ms_median": statistics.median(run["import_ms"] for run in runs),
+        "lifespan_ms_median": statistics.median(run["lifespan_ms"] for run in runs),
+        "total_ms_median": statistics.median(totals),
+        "target_ms": TARGET_MS,
+        "within_target": statistics.median(totals) < TARGET_MS,
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,353 @@
+# benchmarks/datagen.py
+# 벤치마크용 대용량 합성 데이터 생성기 (PostgreSQL / SQLite)
+#
+# 사용법:
+#   python -m benchmarks.datagen --users 10000 --quizzes 20 --questions-per-quiz 2000 \
+#       --submissions-per-user 10 --seed 42 --workers 8
+#
+# - 같은 --seed 이면 항상 같은 데이터가 생성됩니다 (청크마다 seed 에서 파생된 난수 생성기 사용).
+# - PostgreSQL 은 COPY, SQLite 는 executemany 로 적재합니다.
+# - 사용자 범위를 청크로 나눠 여러 프로세스에서 병렬 적재합니다 (SQLite 는 쓰기 잠금 때문에 단일 프로세스).
+# - ID 는 미리 계산해서 넣으므로 적재 후 PostgreSQL 시퀀스를 재설정합니다.
+import argparse
+import io
+import json
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Iterator, List, Sequence, Tuple
+
+from sqlalchemy import create_engine, text
+
+from app.db import Base
+
+# 모든 학생이 같은 비밀번호 (bcrypt 해시 계산을 한 번만 하기 위함)
+DEFAULT_PASSWORD = "datagen1234"
+OPTIONS_PER_QUESTION = 4
+# 문제 태그 (앞쪽 단원일수록 문제가 많음) - 블루프린트/노출 조절 벤치마크용
+TAGS = [f"단원-{i + 1}" for i in range(12)]
+TAG_WEIGHTS = [1 / (i + 1) for i in range(len(TAGS))]
+BASE_TIME = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+@dataclass
+class Plan:
+    users: int
+    quizzes: int
+    questions_per_quiz: int
+    questions_count: int
+    submissions_per_user: float
+    abandon_rate: float
+    seed: int
+    id_offset: int
+
+
+def chunk_seed(seed: int, kind: str, index: int) -> int:
+    """청크별 결정적 시드 (병렬 실행 순서와 무관하게 같은 결과)"""
+    return (seed * 1_000_003 + index * 7919 + sum(map(ord, kind))) & 0x7FFFFFFF
+
+
+def correct_answer_for(q_id: int) -> int:
+    """문제 ID 로부터 결정되는 정답 인덱스"""
+    return (q_id * 2654435761 >> 8) % OPTIONS_PER_QUESTION
+
+
+def difficulty_for(q_id: int) -> float:
+    """문제 ID 로부터 결정되는 난이도 (0.2 ~ 0.9)"""
+    return 0.2 + ((q_id * 2654435761) % 1000) / 1000 * 0.7
+
+
+def difficulty_label(q_id: int) -> str:
+    """난이도 값을 easy/medium/hard 로 (정답률에 쓰는 값과 일치)"""
+    value = difficulty_for(q_id)
+    return "easy" if value < 0.43 else "medium" if value < 0.67 else "hard"
+
+
+def user_rows(plan: Plan, password_hash: str, start: int, stop: int) -> Iterator[tuple]:
+    for i in range(start, stop):
+        user_id = plan.id_offset + i + 1
+        yield (user_id, f"student{user_id}", f"student{user_id}@example.com", password_hash, True, False, BASE_TIME)
+
+
+def quiz_rows(plan: Plan, admin_id: int) -> Iterator[tuple]:
+    for q in range(plan.quizzes):
+        quiz_id = plan.id_offset + q + 1
+        yield (
+            quiz_id, f"합성 퀴즈 {quiz_id}", "벤치마크용 합성 데이터", admin_id,
+            plan.questions_count, True, True, True, BASE_TIME,
+        )
+
+
+def question_id(plan: Plan, quiz_index: int, question_index: int) -> int:
+    return plan.id_offset + quiz_index * plan.questions_per_quiz + question_index + 1
+
+
+def question_rows(plan: Plan, quiz_index: int) -> Iterator[tuple]:
+    rng = random.Random(chunk_seed(plan.seed, "questions", quiz_index))
+    quiz_id = plan.id_offset + quiz_index + 1
+    for i in range(plan.questions_per_quiz):
+        options = [f"보기 {k + 1} ({rng.randint(0, 9999)})" for k in range(OPTIONS_PER_QUESTION)]
+        content = f"문제 {i + 1}: " + " ".join(f"단어{rng.randint(0, 5000)}" for _ in range(rng.randint(8, 30)))
+        # 태그 1~3개, 가중치는 대부분 1 이고 일부 문제만 0.5~3
+        tags = sorted(set(rng.choices(TAGS, weights=TAG_WEIGHTS, k=rng.randint(1, 3))))
+        weight = 1.0 if rng.random() < 0.8 else round(rng.uniform(0.5, 3.0), 2)
+        q_id = question_id(plan, quiz_index, i)
+        yield (
+            q_id, quiz_id, content, json.dumps(options, ensure_ascii=False),
+            correct_answer_for(q_id), i + 1, json.dumps(tags, ensure_ascii=False), difficulty_label(q_id), weight,
+            True, BASE_TIME,
+        )
+
+
+def submission_chunk(plan: Plan, start: int, stop: int) -> Tuple[List[tuple], List[tuple]]:
+    """사용자 범위 [start, stop) 의 응시 기록과 답안 생성
+
+    - 학생마다 능력치(beta 분포)가 있어 점수가 한쪽으로 치우침
+    - 문제마다 난이도가 있어 정답률이 문제별로 다름
+    - abandon_rate 비율의 응시는 중간에 포기된 미완료 상태 (일부 답안만 자동 저장)
+    """
+    rng = random.Random(chunk_seed(plan.seed, "submissions", start))
+    submissions, answers = [], []
+    # 각 사용자의 응시 기록 ID 는 사용자 번호로부터 결정 (청크 간 충돌 없음)
+    max_per_user = max(1, int(plan.submissions_per_user * 2))
+    for i in range(start, stop):
+        user_id = plan.id_offset + i + 1
+        ability = rng.betavariate(5, 2)  # 평균 0.71, 왼쪽 꼬리가 긴 분포
+        attempts = min(max_per_user, int(rng.expovariate(1 / plan.submissions_per_user)) if plan.submissions_per_user else 0)
+        open_quizzes = set()  # 퀴즈별 진행 중 응시는 하나만 (부분 유니크 인덱스)
+        for a in range(attempts):
+            submission_id = plan.id_offset + i * max_per_user + a + 1
+            quiz_index = rng.randrange(plan.quizzes)
+            quiz_id = plan.id_offset + quiz_index + 1
+            order = [
+                question_id(plan, quiz_index, q)
+                for q in rng.sample(range(plan.questions_per_quiz), plan.questions_count)
+            ]
+            started = BASE_TIME + timedelta(seconds=rng.randrange(180 * 86400))
+            abandoned = rng.random() < plan.abandon_rate and quiz_id not in open_quizzes
+            if abandoned:
+                open_quizzes.add(quiz_id)
+            answered = rng.randrange(len(order) + 1) if abandoned else len(order)
+
+            correct = 0
+            for position, q_id in enumerate(order[:answered]):
+                is_correct = rng.random() < ability * (1.2 - difficulty_for(q_id))
+                correct_answer = correct_answer_for(q_id)
+                selected = correct_answer if is_correct else rng.choice(
+                    [k for k in range(OPTIONS_PER_QUESTION) if k != correct_answer]
+                )
+                correct += is_correct
+                answers.append((
+                    submission_id, q_id, selected, None if abandoned else is_correct,
+                    started + timedelta(seconds=30 * (position + 1)),
+                ))
+
+            submit_time = None if abandoned else started + timedelta(seconds=30 * (len(order) + 1))
+            score = None if abandoned else correct / len(order) * 100
+            submissions.append((
+                submission_id, quiz_id, user_id, started, submit_time, json.dumps(order),
+                score, not abandoned, started,
+            ))
+    return submissions, answers
+
+
+USER_COLUMNS = ("id", "username", "email", "hashed_password", "is_active", "is_admin", "created_at")
+QUIZ_COLUMNS = (
+    "id", "title", "description", "created_by", "questions_count",
+    "randomize_questions", "randomize_options", "is_active", "created_at",
+)
+QUESTION_COLUMNS = (
+    "id", "quiz_id", "content", "options", "correct_answer", "order", "tags", "difficulty", "weight",
+    "is_active", "created_at",
+)
+SUBMISSION_COLUMNS = (
+    "id", "quiz_id", "user_id", "start_time", "submit_time", "question_order", "score", "is_completed", "created_at",
+)
+ANSWER_COLUMNS = ("submission_id", "question_id", "selected_option", "is_correct", "created_at")
+
+
+def _copy_value(value) -> str:
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value).replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+
+
+def _sqlite_value(value):
+    # SQLAlchemy 의 SQLite DateTime 저장 형식 (타임존 없는 문자열)
+    if isinstance(value, datetime):
+        return value.replace(tzinfo=None).isoformat(sep=" ")
+    return value
+
+
+def load_rows(engine, table: str, columns: Sequence[str], rows: Sequence[tuple]) -> int:
+    """PostgreSQL 은 COPY, 그 외는 executemany 로 일괄 적재"""
+    if not rows:
+        return 0
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        quoted = ", ".join(f'"{c}"' for c in columns)
+        if engine.dialect.name == "postgresql":
+            buffer = io.StringIO()
+            for row in rows:
+                buffer.write("\t".join(_copy_value(v) for v in row))
+                buffer.write("\n")
+            buffer.seek(0)
+            cursor.copy_expert(f'COPY {table} ({quoted}) FROM STDIN', buffer)
+        else:
+            placeholders = ", ".join("?" for _ in columns)
+            cursor.executemany(
+                f"INSERT INTO {table} ({quoted}) VALUES ({placeholders})",
+                [tuple(_sqlite_value(v) for v in row) for row in rows],
+            )
+        raw.commit()
+    finally:
+        raw.close()
+    return len(rows)
+
+
+def _load_questions(database_url: str, plan: Plan, quiz_index: int) -> int:
+    engine = create_engine(database_url)
+    try:
+        return load_rows(engine, "questions", QUESTION_COLUMNS, list(question_rows(plan, quiz_index)))
+    finally:
+        engine.dispose()
+
+
+def _load_submissions(database_url: str, plan: Plan, start: int, stop: int) -> Tuple[int, int]:
+    engine = create_engine(database_url)
+    try:
+        submissions, answers = submission_chunk(plan, start, stop)
+        load_rows(engine, "submissions", SUBMISSION_COLUMNS, submissions)
+        load_rows(engine, "submission_answers", ANSWER_COLUMNS, answers)
+        return len(submissions), len(answers)
+    finally:
+        engine.dispose()
+
+
+def _reset_sequences(engine) -> None:
+    if engine.dialect.name != "postgresql":
+        return
+    with engine.begin() as conn:
+        for table in ("users", "quizzes", "questions", "submissions", "submission_answers"):
+            conn.execute(text(
+                f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), COALESCE((SELECT MAX(id) FROM {table}), 1))"
+            ))
+
+
+def generate(database_url: str, plan: Plan, workers: int, chunk_size: int) -> dict:
+    from app.utils.auth import get_password_hash
+    import app.models.user, app.models.quiz, app.models.question, app.models.submission  # noqa: F401 (테이블 등록)
+
+    engine = create_engine(database_url)
+    Base.metadata.create_all(bind=engine)
+    if engine.dialect.name == "sqlite":
+        workers = 1  # SQLite 는 동시 쓰기가 불가능
+
+    timings = {}
+    started = time.perf_counter()
+
+    # 작성자 계정 (첫 번째 관리자 사용, 없으면 생성)
+    with engine.begin() as conn:
+        admin_id = conn.execute(text("SELECT id FROM users WHERE is_admin = :t ORDER BY id LIMIT 1"), {"t": True}).scalar()
+    if admin_id is None:
+        load_rows(engine, "users", USER_COLUMNS, [(
+            plan.id_offset + plan.users + 1, f"datagen_admin{plan.id_offset}", f"datagen_admin{plan.id_offset}@example.com",
+            get_password_hash(DEFAULT_PASSWORD), True, True, BASE_TIME,
+        )])
+        admin_id = plan.id_offset + plan.users + 1
+
+    password_hash = get_password_hash(DEFAULT_PASSWORD)
+    step = time.perf_counter()
+    for start in range(0, plan.users, chunk_size):
+        load_rows(engine, "users", USER_COLUMNS, list(user_rows(plan, password_hash, start, min(plan.users, start + chunk_size))))
+    load_rows(engine, "quizzes", QUIZ_COLUMNS, list(quiz_rows(plan, admin_id)))
+    timings["users_quizzes_s"] = time.perf_counter() - step
+
+    step = time.perf_counter()
+    question_count = 0
+    user_chunks = [(start, min(plan.users, start + chunk_size)) for start in range(0, plan.users, chunk_size)]
+    submission_count = answer_count = 0
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            question_count = sum(pool.map(_load_questions, [database_url] * plan.quizzes, [plan] * plan.quizzes, range(plan.quizzes)))
+            timings["questions_s"] = time.perf_counter() - step
+            step = time.perf_counter()
+            futures = [pool.submit(_load_submissions, database_url, plan, start, stop) for start, stop in user_chunks]
+            for future in futures:
+                s, a = future.result()
+                submission_count += s
+                answer_count += a
+    else:
+        for quiz_index in range(plan.quizzes):
+            question_count += _load_questions(database_url, plan, quiz_index)
+        timings["questions_s"] = time.perf_counter() - step
+        step = time.perf_counter()
+        for start, stop in user_chunks:
+            s, a = _load_submissions(database_url, plan, start, stop)
+            submission_count += s
+            answer_count += a
+    timings["submissions_s"] = time.perf_counter() - step
+
+    _reset_sequences(engine)
+    engine.dispose()
+    timings["total_s"] = time.perf_counter() - started
+
+    return {
+        "dialect": engine.dialect.name,
+        "seed": plan.seed,
+        "workers": workers,
+        "rows": {
+            "users": plan.users,
+            "quizzes": plan.quizzes,
+            "questions": question_count,
+            "submissions": submission_count,
+            "submission_answers": answer_count,
+        },
+        "timings": timings,
+        "answer_rows_per_s": answer_count / timings["submissions_s"] if timings["submissions_s"] else None,
+    }
+
+
+def main():
+    from app.config import settings
+
+    parser = argparse.ArgumentParser(description="벤치마크용 합성 데이터 생성")
+    parser.add_argument("--database-url", default=settings.DATABASE_URL)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--quizzes", type=int, default=10)
+    parser.add_argument("--questions-per-quiz", type=int, default=500, help="퀴즈별 문제 은행 크기")
+    parser.add_argument("--questions-count", type=int, default=30, help="응시 1회에 출제되는 문제 수")
+    parser.add_argument("--submissions-per-user", type=float, default=3.0, help="사용자당 평균 응시 횟수 (지수 분포)")
+    parser.add_argument("--abandon-rate", type=float, default=0.15, help="중도 포기(미완료) 응시 비율")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--workers", type=int, default=4, help="병렬 적재 프로세스 수 (SQLite 는 1로 고정)")
+    parser.add_argument("--chunk-size", type=int, default=2000, help="청크당 사용자 수")
+    parser.add_argument("--id-offset", type=int, default=1_000_000, help="기존 데이터와 겹치지 않도록 ID 에 더할 값")
+    args = parser.parse_args()
+
+    if args.questions_count > args.questions_per_quiz:
+        parser.error("--questions-count 는 --questions-per-quiz 보다 클 수 없습니다")
+
+    plan = Plan(
+        users=args.users,
+        quizzes=args.quizzes,
+        questions_per_quiz=args.questions_per_quiz,
+        questions_count=args.questions_count,
+        submissions_per_user=args.submissions_per_user,
+        abandon_rate=args.abandon_rate,
+        seed=args.seed,
+        id_offset=args.id_offset,
+    )
+    report = generate(args.database_url, plan, args.workers, args.chunk_size)
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+# benchmarks/load_test.py
+# 시험 전체 흐름(로그인 → 페이지 응시 → 중간 저장 → 마감 시 제출) 부하 테스트
+#
+# 사용법:
+#   python -m benchmarks.load_test --students 50                 # 앱을 프로세스 내에서 직접 구동 (ASGITransport)
+#   python -m benchmarks.load_test --base-url http://localhost:8000 --students 200
+#   ASYNC_GRADING=True python -m benchmarks.load_test --students 200   # 제출 → 채점 완료 지연(grading_lag) 포함
+#
+# 결과는 엔드포인트별 p50/p95/p99 지연 시간(ms)과 RPS를 담은 JSON으로 출력되며,
+# --output 으로 파일에 저장해 커밋 간 비교에 사용할 수 있습니다.
+import argparse
+import asyncio
+import json
+import math
+import subprocess
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+import httpx
+
+API_PREFIX = "/api"
+STUDENT_PASSWORD = "loadtest1234"
+
+
+def percentile(sorted_values: List[float], pct: float) -> Optional[float]:
+    """정렬된 값에서 nearest-rank 방식 백분위수"""
+    if not sorted_values:
+        return None
+    rank = math.ceil(pct / 100 * len(sorted_values))
+    return sorted_values[max(0, min(len(sorted_values), rank) - 1)]
+
+
+class Recorder:
+    """엔드포인트별 지연 시간/오류 기록"""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.first_request: Optional[float] = None
+        self.last_response: Optional[float] = None
+
+    async def request(self, client: httpx.AsyncClient, name: str, method: str, url: str, **kwargs) -> httpx.Response:
+        started = time.perf_counter()
+        if self.first_request is None:
+            self.first_request = started
+        response = await client.request(method, url, **kwargs)
+        finished = time.perf_counter()
+        self.last_response = finished
+        self.latencies[name].append((finished - started) * 1000)
+        if response.status_code >= 400:
+            self.errors[name] += 1
+        return response
+
+    def observe(self, name: str, elapsed_ms: float) -> None:
+        self.latencies[name].append(elapsed_ms)
+
+    def report(self) -> dict:
+        wall_time = (self.last_response or 0) - (self.first_request or 0)
+        endpoints = {}
+        for name, values in sorted(self.latencies.items()):
+            values = sorted(values)
+            endpoints[name] = {
+                "count": len(values),
+                "errors": self.errors.get(name, 0),
+                "rps": len(values) / wall_time if wall_time > 0 else None,
+                "p50_ms": percentile(values, 50),
+                "p95_ms": percentile(values, 95),
+                "p99_ms": percentile(values, 99),
+                "max_ms": values[-1],
+            }
+        total = sum(len(values) for values in self.latencies.values())
+        return {
+            "wall_time_s": wall_time,
+            "total_requests": total,
+            "total_rps": total / wall_time if wall_time > 0 else None,
+            "endpoints": endpoints,
+        }
+
+
+async def login(client: httpx.AsyncClient, username: str, password: str, recorder: Optional[Recorder] = None) -> dict:
+    data = {"username": username, "password": password}
+    if recorder:
+        response = await recorder.request(client, "login", "POST", f"{API_PREFIX}/users/login", data=data)
+    else:
+        response = await client.post(f"{API_PREFIX}/users/login", data=data)
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def prepare_quiz(client: httpx.AsyncClient, questions: int, admin_user: str, admin_password: str) -> int:
+    """부하 테스트용 퀴즈와 문제 생성"""
+    headers = await login(client, admin_user, admin_password)
+    response = await client.post(
+        f"{API_PREFIX}/quizzes/",
+        headers=headers,
+        json={"title": f"부하 테스트 퀴즈 ({questions}문항)", "questions_count": questions},
+    )
+    response.raise_for_status()
+    quiz_id = response.json()["id"]
+    for i in range(questions):
+        response = await client.post(
+            f"{API_PREFIX}/quizzes/{quiz_id}/questions",
+            headers=headers,
+            json={"content": f"부하 테스트 문제 {i + 1}", "options": ["1", "2", "3", "4"], "correct_answer": i % 4},
+        )
+        response.raise_for_status()
+    return quiz_id
+
+
+async def prepare_students(client: httpx.AsyncClient, count: int, concurrency: int) -> List[str]:
+    """학생 계정 생성 (이미 있으면 재사용)"""
+    semaphore = asyncio.Semaphore(concurrency)
+    usernames = [f"loadtest_{i}" for i in range(count)]
+
+    async def create(username: str):
+        async with semaphore:
+            response = await client.post(
+                f"{API_PREFIX}/users/",
+                json={"username": username, "email": f"{username}@example.com", "password": STUDENT_PASSWORD},
+            )
+            if response.status_code not in (201, 400):
+                response.raise_for_status()
+
+    await asyncio.gather(*(create(username) for username in usernames))
+    return usernames
+
+
+async def run_student(
+        client: httpx.AsyncClient,
+        recorder: Recorder,
+        username: str,
+        quiz_id: int,
+        pages: int,
+        save_every: int,
+        think_time: float,
+        deadline: asyncio.Event,
+) -> None:
+    """학생 한 명의 시나리오: 로그인 → 모든 페이지 응시(주기적 저장) → 마감 시 제출"""
+    headers = await login(client, username, STUDENT_PASSWORD, recorder)
+
+    answers = []
+    submission_id = None
+    for page in range(1, pages + 1):
+        response = await recorder.request(
+            client, "take", "GET", f"{API_PREFIX}/quizzes/{quiz_id}/take", headers=headers, params={"page": page}
+        )
+        if response.status_code != 200:
+            return
+        answers.extend({"question_id": q["id"], "selected_option": 0} for q in response.json())
+
+        if submission_id is None:
+            response = await recorder.request(client, "my_submissions", "GET", f"{API_PREFIX}/submissions/my", headers=headers)
+            submission_id = next(
+                (s["id"] for s in response.json() if s["quiz_id"] == quiz_id and not s["is_completed"]), None
+            )
+            if submission_id is None:
+                return
+
+        if save_every and page % save_every == 0:
+            await recorder.request(
+                client, "save", "POST", f"{API_PREFIX}/submissions/{submission_id}/save", headers=headers, json=answers
+            )
+        if think_time:
+            await asyncio.sleep(think_time)
+
+    # 모든 학생이 마감 시각에 동시에 제출
+    await deadline.wait()
+    submitted = time.perf_counter()
+    response = await recorder.request(
+        client, "answers", "POST", f"{API_PREFIX}/submissions/{submission_id}/answers", headers=headers, json=answers
+    )
+
+    # 비동기 채점이면 점수가 나올 때까지 대기해 제출 → 채점 완료 지연 측정
+    if response.status_code == 202:
+        status_url = response.json()["status_url"]
+        while True:
+            response = await client.get(status_url, headers=headers, params={"wait": 10})
+            if response.status_code != 200 or response.json()["grading_status"] != "pending":
+                break
+        recorder.observe("grading_lag", (time.perf_counter() - submitted) * 1000)
+
+
+def current_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def make_client(base_url: Optional[str], timeout: float) -> httpx.AsyncClient:
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    if base_url:
+        return httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits)
+
+    from app.main import app
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://testserver", timeout=timeout)
+
+
+async def run(args) -> dict:
+    async with make_client(args.base_url, args.timeout) as client:
+        quiz_id = args.quiz_id or await prepare_quiz(client, args.questions, args.admin_user, args.admin_password)
+        usernames = await prepare_students(client, args.students, args.concurrency)
+
+        # 퀴즈의 페이지 수 계산 (take_quiz 와 동일한 규칙)
+        headers = await login(client, args.admin_user, args.admin_password)
+        quiz = (await client.get(f"{API_PREFIX}/quizzes/{quiz_id}", headers=headers)).json()
+        questions_count = quiz["questions_count"]
+        questions_per_page = questions_count // 3 if questions_count >= 3 else questions_count
+        pages = (questions_count + questions_per_page - 1) // questions_per_page
+
+        recorder = Recorder()
+        deadline = asyncio.Event()
+        tasks = [
+            asyncio.create_task(run_student(
+                client, recorder, username, quiz_id, pages, args.save_every, args.think_time, deadline
+            ))
+            for username in usernames
+        ]
+
+        # 마감 시각이 되면 제출 허용
+        await asyncio.sleep(args.deadline)
+        deadline.set()
+        await asyncio.gather(*tasks)
+
+    return {
+        "commit": current_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "target": args.base_url or "asgi",
+        "scenario": {
+            "students": args.students,
+            "quiz_id": quiz_id,
+            "pages": pages,
+            "save_every": args.save_every,
+            "think_time_s": args.think_time,
+            "deadline_s": args.deadline,
+        },
+        **recorder.report(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="시험 응시 흐름 부하 테스트")
+    parser.add_argument("--base-url", help="실행 중인 서버 주소 (생략 시 프로세스 내 ASGI 앱 사용)")
+    parser.add_argument("--students", type=int, default=20, help="동시 응시 학생 수")
+    parser.add_argument("--quiz-id", type=int, help="사용할 퀴즈 ID (생략 시 새로 생성)")
+    parser.add_argument("--questions", type=int, default=30, help="새로 생성할 퀴즈의 문제 수")
+    parser.add_argument("--save-every", type=int, default=1, help="몇 페이지마다 중간 저장할지 (0이면 저장 안 함)")
+    parser.add_argument("--think-time", type=float, default=0.0, help="페이지 사이 대기 시간(초)")
+    parser.add_argument("--deadline", type=float, default=1.0, help="시작 후 제출 마감까지의 시간(초)")
+    parser.add_argument("--concurrency", type=int, default=20, help="계정 생성 동시 요청 수")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--admin-user", default="admin")
+    parser.add_argument("--admin-password", default="admin1234")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
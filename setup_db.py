@@ -7,7 +7,8 @@ from sqlalchemy.orm import sessionmaker
 # 모델 임포트
 from app.models.quiz import Quiz
 from app.models.question import Question
-from app.models.submission import Submission, SubmissionAnswer
+from app.models.submission import ArchivedSubmission, AttemptSummary, Submission, SubmissionAnswer
+import app.services.search  # noqa: F401 (create_all 때 검색 색인 생성)
 
 # 테이블 생성
 Base.metadata.create_all(bind=engine)
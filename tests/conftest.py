@@ -0,0 +1,48 @@
+# tests/conftest.py
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.main import app
+from tests.query_budget import count_queries as _count_queries, query_budget as _query_budget
+
+_client = TestClient(app)
+
+
+def _login(username: str, password: str) -> dict:
+    response = _client.post(
+        f"{settings.API_PREFIX}/users/login",
+        data={"username": username, "password": password}
+    )
+    assert response.status_code == 200
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture
+def login():
+    """로그인해서 인증 헤더를 만드는 함수 - login(username, password)"""
+    return _login
+
+
+@pytest.fixture
+def admin_headers():
+    """테스트 관리자 계정 인증 헤더"""
+    return _login("admin", "admin1234")
+
+
+@pytest.fixture
+def user_headers():
+    """테스트 사용자 계정 인증 헤더"""
+    return _login("user", "user1234")
+
+
+@pytest.fixture
+def count_queries():
+    """SQL 실행 횟수를 세는 컨텍스트 매니저 팩토리"""
+    return _count_queries
+
+
+@pytest.fixture
+def query_budget():
+    """엔드포인트별 쿼리 예산 검사 컨텍스트 매니저"""
+    return _query_budget
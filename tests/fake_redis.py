@@ -0,0 +1,88 @@
+# tests/fake_redis.py
+# 테스트용 최소 Redis - Redis 서버 없이 캐시/색인 경로를 확인할 때 cache.get_redis 를 대신함
+import copy
+
+import redis
+
+
+class FakeRedis:
+    """테스트용 최소 Redis (문자열/해시와 WATCH 파이프라인만)"""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None, nx=False):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        return True
+
+    def setex(self, key, seconds, value):
+        self.data[key] = value
+
+    def mget(self, keys):
+        return [self.data.get(key) for key in keys]
+
+    def hget(self, key, field):
+        return self.data.get(key, {}).get(field)
+
+    def hset(self, key, field, value):
+        self.data.setdefault(key, {})[field] = value
+
+    def expire(self, key, seconds):
+        return key in self.data
+
+    def incr(self, key):
+        self.data[key] = str(int(self.data.get(key) or 0) + 1)
+        return int(self.data[key])
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    """WATCH 후에는 즉시 실행, MULTI(또는 첫 명령) 이후에는 모았다가 EXECUTE 에서 실행"""
+
+    def __init__(self, client):
+        self.client = client
+        self.watched = {}
+        self.commands = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.watched, self.commands = {}, None
+
+    def watch(self, *keys):
+        for key in keys:
+            self.watched[key] = copy.deepcopy(self.client.data.get(key))
+
+    def multi(self):
+        self.commands = []
+
+    def __getattr__(self, name):
+        method = getattr(self.client, name)
+
+        def call(*args, **kwargs):
+            if self.commands is None and self.watched:
+                return method(*args, **kwargs)
+            if self.commands is None:
+                self.commands = []
+            self.commands.append((method, args, kwargs))
+            return self
+        return call
+
+    def execute(self):
+        if any(self.client.data.get(key) != value for key, value in self.watched.items()):
+            raise redis.exceptions.WatchError()
+        results = [method(*args, **kwargs) for method, args, kwargs in self.commands or []]
+        self.watched, self.commands = {}, None
+        return results
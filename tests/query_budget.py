@@ -0,0 +1,66 @@
+# tests/query_budget.py
+# 테스트 중 실행된 SQL 수를 세고 엔드포인트별 쿼리 예산을 검사하는 도구
+from contextlib import contextmanager
+from typing import List, Optional
+
+import pytest
+from sqlalchemy import event
+
+from app.db import get_engine
+
+# 엔드포인트별 쿼리 예산 - 문제 수/페이지 크기와 무관하게 일정해야 함
+QUERY_BUDGETS = {
+    # 사용자, 퀴즈, 진행 중인 응시 기록, 페이지 문제
+    "take_page": 4,
+    # 사용자, 응시 기록, 기존 답안 삭제, 정답 조회, 응시 요약 갱신, 응시 기록 갱신(압축된 답안 포함)
+    "submit_answers": 6,
+    # 사용자, 응시 기록, 기존 답안 삭제, 답안 일괄 저장
+    "save_progress": 4,
+    # 사용자, 응시 기록, 답안 목록
+    "read_submission": 3,
+    # 응시 기록, 퀴즈, 답안+문제
+    "submission_result": 3,
+}
+
+
+class QueryCounter:
+    """블록 안에서 엔진이 실행한 SQL 문을 기록"""
+
+    def __init__(self, bind=None):
+        self.bind = bind if bind is not None else get_engine()
+        self.statements: List[str] = []
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def __enter__(self) -> "QueryCounter":
+        event.listen(self.bind, "after_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        event.remove(self.bind, "after_cursor_execute", self._record)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def report(self) -> str:
+        return "\n".join(f"  {i}. {statement}" for i, statement in enumerate(self.statements, 1))
+
+
+def count_queries(bind=None) -> QueryCounter:
+    """SQL 실행 횟수를 세는 컨텍스트 매니저"""
+    return QueryCounter(bind)
+
+
+@contextmanager
+def query_budget(name: str, limit: Optional[int] = None):
+    """블록 안의 SQL 수가 예산을 넘으면 실행된 쿼리 목록과 함께 테스트 실패 처리"""
+    budget = limit if limit is not None else QUERY_BUDGETS[name]
+    with count_queries() as counter:
+        yield counter
+    if counter.count > budget:
+        pytest.fail(
+            f"'{name}' 쿼리 예산 초과: {counter.count}개 실행 (예산 {budget}개)\n{counter.report()}",
+            pytrace=False,
+        )
@@ -0,0 +1,98 @@
+# tests/test_adaptive.py
+# 적응형 출제 - 정보량 기반 문제 선택/노출 제한, 답할 때마다 문제를 이어 받는 응시 흐름 (numpy 필요)
+import random
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.config import settings
+from app.db import SessionLocal
+from app.models.question import QuestionRating
+
+np = pytest.importorskip("numpy")
+
+from app.services import adaptive  # noqa: E402
+
+API_PREFIX = settings.API_PREFIX
+client = TestClient(app)
+
+
+def test_select_most_informative_with_exposure_limit():
+    bank = adaptive.ItemBank([1, 2, 3, 4], [-2.0, -0.5, 0.4, 2.0], [0] * 4, [0, 0, 0, 0], sessions=10)
+    rng = random.Random(0)
+    # 능력에 가장 가까운 난이도
+    assert bank.select(0.5, top_k=1, rng=rng) == 3
+    assert bank.select(-1.8, top_k=1, rng=rng) == 1
+    # 이미 받은 문제 제외
+    assert bank.select(0.5, exclude=[3], top_k=1, rng=rng) == 2
+    # 노출률 한도를 넘은 문제 제외, 모두 넘으면 한도 무시
+    bank.exposures[:] = [0, 9, 9, 0]
+    assert bank.select(0.5, top_k=1, max_exposure=0.5, rng=rng) in (1, 4)
+    bank.exposures[:] = 9
+    assert bank.select(0.5, top_k=1, max_exposure=0.5, rng=rng) == 3
+    assert bank.select(0.5, exclude=[1, 2, 3, 4]) is None
+
+
+def test_adaptive_attempt_flow(admin_headers, user_headers):
+    headers = user_headers
+
+    response = client.post(
+        f"{API_PREFIX}/quizzes",
+        headers=admin_headers,
+        json={"title": "적응형 퀴즈", "questions_count": 3, "randomize_options": False, "adaptive": True}
+    )
+    assert response.status_code == 201
+    quiz_id = response.json()["id"]
+    assert response.json()["adaptive"] is True
+    for i in range(6):
+        client.post(
+            f"{API_PREFIX}/quizzes/{quiz_id}/questions",
+            headers=admin_headers,
+            json={"content": f"적응형 문제 {i + 1}", "options": ["가", "나", "다", "라"], "correct_answer": 0}
+        )
+
+    # 적응형은 빈 문제 순서로 시작
+    response = client.get(f"{API_PREFIX}/quizzes/{quiz_id}/take", headers=headers)
+    assert response.json() == []
+    submission_id = int(response.headers["X-Submission-Id"])
+    url = f"{API_PREFIX}/submissions/{submission_id}/next"
+
+    step = client.post(url, headers=headers).json()
+    assert step["answered"] == 0 and step["remaining"] == 3
+    first = step["question"]["id"]
+    # 답하지 않고 다시 요청하면 같은 문제
+    assert client.post(url, headers=headers).json()["question"]["id"] == first
+    # 마지막으로 받은 문제가 아니면 400
+    assert client.post(url, headers=headers, json={"question_id": first + 100, "selected_option": 0}).status_code == 400
+
+    served = [first]
+    step = client.post(url, headers=headers, json={"question_id": first, "selected_option": 0}).json()
+    assert step["last_correct"] is True and step["ability"] > 0
+    served.append(step["question"]["id"])
+    step = client.post(url, headers=headers, json={"question_id": served[-1], "selected_option": 1}).json()
+    assert step["last_correct"] is False
+    served.append(step["question"]["id"])
+    step = client.post(url, headers=headers, json={"question_id": served[-1], "selected_option": 0}).json()
+    assert step["answered"] == 3 and step["remaining"] == 0 and step["question"] is None
+    assert len(set(served)) == 3
+
+    db = SessionLocal()
+    try:
+        ratings = {row.question_id: row for row in db.query(QuestionRating).filter(QuestionRating.quiz_id == quiz_id)}
+        assert ratings[served[0]].rating < 0 < ratings[served[1]].rating
+        assert all(ratings[question_id].exposures == 1 for question_id in served)
+    finally:
+        db.close()
+
+    # 적응형 응시는 /next 에서 채점된 답으로 제출 (본문 답안 무시)
+    response = client.post(
+        f"{API_PREFIX}/submissions/{submission_id}/answers",
+        headers=headers,
+        json=[{"question_id": question_id, "selected_option": 0} for question_id in served]
+    )
+    assert response.status_code in (201, 202)
+    result = client.get(f"{API_PREFIX}/submissions/{submission_id}", headers=headers).json()
+    assert result["question_order"] == served
+    if result["score"] is not None:
+        assert round(result["score"]) == 67
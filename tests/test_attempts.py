@@ -0,0 +1,93 @@
+# tests/test_attempts.py
+# 사용자/퀴즈별 응시 요약 - 응시 시작/제출 시 갱신, 퀴즈 목록 응시 여부, 재구성
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.config import settings
+from app.db import SessionLocal
+from app.models.submission import AttemptSummary
+from app.services import attempts
+
+API_PREFIX = settings.API_PREFIX
+client = TestClient(app)
+
+
+def quiz_attempt(headers: dict, quiz_id: int) -> dict:
+    # 퀴즈 목록은 ID 순이라 이전 실행의 퀴즈가 쌓이면 뒤 페이지에 있음
+    page = 1
+    while True:
+        response = client.get(
+            f"{API_PREFIX}/quizzes/", headers=headers, params={"page": page, "page_size": 100, "with_attempts": True}
+        )
+        assert response.status_code == 200 and response.json()
+        quiz = next((quiz for quiz in response.json() if quiz["id"] == quiz_id), None)
+        if quiz is not None:
+            return quiz["attempt"]
+        page += 1
+
+
+def snapshot(user_id: int, quiz_id: int) -> tuple:
+    db = SessionLocal()
+    try:
+        summary = db.get(AttemptSummary, (user_id, quiz_id))
+        return (
+            summary.attempt_count, summary.completed_count, summary.best_score,
+            summary.last_score, summary.in_progress_submission_id
+        )
+    finally:
+        db.close()
+
+
+def test_attempt_summary_lifecycle(admin_headers, user_headers):
+    response = client.post(
+        f"{API_PREFIX}/quizzes",
+        headers=admin_headers,
+        json={"title": "응시 요약 테스트", "questions_count": 2, "randomize_options": False}
+    )
+    quiz_id = response.json()["id"]
+    for i in range(2):
+        client.post(
+            f"{API_PREFIX}/quizzes/{quiz_id}/questions",
+            headers=admin_headers,
+            json={"content": f"문제 {i + 1}", "options": ["가", "나", "다", "라"], "correct_answer": 0}
+        )
+
+    headers = user_headers
+    user_id = client.get(f"{API_PREFIX}/users/me", headers=headers).json()["id"]
+    assert quiz_attempt(headers, quiz_id) is None
+
+    for correct in (2, 1):
+        response = client.get(f"{API_PREFIX}/quizzes/{quiz_id}/take", headers=headers)
+        questions = response.json()
+        attempt = quiz_attempt(headers, quiz_id)
+        submission_id = attempt["in_progress_submission_id"]
+        assert submission_id == int(response.headers["X-Submission-Id"])
+
+        answers = [
+            {"question_id": q["id"], "selected_option": 0 if i < correct else 1}
+            for i, q in enumerate(questions)
+        ]
+        response = client.post(f"{API_PREFIX}/submissions/{submission_id}/answers", headers=headers, json=answers)
+        assert response.status_code == 201
+
+    attempt = quiz_attempt(headers, quiz_id)
+    assert attempt["attempt_count"] == 2
+    assert attempt["completed_count"] == 2
+    assert attempt["best_score"] == 100
+    assert attempt["last_score"] == 50
+    assert attempt["in_progress_submission_id"] is None
+
+    response = client.get(f"{API_PREFIX}/submissions/my/summary", headers=headers)
+    assert response.status_code == 200
+    mine = next(summary for summary in response.json() if summary["quiz_id"] == quiz_id)
+    assert mine["quiz_title"] == "응시 요약 테스트"
+    assert mine["best_score"] == 100
+
+    # 제출 기록으로 다시 채워도 같은 값
+    maintained = snapshot(user_id, quiz_id)
+    db = SessionLocal()
+    try:
+        assert attempts.rebuild(db) > 0
+    finally:
+        db.close()
+    assert snapshot(user_id, quiz_id) == maintained
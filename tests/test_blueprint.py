@@ -0,0 +1,111 @@
+# tests/test_blueprint.py
+# 블루프린트 출제 - 구간별 가중치 비복원 추출, 공개 시 재고 검사, 구간대로 만들어지는 응시 기록
+import random
+from collections import Counter
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.config import settings
+from app.services import blueprint
+
+API_PREFIX = settings.API_PREFIX
+client = TestClient(app)
+
+
+def test_draw_follows_blueprint_and_weights():
+    questions = [(i, ["대수"], "easy", 1.0) for i in range(1, 21)]
+    questions += [(i, ["기하"], "hard", 1.0) for i in range(21, 31)]
+    questions += [(31, ["대수", "기하"], "hard", 1.0), (32, ["기하"], "hard", 9.0)]
+    index = blueprint.BlueprintIndex(questions)
+    assert index.stock("기하", "hard") == 12 and index.stock(None, "hard") == 12 and index.stock(None, None) == 32
+
+    rng = random.Random(0)
+    sections = [{"tag": "대수", "difficulty": "easy", "count": 5}, {"tag": "기하", "difficulty": "hard", "count": 3}]
+    picks = Counter()
+    for _ in range(2000):
+        order = index.draw(sections, shuffle=False, rng=rng)
+        assert len(order) == 8 and len(set(order)) == 8
+        assert all(1 <= q <= 20 for q in order[:5]) and all(q > 20 for q in order[5:])
+        picks.update(order[5:])
+    # 가중치 9 인 문제는 약 86% 의 응시에서 뽑히고 (가중치 비례로 하나씩 뽑을 때의 확률), 나머지는 고르게
+    assert 1640 < picks[32] < 1790
+    assert 300 < picks[21] < 480
+
+    # 구간 문제를 모두 뽑아도 중복 없이 전부
+    assert sorted(index.draw([{"tag": "기하", "count": 12}], rng=rng)) == list(range(21, 33))
+
+
+def test_check_stock():
+    index = blueprint.BlueprintIndex([(1, ["대수"], "easy", 1.0), (2, ["대수", "기하"], "easy", 1.0)])
+    assert blueprint.check_stock(index, [{"tag": "대수", "count": 2}]) == []
+    assert blueprint.check_stock(index, [{"tag": "기하", "difficulty": "hard", "count": 1}]) == [
+        {"section": 0, "tag": "기하", "difficulty": "hard", "count": 1, "stock": 0}
+    ]
+    # 구간마다는 충분하지만 겹치는 문제를 한 번만 세면 부족
+    shortages = blueprint.check_stock(index, [{"tag": "대수", "count": 2}, {"tag": "기하", "count": 1}])
+    assert shortages == [{"section": None, "tag": None, "difficulty": None, "count": 3, "stock": 2}]
+
+
+def test_blueprint_quiz_flow(admin_headers, user_headers):
+    headers = user_headers
+
+    response = client.post(
+        f"{API_PREFIX}/quizzes",
+        headers=admin_headers,
+        json={
+            "title": "블루프린트 퀴즈",
+            "randomize_options": False,
+            "blueprint": [{"tag": "대수", "difficulty": "easy", "count": 2}, {"tag": " 기하 ", "count": 1}],
+        }
+    )
+    assert response.status_code == 201
+    quiz = response.json()
+    quiz_id = quiz["id"]
+    assert quiz["questions_count"] == 3
+    assert quiz["blueprint"][1] == {"tag": "기하", "difficulty": None, "count": 1}
+
+    algebra = [
+        client.post(
+            f"{API_PREFIX}/quizzes/{quiz_id}/questions",
+            headers=admin_headers,
+            json={
+                "content": f"대수 문제 {i}", "options": ["가", "나"], "correct_answer": 0,
+                "tags": ["대수", "대수"], "difficulty": "easy",
+            }
+        ).json()
+        for i in range(3)
+    ]
+    assert algebra[0]["tags"] == ["대수"] and algebra[0]["weight"] == 1.0
+
+    # 공개(활성화) 시 재고 검사 - 기하 문제가 없음
+    response = client.put(f"{API_PREFIX}/quizzes/{quiz_id}", headers=admin_headers, json={"is_active": True})
+    assert response.status_code == 400
+    assert response.json()["detail"]["shortages"][0]["tag"] == "기하"
+
+    geometry = client.post(
+        f"{API_PREFIX}/quizzes/{quiz_id}/questions",
+        headers=admin_headers,
+        json={"content": "기하 문제", "options": ["가", "나"], "correct_answer": 0, "tags": ["기하"], "weight": 2.0}
+    ).json()
+    assert client.put(
+        f"{API_PREFIX}/quizzes/{quiz_id}", headers=admin_headers, json={"is_active": True}
+    ).status_code == 200
+
+    # 응시 기록은 블루프린트대로
+    response = client.get(f"{API_PREFIX}/quizzes/{quiz_id}/take", headers=headers)
+    assert response.status_code == 200
+    submission_id = response.headers["X-Submission-Id"]
+    ids = client.get(f"{API_PREFIX}/submissions/{submission_id}", headers=headers).json()["question_order"]
+    assert len(ids) == 3 and geometry["id"] in ids
+    assert len(set(ids) & {question["id"] for question in algebra}) == 2
+
+    # 적응형과 함께 쓸 수 없고, 가중치는 양수
+    assert client.put(
+        f"{API_PREFIX}/quizzes/{quiz_id}", headers=admin_headers, json={"adaptive": True}
+    ).status_code == 400
+    assert client.post(
+        f"{API_PREFIX}/quizzes/{quiz_id}/questions",
+        headers=admin_headers,
+        json={"content": "가중치 0", "options": ["가", "나"], "correct_answer": 0, "weight": 0}
+    ).status_code == 400
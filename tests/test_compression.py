@@ -0,0 +1,59 @@
+# tests/test_compression.py
+# 응답 압축 - Accept-Encoding 협상, 크기 임계값, ETag 별 압축 결과 재사용
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.config import settings
+from app.utils import metrics
+from app.utils.compression import negotiate
+
+API_PREFIX = settings.API_PREFIX
+client = TestClient(app)
+
+
+def test_negotiate():
+    assert negotiate(None) is None
+    assert negotiate("identity") is None
+    assert negotiate("gzip, deflate") == "gzip"
+    assert negotiate("gzip;q=0, *") in ("zstd", None)
+    assert negotiate("br;q=1.0, gzip;q=0.5") == "gzip"
+
+
+def test_large_quiz_is_compressed_once(admin_headers, user_headers):
+    """큰 퀴즈 상세는 압축해서 보내고, 같은 본문은 다시 압축하지 않음"""
+    response = client.post(
+        f"{API_PREFIX}/quizzes",
+        headers=admin_headers,
+        json={"title": "압축 테스트", "questions_count": 20}
+    )
+    quiz_id = response.json()["id"]
+    for i in range(20):
+        client.post(
+            f"{API_PREFIX}/quizzes/{quiz_id}/questions",
+            headers=admin_headers,
+            json={"content": f"압축 테스트 문제 {i + 1} " * 5, "options": ["가", "나", "다", "라"], "correct_answer": 0}
+        )
+
+    headers = {**user_headers, "Accept-Encoding": "gzip"}
+    url = f"{API_PREFIX}/quizzes/{quiz_id}"
+    response = client.get(url, headers=headers)
+    assert response.status_code == 200
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["ETag"].endswith('-gzip"')
+    assert len(response.json()["questions"]) == 20
+    # 응답 바이트가 원본보다 작음
+    raw = client.get(url, headers={**headers, "Accept-Encoding": "identity"})
+    assert "Content-Encoding" not in raw.headers
+    assert int(response.headers["Content-Length"]) < len(raw.content)
+
+    hits = metrics._compression["gzip"]["cache_hits"]
+    client.get(url, headers=headers)
+    assert metrics._compression["gzip"]["cache_hits"] == hits + 1
+
+    # 압축 표현의 ETag 로도 재검증 가능
+    response = client.get(url, headers={**headers, "If-None-Match": response.headers["ETag"]})
+    assert response.status_code == 304
+
+    # 임계값 미만은 압축하지 않음
+    response = client.get("/", headers=headers)
+    assert "Content-Encoding" not in response.headers
@@ -0,0 +1,160 @@
+# tests/test_conditional.py
+# 조건부 요청 - ETag/Last-Modified 와 304 응답
+import json
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.api import quiz as quiz_api, submission as submission_api
+from app.config import settings
+from app.db import SessionLocal
+from app.models.user import User
+from app.services.quiz_cache import invalidate_quiz
+from app.utils import cache
+from tests.fake_redis import FakeRedis
+
+API_PREFIX = settings.API_PREFIX
+client = TestClient(app)
+
+
+def create_quiz(admin_headers: dict, question_count: int) -> int:
+    response = client.post(
+        f"{API_PREFIX}/quizzes",
+        headers=admin_headers,
+        json={"title": "조건부 요청 테스트", "questions_count": question_count, "randomize_options": False}
+    )
+    quiz_id = response.json()["id"]
+    for i in range(question_count):
+        add_question(admin_headers, quiz_id, i)
+    return quiz_id
+
+
+def add_question(admin_headers: dict, quiz_id: int, i: int) -> None:
+    response = client.post(
+        f"{API_PREFIX}/quizzes/{quiz_id}/questions",
+        headers=admin_headers,
+        json={"content": f"문제 {i + 1}", "options": ["가", "나", "다", "라"], "correct_answer": 0}
+    )
+    assert response.status_code == 200
+
+
+def test_quiz_revalidation(admin_headers, user_headers):
+    """같은 ETag 로 재요청하면 본문 없이 304, 문제가 추가되면 새 ETag 로 200"""
+    quiz_id = create_quiz(admin_headers, 3)
+    headers = user_headers
+
+    response = client.get(f"{API_PREFIX}/quizzes/{quiz_id}", headers=headers)
+    assert response.status_code == 200
+    assert len(response.json()["questions"]) == 3
+    etag = response.headers["ETag"]
+
+    response = client.get(f"{API_PREFIX}/quizzes/{quiz_id}", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+
+    add_question(admin_headers, quiz_id, 3)
+    response = client.get(f"{API_PREFIX}/quizzes/{quiz_id}", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert len(response.json()["questions"]) == 4
+    assert response.headers["ETag"] != etag
+
+    # 토큰 없이는 304 도 받을 수 없음
+    response = client.get(f"{API_PREFIX}/quizzes/{quiz_id}", headers={"If-None-Match": "*"})
+    assert response.status_code == 401
+
+
+def set_active(username: str, is_active: bool) -> None:
+    db = SessionLocal()
+    try:
+        db.query(User).filter(User.username == username).update({"is_active": is_active})
+        db.commit()
+    finally:
+        db.close()
+
+
+def test_inactive_user_gets_no_not_modified(monkeypatch, login, admin_headers):
+    """색인된 ETag 와 같아도 사용자 확인을 먼저 하므로 비활성화된 사용자는 304 를 받지 못함"""
+    quiz_id = create_quiz(admin_headers, 1)
+    client.post(
+        f"{API_PREFIX}/users/",
+        json={"username": "conditional_inactive", "email": "conditional_inactive@example.com", "password": "inactive1234"}
+    )
+    headers = login("conditional_inactive", "inactive1234")
+    user_id = client.get(f"{API_PREFIX}/users/me", headers=headers).json()["id"]
+    # Redis 색인 대신 모든 키에 같은 검증자가 색인된 상황
+    validators = {"etag": '"indexed"', "user_id": user_id}
+    monkeypatch.setattr(quiz_api, "get_validators", lambda key, field="detail": validators)
+    monkeypatch.setattr(submission_api, "get_validators", lambda key, field="detail": validators)
+    urls = [f"{API_PREFIX}/quizzes/{quiz_id}", f"{API_PREFIX}/quizzes/", f"{API_PREFIX}/submissions/{10 ** 9}"]
+    headers = {**headers, "If-None-Match": '"indexed"'}
+    assert [client.get(url, headers=headers).status_code for url in urls] == [304, 304, 304]
+
+    set_active("conditional_inactive", False)
+    try:
+        assert [client.get(url, headers=headers).status_code for url in urls] == [400, 400, 400]
+    finally:
+        set_active("conditional_inactive", True)
+
+
+def test_graded_submission_revalidation(login, admin_headers, user_headers):
+    """채점된 제출은 Last-Modified 를 보내고, 다른 사용자의 조건부 요청은 권한 검사를 거침"""
+    quiz_id = create_quiz(admin_headers, 3)
+    headers = user_headers
+
+    response = client.get(f"{API_PREFIX}/quizzes/{quiz_id}/take", headers=headers)
+    questions = response.json()
+    submission_id = int(response.headers["X-Submission-Id"])
+    in_progress = client.get(f"{API_PREFIX}/submissions/{submission_id}", headers=headers)
+    assert "Last-Modified" not in in_progress.headers
+
+    answers = [{"question_id": q["id"], "selected_option": 0} for q in questions]
+    client.post(f"{API_PREFIX}/submissions/{submission_id}/answers", headers=headers, json=answers)
+
+    response = client.get(f"{API_PREFIX}/submissions/{submission_id}", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["ETag"] != in_progress.headers["ETag"]
+    last_modified = response.headers["Last-Modified"]
+
+    response = client.get(
+        f"{API_PREFIX}/submissions/{submission_id}", headers={**headers, "If-Modified-Since": last_modified}
+    )
+    assert response.status_code == 304
+
+    client.post(
+        f"{API_PREFIX}/users/",
+        json={"username": "conditional_other", "email": "conditional_other@example.com", "password": "other1234"}
+    )
+    other_headers = login("conditional_other", "other1234")
+    response = client.get(
+        f"{API_PREFIX}/submissions/{submission_id}", headers={**other_headers, "If-None-Match": "*"}
+    )
+    assert response.status_code == 403
+
+
+def test_concurrent_invalidation_discards_stale_index(monkeypatch, admin_headers, user_headers):
+    """본문을 읽는 도중 무효화되면 이전 본문의 ETag 를 색인하지 않고, 다음 요청에서 새 본문으로 색인"""
+    quiz_id = create_quiz(admin_headers, 1)
+    fake = FakeRedis()
+    monkeypatch.setattr(cache, "get_redis", lambda: fake)
+    key = cache.quiz_etag_key(quiz_id)
+    url = f"{API_PREFIX}/quizzes/{quiz_id}"
+
+    load = quiz_api.load_quiz_detail
+
+    def load_then_invalidate(*args, **kwargs):
+        # 퀴즈를 읽은 직후 다른 요청이 퀴즈를 바꾸고 색인을 무효화한 상황
+        quiz = load(*args, **kwargs)
+        invalidate_quiz(quiz_id)
+        return quiz
+
+    monkeypatch.setattr(quiz_api, "load_quiz_detail", load_then_invalidate)
+    response = client.get(url, headers=user_headers)
+    assert response.status_code == 200
+    assert fake.hget(key, "detail") is None
+
+    monkeypatch.setattr(quiz_api, "load_quiz_detail", load)
+    response = client.get(url, headers=user_headers)
+    etag = response.headers["ETag"]
+    assert json.loads(fake.hget(key, "detail"))["etag"] == etag
+    assert client.get(url, headers={**user_headers, "If-None-Match": etag}).status_code == 304
@@ -0,0 +1,129 @@
+# tests/test_deadlines.py
+# 제한 시간 - 마감 힙 스케줄러, 마감이 지난 응시의 자동 제출/채점, 마감 후 제출 거부, 재시작 시 마감 복구
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.config import settings
+from app.db import SessionLocal
+from app.models.submission import AttemptSummary, Submission
+from app.services import deadlines, grading
+
+API_PREFIX = settings.API_PREFIX
+client = TestClient(app)
+
+
+def test_scheduler_fires_due_deadlines_in_batches():
+    fired = []
+    done = threading.Event()
+
+    def expire(submission_ids):
+        fired.append(submission_ids)
+        if sum(len(batch) for batch in fired) >= 4:
+            done.set()
+
+    scheduler = deadlines.DeadlineScheduler(expire, batch_size=2)
+    now = time.time()
+    scheduler.add_many([(1, now - 1), (2, now - 1), (3, now + 3600)])
+    scheduler.add(4, now + 0.05)
+    scheduler.cancel(2)
+    scheduler.start()
+    try:
+        # 더 이른 마감으로 바뀐 타이머는 스레드를 깨움, 취소한 타이머는 울리지 않음
+        scheduler.add(3, time.time() + 0.1)
+        scheduler.add(5, time.time() + 0.15)
+        assert done.wait(5)
+    finally:
+        scheduler.stop()
+    assert sorted(submission_id for batch in fired for submission_id in batch) == [1, 3, 4, 5]
+    assert all(len(batch) <= 2 for batch in fired)
+    assert len(scheduler) == 0 and scheduler.next_deadline() is None
+
+
+def test_expired_submission_is_auto_submitted(admin_headers, user_headers):
+    headers = user_headers
+
+    response = client.post(
+        f"{API_PREFIX}/quizzes",
+        headers=admin_headers,
+        json={"title": "제한 시간 퀴즈", "questions_count": 2, "randomize_questions": False, "time_limit_minutes": 10}
+    )
+    assert response.status_code == 201
+    quiz_id = response.json()["id"]
+    assert response.json()["time_limit_minutes"] == 10
+    assert client.put(
+        f"{API_PREFIX}/quizzes/{quiz_id}", headers=admin_headers, json={"time_limit_minutes": 0}
+    ).status_code == 400
+    try:
+        for i in range(2):
+            client.post(
+                f"{API_PREFIX}/quizzes/{quiz_id}/questions",
+                headers=admin_headers,
+                json={"content": f"제한 시간 문제 {i}", "options": ["가", "나"], "correct_answer": 0}
+            )
+        response = client.get(f"{API_PREFIX}/quizzes/{quiz_id}/take", headers=headers)
+        assert response.status_code == 200
+        submission_id = int(response.headers["X-Submission-Id"])
+        first, second = client.get(f"{API_PREFIX}/submissions/{submission_id}", headers=headers).json()["question_order"]
+        assert client.post(
+            f"{API_PREFIX}/submissions/{submission_id}/save",
+            headers=headers,
+            json=[{"question_id": first, "selected_option": 0}, {"question_id": second, "selected_option": 1}]
+        ).status_code == 200
+
+        db = SessionLocal()
+        try:
+            # 재시작 시 DB 에서 마감 복구
+            start_time = deadlines._aware(db.get(Submission, submission_id).start_time)
+            restored = dict(deadlines.load_deadlines(db, quiz_id))
+            assert restored == {submission_id: (start_time + timedelta(minutes=10)).timestamp()}
+
+            # 마감 전에는 자동 제출하지 않음
+            assert deadlines.expire_submissions(db, [submission_id], now=start_time + timedelta(minutes=5)) == {}
+            assert db.get(Submission, submission_id).is_completed is False
+
+            # 마감이 지나면 저장된 답안으로 제출/채점
+            db.expire_all()
+            now = start_time + timedelta(minutes=11)
+            assert deadlines.expire_submissions(db, [submission_id, 10 ** 9], now=now) == {submission_id: 50.0}
+            db.expire_all()
+            row = db.get(Submission, submission_id)
+            assert row.is_completed and row.grading_status == grading.GRADED and row.score == 50.0
+            summary = db.get(AttemptSummary, (row.user_id, quiz_id))
+            assert summary.completed_count == 1 and summary.in_progress_submission_id is None
+            assert summary.last_score == 50.0
+
+            # 두 번 실행해도 결과는 같음
+            assert deadlines.expire_submissions(db, [submission_id], now=now) == {}
+        finally:
+            db.close()
+
+        # 마감(+ 유예)이 지난 새 응시로 요청하면 스케줄러를 기다리지 않고 그 자리에서 자동 제출하고 거부
+        for path in ("answers", "save", "take"):
+            response = client.get(f"{API_PREFIX}/quizzes/{quiz_id}/take", headers=headers)
+            assert response.status_code == 200
+            submission_id = int(response.headers["X-Submission-Id"])
+            db = SessionLocal()
+            try:
+                db.query(Submission).filter(Submission.id == submission_id).update(
+                    {"start_time": datetime.now(timezone.utc) - timedelta(minutes=20)}
+                )
+                db.commit()
+            finally:
+                db.close()
+            if path == "take":
+                response = client.get(f"{API_PREFIX}/quizzes/{quiz_id}/take", headers=headers)
+            else:
+                response = client.post(f"{API_PREFIX}/submissions/{submission_id}/{path}", headers=headers, json=[])
+            assert response.status_code == 403
+            result = client.get(f"{API_PREFIX}/submissions/{submission_id}", headers=headers).json()
+            assert result["is_completed"] and result["grading_status"] == grading.GRADED and result["score"] == 0
+            # 다음 응시는 새 기록으로 시작
+            assert client.get(f"{API_PREFIX}/quizzes/{quiz_id}/take", headers=headers).headers["X-Submission-Id"] != str(
+                submission_id
+            )
+    finally:
+        client.delete(f"{API_PREFIX}/quizzes/{quiz_id}", headers=admin_headers)
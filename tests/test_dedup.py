@@ -0,0 +1,68 @@
+# tests/test_dedup.py
+# 유사 문제 탐지 - MinHash 유사도, 문제 추가 시 중복 확인, 퀴즈별 묶음 (numpy 필요)
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import delete
+
+from app.main import app
+from app.config import settings
+from app.db import SessionLocal
+from app.models.question import QuestionSignature
+
+np = pytest.importorskip("numpy")
+
+from app.services import dedup  # noqa: E402
+
+API_PREFIX = settings.API_PREFIX
+client = TestClient(app)
+
+
+def test_signature_similarity():
+    hasher = dedup.get_hasher()
+    options = ["엽록체", "미토콘드리아", "리보솜", "골지체"]
+    base = hasher.signature("광합성이 일어나는 세포 소기관은 무엇인가?", options)
+    # 문장 부호/대소문자/선택지 순서만 다르면 같은 서명
+    assert dedup.similarity(base, hasher.signature("광합성이 일어나는 세포 소기관은 무엇인가", options[::-1])) == 1.0
+    assert dedup.similarity(base, hasher.signature("광합성이 일어나는 세포 소기관은 무엇인가요?", options)) > 0.7
+    assert dedup.similarity(base, hasher.signature("세포막을 이루는 주요 성분은?", ["인지질", "단백질"])) < 0.2
+
+
+def test_duplicate_check_and_clusters(admin_headers):
+    response = client.post(
+        f"{API_PREFIX}/quizzes",
+        headers=admin_headers,
+        json={"title": "중복 문제 테스트", "questions_count": 5}
+    )
+    quiz_id = response.json()["id"]
+    url = f"{API_PREFIX}/quizzes/{quiz_id}/questions"
+    options = ["서울", "부산", "대구", "인천"]
+
+    def add(content, check=False):
+        return client.post(
+            url, headers=admin_headers, params={"check_duplicates": check},
+            json={"content": content, "options": options, "correct_answer": 0}
+        )
+
+    first = add("대한민국의 수도는 어디인가? 다음 보기 중에서 알맞은 도시를 하나 고르시오.").json()["id"]
+    second = add("대한민국의 수도는 어디인가? 다음 보기 중에서 알맞은 도시를 하나 고르세요.").json()["id"]
+    add("다음 중 가장 인구가 적은 광역시는?")
+
+    response = add("[대한민국의 수도는 어디인가?] 다음 보기 중에서 알맞은 도시를 하나 고르시오!", check=True)
+    assert response.status_code == 409
+    assert {d["question_id"] for d in response.json()["detail"]["duplicates"]} == {first, second}
+    assert add("다음 중 바다와 접한 도시를 모두 고르면?", check=True).status_code == 200
+
+    # 서명이 없는 문제(일괄 적재 등)는 보고할 때 계산
+    db = SessionLocal()
+    try:
+        db.execute(delete(QuestionSignature).where(QuestionSignature.question_id == second))
+        db.commit()
+    finally:
+        db.close()
+    dedup.reset_quiz(quiz_id)
+
+    response = client.get(f"{API_PREFIX}/quizzes/{quiz_id}/duplicates", headers=admin_headers)
+    assert response.status_code == 200
+    clusters = response.json()
+    assert [cluster["question_ids"] for cluster in clusters] == [[first, second]]
+    assert clusters[0]["similarity"] >= settings.DEDUP_THRESHOLD
@@ -0,0 +1,70 @@
+# tests/test_exam_channel.py
+# 응시 WebSocket 채널 - 한 번 인증 후 답안 변경분 저장/페이지 조회
+import pytest
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+from app.main import app
+from app.config import settings
+
+API_PREFIX = settings.API_PREFIX
+client = TestClient(app)
+
+
+def token_of(headers: dict) -> str:
+    return headers["Authorization"].removeprefix("Bearer ")
+
+
+def start_exam(admin_headers: dict, headers: dict, question_count: int = 6) -> tuple:
+    response = client.post(
+        f"{API_PREFIX}/quizzes",
+        headers=admin_headers,
+        json={"title": "WebSocket 응시 테스트", "questions_count": question_count}
+    )
+    quiz_id = response.json()["id"]
+    for i in range(question_count):
+        client.post(
+            f"{API_PREFIX}/quizzes/{quiz_id}/questions",
+            headers=admin_headers,
+            json={"content": f"문제 {i + 1}", "options": ["가", "나", "다", "라"], "correct_answer": 0}
+        )
+
+    response = client.get(f"{API_PREFIX}/quizzes/{quiz_id}/take", headers=headers)
+    assert response.status_code == 200
+    return token_of(headers), headers, int(response.headers["X-Submission-Id"])
+
+
+def test_channel_saves_answers_and_serves_pages(admin_headers, user_headers):
+    """답안은 ack 후 모아서 저장되고, 페이지 응답에 선택한 답이 포함됨"""
+    token, headers, submission_id = start_exam(admin_headers, user_headers)
+
+    with client.websocket_connect(f"{API_PREFIX}/submissions/{submission_id}/ws?token={token}") as ws:
+        ws.send_json({"type": "page", "page": 1})
+        page = ws.receive_json()
+        assert page["type"] == "page" and page["total_pages"] == 3
+        question_id = page["questions"][0]["id"]
+
+        ws.send_json({"type": "answer", "question_id": question_id, "selected_option": 2, "seq": 1})
+        assert ws.receive_json() == {"type": "ack", "seq": 1}
+        ws.send_json({"type": "answer", "question_id": -1, "selected_option": 0, "seq": 2})
+        assert ws.receive_json()["type"] == "error"
+
+        # 페이지 이동 전에 변경분 저장
+        ws.send_json({"type": "page", "page": 1})
+        assert ws.receive_json() == {"type": "saved", "seq": 1}
+        page = ws.receive_json()
+        assert page["questions"][0]["selected_option"] == 2
+
+    detail = client.get(f"{API_PREFIX}/submissions/{submission_id}", headers=headers).json()
+    assert [(a["question_id"], a["selected_option"]) for a in detail["answers"]] == [(question_id, 2)]
+
+
+def test_channel_rejects_invalid_token(admin_headers, user_headers):
+    """토큰이 없거나 다른 사용자의 응시 기록이면 연결 거부"""
+    _, _, submission_id = start_exam(admin_headers, user_headers, 3)
+    admin_token = token_of(admin_headers)
+
+    for token in ("invalid", admin_token):
+        with pytest.raises(WebSocketDisconnect):
+            with client.websocket_connect(f"{API_PREFIX}/submissions/{submission_id}/ws?token={token}") as ws:
+                ws.receive_json()
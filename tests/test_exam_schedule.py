@@ -0,0 +1,131 @@
+# tests/test_exam_schedule.py
+# 예정된 시험 - 응시 기간, 명단 응시 기록 일괄 생성, 중복 없는 응시 기록 생성
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.config import settings
+from app.db import SessionLocal
+from app.models.quiz import Quiz
+from app.models.submission import Submission
+from app.services.exam import create_submission
+
+API_PREFIX = settings.API_PREFIX
+client = TestClient(app)
+
+
+created_quiz_ids = []
+
+
+@pytest.fixture
+def admin_headers(admin_headers):
+    """관리자 인증 헤더 - 테스트에서 만든 예정된 시험은 끝나면 삭제 (다른 테스트가 응시하지 않도록)"""
+    yield admin_headers
+    for quiz_id in created_quiz_ids:
+        client.delete(f"{API_PREFIX}/quizzes/{quiz_id}", headers=admin_headers)
+    created_quiz_ids.clear()
+
+
+def create_scheduled_quiz(admin_headers: dict, starts_at: datetime, question_count: int = 6) -> int:
+    response = client.post(
+        f"{API_PREFIX}/quizzes",
+        headers=admin_headers,
+        json={
+            "title": "예정된 시험",
+            "questions_count": question_count,
+            "starts_at": starts_at.isoformat(),
+            "ends_at": (starts_at + timedelta(hours=2)).isoformat(),
+        }
+    )
+    assert response.status_code == 201
+    quiz_id = response.json()["id"]
+    created_quiz_ids.append(quiz_id)
+    for i in range(question_count):
+        response = client.post(
+            f"{API_PREFIX}/quizzes/{quiz_id}/questions",
+            headers=admin_headers,
+            json={"content": f"문제 {i + 1}", "options": ["가", "나", "다", "라"], "correct_answer": 0}
+        )
+        assert response.status_code == 200
+    return quiz_id
+
+
+def in_progress_count(quiz_id: int) -> int:
+    db = SessionLocal()
+    try:
+        return db.query(Submission).filter(
+            Submission.quiz_id == quiz_id,
+            Submission.is_completed == False
+        ).count()
+    finally:
+        db.close()
+
+
+def test_scheduled_exam_is_materialized_before_start(admin_headers, user_headers, count_queries):
+    """시작 전에는 응시 불가, 명단 응시 기록을 미리 만들면 첫 /take 는 조회만 함"""
+    user_id = client.get(f"{API_PREFIX}/users/me", headers=user_headers).json()["id"]
+
+    quiz_id = create_scheduled_quiz(admin_headers, datetime.now(timezone.utc) + timedelta(hours=1))
+
+    response = client.get(f"{API_PREFIX}/quizzes/{quiz_id}/take", headers=user_headers)
+    assert response.status_code == 403
+
+    response = client.put(
+        f"{API_PREFIX}/quizzes/{quiz_id}/roster",
+        headers=admin_headers,
+        json={"user_ids": [user_id, user_id]}
+    )
+    assert response.status_code == 200
+    assert response.json()["added"] == 1
+
+    # 여러 번 실행해도 응시 기록은 하나
+    for _ in range(2):
+        response = client.post(f"{API_PREFIX}/quizzes/{quiz_id}/materialize", headers=admin_headers)
+        assert response.status_code == 202
+    assert in_progress_count(quiz_id) == 1
+
+    # 시험 시작
+    response = client.put(
+        f"{API_PREFIX}/quizzes/{quiz_id}",
+        headers=admin_headers,
+        json={"starts_at": (datetime.now(timezone.utc) - timedelta(minutes=1)).isoformat()}
+    )
+    assert response.status_code == 200
+
+    with count_queries() as counter:
+        response = client.get(f"{API_PREFIX}/quizzes/{quiz_id}/take", headers=user_headers)
+    assert response.status_code == 200
+    assert len(response.json()) == 2
+    assert not [s for s in counter.statements if s.lstrip().upper().startswith("INSERT")]
+    assert in_progress_count(quiz_id) == 1
+
+
+def test_roster_excludes_other_users(admin_headers, user_headers):
+    """명단이 있는 시험은 명단에 없는 사용자가 응시할 수 없음"""
+    admin_id = client.get(f"{API_PREFIX}/users/me", headers=admin_headers).json()["id"]
+
+    quiz_id = create_scheduled_quiz(admin_headers, datetime.now(timezone.utc) - timedelta(minutes=1))
+    client.put(f"{API_PREFIX}/quizzes/{quiz_id}/roster", headers=admin_headers, json={"user_ids": [admin_id]})
+
+    response = client.get(f"{API_PREFIX}/quizzes/{quiz_id}/take", headers=user_headers)
+    assert response.status_code == 403
+
+
+def test_create_submission_is_idempotent(admin_headers):
+    """같은 사용자의 응시 기록 생성이 겹쳐도 진행 중 응시는 하나"""
+    admin_id = client.get(f"{API_PREFIX}/users/me", headers=admin_headers).json()["id"]
+    quiz_id = create_scheduled_quiz(admin_headers, datetime.now(timezone.utc) - timedelta(minutes=1))
+
+    first_db, second_db = SessionLocal(), SessionLocal()
+    try:
+        quiz = first_db.query(Quiz).filter(Quiz.id == quiz_id).first()
+        # 두 세션 모두 "진행 중 응시 없음"을 본 뒤 동시에 생성하는 상황
+        first = create_submission(first_db, quiz, admin_id, [1, 2, 3])
+        second = create_submission(second_db, quiz, admin_id, [1, 2, 3])
+        assert first.id == second.id
+    finally:
+        first_db.close()
+        second_db.close()
+    assert in_progress_count(quiz_id) == 1
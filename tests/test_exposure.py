@@ -0,0 +1,87 @@
+# tests/test_exposure.py
+# 노출 조절 - 덜 노출된 문제 우선 추출/노출률 한도, 응시 기록 생성 시 노출 수를 모아서 DB 에 더하기
+import random
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.config import settings
+from app.db import SessionLocal
+from app.models.question import QuestionExposure
+from app.models.quiz import Quiz
+from app.services import blueprint, exam, exposure
+
+API_PREFIX = settings.API_PREFIX
+client = TestClient(app)
+
+
+def test_least_exposed_sampling_with_cap():
+    rng = random.Random(0)
+    # 문제 10 개 중 3 개씩 300 번 - 무작위 추출보다 노출 수가 고르게
+    index = blueprint.BlueprintIndex([(i, [], None, 1.0) for i in range(1, 11)], exposures={}, decay=0.5, max_rate=0.5)
+    uniform = dict.fromkeys(range(1, 11), 0)
+    for _ in range(300):
+        order = index.draw([{"count": 3}], rng=rng)
+        assert len(set(order)) == 3
+        for question_id in rng.sample(range(1, 11), 3):
+            uniform[question_id] += 1
+    assert index.sessions == 300 and sum(index.exposures.values()) == 900
+    assert max(index.exposures.values()) - min(index.exposures.values()) <= 5
+    assert max(uniform.values()) - min(uniform.values()) > 10
+
+    # 가중치가 아주 큰 문제도 노출률 한도(0.5)를 넘겨 뽑히지 않음
+    index = blueprint.BlueprintIndex(
+        [(1, [], None, 1000.0)] + [(i, [], None, 1.0) for i in range(2, 11)], exposures={}, max_rate=0.5
+    )
+    for _ in range(200):
+        index.draw([{"count": 2}], rng=rng)
+    assert index.exposures[1] <= 0.5 * 200 + 1
+
+    # 한도를 넘은 문제만 남으면 한도를 무시하고 채움
+    index = blueprint.BlueprintIndex([(1, [], None, 1.0), (2, [], None, 1.0)], exposures={1: 50, 2: 50}, sessions=10,
+                                     max_rate=0.5)
+    assert sorted(index.draw([{"count": 2}], rng=rng)) == [1, 2]
+
+
+def test_exposures_are_batched_into_db(admin_headers, user_headers):
+    headers = user_headers
+
+    quiz_id = client.post(
+        f"{API_PREFIX}/quizzes",
+        headers=admin_headers,
+        json={"title": "노출 조절 퀴즈", "questions_count": 2}
+    ).json()["id"]
+    for i in range(4):
+        client.post(
+            f"{API_PREFIX}/quizzes/{quiz_id}/questions",
+            headers=admin_headers,
+            json={"content": f"노출 문제 {i}", "options": ["가", "나"], "correct_answer": 0}
+        )
+
+    response = client.get(f"{API_PREFIX}/quizzes/{quiz_id}/take", headers=headers)
+    assert response.status_code == 200
+    submission = client.get(f"{API_PREFIX}/submissions/{response.headers['X-Submission-Id']}", headers=headers).json()
+    # 응시 기록 생성 시점에는 메모리에만 쌓임
+    assert exposure.pending_for(quiz_id) == {question_id: 1 for question_id in submission["question_order"]}
+
+    db = SessionLocal()
+    try:
+        # 진행 중 응시가 이미 있어 버려진 문제 순서는 세지 않음 (동시 요청이 각자 순서를 뽑은 상황)
+        quiz = db.get(Quiz, quiz_id)
+        assert exam.create_submission(db, quiz, submission["user_id"]).id == submission["id"]
+        assert exposure.pending_for(quiz_id) == {question_id: 1 for question_id in submission["question_order"]}
+
+        assert db.query(QuestionExposure).filter(QuestionExposure.quiz_id == quiz_id).count() == 0
+        exposure.flush(db)
+        rows = db.query(QuestionExposure).filter(QuestionExposure.quiz_id == quiz_id).all()
+        assert {row.question_id: row.exposures for row in rows} == {
+            question_id: 1 for question_id in submission["question_order"]
+        }
+        assert exposure.pending_for(quiz_id) == {}
+
+        # 다시 더하면 누적
+        exposure.record(quiz_id, submission["question_order"][:1])
+        exposure.flush(db)
+        assert exposure.load_counts(db, quiz_id)[submission["question_order"][0]] == 2
+    finally:
+        db.close()
@@ -0,0 +1,98 @@
+# tests/test_grading.py
+# 비동기 채점 - 202 응답, 채점 상태 롱 폴링, 배치 채점
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.config import settings
+from app.db import SessionLocal
+from app.models.submission import Submission
+from app.services import grading
+
+API_PREFIX = settings.API_PREFIX
+client = TestClient(app)
+
+
+@pytest.fixture
+def async_grading(monkeypatch):
+    """프로세스 내 큐로 비동기 채점 사용"""
+    monkeypatch.setattr(settings, "ASYNC_GRADING", True)
+    monkeypatch.setattr(settings, "GRADING_QUEUE", "local")
+    yield
+    grading.stop_grading()
+
+
+def start_exam(admin_headers: dict, headers: dict, question_count: int = 3) -> tuple:
+    response = client.post(
+        f"{API_PREFIX}/quizzes",
+        headers=admin_headers,
+        json={"title": "비동기 채점 테스트", "questions_count": question_count, "randomize_options": False}
+    )
+    quiz_id = response.json()["id"]
+    for i in range(question_count):
+        client.post(
+            f"{API_PREFIX}/quizzes/{quiz_id}/questions",
+            headers=admin_headers,
+            json={"content": f"문제 {i + 1}", "options": ["가", "나", "다", "라"], "correct_answer": 1}
+        )
+
+    response = client.get(f"{API_PREFIX}/quizzes/{quiz_id}/take", headers=headers)
+    questions = response.json()
+    for page in (2, 3):
+        questions += client.get(f"{API_PREFIX}/quizzes/{quiz_id}/take", headers=headers, params={"page": page}).json()
+    submission_id = int(response.headers["X-Submission-Id"])
+    return headers, submission_id, questions
+
+
+def test_async_submit_returns_status_url(async_grading, admin_headers, user_headers):
+    """제출은 202 와 상태 URL 을 반환하고, 상태 조회로 점수를 받음"""
+    headers, submission_id, questions = start_exam(admin_headers, user_headers)
+    # 첫 문제만 정답
+    answers = [
+        {"question_id": q["id"], "selected_option": 1 if i == 0 else 0}
+        for i, q in enumerate(questions)
+    ]
+
+    response = client.post(f"{API_PREFIX}/submissions/{submission_id}/answers", headers=headers, json=answers)
+    assert response.status_code == 202
+    assert response.json()["grading_status"] == "pending"
+
+    response = client.get(response.json()["status_url"], headers=headers, params={"wait": 5})
+    assert response.status_code == 200
+    result = response.json()
+    assert result["grading_status"] == "graded"
+    assert result["score"] == pytest.approx(100 / 3)
+
+    detail = client.get(f"{API_PREFIX}/submissions/{submission_id}", headers=headers).json()
+    assert sorted(answer["is_correct"] for answer in detail["answers"]) == [False, False, True]
+
+
+def test_grade_pending_is_idempotent(admin_headers, user_headers):
+    """채점 대기 중인 제출만 채점 (같은 ID 가 큐에 두 번 들어와도 한 번만 채점)"""
+    headers, submission_id, questions = start_exam(admin_headers, user_headers)
+    answers = [{"question_id": q["id"], "selected_option": 1} for q in questions]
+    response = client.post(f"{API_PREFIX}/submissions/{submission_id}/answers", headers=headers, json=answers)
+    assert response.status_code == 201
+
+    db = SessionLocal()
+    try:
+        # 재시작 등으로 채점되지 않은 상태 재현
+        db.query(Submission).filter(Submission.id == submission_id).update(
+            {"grading_status": grading.PENDING, "score": None}
+        )
+        db.commit()
+
+        # 채점 전에 같은 제출을 읽어 둔 다른 워커도 이미 채점된 제출은 잡지 못함
+        other = SessionLocal()
+        try:
+            assert other.query(Submission.grading_status).filter(Submission.id == submission_id).scalar() == grading.PENDING
+            other.commit()
+            assert grading.grade_pending(db, [submission_id, submission_id]) == {submission_id: 100}
+            assert grading.grade_pending(other, [submission_id]) == {}
+        finally:
+            other.close()
+        assert grading.grade_pending(db, [submission_id]) == {}
+        db.expire_all()
+        assert db.get(Submission, submission_id).grading_status == grading.GRADED
+    finally:
+        db.close()
@@ -0,0 +1,87 @@
+# tests/test_item_analysis.py
+# 문항 분석 - 청크 누적 통계가 전체 행렬로 직접 계산한 값과 같은지, 채점된 제출로 만든 보고서 (numpy 필요)
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.config import settings
+from app.services import packed_answers
+
+np = pytest.importorskip("numpy")
+
+from app.services import item_analysis  # noqa: E402
+
+API_PREFIX = settings.API_PREFIX
+client = TestClient(app)
+
+
+def test_statistics_match_full_matrix():
+    rng = np.random.RandomState(0)
+    ability = rng.standard_normal(300)
+    difficulty = np.linspace(-1.5, 1.5, 6)
+    scores = (rng.random_sample((300, 6)) < 1 / (1 + np.exp(difficulty - ability[:, None]))).astype(int)
+    selected = np.where(scores == 1, 0, rng.randint(1, 4, size=scores.shape))
+
+    stats = item_analysis.ItemStatistics(list(range(10, 16)), [4] * 6, with_alpha=True)
+    # 청크 세 개로 나눠 넣어도 결과가 같아야 함 (question_order 는 JSON 문자열로 받음)
+    for chunk in np.array_split(np.arange(300), 3):
+        lengths, ids = item_analysis.parse_orders(["[10, 11, 12, 13, 14, 15]"] * len(chunk))
+        stats.update(
+            lengths,
+            ids,
+            [bytes(selected[row].tolist()) for row in chunk],
+            [packed_answers.pack_correct(scores[row].tolist()) for row in chunk],
+        )
+
+    items = stats.report()
+    assert stats.submissions == 300
+    for i, item in enumerate(items):
+        rest = (scores.sum(axis=1) - scores[:, i]) / 5
+        assert item["p_value"] == pytest.approx(scores[:, i].mean())
+        assert item["discrimination"] == pytest.approx(np.corrcoef(scores[:, i], rest)[0, 1])
+        assert sum(item["options"]) == 300 and item["options"][0] == scores[:, i].sum()
+    variances = scores.var(axis=0).sum()
+    expected_alpha = 6 / 5 * (1 - variances / scores.sum(axis=1).var())
+    assert stats.alpha() == pytest.approx(expected_alpha)
+
+
+def test_item_analysis_report(admin_headers, user_headers):
+    headers = user_headers
+
+    response = client.post(
+        f"{API_PREFIX}/quizzes",
+        headers=admin_headers,
+        json={"title": "문항 분석 퀴즈", "questions_count": 3, "randomize_questions": False, "randomize_options": False}
+    )
+    quiz_id = response.json()["id"]
+    question_ids = [
+        client.post(
+            f"{API_PREFIX}/quizzes/{quiz_id}/questions",
+            headers=admin_headers,
+            json={"content": f"분석 문제 {i + 1}", "options": ["가", "나", "다", "라"], "correct_answer": 0}
+        ).json()["id"]
+        for i in range(3)
+    ]
+
+    # 같은 사용자가 네 번 응시 (마지막 문제는 한 번 답하지 않음)
+    attempts = [[0, 0, 0], [0, 0, 1], [0, 2, 3], [1, 2, None]]
+    for selected in attempts:
+        submission_id = client.get(f"{API_PREFIX}/quizzes/{quiz_id}/take", headers=headers).headers["X-Submission-Id"]
+        answers = [
+            {"question_id": question_id, "selected_option": option}
+            for question_id, option in zip(question_ids, selected) if option is not None
+        ]
+        client.post(f"{API_PREFIX}/submissions/{submission_id}/answers", headers=headers, json=answers)
+
+    response = client.get(f"{API_PREFIX}/quizzes/{quiz_id}/analysis", headers=admin_headers)
+    assert response.status_code == 200
+    report = response.json()
+    assert report["submissions"] == 4
+    first, second, third = report["items"]
+    assert first["p_value"] == 0.75 and first["options"] == [3, 1, 0, 0]
+    assert second["p_value"] == 0.5 and second["options"] == [2, 0, 2, 0]
+    assert third["p_value"] == 0.25 and third["no_answer"] == 1
+    assert first["discrimination"] > 0
+    assert report["alpha"] is not None
+
+    assert client.get(f"{API_PREFIX}/quizzes/{quiz_id}/analysis", headers=headers).status_code == 403
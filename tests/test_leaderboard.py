@@ -0,0 +1,115 @@
+# tests/test_leaderboard.py
+# 퀴즈별 리더보드 - 사용자별 최고 점수, 공동 순위, 백분위
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.config import settings
+from app.services import leaderboard
+from app.services.leaderboard import LocalLeaderboard
+
+API_PREFIX = settings.API_PREFIX
+client = TestClient(app)
+
+
+def submit(headers: dict, quiz_id: int, correct: int) -> float:
+    """문제를 받아 앞에서부터 correct 개만 맞히고 제출"""
+    response = client.get(f"{API_PREFIX}/quizzes/{quiz_id}/take", headers=headers)
+    questions = response.json()
+    submission_id = response.headers["X-Submission-Id"]
+    answers = [
+        {"question_id": q["id"], "selected_option": 0 if i < correct else 1}
+        for i, q in enumerate(questions)
+    ]
+    response = client.post(f"{API_PREFIX}/submissions/{submission_id}/answers", headers=headers, json=answers)
+    assert response.status_code == 201
+    return response.json()["score"]
+
+
+def test_local_leaderboard_ranks():
+    board = LocalLeaderboard()
+    board.record_many([(1, 1, 50.0), (1, 2, 80.0), (1, 3, 80.0), (1, 4, 20.0), (2, 1, 10.0)])
+    board.record_many([(1, 4, 10.0)])  # 최고 점수보다 낮으면 무시
+
+    assert board.top(1, 3) == [
+        {"rank": 1, "user_id": 2, "score": 80.0},
+        {"rank": 1, "user_id": 3, "score": 80.0},
+        {"rank": 3, "user_id": 1, "score": 50.0},
+    ]
+    assert board.rank(1, 1) == {"score": 50.0, "rank": 3, "total": 4, "percentile": 25.0}
+    assert board.rank(1, 4)["score"] == 20.0
+    assert board.rank(1, 99) is None
+
+    board.reset(1)
+    assert board.top(1, 10) == []
+    assert board.rank(2, 1)["rank"] == 1
+
+
+def test_local_leaderboard_loads_each_quiz_once():
+    """퀴즈마다 처음 조회할 때 한 번만 채우고, 그 전에 반영된 점수와 병합"""
+    loaded = []
+
+    def loader(quiz_id):
+        loaded.append(quiz_id)
+        board.record_many([(quiz_id, 1, 70.0), (quiz_id, 2, 40.0)])
+
+    board = LocalLeaderboard(loader=loader)
+    board.record_many([(1, 2, 90.0)])
+    assert board.rank(1, 2)["rank"] == 1
+    assert [(e["user_id"], e["score"]) for e in board.top(1, 10)] == [(2, 90.0), (1, 70.0)]
+    assert board.rank(5, 1)["score"] == 70.0
+    assert loaded == [1, 5]
+
+
+def test_quiz_leaderboard(admin_headers, user_headers):
+    """채점이 끝나면 리더보드에 반영되고, 다시 응시해 낮은 점수를 받아도 최고 점수 유지"""
+    response = client.post(
+        f"{API_PREFIX}/quizzes",
+        headers=admin_headers,
+        json={"title": "리더보드 테스트", "questions_count": 2, "randomize_options": False}
+    )
+    quiz_id = response.json()["id"]
+    for i in range(2):
+        client.post(
+            f"{API_PREFIX}/quizzes/{quiz_id}/questions",
+            headers=admin_headers,
+            json={"content": f"문제 {i + 1}", "options": ["가", "나", "다", "라"], "correct_answer": 0}
+        )
+
+    response = client.get(f"{API_PREFIX}/quizzes/{quiz_id}/leaderboard/me", headers=user_headers)
+    assert response.status_code == 404
+
+    assert submit(admin_headers, quiz_id, 2) == 100
+    assert submit(user_headers, quiz_id, 1) == 50
+    assert submit(user_headers, quiz_id, 0) == 0
+
+    response = client.get(f"{API_PREFIX}/quizzes/{quiz_id}/leaderboard", headers=user_headers)
+    assert response.status_code == 200
+    entries = response.json()
+    assert [(e["rank"], e["username"], e["score"]) for e in entries] == [(1, "admin", 100), (2, "user", 50)]
+
+    response = client.get(f"{API_PREFIX}/quizzes/{quiz_id}/leaderboard/me", headers=user_headers)
+    assert response.status_code == 200
+    assert response.json()["score"] == 50
+    assert response.json()["rank"] == 2
+    assert response.json()["total"] == 2
+    assert response.json()["percentile"] == 0
+
+    # 재구성은 관리자만
+    response = client.post(f"{API_PREFIX}/quizzes/{quiz_id}/leaderboard/rebuild", headers=user_headers)
+    assert response.status_code == 403
+    response = client.post(
+        f"{API_PREFIX}/quizzes/{quiz_id}/leaderboard/rebuild", headers=admin_headers, params={"reset": True}
+    )
+    assert response.status_code == 202
+    response = client.get(f"{API_PREFIX}/quizzes/{quiz_id}/leaderboard", headers=user_headers)
+    assert [(e["rank"], e["score"]) for e in response.json()] == [(1, 100), (2, 50)]
+
+    # 재시작 직후(빈 로컬 리더보드)에도 처음 조회할 때 완료된 제출로 채움
+    leaderboard._board = None
+    response = client.get(f"{API_PREFIX}/quizzes/{quiz_id}/leaderboard/me", headers=user_headers)
+    assert response.status_code == 200
+    assert response.json()["score"] == 50
+    assert response.json()["rank"] == 2
+
+    response = client.post(f"{API_PREFIX}/quizzes/999999/leaderboard/rebuild", headers=admin_headers)
+    assert response.status_code == 404
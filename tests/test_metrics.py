@@ -0,0 +1,75 @@
+# tests/test_metrics.py
+# 성능 지표 - 미들웨어의 라우트별 기록과 /metrics 출력, 접근 제한
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.config import settings
+from app.utils import cache, metrics
+from tests.fake_redis import FakeRedis
+
+API_PREFIX = settings.API_PREFIX
+client = TestClient(app)
+
+
+def create_quiz(admin_headers: dict) -> int:
+    response = client.post(
+        f"{API_PREFIX}/quizzes",
+        headers=admin_headers,
+        json={"title": "지표 테스트", "questions_count": 1, "randomize_options": False}
+    )
+    quiz_id = response.json()["id"]
+    client.post(
+        f"{API_PREFIX}/quizzes/{quiz_id}/questions",
+        headers=admin_headers,
+        json={"content": "문제 1", "options": ["가", "나"], "correct_answer": 0}
+    )
+    return quiz_id
+
+
+def test_metrics_middleware_records_route_stats(monkeypatch, admin_headers, user_headers):
+    """라우트 템플릿별 지연 시간/쿼리 수/DB 시간과 캐시 적중·미적중이 기록되고 Prometheus 형식으로 출력됨"""
+    quiz_id = create_quiz(admin_headers)
+    fake = FakeRedis()
+    monkeypatch.setattr(cache, "get_redis", lambda: fake)
+    metrics.reset()
+
+    # 첫 요청은 ETag 색인 미적중, 두 번째는 첫 요청이 남긴 색인에 적중
+    for _ in range(2):
+        assert client.get(f"{API_PREFIX}/quizzes/{quiz_id}", headers=user_headers).status_code == 200
+
+    route = f"{API_PREFIX}/quizzes/{{quiz_id}}"
+    key = ("GET", route)
+    assert metrics._latency[key].count == 2
+    assert metrics._latency[key].total > 0
+    assert metrics._db_queries[key].count == 2
+    assert metrics._db_queries[key].total > 0
+    assert metrics._db_seconds[key].total > 0
+    assert metrics._responses[("GET", route, 200)] == 2
+    totals = metrics.totals()
+    assert totals["db_queries"] > 0 and totals["db_seconds"] > 0
+    assert totals["cache_hits"] >= 1 and totals["cache_misses"] >= 1
+
+    response = client.get("/metrics", headers=admin_headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = response.text
+    labels = f'method="GET",route="{route}"'
+    assert "# TYPE http_request_duration_seconds histogram" in text
+    assert f"http_request_duration_seconds_count{{{labels}}} 2" in text
+    assert f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 2' in text
+    assert f"http_request_db_queries_count{{{labels}}} 2" in text
+    assert f'http_responses_total{{{labels},status="200"}} 2' in text
+    assert f'cache_requests_total{{result="hit"}} {totals["cache_hits"]}' in text
+    assert f'cache_requests_total{{result="miss"}} {totals["cache_misses"]}' in text
+    # 경로 매개변수 값이 아니라 템플릿으로 묶음
+    assert f'route="{API_PREFIX}/quizzes/{quiz_id}"' not in text
+
+
+def test_metrics_requires_admin_or_token(monkeypatch, user_headers, admin_headers):
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers=user_headers).status_code == 403
+    assert client.get("/metrics", headers=admin_headers).status_code == 200
+
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "scrape-token")
+    assert client.get("/metrics", headers={"Authorization": "Bearer scrape-token"}).status_code == 200
+    assert client.get("/metrics", headers={"Authorization": "Bearer wrong-token"}).status_code == 401
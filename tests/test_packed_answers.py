@@ -0,0 +1,96 @@
+# tests/test_packed_answers.py
+# 완료된 제출의 답안 압축 저장 - 압축 형식, 제출 시 저장, 기존 제출 압축 후 같은 응답
+from fastapi.testclient import TestClient
+from sqlalchemy import insert
+
+from app.main import app
+from app.config import settings
+from app.db import SessionLocal
+from app.models.submission import Submission, SubmissionAnswer
+from app.services import packed_answers
+
+API_PREFIX = settings.API_PREFIX
+client = TestClient(app)
+
+
+def test_pack_round_trip():
+    order = [11, 12, 13, 14, 15, 16, 17, 18, 19]
+    selected = {11: 0, 13: None, 19: 3, 99: 1}
+    packed = packed_answers.pack_options(order, selected)
+    assert len(packed) == len(order)
+    assert packed_answers.unpack_options(order, packed) == {11: 0, 13: None, 19: 3}
+
+    bitmap, correct = packed_answers.grade_packed(order, packed, {11: 0, 13: 0, 19: 3})
+    assert correct == 2
+    assert len(bitmap) == 2
+    assert [packed_answers.is_correct_at(bitmap, i) for i in range(len(order))] == [
+        True, False, False, False, False, False, False, False, True
+    ]
+
+
+def test_submit_packs_and_compact_keeps_answers(admin_headers, user_headers):
+    """제출하면 답안 행이 남지 않고, 행으로 저장된 기존 제출은 압축 후에도 같은 답안을 반환"""
+    response = client.post(
+        f"{API_PREFIX}/quizzes",
+        headers=admin_headers,
+        json={"title": "답안 압축 테스트", "questions_count": 3, "randomize_options": False}
+    )
+    quiz_id = response.json()["id"]
+    for i in range(3):
+        client.post(
+            f"{API_PREFIX}/quizzes/{quiz_id}/questions",
+            headers=admin_headers,
+            json={"content": f"문제 {i + 1}", "options": ["가", "나", "다", "라"], "correct_answer": 0}
+        )
+
+    headers = user_headers
+    submission_id = client.get(f"{API_PREFIX}/quizzes/{quiz_id}/take", headers=headers).headers["X-Submission-Id"]
+    order = client.get(f"{API_PREFIX}/submissions/{submission_id}", headers=headers).json()["question_order"]
+    answers = [{"question_id": question_id, "selected_option": i % 2} for i, question_id in enumerate(order[:2])]
+    client.post(f"{API_PREFIX}/submissions/{submission_id}/save", headers=headers, json=answers)
+    response = client.post(f"{API_PREFIX}/submissions/{submission_id}/answers", headers=headers, json=answers)
+    assert response.status_code == 201
+
+    db = SessionLocal()
+    try:
+        assert db.query(SubmissionAnswer).filter(SubmissionAnswer.submission_id == submission_id).count() == 0
+    finally:
+        db.close()
+
+    detail = client.get(f"{API_PREFIX}/submissions/{submission_id}", headers=headers).json()
+    packed = [(a["question_id"], a["selected_option"], a["is_correct"]) for a in detail["answers"]]
+    assert packed == [(order[0], 0, True), (order[1], 1, False)]
+
+    # 압축 저장 전 형식(답안 행)으로 된 완료 제출을 만들어 압축
+    db = SessionLocal()
+    try:
+        legacy = Submission(
+            quiz_id=quiz_id, user_id=detail["user_id"], question_order=order,
+            score=100 / 3, is_completed=True, grading_status="graded"
+        )
+        db.add(legacy)
+        db.flush()
+        db.execute(insert(SubmissionAnswer), [
+            {"submission_id": legacy.id, "question_id": order[0], "selected_option": 0, "is_correct": True},
+            {"submission_id": legacy.id, "question_id": order[2], "selected_option": 2, "is_correct": False},
+        ])
+        db.commit()
+        legacy_id = legacy.id
+    finally:
+        db.close()
+
+    url = f"{API_PREFIX}/submissions/{legacy_id}"
+    before = client.get(url, headers=headers).json()["answers"]
+    db = SessionLocal()
+    try:
+        assert packed_answers.compact(db, batch_size=1) >= 1
+        assert db.query(SubmissionAnswer).filter(SubmissionAnswer.submission_id == legacy_id).count() == 0
+    finally:
+        db.close()
+    after = client.get(url, headers=headers).json()["answers"]
+
+    def key(answer):
+        return answer["question_id"], answer["selected_option"], answer["is_correct"]
+
+    assert sorted(map(key, after)) == sorted(map(key, before))
+    assert all(answer["id"] is None for answer in after)
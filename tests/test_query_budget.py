@@ -0,0 +1,101 @@
+# tests/test_query_budget.py
+# 문제 수가 늘어나도 엔드포인트별 SQL 수가 일정한지(N+1 없음) 검사
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.config import settings
+from app.db import SessionLocal
+from app.services.submission import SubmissionService
+
+API_PREFIX = settings.API_PREFIX
+client = TestClient(app)
+
+QUESTION_COUNTS = [3, 15, 45]
+
+
+@pytest.fixture
+def quiz_with_questions(request, admin_headers):
+    """문제 N개짜리 퀴즈 생성"""
+    question_count = request.param
+
+    response = client.post(
+        f"{API_PREFIX}/quizzes",
+        headers=admin_headers,
+        json={
+            "title": f"쿼리 예산 테스트 ({question_count}문항)",
+            "questions_count": question_count,
+        }
+    )
+    assert response.status_code == 201
+    quiz_id = response.json()["id"]
+
+    for i in range(question_count):
+        response = client.post(
+            f"{API_PREFIX}/quizzes/{quiz_id}/questions",
+            headers=admin_headers,
+            json={
+                "content": f"문제 {i + 1}",
+                "options": ["가", "나", "다", "라"],
+                "correct_answer": i % 4,
+            }
+        )
+        assert response.status_code == 200
+
+    return quiz_id, question_count
+
+
+@pytest.mark.parametrize("quiz_with_questions", QUESTION_COUNTS, indirect=True)
+def test_exam_lifecycle_query_budget(quiz_with_questions, user_headers, query_budget):
+    """응시/저장/제출/조회 쿼리 수가 문제 수와 무관한지 검사"""
+    quiz_id, question_count = quiz_with_questions
+    headers = user_headers
+
+    # 첫 요청에서 응시 기록 생성
+    response = client.get(f"{API_PREFIX}/quizzes/{quiz_id}/take", headers=headers)
+    assert response.status_code == 200
+    submission_id = response.headers["X-Submission-Id"]
+
+    # 페이지 조회
+    questions = []
+    for page in (1, 2, 3):
+        with query_budget("take_page"):
+            response = client.get(
+                f"{API_PREFIX}/quizzes/{quiz_id}/take",
+                headers=headers,
+                params={"page": page}
+            )
+        assert response.status_code == 200
+        questions.extend(response.json())
+    assert len({question["id"] for question in questions}) == question_count
+
+    answers = [{"question_id": q["id"], "selected_option": 0} for q in questions]
+
+    with query_budget("save_progress"):
+        response = client.post(
+            f"{API_PREFIX}/submissions/{submission_id}/save",
+            headers=headers,
+            json=answers
+        )
+    assert response.status_code == 200
+
+    with query_budget("submit_answers"):
+        response = client.post(
+            f"{API_PREFIX}/submissions/{submission_id}/answers",
+            headers=headers,
+            json=answers
+        )
+    assert response.status_code == 201
+
+    with query_budget("read_submission"):
+        response = client.get(f"{API_PREFIX}/submissions/{submission_id}", headers=headers)
+    assert response.status_code == 200
+    assert len(response.json()["answers"]) == question_count
+
+    db = SessionLocal()
+    try:
+        with query_budget("submission_result"):
+            result = SubmissionService.get_submission_result(db, submission_id)
+        assert len(result["answers"]) == question_count
+    finally:
+        db.close()
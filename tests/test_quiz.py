@@ -105,4 +105,51 @@ def test_list_quizzes():
 
     assert response.status_code == 200
     # 퀴즈 목록이 리스트 형태로 반환되는지 확인
-    assert isinstance(response.json(), list)
\ No newline at end of file
+    assert isinstance(response.json(), list)
+
+
+def test_quiz_sparse_fieldsets():
+    """fields/include 로 필요한 필드만 조회"""
+    login_response = client.post(
+        f"{API_PREFIX}/users/login",
+        data={"username": "admin", "password": "admin1234"}
+    )
+    headers = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+
+    response = client.post(
+        f"{API_PREFIX}/quizzes",
+        headers=headers,
+        json={"title": "필드 선택 퀴즈", "questions_count": 2}
+    )
+    quiz_id = response.json()["id"]
+    for content in ("문제 1", "문제 2"):
+        client.post(
+            f"{API_PREFIX}/quizzes/{quiz_id}/questions",
+            headers=headers,
+            json={"content": content, "options": ["가", "나"], "correct_answer": 0}
+        )
+
+    # 문제 제외
+    response = client.get(
+        f"/api/quizzes/{quiz_id}",
+        headers=headers,
+        params={"fields": "title,questions_count", "include": ""}
+    )
+    assert response.status_code == 200
+    assert response.json() == {"title": "필드 선택 퀴즈", "questions_count": 2}
+
+    # 문제는 고른 필드만
+    response = client.get(
+        f"/api/quizzes/{quiz_id}",
+        headers=headers,
+        params={"fields": "id,questions.id,questions.content"}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert set(data) == {"id", "questions"}
+    assert [set(question) for question in data["questions"]] == [{"id", "content"}] * 2
+    assert [question["content"] for question in data["questions"]] == ["문제 1", "문제 2"]
+
+    # 알 수 없는 필드
+    response = client.get(f"/api/quizzes/{quiz_id}", headers=headers, params={"fields": "questions.secret"})
+    assert response.status_code == 400
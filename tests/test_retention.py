@@ -0,0 +1,76 @@
+# tests/test_retention.py
+# 미완료 응시 정리 - 오래된 응시만 보관/삭제, 답안 행과 응시 요약 정리
+from datetime import datetime, timedelta, timezone
+
+from fastapi.testclient import TestClient
+from sqlalchemy import update
+
+from app.main import app
+from app.config import settings
+from app.db import SessionLocal
+from app.models.submission import ArchivedSubmission, AttemptSummary, Submission, SubmissionAnswer
+from app.services import packed_answers, retention
+
+API_PREFIX = settings.API_PREFIX
+client = TestClient(app)
+
+
+def start_attempt(admin_headers: dict, headers: dict, title: str) -> dict:
+    response = client.post(
+        f"{API_PREFIX}/quizzes",
+        headers=admin_headers,
+        json={"title": title, "questions_count": 2, "randomize_options": False}
+    )
+    quiz_id = response.json()["id"]
+    for i in range(2):
+        client.post(
+            f"{API_PREFIX}/quizzes/{quiz_id}/questions",
+            headers=admin_headers,
+            json={"content": f"문제 {i + 1}", "options": ["가", "나", "다", "라"], "correct_answer": 0}
+        )
+    submission_id = client.get(f"{API_PREFIX}/quizzes/{quiz_id}/take", headers=headers).headers["X-Submission-Id"]
+    submission = client.get(f"{API_PREFIX}/submissions/{submission_id}", headers=headers).json()
+    answers = [{"question_id": submission["question_order"][0], "selected_option": 2}]
+    client.post(f"{API_PREFIX}/submissions/{submission['id']}/save", headers=headers, json=answers)
+    return submission
+
+
+def test_purge_abandoned_archives_old_attempts_only(admin_headers, user_headers):
+    headers = user_headers
+    old = start_attempt(admin_headers, headers, "정리 대상 응시")
+    recent = start_attempt(admin_headers, headers, "최근 응시")
+
+    now = datetime.now(timezone.utc)
+    long_ago = now - timedelta(days=120)
+    db = SessionLocal()
+    try:
+        db.execute(update(Submission).where(Submission.id == old["id"]).values(start_time=long_ago))
+        db.execute(update(SubmissionAnswer).where(SubmissionAnswer.submission_id == old["id"]).values(
+            created_at=long_ago, updated_at=long_ago
+        ))
+        db.commit()
+
+        report = retention.purge_abandoned(db, retention.cutoff_for(30, now), batch_size=1, archive=True)
+        assert report["submissions"] >= 1
+        assert report["answers"] >= 1
+        assert report["rows_per_second"] > 0
+
+        assert db.get(Submission, old["id"]) is None
+        assert db.query(SubmissionAnswer).filter(SubmissionAnswer.submission_id == old["id"]).count() == 0
+        assert db.get(AttemptSummary, (old["user_id"], old["quiz_id"])) is None
+        archived = db.get(ArchivedSubmission, old["id"])
+        assert archived.answer_count == 1
+        assert packed_answers.unpack_options(archived.question_order, archived.packed_options) == {
+            old["question_order"][0]: 2
+        }
+
+        # 최근에 시작한 응시는 그대로
+        assert db.get(Submission, recent["id"]) is not None
+        summary = db.get(AttemptSummary, (recent["user_id"], recent["quiz_id"]))
+        assert summary.in_progress_submission_id == recent["id"]
+    finally:
+        db.close()
+
+    # 정리된 퀴즈는 다시 응시하면 새 응시 기록으로 시작
+    response = client.get(f"{API_PREFIX}/quizzes/{old['quiz_id']}/take", headers=headers)
+    assert response.status_code == 200
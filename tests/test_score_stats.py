@@ -0,0 +1,120 @@
+# tests/test_score_stats.py
+# 점수 분포 통계 - KLL 스케치 정확도/병합, 일별 요약 조회, 채점 점수를 모아서 저장소에 합치기
+import bisect
+import random
+from datetime import datetime, timezone
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.config import settings
+from app.services import score_stats
+from app.utils.sketch import Histogram, KLLSketch
+
+API_PREFIX = settings.API_PREFIX
+client = TestClient(app)
+
+
+def test_kll_sketch_merge_accuracy():
+    """나눠서 만든 스케치를 합쳐도 순위 오차가 작고, 보관 표본 수는 값 수와 무관"""
+    rng = random.Random(7)
+    values = [min(max(rng.gauss(65, 15), 0), 100) for _ in range(100000)]
+    parts = [KLLSketch(200, seed=i) for i in range(10)]
+    for i, value in enumerate(values):
+        parts[i % 10].update(value)
+    sketch = KLLSketch(200, seed=0)
+    for part in parts:
+        sketch.merge(part)
+
+    values.sort()
+    assert sketch.n == len(values)
+    assert (sketch.min, sketch.max) == (values[0], values[-1])
+    assert sketch.retained < 1000
+    for q, estimate in sketch.quantiles([0.1, 0.5, 0.9]).items():
+        assert abs(bisect.bisect_left(values, estimate) / len(values) - q) < 0.02
+
+    restored = KLLSketch.from_dict(sketch.to_dict())
+    assert restored.quantile(0.5) == sketch.quantile(0.5)
+
+
+def test_histogram_buckets():
+    histogram = Histogram(10)
+    for score in (0, 9.9, 10, 55, 100):
+        histogram.update(score)
+    other = Histogram(10)
+    other.update(100)
+    histogram.merge(other)
+    counts = [bucket["count"] for bucket in histogram.buckets()]
+    assert counts == [2, 1, 0, 0, 0, 1, 0, 0, 0, 2]
+    assert histogram.buckets()[-1]["upper"] == 100
+
+
+def test_quiz_score_stats(admin_headers, user_headers):
+    """채점된 점수가 오늘 요약에 반영되고, 관리자만 조회"""
+    response = client.post(
+        f"{API_PREFIX}/quizzes",
+        headers=admin_headers,
+        json={"title": "점수 통계 테스트", "questions_count": 2, "randomize_options": False}
+    )
+    quiz_id = response.json()["id"]
+    for i in range(2):
+        client.post(
+            f"{API_PREFIX}/quizzes/{quiz_id}/questions",
+            headers=admin_headers,
+            json={"content": f"문제 {i + 1}", "options": ["가", "나", "다", "라"], "correct_answer": 0}
+        )
+
+    for correct in (2, 1, 1):
+        response = client.get(f"{API_PREFIX}/quizzes/{quiz_id}/take", headers=user_headers)
+        questions = response.json()
+        submission_id = response.headers["X-Submission-Id"]
+        answers = [
+            {"question_id": q["id"], "selected_option": 0 if i < correct else 1}
+            for i, q in enumerate(questions)
+        ]
+        client.post(f"{API_PREFIX}/submissions/{submission_id}/answers", headers=user_headers, json=answers)
+
+    url = f"{API_PREFIX}/quizzes/{quiz_id}/stats"
+    assert client.get(url, headers=user_headers).status_code == 403
+
+    response = client.get(url, headers=admin_headers, params={"quantiles": "0.5,1", "by_day": True})
+    assert response.status_code == 200
+    stats = response.json()
+    assert stats["count"] == 3
+    assert stats["mean"] == (100 + 50 + 50) / 3
+    assert stats["quantiles"] == {"p50": 50, "p100": 100}
+    assert sum(bucket["count"] for bucket in stats["histogram"]) == 3
+    assert len(stats["days"]) == 1 and stats["days"][0]["count"] == 3
+
+    response = client.get(url, headers=admin_headers, params={"quantiles": "median"})
+    assert response.status_code == 400
+
+
+def test_scores_are_buffered_and_never_dropped(monkeypatch):
+    """채점 점수는 메모리에 모였다가 flush 때 저장소에 합쳐지고, 합치지 못하면 다음 flush 에 다시 씀"""
+    quiz_id = 10 ** 9
+    score_stats.reset_quiz(quiz_id)
+    score_stats.flush()  # 앞선 테스트에서 채점한 점수
+    today = datetime.now(timezone.utc).date()
+    stats = score_stats.get_score_stats()
+    try:
+        score_stats.record_results([(quiz_id, 1, 40.0), (quiz_id, 2, 80.0), (quiz_id, 3, None)])
+        # 저장소에 합치기 전에도 이 프로세스의 조회에는 보임
+        assert stats.load(quiz_id, [today.isoformat()]) == [None]
+        assert score_stats.get_distribution(quiz_id, today, today)["count"] == 2
+
+        def conflict(*args, **kwargs):
+            raise RuntimeError("갱신 충돌")
+
+        monkeypatch.setattr(stats, "merge", conflict)
+        assert score_stats.flush() == 0
+        monkeypatch.undo()
+        score_stats.record_results([(quiz_id, 4, 60.0)])
+        assert score_stats.flush() == 3
+        assert score_stats.flush() == 0
+
+        distribution = score_stats.get_distribution(quiz_id, today, today)
+        assert distribution["count"] == 3 and distribution["mean"] == 60.0
+        assert stats.load(quiz_id, [today.isoformat()])[0].count == 3
+    finally:
+        score_stats.reset_quiz(quiz_id)
@@ -0,0 +1,63 @@
+# tests/test_search.py
+# 퀴즈/문제 전문 검색 - 접두어 일치, 관련도 순, 커서 페이지, 수정/삭제 시 색인 갱신
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.config import settings
+
+API_PREFIX = settings.API_PREFIX
+client = TestClient(app)
+
+
+def search(headers: dict, **params) -> dict:
+    response = client.get(f"{API_PREFIX}/quizzes/search", headers=headers, params=params)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_search_questions_and_quizzes(admin_headers, user_headers):
+    response = client.post(
+        f"{API_PREFIX}/quizzes",
+        headers=admin_headers,
+        json={"title": "광합성 단원평가", "description": "엽록체와 빛에너지", "questions_count": 5}
+    )
+    quiz_id = response.json()["id"]
+    contents = [
+        "광합성이 일어나는 세포 소기관은?",
+        "광합성 광합성 반응의 산물은?",
+        "호흡과 광합성의 차이는?",
+        "세포막의 구성 성분은?",
+    ]
+    for content in contents:
+        client.post(
+            f"{API_PREFIX}/quizzes/{quiz_id}/questions",
+            headers=admin_headers,
+            json={"content": content, "options": ["엽록체", "미토콘드리아", "리보솜"], "correct_answer": 0}
+        )
+
+    # 접두어 일치 ("광합"), 같은 퀴즈 안에서 관련도 순 + 커서 페이지
+    first = search(admin_headers, q="광합", quiz_id=quiz_id, limit=2)
+    assert len(first["items"]) == 2 and first["next_cursor"]
+    second = search(admin_headers, q="광합", quiz_id=quiz_id, limit=2, cursor=first["next_cursor"])
+    hits = first["items"] + second["items"]
+    assert second["next_cursor"] is None
+    assert len(hits) == 3 and len({hit["id"] for hit in hits}) == 3
+    assert hits[0]["text"] == contents[1]
+    assert [hit["score"] for hit in hits] == sorted((hit["score"] for hit in hits), reverse=True)
+
+    # 선택지도 색인, 모든 단어를 포함해야 함
+    assert len(search(admin_headers, q="미토콘", quiz_id=quiz_id)["items"]) == 4
+    assert search(admin_headers, q="세포 산물", quiz_id=quiz_id)["items"] == []
+
+    # 퀴즈 제목/설명, 수정하면 색인도 갱신
+    assert [hit["id"] for hit in search(admin_headers, q="엽록체", target="quizzes")["items"]] == [quiz_id]
+    client.put(f"{API_PREFIX}/quizzes/{quiz_id}", headers=admin_headers, json={"description": "식물의 에너지"})
+    assert search(admin_headers, q="엽록체", target="quizzes")["items"] == []
+    assert [hit["id"] for hit in search(admin_headers, q="식물", target="quizzes")["items"]] == [quiz_id]
+
+    client.delete(f"{API_PREFIX}/quizzes/{quiz_id}", headers=admin_headers)
+    assert search(admin_headers, q="광합", quiz_id=quiz_id)["items"] == []
+
+    response = client.get(f"{API_PREFIX}/quizzes/search", headers=admin_headers, params={"q": "x", "cursor": "!!"})
+    assert response.status_code == 400
+    assert client.get(f"{API_PREFIX}/quizzes/search", headers=user_headers, params={"q": "x"}).status_code == 403
@@ -0,0 +1,111 @@
+# tests/test_snapshot.py
+import os
+import threading
+from datetime import datetime, timezone
+
+import pytest
+
+from app.config import settings
+from app.services import snapshot as snapshot_service
+from app.services.snapshot import QuestionSnapshot, SnapshotQuestion, write_snapshot
+
+
+def make_question(question_id: int, **fields) -> SnapshotQuestion:
+    values = {
+        "id": question_id,
+        "quiz_id": 1,
+        "content": f"문제 {question_id}",
+        "options": ["서울", "부산", "인천"],
+        "correct_answer": 0,
+        "order": question_id,
+        "created_at": datetime(2025, 3, 1, tzinfo=timezone.utc),
+        "updated_at": None,
+    }
+    values.update(fields)
+    return SnapshotQuestion(**values)
+
+
+def test_snapshot_round_trip(tmp_path):
+    """스냅샷에 쓴 문제를 ID 로 그대로 읽어오는지 확인"""
+    path = str(tmp_path / "questions.snap")
+    questions = [
+        make_question(7, options=["", "빈 문자열 다음 보기"], correct_answer=1, order=None),
+        make_question(12, quiz_id=2, updated_at=datetime(2025, 3, 2, tzinfo=timezone.utc)),
+        make_question(
+            30, content="대한민국의 수도는?", options=["서울", "부산", "인천", "대전"], correct_answer=0,
+            tags=["지리", "수도"], difficulty="easy", weight=2.5
+        ),
+    ]
+    assert write_snapshot(iter(questions), path) == 3
+    assert os.listdir(tmp_path) == ["questions.snap"]
+
+    snapshot = QuestionSnapshot(path)
+    assert len(snapshot) == 3
+    assert list(snapshot.ids) == [7, 12, 30]
+
+    question = snapshot.get(30)
+    assert question.content == "대한민국의 수도는?"
+    assert question.options == ["서울", "부산", "인천", "대전"]
+    assert question.correct_answer == 0
+    assert question.created_at == datetime(2025, 3, 1, tzinfo=timezone.utc)
+    assert question.updated_at is None
+    assert question.tags == ["지리", "수도"]
+    assert question.difficulty == "easy" and question.weight == 2.5
+
+    assert snapshot.get(7).options == ["", "빈 문자열 다음 보기"]
+    assert snapshot.get(7).tags == [] and snapshot.get(7).difficulty is None and snapshot.get(7).weight == 1.0
+    assert snapshot.get(7).order is None
+    assert snapshot.get(12).quiz_id == 2
+    assert snapshot.get(12).updated_at == datetime(2025, 3, 2, tzinfo=timezone.utc)
+    assert snapshot.get(8) is None
+    assert set(snapshot.get_many([7, 8, 30])) == {7, 30}
+
+
+def test_empty_snapshot(tmp_path):
+    path = str(tmp_path / "empty.snap")
+    write_snapshot([], path)
+    snapshot = QuestionSnapshot(path)
+    assert len(snapshot) == 0
+    assert snapshot.get(1) is None
+
+
+def test_snapshot_requires_id_order(tmp_path):
+    """행을 받는 대로 기록하므로 ID 오름차순이 아니면 거부하고 기존 파일은 그대로 둠"""
+    path = str(tmp_path / "questions.snap")
+    write_snapshot([make_question(1)], path)
+    with pytest.raises(ValueError):
+        write_snapshot([make_question(5), make_question(3)], path)
+    assert os.listdir(tmp_path) == ["questions.snap"]
+    assert list(QuestionSnapshot(path).ids) == [1]
+
+
+class _ReleaseHookLock:
+    """잠금 해제 직전에 한 번 hook 을 실행하는 잠금 (안쪽 확인과 해제 사이의 요청 재현)"""
+
+    def __init__(self, hook):
+        self._lock = threading.Lock()
+        self._hook = hook
+
+    def acquire(self, blocking=True):
+        return self._lock.acquire(blocking)
+
+    def release(self):
+        hook, self._hook = self._hook, None
+        if hook:
+            hook()
+        self._lock.release()
+
+
+def test_rebuild_request_during_release_is_not_lost(monkeypatch, tmp_path):
+    builds = []
+    monkeypatch.setattr(settings, "QUESTION_SNAPSHOT_PATH", str(tmp_path / "questions.snap"))
+    monkeypatch.setattr(snapshot_service, "build_snapshot", lambda db, path: builds.append(path) or 0)
+
+    def request_from_other_thread():
+        thread = threading.Thread(target=snapshot_service.request_rebuild)
+        thread.start()
+        thread.join()
+
+    monkeypatch.setattr(snapshot_service, "_rebuild_lock", _ReleaseHookLock(request_from_other_thread))
+    snapshot_service.request_rebuild()
+    assert len(builds) == 2
@@ -43,23 +43,8 @@ def test_submit_answer():
     assert take_response.status_code == 200
     questions = take_response.json()
 
-    # 제출 ID 확인
-    submissions_response = client.get(
-        f"{API_PREFIX}/submissions/my",
-        headers=headers
-    )
-
-    submissions = submissions_response.json()
-    submission_id = None
-
-    for submission in submissions:
-        if submission["quiz_id"] == quiz_id and not submission["is_completed"]:
-            submission_id = submission["id"]
-            break
-
-    if not submission_id:
-        print("진행 중인 제출을 찾을 수 없습니다.")
-        return
+    # 제출 ID 확인 (응시 응답 헤더)
+    submission_id = int(take_response.headers["X-Submission-Id"])
 
     # 답안 작성
     answers = []
@@ -110,23 +95,8 @@ def test_save_progress():
 
     questions = take_response.json()
 
-    # 제출 ID 확인
-    submissions_response = client.get(
-        f"{API_PREFIX}/submissions/my",
-        headers=headers
-    )
-
-    submissions = submissions_response.json()
-    submission_id = None
-
-    for submission in submissions:
-        if submission["quiz_id"] == quiz_id and not submission["is_completed"]:
-            submission_id = submission["id"]
-            break
-
-    if not submission_id:
-        print("진행 중인 제출을 찾을 수 없습니다.")
-        return
+    # 제출 ID 확인 (응시 응답 헤더)
+    submission_id = int(take_response.headers["X-Submission-Id"])
 
     # 일부 답안만 저장
     partial_answers = []